@@ -0,0 +1,6 @@
+"""
+Benchmark suite for the hot views and exports.
+
+Run through the management command:
+    python manage.py run_benchmarks --help
+"""
@@ -0,0 +1,92 @@
+"""
+PM checklist PDF micro-benchmark: CPU time per PDF when many checklists are
+exported in a loop, the way a month of Annex A sheets gets printed.
+
+    pm_pdf:checklist  pm_pdf_export.generate_pm_checklist_pdf (any annex)
+    pm_pdf:daily      pm_daily_weekly_export.generate_daily_pm_pdf (Annex A)
+    pm_pdf:weekly     pm_daily_weekly_export.generate_weekly_pm_pdf (Annex A week)
+    pm_pdf:monthly    pm_monthly_weekly_export.export_monthly_pm_pdf (Annex B)
+    pm_pdf:fdbd       pm_monthly_weekly_export.export_weekly_pm_pdf (Annex C)
+
+CPU time (time.process_time) is what style/layout setup costs; it includes
+the exporter's own queries but not time spent waiting on other processes.
+"""
+import statistics
+import time
+
+from django.test import RequestFactory
+
+
+def _exporters(user, count):
+    from inventory.models import PMChecklistCompletion
+    from inventory.pm_daily_weekly_export import generate_daily_pm_pdf, generate_weekly_pm_pdf
+    from inventory.pm_monthly_weekly_export import export_monthly_pm_pdf, export_weekly_pm_pdf
+    from inventory.pm_pdf_export import generate_pm_checklist_pdf
+
+    completions = PMChecklistCompletion.objects.select_related('schedule__template', 'completed_by').order_by('pk')
+    annex_a = list(completions.filter(schedule__template__annex_code='A')[:count])
+    request = RequestFactory().get('/')
+    request.user = user
+
+    def view_pdf(view, pk):
+        return lambda: view(request, pk).content
+
+    return [
+        ('checklist', [lambda c=c: generate_pm_checklist_pdf(c).getvalue() for c in completions[:count]]),
+        ('daily', [lambda c=c: generate_daily_pm_pdf(c).getvalue() for c in annex_a]),
+        ('weekly', [
+            lambda c=c: generate_weekly_pm_pdf(c.schedule.template, c.completion_date, user).getvalue()
+            for c in annex_a if c.completion_date.weekday() == 4
+        ]),
+        ('monthly', [view_pdf(export_monthly_pm_pdf, pk) for pk in
+                     completions.filter(schedule__template__annex_code='B').values_list('pk', flat=True)[:count]]),
+        ('fdbd', [view_pdf(export_weekly_pm_pdf, pk) for pk in
+                  completions.filter(schedule__template__annex_code='C').values_list('pk', flat=True)[:count]]),
+    ]
+
+
+def measure_exporter(name, calls, rounds=3):
+    """Median CPU/wall ms per PDF over `rounds` passes through `calls`"""
+    calls[0]()  # warm-up: imports, font metrics
+    cpu, wall = [], []
+    for _ in range(rounds):
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        for call in calls:
+            call()
+        cpu.append((time.process_time() - cpu_started) * 1000 / len(calls))
+        wall.append((time.perf_counter() - wall_started) * 1000 / len(calls))
+    return {
+        'name': f'pm_pdf:{name}',
+        'status': 'ok',
+        'pdfs': len(calls),
+        'rounds': rounds,
+        'cpu_ms_per_pdf': round(statistics.median(cpu), 2),
+        'wall_ms_per_pdf': round(statistics.median(wall), 2),
+    }
+
+
+def run_pm_pdf(user, count=50, rounds=3):
+    results = []
+    for name, calls in _exporters(user, count):
+        if not calls:
+            results.append({'name': f'pm_pdf:{name}', 'status': 'skipped', 'reason': 'no completions to render'})
+            continue
+        try:
+            results.append(measure_exporter(name, calls, rounds))
+        except Exception as e:
+            results.append({'name': f'pm_pdf:{name}', 'status': 'error', 'reason': f'{type(e).__name__}: {e}'})
+    return results
+
+
+def compare_pm_pdf(results, baseline, tolerance=0.2, min_delta_ms=2.0):
+    """CPU time per PDF worse than baseline by more than `tolerance`"""
+    previous = {r['name']: r for r in baseline.get('pm_pdf', []) if r.get('status') == 'ok'}
+    regressions = []
+    for result in results:
+        base = previous.get(result['name'])
+        if not base or result.get('status') != 'ok':
+            continue
+        if (result['cpu_ms_per_pdf'] > base['cpu_ms_per_pdf'] * (1 + tolerance)
+                and result['cpu_ms_per_pdf'] - base['cpu_ms_per_pdf'] >= min_delta_ms):
+            regressions.append(f"{result['name']}: {base['cpu_ms_per_pdf']} -> {result['cpu_ms_per_pdf']} CPU ms/PDF")
+    return regressions
@@ -0,0 +1,161 @@
+"""
+Benchmark runner: times each scenario through the Django test client and
+compares the results with a stored baseline.
+"""
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from inventory.middleware import _QueryRecorder
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _consume(response):
+    # Streamed responses only do their work while being iterated
+    if getattr(response, 'streaming', False):
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def _request(client, url, query):
+    response = client.get(url, query)
+    size = _consume(response)
+    return response, size
+
+
+def _client_host():
+    # The test client sends Host: testserver, which ALLOWED_HOSTS rejects with a 400
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*':
+            return host.lstrip('.')
+    return 'localhost'
+
+
+def _failed(scenario, url, response):
+    return {
+        'name': scenario.name, 'url': url, 'status': 'error', 'http_status': response.status_code,
+        'reason': f'HTTP {response.status_code}',
+    }
+
+
+def run_scenario(client, scenario, iterations=5, warmup=1):
+    """Run one scenario and return its result dict"""
+    args = []
+    if scenario.resolve_args:
+        args = scenario.resolve_args()
+        if args is None:
+            return {'name': scenario.name, 'status': 'skipped', 'reason': 'no object to render'}
+    url = reverse(scenario.url_name, args=args)
+
+    try:
+        # Error pages and login redirects are not timings of the view
+        for _ in range(warmup):
+            response, _ = _request(client, url, scenario.query)
+            if not 200 <= response.status_code < 300:
+                return _failed(scenario, url, response)
+
+        timings = []
+        query_counts = []
+        for _ in range(iterations):
+            # execute_wrapper rather than connection.queries: that log is capped at 9000 entries
+            recorder = _QueryRecorder()
+            with connection.execute_wrapper(recorder):
+                started = time.perf_counter()
+                response, size = _request(client, url, scenario.query)
+                timings.append((time.perf_counter() - started) * 1000)
+            query_counts.append(recorder.count)
+            if not 200 <= response.status_code < 300:
+                return _failed(scenario, url, response)
+
+        # Peak Python allocations, measured separately so tracing does not skew timings
+        tracemalloc.start()
+        _request(client, url, scenario.query)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    except Exception as e:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return {'name': scenario.name, 'url': url, 'status': 'error', 'reason': f'{type(e).__name__}: {e}'}
+
+    return {
+        'name': scenario.name,
+        'url': url,
+        'status': 'ok',
+        'http_status': response.status_code,
+        'iterations': iterations,
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(_percentile(timings, 95), 2),
+        'max_ms': round(max(timings), 2),
+        'queries': max(query_counts),
+        'peak_mem_kb': round(peak / 1024, 1),
+        'response_bytes': size,
+    }
+
+
+def run_suite(user, scenarios, iterations=5, warmup=1, dataset=None):
+    """Run every scenario logged in as `user` and return the full report"""
+    client = Client(HTTP_HOST=_client_host())
+    client.force_login(user)
+
+    results = [run_scenario(client, s, iterations, warmup) for s in scenarios]
+    db = settings.DATABASES['default']
+    return {
+        'created_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'database': {'engine': db['ENGINE'], 'name': str(db.get('NAME'))},
+        'dataset': dataset or {},
+        'results': results,
+    }
+
+
+def compare_to_baseline(report, baseline, tolerance=0.2, min_delta_ms=5.0):
+    """
+    Flag regressions: latency (p95) worse than baseline by more than
+    `tolerance` (and at least `min_delta_ms`), or any increase in queries.
+    """
+    previous = {r['name']: r for r in baseline.get('results', []) if r.get('status') == 'ok'}
+    regressions = []
+    for result in report['results']:
+        base = previous.get(result['name'])
+        if not base or result.get('status') != 'ok':
+            continue
+        if (result['p95_ms'] > base['p95_ms'] * (1 + tolerance)
+                and result['p95_ms'] - base['p95_ms'] >= min_delta_ms):
+            regressions.append(f"{result['name']}: p95 {base['p95_ms']} -> {result['p95_ms']} ms")
+        if result['queries'] > base['queries']:
+            regressions.append(f"{result['name']}: queries {base['queries']} -> {result['queries']}")
+    return regressions
+
+
+def write_report(report, path=None):
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+        path = os.path.join(RESULTS_DIR, f'benchmark_{stamp}.json')
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump(report, fh, indent=2)
+    return path
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
@@ -0,0 +1,49 @@
+"""
+Benchmark scenarios: one entry per hot page/export.
+
+Each scenario names the URL and, where the URL needs an object id,
+a resolver that picks one from the current database (None = skip).
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+
+def _first_pk(model_path, **filters):
+    def resolve():
+        from django.apps import apps
+        model = apps.get_model('inventory', model_path)
+        pk = model.objects.filter(**filters).order_by('pk').values_list('pk', flat=True).first()
+        return [pk] if pk is not None else None
+    return resolve
+
+
+@dataclass
+class Scenario:
+    name: str
+    url_name: str
+    resolve_args: Optional[Callable] = None
+    query: dict = field(default_factory=dict)
+
+
+SCENARIOS = [
+    Scenario('dashboard_pro', 'dashboard'),
+    Scenario('pm_overview_view', 'pm_overview'),
+    Scenario('equipment_package_base', 'desktop_details'),
+    Scenario('laptop_list', 'laptop_list'),
+    Scenario('monitor_details', 'monitor_details'),
+    Scenario('salvage_overview', 'salvage_overview'),
+    Scenario('notifications_center', 'notifications_center'),
+    Scenario('daily_pm_dashboard', 'pm_daily_dashboard'),
+    Scenario('downtime_analytics_dashboard', 'downtime_analytics'),
+    Scenario('export_equipment_packages_excel', 'export_desktop_excel'),
+    Scenario('generate_desktop_pdf', 'generate_desktop_pdf',
+             _first_pk('Equipment_Package', is_disposed=False, desktop_details__isnull=False)),
+    Scenario('snmr_export_excel', 'snmr_export_excel', _first_pk('SNMRReport')),
+]
+
+
+def get_scenarios(names=None):
+    if not names:
+        return list(SCENARIOS)
+    wanted = set(names)
+    return [s for s in SCENARIOS if s.name in wanted]
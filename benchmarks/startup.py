@@ -0,0 +1,103 @@
+"""
+Cold-start benchmark: how long a fresh interpreter takes to bring the project
+up, and how much resident memory it holds afterwards.
+
+    setup  what every `manage.py <command>` pays (django.setup())
+    wsgi   what every WSGI worker pays before its first request
+           (get_wsgi_application() + importing the URLconf and its views)
+
+Each sample runs in its own subprocess so nothing is imported yet.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = ('setup', 'wsgi')
+
+# Document/image libraries only the export endpoints need
+HEAVY_MODULES = ('openpyxl', 'weasyprint', 'fpdf', 'docx', 'docx2pdf', 'qrcode', 'reportlab', 'PIL')
+
+_PROBE = r'''
+import json, os, resource, sys, time
+started = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'inventorysystem.settings')
+if sys.argv[1] == 'wsgi':
+    from django.core.wsgi import get_wsgi_application
+    from django.urls import get_resolver
+    get_wsgi_application()
+    get_resolver().url_patterns
+else:
+    import django
+    django.setup()
+elapsed = (time.perf_counter() - started) * 1000
+heavy = sys.argv[2].split(',')
+# VmHWM is reset by exec; ru_maxrss can carry over the parent's peak on Linux
+try:
+    with open('/proc/self/status') as fh:
+        rss = int(next(l for l in fh if l.startswith('VmHWM:')).split()[1])
+except (OSError, StopIteration):
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss //= 1024
+print(json.dumps({
+    'startup_ms': elapsed,
+    'max_rss_kb': rss,
+    'modules': len(sys.modules),
+    'heavy_loaded': sorted(m for m in heavy if m in sys.modules),
+}))
+'''
+
+
+def _probe(target):
+    completed = subprocess.run(
+        [sys.executable, '-c', _PROBE, target, ','.join(HEAVY_MODULES)],
+        cwd=PROJECT_ROOT, env=os.environ.copy(), capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure_startup(target, samples=5):
+    """Median start-up time / RSS of `samples` fresh interpreters for one target"""
+    runs = [_probe(target) for _ in range(samples)]
+    return {
+        'name': f'startup:{target}',
+        'status': 'ok',
+        'samples': samples,
+        'startup_ms': round(statistics.median(r['startup_ms'] for r in runs), 1),
+        'max_rss_kb': int(statistics.median(r['max_rss_kb'] for r in runs)),
+        'modules': runs[-1]['modules'],
+        'heavy_loaded': runs[-1]['heavy_loaded'],
+    }
+
+
+def run_startup(samples=5, targets=TARGETS):
+    results = []
+    for target in targets:
+        try:
+            results.append(measure_startup(target, samples))
+        except (subprocess.CalledProcessError, ValueError) as e:
+            reason = getattr(e, 'stderr', None) or str(e)
+            results.append({'name': f'startup:{target}', 'status': 'error',
+                            'reason': reason.strip().splitlines()[-1]})
+    return results
+
+
+def compare_startup(results, baseline, tolerance=0.2, min_delta_ms=20.0, min_delta_kb=2048):
+    """Start-up time or RSS worse than baseline by more than `tolerance`"""
+    previous = {r['name']: r for r in baseline.get('startup', []) if r.get('status') == 'ok'}
+    regressions = []
+    for result in results:
+        base = previous.get(result['name'])
+        if not base or result.get('status') != 'ok':
+            continue
+        if (result['startup_ms'] > base['startup_ms'] * (1 + tolerance)
+                and result['startup_ms'] - base['startup_ms'] >= min_delta_ms):
+            regressions.append(f"{result['name']}: {base['startup_ms']} -> {result['startup_ms']} ms")
+        if (result['max_rss_kb'] > base['max_rss_kb'] * (1 + tolerance)
+                and result['max_rss_kb'] - base['max_rss_kb'] >= min_delta_kb):
+            regressions.append(f"{result['name']}: RSS {base['max_rss_kb']} -> {result['max_rss_kb']} KB")
+    return regressions
@@ -20,7 +20,10 @@ from .models import (
     # ASIR Models
     ASIRReport, ASIREntry,
     # HDR Models
-    HDRReport, HDREntry
+    HDRReport, HDREntry,
+    # Read models
+    DashboardSnapshot, AssetIndex,
+    NotificationOutbox, ExportJob, PMAlertState, PMComplianceCell,
 )
 
 # Register your models here.
@@ -89,4 +92,43 @@ admin.site.register(ASIREntry)
 
 # HDR - HelpDesk Report
 admin.site.register(HDRReport)
-admin.site.register(HDREntry)
\ No newline at end of file
+admin.site.register(HDREntry)
+
+# Read models
+admin.site.register(DashboardSnapshot)
+
+
+@admin.register(AssetIndex)
+class AssetIndexAdmin(admin.ModelAdmin):
+    list_display = ['asset_type', 'package_id', 'computer_name', 'serial_no', 'brand', 'end_user_name', 'section_name', 'is_disposed']
+    list_filter = ['asset_type', 'is_disposed']
+    search_fields = ['computer_name', 'serial_no', 'end_user_name', 'asset_owner_name']
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ['id', 'event_type', 'status', 'attempts', 'object_id', 'created_at', 'processed_at']
+    list_filter = ['status', 'event_type']
+    search_fields = ['idempotency_key', 'last_error']
+    readonly_fields = ['created_at', 'processed_at', 'claimed_at']
+
+
+@admin.register(PMAlertState)
+class PMAlertStateAdmin(admin.ModelAdmin):
+    list_display = ['assignment', 'state', 'alerted_at']
+    list_filter = ['state']
+    raw_id_fields = ['assignment']
+
+
+@admin.register(PMComplianceCell)
+class PMComplianceCellAdmin(admin.ModelAdmin):
+    list_display = ['asset_type', 'package_id', 'quarter', 'section', 'is_completed', 'due_date']
+    list_filter = ['asset_type', 'is_completed', 'quarter']
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'progress', 'attempts', 'requested_by', 'created_at', 'finished_at', 'expires_at']
+    list_filter = ['status', 'kind']
+    search_fields = ['dedupe_key', 'filename', 'error']
+    readonly_fields = ['dedupe_key', 'created_at', 'started_at', 'heartbeat_at', 'finished_at']
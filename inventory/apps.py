@@ -6,4 +6,9 @@ class InventoryConfig(AppConfig):
     name = 'inventory'
 
     def ready(self):
-        import inventory.signals  # 👈 Load your signal (this being used in QR CODE and notifications)
\ No newline at end of file
+        import inventory.signals  # 👈 Load your signal (this being used in QR CODE and notifications)
+
+        from django.conf import settings
+        if settings.NOTIFICATION_OUTBOX_SCHEDULER:
+            from inventory.notification_outbox import start_scheduler
+            start_scheduler()
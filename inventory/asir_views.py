@@ -219,53 +219,41 @@ def asir_finalize(request, report_id):
 @login_required
 def asir_export_excel(request, report_id):
     """Export ASIR report to Excel using template - fills data into pre-formatted cells"""
-    from openpyxl import load_workbook
     from openpyxl.styles import Alignment
-    from django.db import models
+    from .excel_templates import ASIR_TEMPLATE
     import io
 
     report = get_object_or_404(ASIRReport, id=report_id)
     entries = report.entries.order_by('item_number')
 
-    # Load template
-    template_path = 'media/pm_reports/Ley4_ASIR.xlsx'
-    wb = load_workbook(template_path)
-
-    # Use the "Do not delete" sheet as template or create new sheet
-    # We'll use "October 2025" sheet as template and modify it
-    if 'Do not delete' in wb.sheetnames:
-        ws = wb['Do not delete']
-    else:
-        ws = wb.active
+    # The "Do not delete" sheet of the template (falls back to the active sheet)
+    wb, ws = ASIR_TEMPLATE.open()
 
     # Fill in header information
-    ws['A2'] = f'For the Month of {report.period_display}'
-    ws['B4'] = report.region
-    ws['B5'] = report.office
-    ws['B6'] = report.address
-    ws['F4'] = report.network_admin_name
-    ws['F5'] = report.network_admin_contact
-    ws['F6'] = report.network_admin_email
-
-    # Data starts at row 10 (template already has headers and formatting)
-    data_start_row = 10
+    ASIR_TEMPLATE.write_cells(ws, {
+        'period': f'For the Month of {report.period_display}',
+        'region': report.region,
+        'office': report.office,
+        'address': report.address,
+        'admin_name': report.network_admin_name,
+        'admin_contact': report.network_admin_contact,
+        'admin_email': report.network_admin_email,
+    })
 
     # Fill in data entries - preserve template formatting
     for idx, entry in enumerate(entries):
-        row_num = data_start_row + idx
-
-        # Fill in the data for this entry
-        ws[f'A{row_num}'] = entry.item_number
-        ws[f'B{row_num}'] = entry.application_name
-        ws[f'C{row_num}'] = entry.number_of_users if entry.number_of_users > 0 else ''
-        ws[f'D{row_num}'] = entry.status
-        ws[f'E{row_num}'] = entry.activity_details
-        ws[f'F{row_num}'] = entry.activity_date
-        ws[f'G{row_num}'] = entry.remarks
+        row_num = ASIR_TEMPLATE.write_row(ws, idx, {
+            'item_number': entry.item_number,
+            'application_name': entry.application_name,
+            'number_of_users': entry.number_of_users if entry.number_of_users > 0 else '',
+            'status': entry.status,
+            'activity_details': entry.activity_details,
+            'activity_date': entry.activity_date,
+            'remarks': entry.remarks,
+        })
 
         # Enable text wrapping for all data cells to handle long content
-        for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G']:
-            cell = ws[f'{col}{row_num}']
+        for cell in ASIR_TEMPLATE.row_cells(ws, row_num):
             if cell.alignment:
                 # Preserve existing alignment but enable wrapping
                 cell.alignment = Alignment(
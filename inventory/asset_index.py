@@ -0,0 +1,267 @@
+"""
+Asset index - one denormalized AssetIndex row per desktop, laptop, printer
+and office supplies package.
+
+Rows are built set-based (a handful of queries per asset type, whatever the
+number of packages), refreshed per package by the signals in signals.py and
+rebuilt from scratch by `python manage.py rebuild_asset_index`.
+"""
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import (
+    AssetIndex, Employee, UserDetails, normalize_sn,
+    Equipment_Package, DesktopDetails, LaptopPackage, LaptopDetails,
+    PrinterPackage, PrinterDetails, OfficeSuppliesPackage, OfficeSuppliesDetails,
+)
+
+# asset_type -> where its rows come from. `fields` maps AssetIndex fields to
+# lookups on the details model.
+ASSET_SOURCES = {
+    'desktop': {
+        'package': Equipment_Package,
+        'details': DesktopDetails,
+        'details_fk': 'equipment_package_id',
+        'user_fk': 'equipment_package_id',
+        'fields': {
+            'computer_name': 'computer_name',
+            'serial_no': 'serial_no',
+            'serial_no_norm': 'serial_no_norm',
+            'brand': 'brand_name__name',
+            'model': 'model',
+        },
+    },
+    'laptop': {
+        'package': LaptopPackage,
+        'details': LaptopDetails,
+        'details_fk': 'laptop_package_id',
+        'user_fk': 'laptop_package_id',
+        'fields': {
+            'computer_name': 'computer_name',
+            'serial_no': 'laptop_sn_db',
+            'serial_no_norm': 'serial_no_norm',
+            'brand': 'brand_name__name',
+            'model': 'model',
+        },
+    },
+    'printer': {
+        'package': PrinterPackage,
+        'details': PrinterDetails,
+        'details_fk': 'printer_package_id',
+        'user_fk': 'printer_package_id',
+        'fields': {
+            'serial_no': 'printer_sn_db',
+            'serial_no_norm': 'printer_sn_norm',
+            'brand': 'printer_brand_db__name',
+            'model': 'printer_model_db',
+        },
+    },
+    'office_supplies': {
+        'package': OfficeSuppliesPackage,
+        'details': OfficeSuppliesDetails,
+        'details_fk': 'supplies_package_id',
+        'user_fk': 'office_supplies_package_id',
+        'fields': {
+            'serial_no': 'supplies_sn_db',
+            'serial_no_norm': 'serial_no_norm',
+            'brand': 'brand_name__name',
+            'model': 'item_type',
+        },
+    },
+}
+
+
+def asset_type_for(model):
+    """AssetIndex.asset_type for a package or details model (None if not indexed)"""
+    for asset_type, source in ASSET_SOURCES.items():
+        if model in (source['package'], source['details']):
+            return asset_type
+    return None
+
+
+def _first_per_package(queryset, fk):
+    """{package_id: first row} - same row the views get from .first()"""
+    first = {}
+    for row in queryset.order_by(fk, 'id'):
+        first.setdefault(row[fk], row)
+    return first
+
+
+def _employee_map(employee_ids):
+    employees = (
+        Employee.objects.filter(pk__in=employee_ids)
+        .select_related('employee_office_section')
+        .only('employee_fname', 'employee_mname', 'employee_lname',
+              'employee_office_section__name')
+    )
+    return {e.pk: e for e in employees}
+
+
+def build_rows(asset_type, package_ids=None):
+    """Unsaved AssetIndex rows for the given packages (all packages if None)"""
+    source = ASSET_SOURCES[asset_type]
+    details_fk, user_fk = source['details_fk'], source['user_fk']
+
+    packages = source['package'].objects.all()
+    details = source['details'].objects.filter(**{f'{details_fk}__isnull': False})
+    users = UserDetails.objects.filter(**{f'{user_fk}__isnull': False})
+    if package_ids is not None:
+        packages = packages.filter(pk__in=package_ids)
+        details = details.filter(**{f'{details_fk}__in': package_ids})
+        users = users.filter(**{f'{user_fk}__in': package_ids})
+
+    packages = packages.values('id', 'is_disposed', 'disposal_date', 'created_at', 'updated_at')
+    details = _first_per_package(
+        details.values('id', details_fk, *source['fields'].values()), details_fk
+    )
+    users = _first_per_package(
+        users.values('id', user_fk, 'user_Enduser_id', 'user_Assetowner_id'), user_fk
+    )
+    employees = _employee_map({
+        pk for u in users.values()
+        for pk in (u['user_Enduser_id'], u['user_Assetowner_id']) if pk
+    })
+
+    rows = []
+    for package in packages:
+        detail = details.get(package['id'], {})
+        user = users.get(package['id'], {})
+        end_user = employees.get(user.get('user_Enduser_id'))
+        asset_owner = employees.get(user.get('user_Assetowner_id'))
+        section = end_user.employee_office_section if end_user else None
+
+        row = AssetIndex(
+            asset_type=asset_type,
+            package_id=package['id'],
+            detail_id=detail.get('id'),
+            end_user=end_user,
+            end_user_name=end_user.full_name if end_user else '',
+            asset_owner=asset_owner,
+            asset_owner_name=asset_owner.full_name if asset_owner else '',
+            section=section,
+            section_name=section.name if section else '',
+            is_disposed=package['is_disposed'],
+            disposal_date=package['disposal_date'],
+            created_at=package['created_at'],
+            updated_at=package['updated_at'],
+        )
+        for field, lookup in source['fields'].items():
+            setattr(row, field, detail.get(lookup) or '')
+        rows.append(row)
+    return rows
+
+
+def sync_assets(asset_type, package_ids):
+    """Re-index the given packages; rows of deleted packages are dropped"""
+    package_ids = [pk for pk in set(package_ids) if pk is not None]
+    if not package_ids:
+        return
+    rows = build_rows(asset_type, package_ids)
+    with transaction.atomic():
+        AssetIndex.objects.filter(asset_type=asset_type, package_id__in=package_ids).delete()
+        AssetIndex.objects.bulk_create(rows)
+
+
+def sync_assets_for_employees(employee_ids):
+    """Re-index every asset an employee is end user or asset owner of"""
+    affected = (
+        AssetIndex.objects
+        .filter(Q(end_user_id__in=employee_ids) | Q(asset_owner_id__in=employee_ids))
+        .values_list('asset_type', 'package_id')
+    )
+    by_type = {}
+    for asset_type, package_id in affected:
+        by_type.setdefault(asset_type, []).append(package_id)
+    for asset_type, package_ids in by_type.items():
+        sync_assets(asset_type, package_ids)
+
+
+def sync_assets_for_brand(brand_id):
+    """Re-index every asset whose details use this brand"""
+    for asset_type, source in ASSET_SOURCES.items():
+        brand_field = source['fields']['brand'].split('__')[0]
+        package_ids = (
+            source['details'].objects.filter(**{brand_field: brand_id})
+            .values_list(source['details_fk'], flat=True)
+        )
+        sync_assets(asset_type, list(package_ids))
+
+
+def rebuild_asset_index(batch_size=2000):
+    """Drop and rebuild the whole index; returns {asset_type: rows}"""
+    counts = {}
+    with transaction.atomic():
+        AssetIndex.objects.all().delete()
+        for asset_type in ASSET_SOURCES:
+            rows = build_rows(asset_type)
+            AssetIndex.objects.bulk_create(rows, batch_size=batch_size)
+            counts[asset_type] = len(rows)
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def search_assets(term, asset_type=None, include_disposed=False):
+    """Cross-type search on name, serial, brand, model and assigned people"""
+    qs = AssetIndex.objects.all()
+    if asset_type:
+        qs = qs.filter(asset_type=asset_type)
+    if not include_disposed:
+        qs = qs.filter(is_disposed=False)
+
+    term = (term or '').strip()
+    if term:
+        match = (
+            Q(computer_name__icontains=term)
+            | Q(serial_no__icontains=term)
+            | Q(brand__icontains=term)
+            | Q(model__icontains=term)
+            | Q(end_user_name__icontains=term)
+            | Q(asset_owner_name__icontains=term)
+            | Q(section_name__icontains=term)
+        )
+        sn = normalize_sn(term)
+        if sn:
+            match |= Q(serial_no_norm=sn)
+        qs = qs.filter(match)
+    return qs.order_by('-created_at', '-id')
+
+
+def asset_type_counts():
+    """{asset_type: {'active': n, 'disposed': n}} in one query"""
+    counts = {t: {'active': 0, 'disposed': 0} for t in ASSET_SOURCES}
+    rows = AssetIndex.objects.values('asset_type', 'is_disposed').annotate(n=Count('id'))
+    for row in rows:
+        counts[row['asset_type']]['disposed' if row['is_disposed'] else 'active'] = row['n']
+    return counts
+
+
+def section_asset_counts(include_disposed=False):
+    """Active assets per end-user section and type, in one query"""
+    qs = AssetIndex.objects.all()
+    if not include_disposed:
+        qs = qs.filter(is_disposed=False)
+    return (
+        qs.values('section_id', 'section_name', 'asset_type')
+        .annotate(total=Count('id'))
+        .order_by('section_name', 'asset_type')
+    )
+
+
+def indexed_package_ids(asset_type, **lookups):
+    """Subquery of package ids whose index row matches `lookups`"""
+    return AssetIndex.objects.filter(asset_type=asset_type, **lookups).values('package_id')
+
+
+def filter_by_index(queryset, asset_type, package_field, **lookups):
+    """Restrict `queryset` to packages whose index row matches `lookups`"""
+    matching = indexed_package_ids(asset_type, **lookups)
+    return queryset.filter(**{f'{package_field}__in': matching})
+
+
+def search_by_index(queryset, asset_type, package_field, term):
+    """Restrict `queryset` to packages found by search_assets(term)"""
+    matching = search_assets(term, asset_type, include_disposed=True).values('package_id')
+    return queryset.filter(**{f'{package_field}__in': matching})
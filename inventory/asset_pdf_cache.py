@@ -0,0 +1,187 @@
+"""
+Rendered desktop/laptop asset sheet PDFs, cached on disk.
+
+Files are content-addressed: the key is a hash of the sheet's HTML, which
+carries everything the PDF shows (details, components, documents, user,
+history, disposals, QR code URL). The "Generated on" footer is left out of
+the hash and filled in when the PDF is rendered, so a package whose data did
+not change hashes the same and reuses the same file.
+
+Building that HTML still costs the sheet's queries, so the digest of each
+package's current sheet is also remembered in the Django cache. Signals
+(inventory/signals.py) drop it when one of the package's rows changes, or
+bump a generation number for changes that can touch any sheet (employees,
+brands, sections, PM schedules). A warm hit is a cache read and a stat().
+
+Responses carry an ETag (the digest) and Last-Modified (when that content
+was first rendered), so conditional requests are answered with 304.
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import FileResponse
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.utils.module_loading import import_string
+
+from .utils.pdf_render import html_to_pdf
+
+# Bump when the way sheets are rendered changes without the HTML changing
+CACHE_VERSION = 1
+
+# kind -> builder returning (template, context, filename) for {'package_id', 'base_url'}
+PDF_SOURCES = {
+    'desktop': 'inventory.export_views.desktop_pdf_context',
+    'laptop': 'inventory.export_views.laptop_pdf_context',
+}
+
+POINTER_PREFIX = 'asset_pdf'
+GENERATION_KEY = 'asset_pdf:generation'
+POINTER_TIMEOUT = None  # until invalidated
+
+
+class CachedPDF:
+
+    def __init__(self, path, digest, filename):
+        self.path = path
+        self.digest = digest
+        self.filename = filename
+
+    @property
+    def etag(self):
+        return f'"{self.digest}"'
+
+    @property
+    def last_modified(self):
+        return int(os.path.getmtime(self.path))
+
+    def open(self):
+        return open(self.path, 'rb')
+
+
+def _pointer_key(kind, package_id):
+    return f'{POINTER_PREFIX}:{kind}:{package_id}'
+
+
+def _path(digest):
+    return os.path.join(settings.ASSET_PDF_CACHE_DIR, digest[:2], f'{digest}.pdf')
+
+
+def write_pdf(html, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            html_to_pdf(html, fh)
+        os.replace(tmp, path)  # atomic: readers never see a partial file
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def init_worker():
+    """
+    Initializer of processes that write_pdf() for a batch (inventory/asset_sheets.py).
+    Spawned workers start without Django; the URL fetcher needs its settings
+    and the staticfiles finders.
+    """
+    import django
+    django.setup()
+
+
+def current_generation():
+    return cache.get(GENERATION_KEY, 0)
+
+
+def cached_pdf(kind, package_id, base_url, generation):
+    """The package's sheet if its pointer is current and the file is there, else None"""
+    pointer = cache.get(_pointer_key(kind, package_id))
+    if pointer and pointer['base_url'] == base_url and pointer['generation'] == generation:
+        path = _path(pointer['digest'])
+        if os.path.exists(path):
+            return CachedPDF(path, pointer['digest'], pointer['filename'])
+    return None
+
+
+def prepare(template, context, filename):
+    """
+    (CachedPDF, html) for a sheet's template and context. `html` is None when
+    the file is already on disk, otherwise the page to write_pdf() to pdf.path.
+    """
+    html = render_to_string(template, dict(context, generated_at=None))
+    digest = hashlib.sha256(f'{CACHE_VERSION}\0{html}'.encode()).hexdigest()
+    path = _path(digest)
+    if os.path.exists(path):
+        return CachedPDF(path, digest, filename), None
+    return CachedPDF(path, digest, filename), render_to_string(template, dict(context, generated_at=timezone.localtime()))
+
+
+def remember(kind, package_id, base_url, pdf, generation):
+    cache.set(_pointer_key(kind, package_id), {
+        'digest': pdf.digest, 'filename': pdf.filename, 'base_url': base_url, 'generation': generation,
+    }, POINTER_TIMEOUT)
+
+
+def get_pdf(kind, package_id, base_url):
+    """The cached sheet of one package, rendering it first if needed"""
+    generation = current_generation()
+    pdf = cached_pdf(kind, package_id, base_url, generation)
+    if pdf:
+        return pdf
+
+    template, context, filename = import_string(PDF_SOURCES[kind])({'package_id': package_id, 'base_url': base_url})
+    pdf, html = prepare(template, context, filename)
+    if html is not None:
+        write_pdf(html, pdf.path)
+    remember(kind, package_id, base_url, pdf, generation)
+    return pdf
+
+
+def pdf_response(request, kind, package_id):
+    """Inline PDF response with ETag / Last-Modified; 304 when the client copy is current"""
+    pdf = get_pdf(kind, package_id, request.build_absolute_uri('/'))
+    last_modified = pdf.last_modified
+    response = get_conditional_response(request, etag=pdf.etag, last_modified=last_modified)
+    if response is None:
+        response = FileResponse(pdf.open(), filename=pdf.filename, content_type='application/pdf')
+    response['ETag'] = pdf.etag
+    response['Last-Modified'] = http_date(last_modified)
+    # Cache, but ask again every time - the answer is usually a cheap 304
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def invalidate(kind, package_ids):
+    cache.delete_many([_pointer_key(kind, package_id) for package_id in package_ids if package_id])
+
+
+def invalidate_all():
+    """Every package's sheet is re-checked on its next request"""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+
+def purge(max_age_days=None):
+    """Delete cached files first rendered more than `max_age_days` ago; returns how many"""
+    max_age_days = settings.ASSET_PDF_CACHE_DAYS if max_age_days is None else max_age_days
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for root, _dirs, files in os.walk(settings.ASSET_PDF_CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
@@ -0,0 +1,380 @@
+"""
+Desktop/laptop asset sheets - one package (generate_desktop_pdf /
+generate_laptop_pdf) or a whole selection in one PDF (asset_sheets_pdf,
+`manage.py print_asset_sheets`).
+
+Sheet contexts are built for a batch of packages at once: every related
+table (details, components, documents, users, history, disposals, PMs) is
+read with one query per batch, not one per package. Batch PDFs are rendered
+CHUNK_SIZE packages at a time: the chunk's pages go through the asset sheet
+cache (inventory/asset_pdf_cache.py), so sheets whose data did not change are
+not rendered again, and missing ones are rendered in ASSET_SHEET_BATCH_WORKERS
+worker processes. The sheets are then appended behind a table of contents,
+with a bookmark per package. Only one chunk's contexts and HTML are held at a
+time, and the output is written one sheet at a time (utils/pdf_stream.py).
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from urllib.parse import urljoin
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F, Prefetch, Q
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.templatetags.static import static
+from django.utils import timezone
+
+from . import asset_pdf_cache
+from .models import (
+    AssetOwnerChangeHistory, DesktopDetails, DisposedDesktopDetail, DisposedKeyboard, DisposedLaptop,
+    DisposedMonitor, DisposedMouse, DisposedUPS, DocumentsDetails, Employee, EndUserChangeHistory, Equipment_Package,
+    KeyboardDetails, LaptopDetails, LaptopPackage, MonitorDetails, MouseDetails, OfficeSection, PMScheduleAssignment,
+    PreventiveMaintenance, UPSDetails, UserDetails,
+)
+
+CHUNK_SIZE = 100
+# Sheets below this are rendered in-process; starting workers costs more
+MIN_PARALLEL_SHEETS = 4
+MAX_AUTO_WORKERS = 4
+
+SHEET_USER_RELATED = ('user_Enduser__employee_office_section', 'user_Assetowner__employee_office_section')
+
+
+class AssetSheet:
+    """One package's sheet: what to render, and its line in the table of contents"""
+
+    def __init__(self, kind, package_id, template, context, filename, computer_name, user_details):
+        self.kind = kind
+        self.package_id = package_id
+        self.template = template
+        self.context = context
+        self.filename = filename
+        self.computer_name = computer_name or f'{kind.title()} package {package_id}'
+        end_user = user_details.user_Enduser if user_details else None
+        self.end_user = end_user.full_name if end_user else ''
+        self.section = str(end_user.employee_office_section or '') if end_user else ''
+
+
+def _group(rows, key):
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(getattr(row, key), []).append(row)
+    return grouped
+
+
+def _first(rows):
+    return rows[0] if rows else None
+
+
+def desktop_sheets(package_ids, base_url):
+    """AssetSheets of desktop packages, in the order of `package_ids`; packages without details are skipped"""
+    packages = Equipment_Package.objects.filter(id__in=package_ids).prefetch_related(
+        Prefetch('desktop_details', DesktopDetails.objects.select_related('brand_name').order_by('pk'),
+                 to_attr='sheet_desktops'),
+        Prefetch('keyboards', KeyboardDetails.objects.filter(is_disposed=False)
+                 .select_related('keyboard_brand_db').order_by('pk'), to_attr='sheet_keyboards'),
+        Prefetch('mouse_db', MouseDetails.objects.filter(is_disposed=False)
+                 .select_related('mouse_brand_db').order_by('pk'), to_attr='sheet_mice'),
+        Prefetch('monitors', MonitorDetails.objects.filter(is_disposed=False)
+                 .select_related('monitor_brand_db').order_by('pk'), to_attr='sheet_monitors'),
+        Prefetch('ups', UPSDetails.objects.filter(is_disposed=False)
+                 .select_related('ups_brand_db').order_by('pk'), to_attr='sheet_ups'),
+        # Left as a queryset: the template calls documents_detailse.first,
+        # which an ordered prefetched queryset answers from its cache
+        Prefetch('docs', DocumentsDetails.objects.order_by('pk')),
+        Prefetch('user_details', UserDetails.objects.select_related(*SHEET_USER_RELATED).order_by('pk'),
+                 to_attr='sheet_users'),
+        Prefetch('monitors_details', DisposedMonitor.objects.order_by('-disposal_date'), to_attr='sheet_disposed_monitors'),
+        Prefetch('keyboards_details', DisposedKeyboard.objects.order_by('-disposal_date'), to_attr='sheet_disposed_keyboards'),
+        Prefetch('mouse_details', DisposedMouse.objects.order_by('-disposal_date'), to_attr='sheet_disposed_mice'),
+        Prefetch('ups_details', DisposedUPS.objects.order_by('-disposal_date'), to_attr='sheet_disposed_ups'),
+    ).in_bulk()
+
+    content_type = ContentType.objects.get_for_model(Equipment_Package)
+    owner_history = _group(
+        AssetOwnerChangeHistory.objects.filter(content_type=content_type, object_id__in=list(packages))
+        .select_related('old_assetowner', 'new_assetowner', 'changed_by').order_by('-changed_at'),
+        'object_id',
+    )
+    enduser_history = _group(
+        EndUserChangeHistory.objects.filter(content_type=content_type, object_id__in=list(packages))
+        .select_related('old_enduser', 'new_enduser', 'changed_by').order_by('-changed_at'),
+        'object_id',
+    )
+    disposed_desktops = _group(
+        DisposedDesktopDetail.objects.filter(desktop__equipment_package__in=list(packages))
+        .annotate(sheet_package_id=F('desktop__equipment_package_id')).order_by('-date_disposed'),
+        'sheet_package_id',
+    )
+    logo_url = urljoin(base_url, static('img/logo.png'))
+
+    sheets = []
+    for package_id in package_ids:
+        package = packages.get(package_id)
+        desktop = _first(package.sheet_desktops) if package else None
+        if desktop is None:
+            continue
+        user_details = _first(package.sheet_users)
+        sheets.append(AssetSheet('desktop', package.id, 'pdf_template.html', {
+            'desktop_detailsx': desktop,
+            'equipment_package': package,
+            'keyboard_detailse': _first(package.sheet_keyboards),
+            'mouse_detailse': _first(package.sheet_mice),
+            'monitor_detailse': _first(package.sheet_monitors),
+            'ups_detailse': _first(package.sheet_ups),
+            'user_details': user_details,
+            'documents_detailse': package.docs.all(),
+            'qr_code_url': urljoin(base_url, package.qr_code.url) if package.qr_code else None,
+            'logo_url': logo_url,
+            'asset_owner_history': owner_history.get(package.id, []),
+            'enduser_history': enduser_history.get(package.id, []),
+            'disposed_desktops': disposed_desktops.get(package.id, []),
+            'disposed_monitors': package.sheet_disposed_monitors,
+            'disposed_keyboards': package.sheet_disposed_keyboards,
+            'disposed_mice': package.sheet_disposed_mice,
+            'disposed_ups': package.sheet_disposed_ups,
+        }, f"desktop_{desktop.computer_name or package.id}_details.pdf", desktop.computer_name, user_details))
+    return sheets
+
+
+def laptop_sheets(package_ids, base_url):
+    """AssetSheets of laptop packages, in the order of `package_ids`; packages without details are skipped"""
+    packages = LaptopPackage.objects.filter(id__in=package_ids).prefetch_related(
+        Prefetch('laptop_details', LaptopDetails.objects.select_related('brand_name').order_by('pk'),
+                 to_attr='sheet_laptops'),
+        Prefetch('docs', DocumentsDetails.objects.order_by('pk'), to_attr='sheet_documents'),
+        Prefetch('user_details', UserDetails.objects.select_related(*SHEET_USER_RELATED).order_by('pk'),
+                 to_attr='sheet_users'),
+        Prefetch('maintenances', PreventiveMaintenance.objects.select_related(
+            'pm_schedule_assignment__pm_section_schedule__quarter_schedule'
+        ).order_by('date_accomplished'), to_attr='sheet_maintenance'),
+    ).in_bulk()
+
+    disposed_laptops = _group(
+        DisposedLaptop.objects.filter(laptop__laptop_package__in=list(packages))
+        .annotate(sheet_package_id=F('laptop__laptop_package_id')).order_by('-date_disposed'),
+        'sheet_package_id',
+    )
+    logo_url = urljoin(base_url, static('img/logo.png'))
+
+    sheets = []
+    for package_id in package_ids:
+        package = packages.get(package_id)
+        laptop = _first(package.sheet_laptops) if package else None
+        if laptop is None:
+            continue
+        user_details = _first(package.sheet_users)
+        sheets.append(AssetSheet('laptop', package.id, 'laptop/pdf_template_laptop.html', {
+            "laptop_package": package,
+            "laptop_details": laptop,
+            "user_details": user_details,
+            "documents_details": _first(package.sheet_documents),
+            "disposed_laptops": disposed_laptops.get(package.id, []),
+            "maintenance_records": package.sheet_maintenance,
+            "current_pm_schedule": PMScheduleAssignment.objects.filter(laptop_package=package).select_related(
+                "pm_section_schedule__quarter_schedule", "pm_section_schedule__section"
+            ).order_by(
+                "pm_section_schedule__quarter_schedule__year",
+                "pm_section_schedule__quarter_schedule__quarter"
+            ),
+            "qr_code_url": urljoin(base_url, package.qr_code.url) if package.qr_code else None,
+            "logo_url": logo_url,
+        }, f"laptop_{laptop.computer_name or package.id}_details.pdf", laptop.computer_name, user_details))
+    return sheets
+
+
+SHEET_BUILDERS = {
+    'desktop': (desktop_sheets, Equipment_Package, "No DesktopDetails found for this package."),
+    'laptop': (laptop_sheets, LaptopPackage, "No LaptopDetails found for this package."),
+}
+
+
+def asset_sheet(kind, package_id, base_url):
+    """One package's AssetSheet; Http404 when the package or its details don't exist"""
+    build, model, missing_details = SHEET_BUILDERS[kind]
+    sheets = build([package_id], base_url)
+    if sheets:
+        return sheets[0]
+    if not model.objects.filter(id=package_id).exists():
+        raise Http404(f"No {model._meta.object_name} matches the given query.")
+    raise Http404(missing_details)
+
+
+def select_packages(section_id=None, owner_id=None, desktop_ids=(), laptop_ids=()):
+    """
+    [(kind, package_id)] to print - desktops then laptops, each by computer
+    name. Explicit IDs pick those packages; section (of the end user) and
+    asset owner narrow the selection down, and without IDs select from the
+    packages that are not disposed.
+    """
+    filters = Q()
+    if section_id:
+        filters &= Q(user_details__user_Enduser__employee_office_section_id=section_id)
+    if owner_id:
+        filters &= Q(user_details__user_Assetowner_id=owner_id)
+
+    selection = []
+    for kind, model, ids, details, package_field in (
+        ('desktop', Equipment_Package, desktop_ids, DesktopDetails, 'equipment_package_id'),
+        ('laptop', LaptopPackage, laptop_ids, LaptopDetails, 'laptop_package_id'),
+    ):
+        if desktop_ids or laptop_ids:
+            if not ids:
+                continue
+            packages = model.objects.filter(filters, id__in=ids)
+        elif filters:
+            packages = model.objects.filter(filters, is_disposed=False)
+        else:
+            continue
+        names = details.objects.filter(**{f'{package_field}__in': packages.values('id')}).order_by(
+            F('computer_name').asc(nulls_last=True), package_field,
+        ).values_list(package_field, flat=True)
+        # dict: first detail row per package, in name order
+        selection.extend((kind, package_id) for package_id in dict.fromkeys(names))
+    return selection
+
+
+def batch_title(section_id=None, owner_id=None):
+    """'Asset Sheets - <section> - <owner>'; Http404 for an unknown section or owner"""
+    parts = ['Asset Sheets']
+    if section_id:
+        parts.append(get_object_or_404(OfficeSection, pk=section_id).name)
+    if owner_id:
+        parts.append(get_object_or_404(Employee, pk=owner_id).full_name)
+    return ' - '.join(parts)
+
+
+# ---------------------------------------------------------------- batch PDF
+
+def _worker_count(jobs, workers=None):
+    workers = settings.ASSET_SHEET_BATCH_WORKERS if workers is None else workers
+    if workers <= 0:
+        workers = min(MAX_AUTO_WORKERS, os.cpu_count() or 1)
+    return min(workers, jobs)
+
+
+def _chunks(selection, size=CHUNK_SIZE):
+    for start in range(0, len(selection), size):
+        yield selection[start:start + size]
+
+
+def _chunk_sheets(chunk, base_url):
+    by_kind = {}
+    for kind, package_id in chunk:
+        by_kind.setdefault(kind, []).append(package_id)
+    sheets = {}
+    for kind, package_ids in by_kind.items():
+        for sheet in SHEET_BUILDERS[kind][0](package_ids, base_url):
+            sheets[kind, sheet.package_id] = sheet
+    return [sheets[key] for key in chunk if key in sheets]
+
+
+def render_sheets(selection, base_url, progress, workers=None):
+    """
+    [(AssetSheet, CachedPDF)] for the selection, in order, every file on disk.
+    The sheet contexts are dropped once rendered.
+    """
+    workers = _worker_count(len(selection), workers)
+    pool = None
+    if workers > 1 and len(selection) >= MIN_PARALLEL_SHEETS:
+        # spawn: see inventory/job_sheets.py
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=asset_pdf_cache.init_worker)
+    rendered = []
+    total = len(selection)
+    try:
+        for chunk in _chunks(selection):
+            generation = asset_pdf_cache.current_generation()
+            prepared, jobs = [], []
+            for sheet in _chunk_sheets(chunk, base_url):
+                pdf, html = asset_pdf_cache.prepare(sheet.template, sheet.context, sheet.filename)
+                if html is not None:
+                    jobs.append((html, pdf.path))
+                prepared.append((sheet, pdf))
+            if pool and len(jobs) > 1:
+                list(pool.map(asset_pdf_cache.write_pdf, *zip(*jobs)))
+            else:
+                for html, path in jobs:
+                    asset_pdf_cache.write_pdf(html, path)
+            for sheet, pdf in prepared:
+                asset_pdf_cache.remember(sheet.kind, sheet.package_id, base_url, pdf, generation)
+                sheet.context = None
+                rendered.append((sheet, pdf))
+            progress(len(rendered), total, f'{len(rendered)} of {total} asset sheets')
+    finally:
+        if pool:
+            pool.shutdown()
+    return rendered
+
+
+def _contents_pdf(title, entries, first_page):
+    """Table of contents as a PDF; `entries` are (AssetSheet, start page counted from the first sheet)"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    title_style = ParagraphStyle('SheetsTitle', fontName='Helvetica-Bold', fontSize=14, leading=18)
+    note_style = ParagraphStyle('SheetsNote', fontName='Helvetica', fontSize=9, leading=12, textColor=colors.grey)
+    cell_style = ParagraphStyle('SheetsCell', fontName='Helvetica', fontSize=9, leading=11)
+
+    rows = [['#', 'Type', 'Computer Name', 'End User', 'Section', 'Page']]
+    for number, (sheet, page) in enumerate(entries, start=1):
+        rows.append([
+            number, sheet.kind.title(),
+            Paragraph(escape(sheet.computer_name), cell_style),
+            Paragraph(escape(sheet.end_user), cell_style),
+            Paragraph(escape(sheet.section), cell_style),
+            first_page + page,
+        ])
+    table = Table(rows, colWidths=[10 * mm, 18 * mm, 46 * mm, 46 * mm, 40 * mm, 14 * mm], repeatRows=1)
+    table.setStyle(TableStyle([
+        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 9),
+        ('FONT', (0, 1), (-1, -1), 'Helvetica', 9),
+        ('LINEBELOW', (0, 0), (-1, 0), 0.75, colors.black),
+        ('LINEBELOW', (0, 1), (-1, -1), 0.25, colors.lightgrey),
+        ('ALIGN', (-1, 0), (-1, -1), 'RIGHT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, title=title,
+                            leftMargin=15 * mm, rightMargin=15 * mm, topMargin=15 * mm, bottomMargin=15 * mm)
+    doc.build([
+        Paragraph(escape(title), title_style),
+        Paragraph(f'{len(entries)} asset sheets &middot; generated {timezone.localtime():%B %d, %Y %I:%M %p}', note_style),
+        Spacer(1, 5 * mm),
+        table,
+    ])
+    return buffer, doc.page
+
+
+def write_asset_sheets_pdf(fileobj, selection, base_url, title, progress, workers=None):
+    """One PDF: table of contents, then every selected package's sheet, written a sheet at a time"""
+    from .utils.pdf_stream import PdfStreamWriter
+
+    rendered = render_sheets(selection, base_url, progress, workers)
+    progress(len(rendered), len(rendered), 'Assembling PDF')
+
+    writer = PdfStreamWriter(fileobj)
+    entries = []
+    for sheet, pdf in rendered:
+        entries.append((sheet, writer.page_count))
+        writer.append(pdf.path, outline_item=f'{sheet.computer_name} ({sheet.kind})')
+
+    # The contents go in front, so their own length shifts every page number
+    contents_pages, contents = 1, None
+    for _attempt in range(3):
+        contents, pages = _contents_pdf(title, entries, contents_pages + 1)
+        if pages == contents_pages:
+            break
+        contents_pages = pages
+    contents.seek(0)
+    writer.append(contents, position=0)
+    writer.close(title=title)
+    return len(rendered)
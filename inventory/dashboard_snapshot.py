@@ -0,0 +1,272 @@
+"""
+Dashboard snapshot - materialized read model behind views.dashboard_pro
+
+The dashboard numbers are computed here and stored in a single
+DashboardSnapshot row. Model signals only flag the row as stale; the
+next dashboard hit (or the refresh_dashboard_snapshot command) rebuilds it.
+"""
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import (
+    DashboardSnapshot, AssetIndex,
+    Equipment_Package, DesktopDetails, MonitorDetails, KeyboardDetails,
+    MouseDetails, UPSDetails, UserDetails, LaptopPackage, LaptopDetails, PrinterDetails,
+    DisposedDesktopDetail, DisposedMonitor, DisposedKeyboard, DisposedMouse,
+    DisposedUPS, DisposedLaptop, DisposedPrinter,
+    PMScheduleAssignment, EndUserChangeHistory, AssetOwnerChangeHistory,
+)
+
+SNAPSHOT_KEY = 'default'
+CHART_MONTHS = 6
+
+
+def _active_count(model):
+    return model.objects.filter(is_disposed=False).count()
+
+
+def _month_key(value):
+    """(year, month) for a date/datetime so DateField and DateTimeField buckets compare equal"""
+    return (value.year, value.month) if value else None
+
+
+def _disposal_series(model, date_field, start, month_keys):
+    rows = (
+        model.objects.filter(**{f"{date_field}__gte": start})
+        .annotate(month=TruncMonth(date_field))
+        .values("month")
+        .annotate(cnt=Count("id"))
+        .order_by("month")
+    )
+    data = {_month_key(r["month"]): r["cnt"] for r in rows}
+    return [data.get(mk, 0) for mk in month_keys]
+
+
+def _recent_items():
+    """10 most recent active desktops/laptops, one query on the asset index"""
+    rows = AssetIndex.objects.filter(
+        asset_type__in=['desktop', 'laptop'], is_disposed=False, detail_id__isnull=False
+    ).order_by('-created_at', '-id')[:10]
+
+    return [{
+        'id': row.package_id,
+        'computer_name': row.computer_name or 'N/A',
+        'serial_no': row.serial_no or 'N/A',
+        'brand_name': row.brand or 'N/A',
+        'model': row.model or 'N/A',
+        'created_at': row.created_at.isoformat(),
+        'type': row.get_asset_type_display(),
+        'url_name': 'desktop_details_view' if row.asset_type == 'desktop' else 'laptop_details_view',
+    } for row in rows]
+
+
+def _audit_trail():
+    equipment_ct = ContentType.objects.get_for_model(Equipment_Package)
+    laptop_ct = ContentType.objects.get_for_model(LaptopPackage)
+
+    def device_type(content_type):
+        if content_type == equipment_ct:
+            return "Desktop"
+        if content_type == laptop_ct:
+            return "Laptop"
+        return content_type.model.capitalize()
+
+    audit = []
+
+    enduser = EndUserChangeHistory.objects.filter(
+        content_type__isnull=False
+    ).select_related(
+        "new_enduser", "old_enduser", "content_type"
+    ).order_by("-changed_at")[:5]
+    for e in enduser:
+        old_name = e.old_enduser.full_name if e.old_enduser else 'None'
+        new_name = e.new_enduser.full_name if e.new_enduser else 'None'
+        audit.append({
+            "type": "End User",
+            "when": e.changed_at.strftime("%Y-%m-%d %H:%M"),
+            "text": f"{device_type(e.content_type)} Package #{e.object_id}: <strong>{old_name}</strong> → <strong>{new_name}</strong>",
+        })
+
+    assetowner = AssetOwnerChangeHistory.objects.filter(
+        content_type__isnull=False
+    ).select_related(
+        "new_assetowner", "old_assetowner", "content_type"
+    ).order_by("-changed_at")[:5]
+    for a in assetowner:
+        old_name = a.old_assetowner.full_name if a.old_assetowner else 'None'
+        new_name = a.new_assetowner.full_name if a.new_assetowner else 'None'
+        audit.append({
+            "type": "Asset Owner",
+            "when": a.changed_at.strftime("%Y-%m-%d %H:%M"),
+            "text": f"{device_type(a.content_type)} Package #{a.object_id}: <strong>{old_name}</strong> → <strong>{new_name}</strong>",
+        })
+
+    return sorted(audit, key=lambda x: x["when"], reverse=True)[:10]
+
+
+def build_dashboard_data():
+    """Compute every dashboard number. JSON-serializable result."""
+
+    # ===================== KPIs =====================
+    packages = Equipment_Package.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_disposed=False)),
+    )
+    total_packages = packages['total']
+    active_packages = packages['active']
+
+    disposed_desktops = DisposedDesktopDetail.objects.count()
+    disposed_monitors = DisposedMonitor.objects.count()
+    disposed_keyboards = DisposedKeyboard.objects.count()
+    disposed_mice = DisposedMouse.objects.count()
+    disposed_ups = DisposedUPS.objects.count()
+    disposed_all = (
+        disposed_desktops + disposed_monitors + disposed_keyboards +
+        disposed_mice + disposed_ups +
+        DisposedLaptop.objects.count() + DisposedPrinter.objects.count()
+    )
+
+    kpis = {
+        "total_packages": total_packages,
+        "active_packages": active_packages,
+        "disposed_all": disposed_all,
+        "pm_pending": PMScheduleAssignment.objects.filter(is_completed=False).count(),
+        "total_desktops": _active_count(DesktopDetails),
+        "total_monitors": _active_count(MonitorDetails),
+        "total_keyboards": _active_count(KeyboardDetails),
+        "total_mice": _active_count(MouseDetails),
+        "total_ups": _active_count(UPSDetails),
+        "total_laptops": _active_count(LaptopDetails),
+        "total_printers": _active_count(PrinterDetails),
+        "health_score": int((active_packages / total_packages) * 100) if total_packages else 100,
+    }
+
+    # ===================== CHARTS DATA =====================
+    # Disposal trend - last 6 months
+    today = timezone.now()
+    start = today - timedelta(days=30 * CHART_MONTHS)
+
+    lbls = []
+    month_keys = []
+    for i in range(CHART_MONTHS, 0, -1):
+        dt = today - timedelta(days=30 * i)
+        lbls.append(dt.strftime("%b %Y"))
+        month_keys.append(_month_key(dt))
+
+    # Top 5 brands (desktops + laptops), grouped in the database
+    brand_counts = {}
+    for model in (DesktopDetails, LaptopDetails):
+        rows = (
+            model.objects.filter(is_disposed=False, brand_name__isnull=False)
+            .values('brand_name__name')
+            .annotate(cnt=Count('id'))
+        )
+        for row in rows:
+            name = row['brand_name__name']
+            brand_counts[name] = brand_counts.get(name, 0) + row['cnt']
+    top_brands = sorted(brand_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+
+    # Assets by section (end user's office section)
+    section_rows = (
+        UserDetails.objects.filter(user_Enduser__employee_office_section__isnull=False)
+        .values('user_Enduser__employee_office_section__name')
+        .annotate(cnt=Count('id'))
+        .order_by('user_Enduser__employee_office_section__name')
+    )
+
+    charts = {
+        "months": CHART_MONTHS,
+        "labels": lbls,
+        "desktop": _disposal_series(DisposedDesktopDetail, "date_disposed", start, month_keys),
+        "mouse": _disposal_series(DisposedMouse, "disposal_date", start, month_keys),
+        "keyboard": _disposal_series(DisposedKeyboard, "disposal_date", start, month_keys),
+        "ups": _disposal_series(DisposedUPS, "disposal_date", start, month_keys),
+        "disposed_by_cat_labels": ["Desktop", "Monitor", "Keyboard", "Mouse", "UPS"],
+        "disposed_by_cat_data": [
+            disposed_desktops, disposed_monitors, disposed_keyboards, disposed_mice, disposed_ups,
+        ],
+        "stack_labels": ["Desktop", "Monitor", "Keyboard", "Mouse", "UPS"],
+        "stack_active": [
+            kpis["total_desktops"], kpis["total_monitors"], kpis["total_keyboards"],
+            kpis["total_mice"], kpis["total_ups"],
+        ],
+        "stack_disposed": [
+            disposed_desktops, disposed_monitors, disposed_keyboards, disposed_mice, disposed_ups,
+        ],
+        "brand_labels": [b[0] for b in top_brands],
+        "brand_data": [b[1] for b in top_brands],
+        "section_labels": [r['user_Enduser__employee_office_section__name'] for r in section_rows],
+        "section_data": [r['cnt'] for r in section_rows],
+    }
+
+    return {
+        "kpis": kpis,
+        "charts": charts,
+        "recent": _recent_items(),
+        "audit": _audit_trail(),
+    }
+
+
+def refresh_dashboard_snapshot(key=SNAPSHOT_KEY):
+    """Rebuild the snapshot row now and return it"""
+    started = time.monotonic()
+    data = build_dashboard_data()
+    build_ms = int((time.monotonic() - started) * 1000)
+
+    snapshot, _ = DashboardSnapshot.objects.update_or_create(
+        key=key,
+        defaults={
+            'data': data,
+            'is_stale': False,
+            'refreshed_at': timezone.now(),
+            'build_ms': build_ms,
+        },
+    )
+    return snapshot
+
+
+def get_dashboard_snapshot(key=SNAPSHOT_KEY, max_age=None):
+    """
+    Return the snapshot, rebuilding it first if it is missing, flagged stale
+    by a signal, or older than max_age seconds (DASHBOARD_SNAPSHOT_MAX_AGE).
+    """
+    if max_age is None:
+        max_age = getattr(settings, 'DASHBOARD_SNAPSHOT_MAX_AGE', 900)
+
+    snapshot = DashboardSnapshot.objects.filter(key=key).first()
+    if (
+        snapshot is None
+        or snapshot.is_stale
+        or snapshot.refreshed_at is None
+        or (max_age and snapshot.age > timedelta(seconds=max_age))
+    ):
+        snapshot = refresh_dashboard_snapshot(key)
+    return snapshot
+
+
+def mark_dashboard_snapshot_stale(key=SNAPSHOT_KEY):
+    """Flag the snapshot for rebuild on the next read (single UPDATE)"""
+    DashboardSnapshot.objects.filter(key=key, is_stale=False).update(is_stale=True)
+
+
+def snapshot_context(snapshot):
+    """Template context from a snapshot row (restores datetimes for |date filters)"""
+    data = snapshot.data
+    recent = [
+        dict(item, created_at=datetime.fromisoformat(item['created_at']))
+        for item in data.get('recent', [])
+    ]
+    return {
+        "kpis": data.get('kpis', {}),
+        "charts": data.get('charts', {}),
+        "recent": recent,
+        "audit": data.get('audit', []),
+        "snapshot_refreshed_at": snapshot.refreshed_at,
+        "snapshot_build_ms": snapshot.build_ms,
+    }
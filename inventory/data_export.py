@@ -0,0 +1,348 @@
+"""
+Raw data feeds for BI tooling - CSV or JSON Lines, streamed.
+
+    GET /api/export/                                  datasets and their columns
+    GET /api/export/desktops/?format=jsonl&updated_since=2025-06-01T00:00:00Z
+
+Every dataset is a values_list() projection read with
+.iterator(chunk_size=CHUNK_SIZE) and written to a StreamingHttpResponse a few
+hundred lines at a time: no model instances, and memory stays flat however
+many rows there are.
+
+`updated_since` (ISO date or datetime) keeps rows changed at or after that
+moment. Desktops, laptops, printers and components go by their package's
+updated_at, which signals bump whenever one of the package's rows changes.
+Each response carries the time it started in X-Export-Started; pass it as
+the next pull's updated_since. Deleted rows are not reported - run a full
+pull now and then.
+"""
+import csv
+from datetime import date, datetime, time
+from itertools import chain
+
+from django.contrib.auth.decorators import login_required
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.http import Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import (
+    DesktopDetails, Employee, EquipmentDowntimeEvent, KeyboardDetails, LaptopDetails, MonitorDetails,
+    MouseDetails, PMChecklistCompletion, PMScheduleAssignment, PrinterDetails, UPSDetails, UserDetails,
+)
+
+CHUNK_SIZE = 2000      # rows per database fetch
+LINES_PER_WRITE = 500  # lines per chunk handed to the server
+
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+
+
+class Source:
+    """One queryset of a dataset: {column: lookup} and the field updated_since filters on"""
+
+    def __init__(self, queryset, columns, updated_field):
+        self.queryset = queryset
+        self.columns = columns
+        self.updated_field = updated_field
+
+    def rows(self, updated_since=None):
+        qs = self.queryset()
+        if updated_since:
+            qs = qs.filter(**{f'{self.updated_field}__gte': updated_since})
+        return qs.order_by('pk').values_list(*self.columns.values()).iterator(chunk_size=CHUNK_SIZE)
+
+
+class Dataset:
+    """Rows of one or more sources with the same columns, one source after the other"""
+
+    def __init__(self, *sources):
+        self.sources = sources
+        self.columns = list(sources[0].columns)
+
+    def rows(self, updated_since=None):
+        return chain.from_iterable(source.rows(updated_since) for source in self.sources)
+
+
+def _assigned(package_fk, employee_fk):
+    """First UserDetails' end user / asset owner of the row's package"""
+    return Subquery(
+        UserDetails.objects.filter(**{package_fk: OuterRef(package_fk)}).order_by('pk').values(employee_fk)[:1]
+    )
+
+
+def _desktops():
+    return DesktopDetails.objects.annotate(
+        end_user_id=_assigned('equipment_package', 'user_Enduser'),
+        asset_owner_id=_assigned('equipment_package', 'user_Assetowner'),
+    )
+
+
+def _laptops():
+    return LaptopDetails.objects.annotate(
+        end_user_id=_assigned('laptop_package', 'user_Enduser'),
+        asset_owner_id=_assigned('laptop_package', 'user_Assetowner'),
+    )
+
+
+def _printers():
+    return PrinterDetails.objects.annotate(
+        end_user_id=_assigned('printer_package', 'user_Enduser'),
+        asset_owner_id=_assigned('printer_package', 'user_Assetowner'),
+    )
+
+
+def _component(model, label, prefix, size_field=None):
+    columns = {
+        'component': 'component_type',
+        'id': 'id',
+        'package_id': 'equipment_package_id',
+        'serial_no': f'{prefix}_sn_db',
+        'brand': f'{prefix}_brand_db__name',
+        'model': f'{prefix}_model_db',
+        'size_capacity': size_field or 'size_capacity',
+        'is_disposed': 'is_disposed',
+        'created_at': 'created_at',
+        'package_updated_at': 'equipment_package__updated_at',
+    }
+    annotations = {'component_type': Value(label)}
+    if not size_field:
+        annotations['size_capacity'] = Value('')
+    return Source(lambda: model.objects.annotate(**annotations), columns, 'equipment_package__updated_at')
+
+
+DATASETS = {
+    'desktops': Dataset(Source(_desktops, {
+        'id': 'id',
+        'package_id': 'equipment_package_id',
+        'computer_name': 'computer_name',
+        'serial_no': 'serial_no',
+        'brand': 'brand_name__name',
+        'model': 'model',
+        'processor': 'processor',
+        'memory': 'memory',
+        'drive': 'drive',
+        'graphics': 'desktop_Graphics',
+        'graphics_size': 'desktop_Graphics_Size',
+        'os': 'desktop_OS',
+        'office': 'desktop_Office',
+        'is_disposed': 'is_disposed',
+        'package_disposed': 'equipment_package__is_disposed',
+        'disposal_date': 'equipment_package__disposal_date',
+        'end_user_id': 'end_user_id',
+        'asset_owner_id': 'asset_owner_id',
+        'created_at': 'created_at',
+        'package_updated_at': 'equipment_package__updated_at',
+    }, 'equipment_package__updated_at')),
+    'components': Dataset(
+        _component(MonitorDetails, 'Monitor', 'monitor', 'monitor_size_db'),
+        _component(KeyboardDetails, 'Keyboard', 'keyboard'),
+        _component(MouseDetails, 'Mouse', 'mouse'),
+        _component(UPSDetails, 'UPS', 'ups', 'ups_capacity_db'),
+    ),
+    'laptops': Dataset(Source(_laptops, {
+        'id': 'id',
+        'package_id': 'laptop_package_id',
+        'computer_name': 'computer_name',
+        'serial_no': 'laptop_sn_db',
+        'brand': 'brand_name__name',
+        'model': 'model',
+        'processor': 'processor',
+        'memory': 'memory',
+        'drive': 'drive',
+        'os': 'laptop_OS',
+        'office': 'laptop_Office',
+        'is_disposed': 'is_disposed',
+        'package_disposed': 'laptop_package__is_disposed',
+        'disposal_date': 'laptop_package__disposal_date',
+        'end_user_id': 'end_user_id',
+        'asset_owner_id': 'asset_owner_id',
+        'created_at': 'created_at',
+        'package_updated_at': 'laptop_package__updated_at',
+    }, 'laptop_package__updated_at')),
+    'printers': Dataset(Source(_printers, {
+        'id': 'id',
+        'package_id': 'printer_package_id',
+        'serial_no': 'printer_sn_db',
+        'brand': 'printer_brand_db__name',
+        'model': 'printer_model_db',
+        'type': 'printer_type',
+        'color': 'printer_color',
+        'duplex': 'printer_duplex',
+        'resolution': 'printer_resolution',
+        'monthly_duty': 'printer_monthly_duty',
+        'is_disposed': 'is_disposed',
+        'package_disposed': 'printer_package__is_disposed',
+        'disposal_date': 'printer_package__disposal_date',
+        'end_user_id': 'end_user_id',
+        'asset_owner_id': 'asset_owner_id',
+        'created_at': 'created_at',
+        'package_updated_at': 'printer_package__updated_at',
+    }, 'printer_package__updated_at')),
+    'employees': Dataset(Source(Employee.objects.all, {
+        'id': 'id',
+        'last_name': 'employee_lname',
+        'first_name': 'employee_fname',
+        'middle_name': 'employee_mname',
+        'position': 'employee_position',
+        'section_id': 'employee_office_section_id',
+        'section': 'employee_office_section__name',
+        'level': 'employee_level',
+        'status': 'employee_status',
+        'email': 'email',
+        'phone': 'phone',
+        'date_hired': 'date_hired',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }, 'updated_at')),
+    'pm_assignments': Dataset(Source(PMScheduleAssignment.objects.all, {
+        'id': 'id',
+        'desktop_package_id': 'equipment_package_id',
+        'laptop_package_id': 'laptop_package_id',
+        'section_schedule_id': 'pm_section_schedule_id',
+        'section_id': 'pm_section_schedule__section_id',
+        'section': 'pm_section_schedule__section__name',
+        'year': 'pm_section_schedule__quarter_schedule__year',
+        'quarter': 'pm_section_schedule__quarter_schedule__quarter',
+        'start_date': 'pm_section_schedule__start_date',
+        'end_date': 'pm_section_schedule__end_date',
+        'assigned_date': 'assigned_date',
+        'is_completed': 'is_completed',
+        'remarks': 'remarks',
+        'updated_at': 'updated_at',
+    }, 'updated_at')),
+    'checklist_completions': Dataset(Source(lambda: PMChecklistCompletion.objects.annotate(
+        items_total=Count('item_completions'),
+        items_completed=Count('item_completions', filter=Q(item_completions__is_completed=True)),
+    ), {
+        'id': 'id',
+        'schedule_id': 'schedule_id',
+        'annex': 'schedule__template__annex_code',
+        'checklist': 'schedule__template__title',
+        'frequency': 'schedule__template__frequency',
+        'scheduled_date': 'schedule__scheduled_date',
+        'due_date': 'schedule__due_date',
+        'week_number': 'schedule__week_number',
+        'location': 'schedule__location',
+        'completion_date': 'completion_date',
+        'completion_time': 'completion_time',
+        'completed_by': 'completed_by__username',
+        'printed_name': 'printed_name',
+        'items_total': 'items_total',
+        'items_completed': 'items_completed',
+        'general_notes': 'general_notes',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }, 'updated_at')),
+    'downtime_events': Dataset(Source(EquipmentDowntimeEvent.objects.all, {
+        'id': 'id',
+        'completion_id': 'item_completion__completion_id',
+        'system_reference': 'system_reference',
+        'occurrence_date': 'occurrence_date',
+        'start_time': 'start_time',
+        'end_time': 'end_time',
+        'duration_minutes': 'duration_minutes',
+        'equipment_name': 'equipment_name',
+        'severity': 'severity',
+        'cause_description': 'cause_description',
+        'resolution_notes': 'resolution_notes',
+        'services_affected': 'services_affected',
+        'users_affected_count': 'users_affected_count',
+        'reported_by': 'reported_by__username',
+        'requires_followup': 'requires_followup',
+        'followup_notes': 'followup_notes',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }, 'updated_at')),
+}
+
+
+def parse_updated_since(value):
+    """Aware datetime from an ISO date or datetime (naive = server time zone); ValueError if invalid"""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (date, time)):  # datetime is a date
+        return value.isoformat()
+    return value
+
+
+class _Echo:
+    """csv.writer target that hands back the formatted line"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def jsonl_lines(columns, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def _batched(lines, size=LINES_PER_WRITE):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+@login_required
+def data_export_index(request):
+    """The datasets data_export_api serves, with their columns"""
+    return JsonResponse({'datasets': {name: dataset.columns for name, dataset in DATASETS.items()},
+                         'formats': list(FORMATS)})
+
+
+@login_required
+def data_export_api(request, dataset):
+    """One dataset as CSV (default) or ?format=jsonl, optionally ?updated_since=<ISO date/datetime>"""
+    if dataset not in DATASETS:
+        raise Http404(f'Unknown dataset "{dataset}"')
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in FORMATS:
+        return HttpResponseBadRequest(f'format must be one of: {", ".join(FORMATS)}')
+    updated_since = None
+    if request.GET.get('updated_since'):
+        try:
+            updated_since = parse_updated_since(request.GET['updated_since'])
+        except ValueError:
+            return HttpResponseBadRequest('updated_since must be an ISO date or datetime')
+
+    started = timezone.now()
+    columns = DATASETS[dataset].columns
+    rows = DATASETS[dataset].rows(updated_since)
+    lines = csv_lines(columns, rows) if fmt == 'csv' else jsonl_lines(columns, rows)
+    content_type, extension = FORMATS[fmt]
+    response = StreamingHttpResponse(_batched(lines), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{dataset}.{extension}"'
+    response['X-Export-Started'] = started.isoformat()
+    response['Cache-Control'] = 'no-store'
+    return response
@@ -0,0 +1,167 @@
+"""
+Excel report templates, parsed once per process.
+
+    wb, ws = SNMR_TEMPLATE.open()
+    SNMR_TEMPLATE.write_cells(ws, {'region': report.region, ...})
+    SNMR_TEMPLATE.write_row(ws, 0, {'item_number': 1, ...})
+
+The first open() of a template loads it with openpyxl, applies its fix-ups
+(e.g. unmerging every merged range so filled cells are writable) and keeps
+the result pickled in memory. Every later open() unpickles that pristine
+copy - a fresh, independent workbook in a fraction of a load_workbook - until
+the template file's mtime changes, which reloads it.
+
+Each template also declares where its fields go: `cells` maps header fields
+to cell addresses, `columns` maps row fields to column letters starting at
+`first_row`.
+"""
+import io
+import os
+import pickle
+import threading
+
+from django.conf import settings
+
+
+class ExcelTemplate:
+
+    def __init__(self, name, path, sheet=None, unmerge=False, merge_after_fill=(),
+                 cells=None, columns=None, first_row=None):
+        self.name = name
+        self.path = path
+        self.sheet = sheet                          # sheet title (falls back to the active sheet) or index
+        self.unmerge = unmerge                      # unmerge everything so merged cells can be written
+        self.merge_after_fill = merge_after_fill    # ranges re-merged by finish(), after the data is in
+        self.cells = cells or {}
+        self.columns = columns or {}
+        self.first_row = first_row
+        self._lock = threading.Lock()
+        self._compiled = None                       # (mtime, pickled workbook)
+
+    @property
+    def full_path(self):
+        return os.path.join(settings.BASE_DIR, self.path)
+
+    def _compile(self):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(self.full_path, data_only=False, keep_vba=False)
+        for ws in wb.worksheets:
+            # Images read lazily from the template's zip, which is closed by now
+            for image in ws._images:
+                image.ref = io.BytesIO(image._data())
+        if self.unmerge:
+            ws = self._sheet(wb)
+            for merged_range in list(ws.merged_cells.ranges):
+                ws.unmerge_cells(str(merged_range))
+        return pickle.dumps(wb, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def compiled(self):
+        mtime = os.path.getmtime(self.full_path)
+        compiled = self._compiled
+        if compiled is None or compiled[0] != mtime:
+            with self._lock:
+                compiled = self._compiled
+                if compiled is None or compiled[0] != mtime:
+                    compiled = self._compiled = (mtime, self._compile())
+        return compiled[1]
+
+    def _sheet(self, wb):
+        if isinstance(self.sheet, int):
+            return wb.worksheets[self.sheet]
+        if self.sheet and self.sheet in wb.sheetnames:
+            return wb[self.sheet]
+        return wb.active
+
+    def open(self):
+        """(workbook, sheet) - a private copy of the prepared template"""
+        wb = pickle.loads(self.compiled())
+        return wb, self._sheet(wb)
+
+    def write_cells(self, ws, values):
+        for field, value in values.items():
+            ws[self.cells[field]] = value
+
+    def write_row(self, ws, index, values):
+        """Write the `index`-th data row; returns its row number"""
+        row_num = self.first_row + index
+        for field, value in values.items():
+            ws[f'{self.columns[field]}{row_num}'] = value
+        return row_num
+
+    def row_cells(self, ws, row_num):
+        return [ws[f'{col}{row_num}'] for col in self.columns.values()]
+
+    def finish(self, ws):
+        for cell_range in self.merge_after_fill:
+            ws.merge_cells(cell_range)
+
+
+SNMR_TEMPLATE = ExcelTemplate(
+    'snmr', os.path.join('static', 'excel_template', 'snmr_template.xlsx'),
+    cells={
+        'period': 'A2', 'region': 'B4', 'office': 'B5', 'address': 'B6',
+        'admin_name': 'F4', 'admin_contact': 'F5', 'admin_email': 'F6',
+    },
+    first_row=10,
+    columns={
+        'item_number': 'A', 'area_category': 'B', 'status': 'C', 'reason': 'D',
+        'initial_isolation': 'E', 'date': 'F', 'resolution': 'G',
+    },
+)
+
+ASIR_TEMPLATE = ExcelTemplate(
+    'asir', os.path.join('media', 'pm_reports', 'Ley4_ASIR.xlsx'), sheet='Do not delete',
+    cells={
+        'period': 'A2', 'region': 'B4', 'office': 'B5', 'address': 'B6',
+        'admin_name': 'F4', 'admin_contact': 'F5', 'admin_email': 'F6',
+    },
+    first_row=10,
+    columns={
+        'item_number': 'A', 'application_name': 'B', 'number_of_users': 'C', 'status': 'D',
+        'activity_details': 'E', 'activity_date': 'F', 'remarks': 'G',
+    },
+)
+
+HDR_TEMPLATE = ExcelTemplate(
+    'hdr', os.path.join('media', 'pm_reports', 'new_hdr.xlsx'), sheet=0, unmerge=True,
+    merge_after_fill=(
+        'G14:H14', 'G15:H15', 'G16:H16', 'G17:H17',
+        'A12:B12', 'A14:B14', 'A15:B15', 'A16:B16', 'A17:B17',
+    ),
+    cells={
+        'period': 'B2', 'region': 'B4', 'office': 'B5', 'address': 'B6',
+        'admin_name': 'H4', 'admin_contact': 'H5', 'admin_email': 'H6',
+    },
+    first_row=9,
+    columns={
+        'ref_number': 'A', 'incident_type': 'B', 'main_category': 'C', 'sub_category': 'D',
+        'description': 'E', 'status': 'F', 'date_reported': 'G', 'reported_by': 'H', 'resolution': 'I',
+    },
+)
+
+JOB_SHEET_TEMPLATE = ExcelTemplate(
+    'job_sheet', os.path.join('templates', 'excel temps', 'Standard Job Sheet.xlsx'), unmerge=True,
+    cells={
+        # Header / client's information
+        'ref_number': 'G6',
+        'reported_by': 'B11', 'section_division': 'B12', 'date_reported': 'G11', 'contact_no': 'G12',
+        'description': 'B14',
+        # I.T. support technical assessment
+        'incident_type': 'B18', 'main_category': 'D18', 'sub_category': 'B19', 'status': 'D19',
+        'hardware_type': 'B22', 'hardware_brand_model': 'D22',
+        'hardware_serial_number': 'B23', 'computer_name': 'E23',
+        'application_description': 'B26', 'application_version': 'G26',
+        'connectivity_description': 'B29',
+        'user_account_description': 'B32',
+        'assessment': 'B35',
+        'resolution': 'B38',
+        # Personnel
+        'fulfilled_by': 'E43', 'reviewed_by': 'E44',
+        # Client's evaluation
+        'concern_addressed': 'B48', 'satisfaction_service': 'B49', 'satisfaction_solution': 'B50',
+        'client_comments': 'B52',
+    },
+)
+
+TEMPLATES = {t.name: t for t in (SNMR_TEMPLATE, ASIR_TEMPLATE, HDR_TEMPLATE, JOB_SHEET_TEMPLATE)}
@@ -0,0 +1,235 @@
+"""
+Export jobs - exports and reports rendered by a worker process instead of
+inside the HTTP request.
+
+    job, created = submit('inventory_excel', {}, user=request.user)
+    process_jobs()          # worker: claim, build, store the file under MEDIA_ROOT
+
+Every export has a builder, `build(params, progress) -> ExportFile`, that
+the synchronous view and the worker share. Submitting the same kind and
+params while a job for them is still queued/running returns that job
+instead of a new one (enforced by the unique_active_export_job constraint).
+A job whose worker stops sending progress for EXPORT_JOB_LEASE_SECONDS is
+picked up again. Finished files are kept for EXPORT_JOB_TTL_HOURS and then
+removed by purge_expired_jobs().
+
+Run `python manage.py run_export_jobs --loop 5` as the worker.
+"""
+import hashlib
+import json
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile, File
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# kind -> (builder, label). Builders are imported by the worker when a job
+# runs, so submitting a job never loads the document libraries.
+EXPORT_KINDS = {
+    'inventory_excel': ('inventory.inventory_export.build_inventory_excel', 'ICT equipment inventory (Excel)'),
+    'desktop_pdf': ('inventory.export_views.build_desktop_pdf', 'Desktop asset sheet (PDF)'),
+    'laptop_pdf': ('inventory.export_views.build_laptop_pdf', 'Laptop asset sheet (PDF)'),
+    'asset_sheets_pdf': ('inventory.export_views.build_asset_sheets_pdf', 'Asset sheets, batch (PDF)'),
+    'salvage_excel': ('inventory.export_views.build_salvage_excel', 'Salvaged equipment (Excel)'),
+    'salvage_pdf': ('inventory.export_views.build_salvage_overview_pdf', 'Salvage overview (PDF)'),
+    'snmr_excel': ('inventory.export_views.build_snmr_excel', 'SNMR report (Excel)'),
+    'pm_checklist_pdf': ('inventory.export_views.build_pm_checklist_pdf', 'PM checklist (PDF)'),
+    'pm_section_checklists_pdf': ('inventory.export_views.build_section_pm_checklists_pdf', 'Section PM checklists (PDF)'),
+    'hdr_excel': ('inventory.hdr_views.build_hdr_excel', 'HDR report (Excel)'),
+    'hdr_job_sheets': ('inventory.hdr_views.build_hdr_job_sheets', 'HDR job sheets (ZIP/Excel)'),
+}
+
+
+class ExportFile:
+    """
+    A rendered export and how to serve it. `content` is bytes, or an open
+    file positioned at the start for large exports - those are streamed in
+    chunks rather than held in memory.
+    """
+
+    def __init__(self, content, filename, content_type, inline=False):
+        self.content = content
+        self.filename = filename
+        self.content_type = content_type
+        self.inline = inline
+
+    @property
+    def is_file(self):
+        return hasattr(self.content, 'read')
+
+    def as_file(self):
+        return File(self.content) if self.is_file else ContentFile(self.content)
+
+    def response(self):
+        if self.is_file:
+            return FileResponse(
+                self.content, as_attachment=not self.inline,
+                filename=self.filename, content_type=self.content_type,
+            )
+        response = HttpResponse(self.content, content_type=self.content_type)
+        disposition = 'inline' if self.inline else 'attachment'
+        response['Content-Disposition'] = f'{disposition}; filename="{self.filename}"'
+        return response
+
+
+def _no_progress(done, total, message=''):
+    pass
+
+
+def build_export(kind, params, progress=None):
+    """Run the builder of `kind` in-process (what the synchronous views do)"""
+    return import_string(EXPORT_KINDS[kind][0])(params, progress or _no_progress)
+
+
+# ---------------------------------------------------------------------------
+# Submitting
+# ---------------------------------------------------------------------------
+
+def dedupe_key(kind, params):
+    payload = json.dumps([kind, params], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def submit(kind, params=None, user=None):
+    """
+    Queue an export; returns (job, created). An identical job that is still
+    queued or running is returned instead of queueing a second one.
+    """
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f'Unknown export kind {kind!r}')
+    params = params or {}
+    key = dedupe_key(kind, params)
+
+    active = ExportJob.objects.filter(dedupe_key=key, status__in=ExportJob.ACTIVE_STATUSES)
+    job = active.first()
+    if job is not None:
+        return job, False
+    try:
+        with transaction.atomic():
+            job = ExportJob.objects.create(
+                kind=kind, params=params, dedupe_key=key,
+                requested_by=user if user is not None and user.is_authenticated else None,
+            )
+        return job, True
+    except IntegrityError:
+        # Lost the race against an identical submission
+        return active.get(), False
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+class JobProgress:
+    """progress(done, total, message) callback that also keeps the job's lease alive"""
+
+    min_interval = 1.0  # seconds between writes, unless the percentage moved
+
+    def __init__(self, job):
+        self.job = job
+        self._written_at = 0.0
+        self._percent = -1
+
+    def __call__(self, done, total, message=''):
+        percent = min(99, int(done * 100 / total)) if total else 0
+        now = time.monotonic()
+        if percent == self._percent and now - self._written_at < self.min_interval:
+            return
+        self._percent, self._written_at = percent, now
+        ExportJob.objects.filter(pk=self.job.pk).update(
+            progress=percent, message=message[:255], heartbeat_at=timezone.now(),
+        )
+
+
+def _claim_next(lease_seconds, exclude=()):
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            ExportJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status='queued')
+                | Q(status='running', heartbeat_at__lt=now - timedelta(seconds=lease_seconds))
+            )
+            .exclude(pk__in=exclude)
+            .order_by('id')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = 'running'
+        job.attempts += 1
+        job.started_at = job.heartbeat_at = now
+        job.save(update_fields=['status', 'attempts', 'started_at', 'heartbeat_at'])
+    return job
+
+
+def run_job(job, max_attempts=None):
+    """Build one claimed job and store its file; failures are requeued up to `max_attempts`"""
+    max_attempts = max_attempts or settings.EXPORT_JOB_MAX_ATTEMPTS
+    try:
+        result = build_export(job.kind, job.params, JobProgress(job))
+    except Exception as e:
+        logger.exception('Export job %s (%s) failed', job.pk, job.kind)
+        job.error = f'{type(e).__name__}: {e}'
+        job.status = 'failed' if job.attempts >= max_attempts else 'queued'
+        job.finished_at = timezone.now() if job.status == 'failed' else None
+        job.save(update_fields=['error', 'status', 'finished_at'])
+        return job
+
+    now = timezone.now()
+    try:
+        job.file.save(f'{job.pk}_{result.filename}', result.as_file(), save=False)
+    finally:
+        if result.is_file:
+            result.content.close()
+    job.filename = result.filename
+    job.content_type = result.content_type
+    job.status = 'done'
+    job.progress = 100
+    job.message = ''
+    job.error = ''
+    job.finished_at = now
+    job.expires_at = now + timedelta(hours=settings.EXPORT_JOB_TTL_HOURS)
+    job.save()
+    return job
+
+
+def process_jobs(max_jobs=None, lease_seconds=None):
+    """
+    Run queued jobs one after another until none are left; returns {status: n}.
+    A job that failed and was requeued is retried on the next call, not in this one.
+    """
+    lease_seconds = lease_seconds or settings.EXPORT_JOB_LEASE_SECONDS
+    counts = {'done': 0, 'queued': 0, 'failed': 0}
+    ran = []
+    while max_jobs is None or len(ran) < max_jobs:
+        job = _claim_next(lease_seconds, exclude=ran)
+        if job is None:
+            break
+        job = run_job(job)
+        counts[job.status] += 1
+        ran.append(job.pk)
+    return counts
+
+
+def purge_expired_jobs():
+    """Delete the files of jobs past `expires_at`; returns the number expired"""
+    expired = list(ExportJob.objects.filter(status='done', expires_at__lt=timezone.now()))
+    for job in expired:
+        if job.file:
+            job.file.delete(save=False)
+    ExportJob.objects.filter(pk__in=[job.pk for job in expired]).update(status='expired', file='')
+    return len(expired)
@@ -0,0 +1,320 @@
+"""
+Export/report views - PDF (WeasyPrint, ReportLab) and Excel (openpyxl) downloads.
+
+Kept out of views.py so the document libraries are only imported when an
+export is first requested: urls.py routes here through lazy_view(), and
+workers / management commands that never export never load them.
+
+Each export is a `build_*(params, progress)` function returning an
+ExportFile, shared by the view (rendered in the request, or queued with
+?background=1) and the export job worker (inventory/export_jobs.py).
+"""
+import io
+
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseBadRequest
+from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
+from django.utils.text import slugify
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment
+
+from inventory.models import (
+    UserDetails,
+    DisposedKeyboard, DisposedMouse, DisposedMonitor, DisposedUPS,
+    PreventiveMaintenance, PMSectionSchedule,
+    SNMRReport,
+)
+from inventory.excel_templates import SNMR_TEMPLATE
+from inventory.export_jobs import XLSX_CONTENT_TYPE, ExportFile
+from inventory.job_views import run_export, wants_background
+from inventory import asset_pdf_cache
+from inventory.asset_sheets import asset_sheet
+from inventory.utils.pdf_render import html_to_pdf
+
+
+# ============================ DESKTOP ============================
+
+def generate_desktop_pdf(request, package_id):
+    if not wants_background(request):
+        return asset_pdf_cache.pdf_response(request, 'desktop', package_id)
+    params = {'package_id': package_id, 'base_url': request.build_absolute_uri('/')}
+    return run_export(request, 'desktop_pdf', params)
+
+
+def build_desktop_pdf(params, progress):
+    pdf = asset_pdf_cache.get_pdf('desktop', params['package_id'], params['base_url'])
+    return ExportFile(pdf.open(), pdf.filename, 'application/pdf', inline=True)
+
+
+def desktop_pdf_context(params):
+    """(template, context, filename) of a desktop package's asset sheet"""
+    sheet = asset_sheet('desktop', params['package_id'], params['base_url'])
+    return sheet.template, sheet.context, sheet.filename
+
+
+def export_equipment_packages_excel(request):
+    """ICT inventory workbook; ?type=desktop|laptop|printer (repeatable) narrows it down"""
+    types = [t for t in request.GET.getlist('type') if t in ('desktop', 'laptop', 'printer')]
+    return run_export(request, 'inventory_excel', {'types': types} if types else {})
+
+
+# ============================ PREVENTIVE MAINTENANCE ============================
+
+def generate_pm_checklist_pdf(request, pm_id):
+    return run_export(request, 'pm_checklist_pdf', {'pm_id': pm_id})
+
+
+def build_pm_checklist_pdf(params, progress):
+    from inventory.pm_checklist_pdf import render_pm_checklists
+
+    pm = get_object_or_404(PreventiveMaintenance, pk=params['pm_id'])
+    pdf = render_pm_checklists([pm], progress)
+    return ExportFile(pdf, f'PM_Report_{pm.id}.pdf', 'application/pdf')
+
+
+@login_required
+def generate_section_pm_checklists_pdf(request, schedule_id):
+    """Every PM checklist of one section's quarter schedule, one page each"""
+    return run_export(request, 'pm_section_checklists_pdf', {'schedule_id': schedule_id})
+
+
+def build_section_pm_checklists_pdf(params, progress):
+    from inventory.pm_checklist_pdf import render_pm_checklists, section_schedule_pms
+
+    schedule = get_object_or_404(
+        PMSectionSchedule.objects.select_related('section', 'quarter_schedule'), pk=params['schedule_id']
+    )
+    pdf = render_pm_checklists(section_schedule_pms(schedule), progress)
+    quarter = schedule.quarter_schedule
+    section = slugify(schedule.section.name) or schedule.section_id
+    return ExportFile(pdf, f'PM_Checklists_{section}_{quarter.year}_{quarter.quarter}.pdf', 'application/pdf')
+
+
+# ============================ SALVAGE ============================
+
+def export_salvage_excel(request):
+    return run_export(request, 'salvage_excel', {})
+
+
+def build_salvage_excel(params, progress):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Salvaged Equipment"
+
+    headers = [
+        "Category", "SN", "Brand", "Model", "Size/Capacity",
+        "Computer Name", "Asset Owner", "Date Salvaged", "Notes", "Status"
+    ]
+    ws.append(headers)
+
+    def get_asset_owner(equipment_package):
+        if not equipment_package:
+            return ""
+        user = UserDetails.objects.filter(equipment_package=equipment_package).first()
+        if user and user.user_Assetowner:
+            return user.user_Assetowner.full_name
+        return ""
+
+    def fmt_date(dt):
+        if not dt:
+            return ""
+        try:
+            return dt.strftime("%Y-%m-%d %H:%M")  # works if datetime
+        except Exception:
+            return dt.strftime("%Y-%m-%d")        # fallback for date
+
+    # Monitors
+    for m in DisposedMonitor.objects.all():
+        computer_name = m.equipment_package.computer_name if m.equipment_package else ""
+        asset_owner = get_asset_owner(m.equipment_package)
+        ws.append([
+            "Monitor", m.monitor_sn, m.monitor_brand, m.monitor_model, m.monitor_size,
+            computer_name, asset_owner,
+            fmt_date(m.disposal_date),
+            m.reason or "", "Disposed"
+        ])
+
+    # Keyboards
+    for k in DisposedKeyboard.objects.all():
+        computer_name = k.equipment_package.computer_name if k.equipment_package else ""
+        asset_owner = get_asset_owner(k.equipment_package)
+        ws.append([
+            "Keyboard",
+            k.keyboard_dispose_db.keyboard_sn_db,
+            str(k.keyboard_dispose_db.keyboard_brand_db),
+            k.keyboard_dispose_db.keyboard_model_db,
+            "",
+            computer_name, asset_owner,
+            fmt_date(k.disposal_date),
+            "", "Disposed"
+        ])
+
+    # Mice
+    for mo in DisposedMouse.objects.all():
+        computer_name = mo.equipment_package.computer_name if mo.equipment_package else ""
+        asset_owner = get_asset_owner(mo.equipment_package)
+        ws.append([
+            "Mouse",
+            mo.mouse_db.mouse_sn_db,
+            str(mo.mouse_db.mouse_brand_db),
+            mo.mouse_db.mouse_model_db,
+            "",
+            computer_name, asset_owner,
+            fmt_date(mo.disposal_date),
+            "", "Disposed"
+        ])
+
+    # UPS
+    for u in DisposedUPS.objects.all():
+        computer_name = u.equipment_package.computer_name if u.equipment_package else ""
+        asset_owner = get_asset_owner(u.equipment_package)
+        ws.append([
+            "UPS",
+            u.ups_db.ups_sn_db,
+            str(u.ups_db.ups_brand_db),
+            u.ups_db.ups_model_db,
+            u.ups_db.ups_capacity_db,
+            computer_name, asset_owner,
+            fmt_date(u.disposal_date),
+            "", "Disposed"
+        ])
+
+    output = io.BytesIO()
+    wb.save(output)
+    return ExportFile(output.getvalue(), 'salvaged_equipment.xlsx', XLSX_CONTENT_TYPE)
+
+
+def print_salvage_overview(request):
+    return run_export(request, 'salvage_pdf', {})
+
+
+def build_salvage_overview_pdf(params, progress):
+    salvaged_monitors = DisposedMonitor.objects.all()
+    salvaged_keyboards = DisposedKeyboard.objects.all()
+    salvaged_mice = DisposedMouse.objects.all()
+    salvaged_ups = DisposedUPS.objects.all()
+
+    html_string = render_to_string("salvage/print_salvage.html", {
+        "salvaged_monitors": salvaged_monitors,
+        "salvaged_keyboards": salvaged_keyboards,
+        "salvaged_mice": salvaged_mice,
+        "salvaged_ups": salvaged_ups,
+    })
+
+    pdf = html_to_pdf(html_string)
+    return ExportFile(pdf, 'salvage_overview.pdf', 'application/pdf', inline=True)
+
+
+# ============================ LAPTOP ============================
+
+def generate_laptop_pdf(request, package_id):
+    if not wants_background(request):
+        return asset_pdf_cache.pdf_response(request, 'laptop', package_id)
+    params = {'package_id': package_id, 'base_url': request.build_absolute_uri('/')}
+    return run_export(request, 'laptop_pdf', params)
+
+
+def build_laptop_pdf(params, progress):
+    pdf = asset_pdf_cache.get_pdf('laptop', params['package_id'], params['base_url'])
+    return ExportFile(pdf.open(), pdf.filename, 'application/pdf', inline=True)
+
+
+def laptop_pdf_context(params):
+    """(template, context, filename) of a laptop package's asset sheet"""
+    sheet = asset_sheet('laptop', params['package_id'], params['base_url'])
+    return sheet.template, sheet.context, sheet.filename
+
+
+# ============================ ASSET SHEETS (BATCH) ============================
+
+@login_required
+def asset_sheets_pdf(request):
+    """
+    Desktop/laptop asset sheets of many packages in one PDF with a table of
+    contents. Select by ?section=<id> (the end user's section), ?owner=<employee
+    id> and/or explicit ?desktop=<id> / ?laptop=<id> (repeatable).
+    """
+    params = {'base_url': request.build_absolute_uri('/')}
+    for key in ('section', 'owner'):
+        if request.GET.get(key, '').isdigit():
+            params[key] = int(request.GET[key])
+    for key in ('desktop', 'laptop'):
+        ids = [int(i) for i in request.GET.getlist(key) if i.isdigit()]
+        if ids:
+            params[key] = ids
+    if len(params) == 1:
+        return HttpResponseBadRequest('Choose a section, an asset owner or package IDs.')
+    return run_export(request, 'asset_sheets_pdf', params)
+
+
+def build_asset_sheets_pdf(params, progress):
+    import tempfile
+    from inventory.asset_sheets import batch_title, select_packages, write_asset_sheets_pdf
+
+    title = batch_title(params.get('section'), params.get('owner'))
+    selection = select_packages(
+        params.get('section'), params.get('owner'), params.get('desktop', ()), params.get('laptop', ()),
+    )
+    tmp = tempfile.TemporaryFile()
+    write_asset_sheets_pdf(tmp, selection, params['base_url'], title, progress)
+    tmp.seek(0)
+    return ExportFile(tmp, f"{slugify(title).replace('-', '_') or 'asset_sheets'}.pdf", 'application/pdf')
+
+
+# ============================ SNMR ============================
+
+@login_required
+def snmr_export_excel(request, report_id):
+    """Export SNMR report to Excel using template - fills data into pre-formatted cells"""
+    return run_export(request, 'snmr_excel', {'report_id': report_id})
+
+
+def build_snmr_excel(params, progress):
+    report = get_object_or_404(SNMRReport, id=params['report_id'])
+    entries = report.entries.select_related('area_category').order_by('item_number')
+
+    wb, ws = SNMR_TEMPLATE.open()
+
+    # Fill in header information
+    SNMR_TEMPLATE.write_cells(ws, {
+        'period': f'For the Month of {report.period_display}',
+        'region': report.region,
+        'office': report.office,
+        'address': report.address,
+        'admin_name': report.network_admin_name,
+        'admin_contact': report.network_admin_contact,
+        'admin_email': report.network_admin_email,
+    })
+
+    # Fill in data entries - just add data and enable wrapping, preserve all template formatting
+    for idx, entry in enumerate(entries):
+        row_num = SNMR_TEMPLATE.write_row(ws, idx, {
+            'item_number': entry.item_number,
+            'area_category': entry.area_category.name,
+            'status': entry.status,
+            'reason': entry.reason,
+            'initial_isolation': entry.initial_isolation,
+            'date': entry.date,
+            'resolution': entry.resolution,
+        })
+
+        # Enable text wrapping for all data cells to handle long content
+        # Preserve existing alignment from template
+        for cell in SNMR_TEMPLATE.row_cells(ws, row_num):
+            if cell.alignment:
+                # Preserve existing alignment but enable wrapping
+                cell.alignment = Alignment(
+                    horizontal=cell.alignment.horizontal,
+                    vertical=cell.alignment.vertical,
+                    wrap_text=True
+                )
+            else:
+                # Default alignment with wrapping if no existing alignment
+                cell.alignment = Alignment(wrap_text=True)
+
+    # Save to BytesIO
+    output = io.BytesIO()
+    wb.save(output)
+    return ExportFile(output.getvalue(), f'SNMR_{report.month_name}_{report.year}.xlsx', XLSX_CONTENT_TYPE)
@@ -6,11 +6,14 @@ Monthly reporting system for helpdesk incidents and service requests
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseBadRequest
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.db import models
 from datetime import date
 from .models import HDRReport, HDREntry
+from .export_jobs import XLSX_CONTENT_TYPE, ExportFile
+from .job_views import run_export
 
 
 @login_required
@@ -321,175 +324,131 @@ def hdr_entry_export_diagnostic(request, entry_id):
 @login_required
 def hdr_entry_export(request, entry_id):
     """Export individual job sheet to Excel using Standard Job Sheet template"""
-    from openpyxl import load_workbook
-    from openpyxl.styles import Alignment
-    import io
+    from .job_sheets import job_sheet_values, render_job_sheet
 
     entry = get_object_or_404(HDREntry, id=entry_id)
-    report = entry.report
 
-    # Load the Standard Job Sheet template
-    template_path = 'templates/excel temps/Standard Job Sheet.xlsx'
-    wb = load_workbook(template_path, data_only=False, keep_vba=False)
-    ws = wb.active
-
-    # Unmerge all cells to avoid "MergedCell is read-only" errors
-    merged_ranges = list(ws.merged_cells.ranges)
-    for merged_range in merged_ranges:
-        ws.unmerge_cells(str(merged_range))
-
-    # Fill in the job sheet data based on the actual template structure
-    # Looking at the exported form, mapping cells more precisely
-
-    # Header Section (top right)
-    ws['G6'] = str(entry.ref_number)  # Ref No field (top right)
-
-    # CLIENT'S INFORMATION Section
-    ws['B11'] = str(entry.reported_by)  # Full Name (first field under client info header)
-    ws['B12'] = str(entry.section_division)  # Section/Division
-    ws['G11'] = entry.date_reported.strftime('%B %d, %Y') if entry.date_reported else ''  # Date of Filing (right side)
-    ws['G12'] = str(entry.contact_no)  # Contact No. (right side, same row as section)
-    ws['B14'] = str(entry.description)  # Brief description (multi-line field)
-
-    # I.T. SUPPORT TECHNICAL ASSESSMENT Section
-    # Incident Classification subsection
-    ws['B18'] = str(entry.incident_type)  # Type of Incident
-    ws['D18'] = str(entry.main_category)  # Main Category
-    ws['B19'] = str(entry.sub_category)  # Sub-Category
-    ws['D19'] = str(entry.status)  # Status
-
-    # Hardware subsection
-    ws['B22'] = str(entry.hardware_type)  # Type
-    ws['D22'] = str(entry.hardware_brand_model)  # Brand and Model
-    ws['B23'] = str(entry.hardware_serial_number)  # Serial Number
-    ws['E23'] = str(entry.computer_name)  # Computer Name
-
-    # Application System / Software subsection
-    ws['B26'] = str(entry.application_description)  # Description
-    ws['G26'] = str(entry.application_version)  # Version
-
-    # Connectivity subsection
-    ws['B29'] = str(entry.connectivity_description)
-
-    # User Account subsection
-    ws['B32'] = str(entry.user_account_description)
-
-    # Assessment subsection
-    ws['B35'] = str(entry.assessment)
-
-    # Actions Taken and/or Recommendations
-    ws['B38'] = str(entry.resolution)
-
-    # Mode of Filing and Personnel Section
-    # Mode checkboxes around row 42, personnel names to the right
-    ws['E43'] = str(entry.fulfilled_by)  # Fulfilled by
-    ws['E44'] = str(entry.reviewed_by)  # Reviewed by
-
-    # CLIENT'S EVALUATION Section (bottom)
-    # Questions with Yes/No and satisfaction options
-    ws['B48'] = str(entry.concern_addressed)  # Question 1
-    ws['B49'] = str(entry.satisfaction_service)  # Question 2
-    ws['B50'] = str(entry.satisfaction_solution)  # Question 3
-    ws['B52'] = str(entry.client_comments)  # Comments/Suggestions
-
-    # Prepare response
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-
-    # Create response
-    response = HttpResponse(
-        output.read(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
+    response = HttpResponse(render_job_sheet(job_sheet_values(entry)), content_type=XLSX_CONTENT_TYPE)
     filename = f'JobSheet_{entry.ref_number}.xlsx'
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
     return response
 
 
+JOB_SHEET_FILTERS = ('status', 'incident_type', 'main_category')
+
+
+@login_required
+def hdr_job_sheets_export(request, report_id):
+    """
+    Every job sheet of a report month: a ZIP of individual workbooks, or with
+    ?format=xlsx one workbook with a sheet per ticket. Narrow it down with
+    ?status= / ?incident_type= / ?main_category= / ?date_from= / ?date_to=
+    (YYYY-MM-DD) or explicit ?entry=<id> (repeatable).
+    """
+    params = {'report_id': report_id, 'format': 'xlsx' if request.GET.get('format') == 'xlsx' else 'zip'}
+    for key in JOB_SHEET_FILTERS:
+        if request.GET.get(key):
+            params[key] = request.GET[key]
+    for key in ('date_from', 'date_to'):
+        if request.GET.get(key):
+            try:
+                day = parse_date(request.GET[key])
+            except ValueError:  # well-formed but impossible, e.g. 2024-02-30
+                day = None
+            if day is None:
+                return HttpResponseBadRequest(f'{key} must be a YYYY-MM-DD date')
+            params[key] = day.isoformat()
+    entry_ids = [int(i) for i in request.GET.getlist('entry') if i.isdigit()]
+    if entry_ids:
+        params['entries'] = entry_ids
+    return run_export(request, 'hdr_job_sheets', params)
+
+
+def build_hdr_job_sheets(params, progress):
+    from .job_sheets import write_job_sheets_workbook, write_job_sheets_zip
+    import tempfile
+
+    report = get_object_or_404(HDRReport, id=params['report_id'])
+    entries = report.entries.order_by('date_reported', 'ref_number')
+    for key in JOB_SHEET_FILTERS:
+        if params.get(key):
+            entries = entries.filter(**{key: params[key]})
+    if params.get('date_from'):
+        entries = entries.filter(date_reported__gte=date.fromisoformat(params['date_from']))
+    if params.get('date_to'):
+        entries = entries.filter(date_reported__lte=date.fromisoformat(params['date_to']))
+    if params.get('entries'):
+        entries = entries.filter(id__in=params['entries'])
+    entries = list(entries)
+
+    tmp = tempfile.TemporaryFile()
+    name = f'JobSheets_{report.period_display.replace(" ", "_")}'
+    if params.get('format') == 'xlsx':
+        write_job_sheets_workbook(tmp, entries, progress)
+        result = ExportFile(tmp, f'{name}.xlsx', XLSX_CONTENT_TYPE)
+    else:
+        write_job_sheets_zip(tmp, entries, progress)
+        result = ExportFile(tmp, f'{name}.zip', 'application/zip')
+    tmp.seek(0)
+    return result
+
+
 @login_required
 def hdr_export_excel(request, report_id):
     """Export HDR report to Excel using template - fills data into pre-formatted cells"""
-    from openpyxl import load_workbook
-    from openpyxl.styles import Alignment, Border, Side, Font, PatternFill
-    from copy import copy
-    from datetime import datetime
+    return run_export(request, 'hdr_excel', {'report_id': report_id})
+
+
+def build_hdr_excel(params, progress):
+    """HDR workbook for export jobs and hdr_export_excel (ExportFile)"""
+    from openpyxl.styles import Alignment
+    from .excel_templates import HDR_TEMPLATE
     import io
 
-    report = get_object_or_404(HDRReport, id=report_id)
+    report = get_object_or_404(HDRReport, id=params['report_id'])
     entries = report.entries.order_by('date_reported', 'ref_number')
 
-    # Load the new template
-    template_path = 'media/pm_reports/new_hdr.xlsx'
-    wb = load_workbook(template_path, data_only=False, keep_vba=False)
-
-    # Use the template's first sheet
-    ws = wb.worksheets[0]
+    # The template's first sheet, already unmerged (avoids "MergedCell is read-only" errors)
+    wb, ws = HDR_TEMPLATE.open()
     wb.active = ws  # Make it the active sheet
 
-    # Unmerge all cells to avoid "MergedCell is read-only" errors
-    # Create a list of merged ranges to unmerge
-    merged_ranges = list(ws.merged_cells.ranges)
-    for merged_range in merged_ranges:
-        ws.unmerge_cells(str(merged_range))
-
     # Fill in header information in the template
-    ws['B2'] = report.period_display
-    ws['B4'] = report.region
-    ws['H4'] = report.network_admin_name
-    ws['B5'] = report.office
-    ws['H5'] = report.network_admin_contact
-    ws['B6'] = report.address
-    ws['H6'] = report.network_admin_email
-    # Data starts at row 9 (assuming row 8 has headers in template)
-    data_start_row = 9
+    HDR_TEMPLATE.write_cells(ws, {
+        'period': report.period_display,
+        'region': report.region,
+        'admin_name': report.network_admin_name,
+        'office': report.office,
+        'admin_contact': report.network_admin_contact,
+        'address': report.address,
+        'admin_email': report.network_admin_email,
+    })
 
     # Write each entry to the template
+    wrap = Alignment(wrap_text=True, vertical='top')
     for idx, entry in enumerate(entries):
-        row_num = data_start_row + idx
-
-        # Write data directly to template cells
-        ws[f'A{row_num}'] = str(entry.ref_number)
-        ws[f'B{row_num}'] = str(entry.incident_type)
-        ws[f'C{row_num}'] = str(entry.main_category)
-        ws[f'D{row_num}'] = str(entry.sub_category)
-        ws[f'E{row_num}'] = str(entry.description)
-        ws[f'F{row_num}'] = str(entry.status)
-        ws[f'G{row_num}'] = entry.date_reported if entry.date_reported else ''
-        ws[f'H{row_num}'] = str(entry.reported_by)
-        ws[f'I{row_num}'] = str(entry.resolution) if entry.resolution else ''
+        row_num = HDR_TEMPLATE.write_row(ws, idx, {
+            'ref_number': str(entry.ref_number),
+            'incident_type': str(entry.incident_type),
+            'main_category': str(entry.main_category),
+            'sub_category': str(entry.sub_category),
+            'description': str(entry.description),
+            'status': str(entry.status),
+            'date_reported': entry.date_reported if entry.date_reported else '',
+            'reported_by': str(entry.reported_by),
+            'resolution': str(entry.resolution) if entry.resolution else '',
+        })
 
         # Enable text wrapping for all data cells in this row
-        for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']:
-            ws[f'{col}{row_num}'].alignment = Alignment(wrap_text=True, vertical='top')
-
-    # Apply formatting
-    # Merge specific cells
-    # Apply formatting
-    # Merge specific cells
-    ws.merge_cells('G14:H14')
-    ws.merge_cells('G15:H15')
-    ws.merge_cells('G16:H16')
-    ws.merge_cells('G17:H17')
-
-    ws.merge_cells('A12:B12')
-    ws.merge_cells('A14:B14')
-    ws.merge_cells('A15:B15')
-    ws.merge_cells('A16:B16')
-    ws.merge_cells('A17:B17')
+        for cell in HDR_TEMPLATE.row_cells(ws, row_num):
+            cell.alignment = wrap
+
+    # Re-merge the template's fixed ranges
+    HDR_TEMPLATE.finish(ws)
 
     # Prepare response
     output = io.BytesIO()
     wb.save(output)
-    output.seek(0)
 
-    # Create response
-    response = HttpResponse(
-        output.read(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
     filename = f'HDR_{report.period_display.replace(" ", "_")}.xlsx'
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-    return response
+    return ExportFile(output.getvalue(), filename, XLSX_CONTENT_TYPE)
@@ -0,0 +1,290 @@
+"""
+Monthly ICT Equipment Inventory workbook - desktops (with their monitor,
+keyboard, mouse and UPS rows), laptops and printers on the regional
+template.
+
+Rows are streamed through a write-only openpyxl workbook into a temporary
+file: packages are read in batches of BATCH_SIZE with one query per related
+table per batch, so the query count grows with batches rather than packages
+and memory stays flat. Only the template's header rows (and its column
+widths / data-row styles) are reused; the template is not loaded per export.
+"""
+import os
+import tempfile
+from copy import copy
+from datetime import datetime
+from functools import lru_cache
+
+from django.conf import settings
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill
+
+from inventory.export_jobs import XLSX_CONTENT_TYPE, ExportFile
+from inventory.models import (
+    DesktopDetails, MonitorDetails, KeyboardDetails, MouseDetails, UPSDetails,
+    LaptopDetails, PrinterDetails, DocumentsDetails, UserDetails,
+)
+
+TEMPLATE_PATH = os.path.join('static', 'excel_template', '3f2e3faf-8c25-426f-b673-a2b5fb38e34a.xlsx')
+HEADER_ROWS = 8          # rows 1-8 of the template: title, office block, column headings
+DATA_STYLE_ROW = 9       # first data row; its cell styles are applied to every row written
+COLUMNS = 26             # A..Z
+BATCH_SIZE = 500
+
+ASSET_TYPES = ('desktop', 'laptop', 'printer')
+
+DISPOSED_FILL = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+
+# (label, model, item-number suffix, serial / model / brand fields)
+DESKTOP_COMPONENTS = [
+    ('Monitor', MonitorDetails, 'b', 'monitor_sn_db', 'monitor_model_db', 'monitor_brand_db'),
+    ('Keyboard', KeyboardDetails, 'c', 'keyboard_sn_db', 'keyboard_model_db', 'keyboard_brand_db'),
+    ('Mouse', MouseDetails, 'd', 'mouse_sn_db', 'mouse_model_db', 'mouse_brand_db'),
+    ('UPS', UPSDetails, 'e', 'ups_sn_db', 'ups_model_db', 'ups_brand_db'),
+]
+
+
+# ---------------------------------------------------------------------------
+# Template
+# ---------------------------------------------------------------------------
+
+def _style_of(cell):
+    return {
+        'font': copy(cell.font), 'border': copy(cell.border), 'fill': copy(cell.fill),
+        'alignment': copy(cell.alignment), 'number_format': cell.number_format,
+    }
+
+
+@lru_cache(maxsize=4)
+def _template_layout(path, mtime):
+    """Header cells, column widths and data-row styles of the template (cached per file version)"""
+    wb = load_workbook(path)
+    ws = wb.active
+    header = [
+        (ws.row_dimensions[r].height, [(cell.value, _style_of(cell)) for cell in ws[r][:COLUMNS]])
+        for r in range(1, HEADER_ROWS + 1)
+    ]
+    return {
+        'title': ws.title,
+        'header': header,
+        'widths': {key: dim.width for key, dim in ws.column_dimensions.items() if dim.width},
+        'data_styles': [_style_of(cell) for cell in ws[DATA_STYLE_ROW][:COLUMNS]],
+        'freeze_panes': ws.freeze_panes,
+    }
+
+
+def template_layout(path=TEMPLATE_PATH):
+    path = os.path.join(settings.BASE_DIR, path)
+    return _template_layout(path, os.path.getmtime(path))
+
+
+def _styled(ws, value, style):
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font = style['font']
+    cell.border = style['border']
+    cell.fill = style['fill']
+    cell.alignment = style['alignment']
+    cell.number_format = style['number_format']
+    return cell
+
+
+def _like(ws, value, prototype):
+    """Cell styled like `prototype`; copies its style ids instead of re-registering each style"""
+    cell = WriteOnlyCell(ws, value=value)
+    cell._style = copy(prototype._style)
+    return cell
+
+
+# ---------------------------------------------------------------------------
+# Data
+# ---------------------------------------------------------------------------
+
+def _batches(queryset, size=BATCH_SIZE):
+    """Keyset-batched iteration in primary key order"""
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).order_by('pk')[:size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1].pk
+
+
+def _first_by(queryset, fk, ids):
+    """{package_id: first row} for the given packages - the row .first() would return"""
+    first = {}
+    for row in queryset.filter(**{f'{fk}__in': ids}).order_by(fk, 'pk'):
+        first.setdefault(getattr(row, fk), row)
+    return first
+
+
+def _grouped_by(queryset, fk, ids):
+    grouped = {}
+    for row in queryset.filter(**{f'{fk}__in': ids}).order_by(fk, 'pk'):
+        grouped.setdefault(getattr(row, fk), []).append(row)
+    return grouped
+
+
+def _users(fk, ids):
+    users = UserDetails.objects.select_related(
+        'user_Enduser__employee_office_section', 'user_Assetowner'
+    )
+    return _first_by(users, fk, ids)
+
+
+def _shared_columns(doc, user):
+    """Acquisition / property / assignment columns every row of a package repeats"""
+    end_user = user.user_Enduser if user else None
+    owner = user.user_Assetowner if user else None
+    section = end_user.employee_office_section if end_user else None
+    return {
+        'C': doc.docs_Acquisition_Type if doc else '',
+        'J': doc.docs_PAR if doc else '',
+        'L': doc.docs_Propertyno if doc else '',
+        'O': doc.docs_Value if doc else '',
+        'P': f"{end_user.employee_fname} {end_user.employee_lname}" if end_user else '',
+        'Q': end_user.employee_position if end_user else '',
+        'R': section.name if section else '',
+        'S': "Region VIII",
+        'T': "Leyte 4th DEO",
+        'U': f"{owner.employee_fname} {owner.employee_lname}" if owner else '',
+        'V': doc.docs_Datereceived if doc else '',
+        'W': doc.docs_Supplier if doc else '',
+        'X': doc.docs_Dateinspected if doc else '',
+    }
+
+
+def _status(obj):
+    return "Disposed" if obj.is_disposed else "Active"
+
+
+def _equipment_row(item_no, label, shared, status, serial, model, brand, specs=None, computer_name="N/A"):
+    row = dict(shared)
+    row.update({
+        'A': item_no, 'B': label, 'I': status, 'K': serial, 'M': model,
+        'N': brand.name if brand else '', 'Y': computer_name, 'Z': status,
+    })
+    row.update(zip('DEFGH', specs or ("N/A",) * 5))
+    return row
+
+
+class ItemNumbers:
+    """Bundle item numbers (1a, 1b, ... 2a) - one number per asset; `last` doubles as progress"""
+
+    def __init__(self):
+        self.last = 0
+
+    def next(self):
+        self.last += 1
+        return self.last
+
+
+def desktop_rows(numbers):
+    """Desktop row followed by its component rows, per package"""
+    desktops = DesktopDetails.objects.select_related('brand_name')
+    for batch in _batches(desktops):
+        ids = {d.equipment_package_id for d in batch if d.equipment_package_id}
+        docs = _first_by(DocumentsDetails.objects.all(), 'equipment_package_id', ids)
+        users = _users('equipment_package_id', ids)
+        components = [
+            (label, _grouped_by(model.objects.select_related(brand), 'equipment_package_id', ids),
+             suffix, sn, model_field, brand)
+            for label, model, suffix, sn, model_field, brand in DESKTOP_COMPONENTS
+        ]
+        for desktop in batch:
+            i = numbers.next()
+            package_id = desktop.equipment_package_id
+            shared = _shared_columns(docs.get(package_id), users.get(package_id))
+            status = _status(desktop)
+            yield _equipment_row(
+                f"{i}a", "Desktop", shared, status, desktop.serial_no, desktop.model, desktop.brand_name,
+                specs=(desktop.processor, desktop.memory, desktop.drive, desktop.desktop_OS, desktop.desktop_Office),
+                computer_name=desktop.computer_name,
+            ), desktop.is_disposed
+            for label, items, suffix, sn, model_field, brand in components:
+                for item in items.get(package_id, ()):
+                    yield _equipment_row(
+                        f"{i}{suffix}", label, shared, _status(item),
+                        getattr(item, sn), getattr(item, model_field), getattr(item, brand),
+                    ), item.is_disposed
+
+
+def laptop_rows(numbers):
+    laptops = LaptopDetails.objects.select_related('brand_name')
+    for batch in _batches(laptops):
+        ids = {l.laptop_package_id for l in batch if l.laptop_package_id}
+        docs = _first_by(DocumentsDetails.objects.all(), 'laptop_package_id', ids)
+        users = _users('laptop_package_id', ids)
+        for laptop in batch:
+            shared = _shared_columns(docs.get(laptop.laptop_package_id), users.get(laptop.laptop_package_id))
+            yield _equipment_row(
+                f"{numbers.next()}a", "Laptop", shared, _status(laptop),
+                laptop.laptop_sn_db, laptop.model, laptop.brand_name,
+                specs=(laptop.processor, laptop.memory, laptop.drive, laptop.laptop_OS, laptop.laptop_Office),
+                computer_name=laptop.computer_name,
+            ), laptop.is_disposed
+
+
+def printer_rows(numbers):
+    printers = PrinterDetails.objects.select_related('printer_brand_db')
+    for batch in _batches(printers):
+        ids = {p.printer_package_id for p in batch if p.printer_package_id}
+        docs = _first_by(DocumentsDetails.objects.all(), 'printer_package_id', ids)
+        users = _users('printer_package_id', ids)
+        for printer in batch:
+            shared = _shared_columns(docs.get(printer.printer_package_id), users.get(printer.printer_package_id))
+            yield _equipment_row(
+                f"{numbers.next()}a", "Printer", shared, _status(printer),
+                printer.printer_sn_db, printer.printer_model_db, printer.printer_brand_db,
+            ), printer.is_disposed
+
+
+ROW_SOURCES = {
+    'desktop': (desktop_rows, DesktopDetails),
+    'laptop': (laptop_rows, LaptopDetails),
+    'printer': (printer_rows, PrinterDetails),
+}
+
+
+# ---------------------------------------------------------------------------
+# Workbook
+# ---------------------------------------------------------------------------
+
+def write_inventory(fileobj, asset_types, progress):
+    """Stream the inventory workbook into `fileobj`; progress(done, total, message) per row"""
+    layout = template_layout()
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(layout['title'])
+    for key, width in layout['widths'].items():
+        ws.column_dimensions[key].width = width
+    ws.freeze_panes = layout['freeze_panes']
+
+    for row_no, (height, cells) in enumerate(layout['header'], start=1):
+        if height:
+            ws.row_dimensions[row_no].height = height
+        ws.append([_styled(ws, value, style) for value, style in cells])
+
+    styles = [_styled(ws, None, style) for style in layout['data_styles']]
+    disposed_styles = [_styled(ws, None, dict(style, fill=DISPOSED_FILL)) for style in layout['data_styles']]
+    columns = [chr(ord('A') + i) for i in range(COLUMNS)]
+
+    total = sum(ROW_SOURCES[t][1].objects.count() for t in asset_types)
+    numbers = ItemNumbers()
+    for asset_type in asset_types:
+        rows = ROW_SOURCES[asset_type][0]
+        for row, disposed in rows(numbers):
+            row_styles = disposed_styles if disposed else styles
+            ws.append([_like(ws, row.get(col, ''), style) for col, style in zip(columns, row_styles)])
+            progress(numbers.last, total, f'{numbers.last} of {total} assets')
+    wb.save(fileobj)
+
+
+def build_inventory_excel(params, progress):
+    """ExportFile backed by a temporary file, served/stored in chunks"""
+    asset_types = [t for t in params.get('types') or ASSET_TYPES if t in ROW_SOURCES]
+    tmp = tempfile.TemporaryFile()
+    write_inventory(tmp, asset_types, progress)
+    tmp.seek(0)
+    name = 'desktop_bundle_export' if asset_types == ['desktop'] else 'ict_inventory_export'
+    return ExportFile(tmp, f'{name}_{datetime.today().date()}.xlsx', XLSX_CONTENT_TYPE)
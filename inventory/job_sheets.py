@@ -0,0 +1,135 @@
+"""
+Standard Job Sheets for HDR entries - one at a time (hdr_entry_export) or a
+whole report month at once (hdr_job_sheets_export).
+
+Rendering a sheet needs nothing from the database: the entry is turned into
+a dict of cell values first (job_sheet_values), and render_job_sheet(values)
+fills a copy of the cached template (inventory/excel_templates.py). Months
+with many tickets are rendered in HDR_JOB_SHEET_WORKERS worker processes;
+the sheets come back in entry order and are written straight into a ZIP in a
+temporary file, or into one workbook with a sheet per ticket.
+"""
+import io
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+
+from django.conf import settings
+
+from .excel_templates import JOB_SHEET_TEMPLATE
+
+# Entries below this are rendered in-process; starting workers costs more
+MIN_PARALLEL_SHEETS = 8
+MAX_AUTO_WORKERS = 4
+
+JOB_SHEET_FIELDS = (
+    'ref_number', 'reported_by', 'section_division', 'contact_no', 'description',
+    'incident_type', 'main_category', 'sub_category', 'status',
+    'hardware_type', 'hardware_brand_model', 'hardware_serial_number', 'computer_name',
+    'application_description', 'application_version', 'connectivity_description',
+    'user_account_description', 'assessment', 'resolution', 'fulfilled_by', 'reviewed_by',
+    'concern_addressed', 'satisfaction_service', 'satisfaction_solution', 'client_comments',
+)
+
+
+def job_sheet_values(entry):
+    """{template field: cell value} for one HDREntry"""
+    values = {field: str(getattr(entry, field)) for field in JOB_SHEET_FIELDS}
+    values['date_reported'] = entry.date_reported.strftime('%B %d, %Y') if entry.date_reported else ''
+    return values
+
+
+def render_job_sheet(values):
+    """xlsx bytes of one filled job sheet (runs in worker processes)"""
+    wb, ws = JOB_SHEET_TEMPLATE.open()
+    JOB_SHEET_TEMPLATE.write_cells(ws, values)
+    output = io.BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+def _worker_count(jobs, workers=None):
+    workers = settings.HDR_JOB_SHEET_WORKERS if workers is None else workers
+    if workers <= 0:
+        workers = min(MAX_AUTO_WORKERS, os.cpu_count() or 1)
+    return min(workers, jobs)
+
+
+def render_job_sheets(values_list, workers=None):
+    """Rendered sheets in the order of `values_list`, in parallel when it is worth it"""
+    workers = _worker_count(len(values_list), workers)
+    if workers <= 1 or len(values_list) < MIN_PARALLEL_SHEETS:
+        for values in values_list:
+            yield render_job_sheet(values)
+        return
+    # spawn: workers start clean (no copies of the web process' threads or
+    # DB connections) and behave the same on Windows and Linux
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        yield from pool.map(render_job_sheet, values_list, chunksize=2)
+
+
+def _unique(name, taken, max_length=255):
+    candidate, n = name, 2
+    while candidate.lower() in taken:
+        suffix = f' ({n})'
+        candidate = name[:max_length - len(suffix)] + suffix
+        n += 1
+    taken.add(candidate.lower())
+    return candidate
+
+
+def write_job_sheets_zip(fileobj, entries, progress, workers=None):
+    """ZIP of one JobSheet_<ref>.xlsx per entry"""
+    values_list = [job_sheet_values(entry) for entry in entries]
+    names = set()
+    total = len(values_list)
+    with zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for done, (values, sheet) in enumerate(zip(values_list, render_job_sheets(values_list, workers)), start=1):
+            name = _unique(re.sub(r'[\\/:*?"<>|]', '-', f"JobSheet_{values['ref_number']}"), names)
+            archive.writestr(f'{name}.xlsx', sheet)
+            progress(done, total, f'{done} of {total} job sheets')
+
+
+def _sheet_title(ref_number):
+    # Excel sheet names: at most 31 characters, none of []:*?/\
+    return re.sub(r'[\[\]:*?/\\]', '-', ref_number)[:31] or 'Job Sheet'
+
+
+def write_job_sheets_workbook(fileobj, entries, progress):
+    """One workbook with a job sheet per entry, named after its ref number"""
+    from openpyxl.drawing.image import Image
+
+    wb, base = JOB_SHEET_TEMPLATE.open()
+    for ws in list(wb.worksheets):
+        if ws is not base:
+            wb.remove(ws)
+
+    # copy_worksheet leaves images (the letterhead logo) behind; _data() also
+    # closes the image's source, so read each one once and hand out copies
+    images = []
+    for image in base._images:
+        data = image._data()
+        image.ref = io.BytesIO(data)
+        images.append((data, image))
+
+    titles = set()
+    total = len(entries)
+    for done, entry in enumerate(entries, start=1):
+        ws = wb.copy_worksheet(base)
+        ws.title = _unique(_sheet_title(str(entry.ref_number)), titles, max_length=31)
+        for data, image in images:
+            clone = Image(io.BytesIO(data))
+            clone.width, clone.height = image.width, image.height
+            clone.anchor = copy(image.anchor)
+            ws.add_image(clone)
+        JOB_SHEET_TEMPLATE.write_cells(ws, job_sheet_values(entry))
+        progress(done, total, f'{done} of {total} job sheets')
+
+    if entries:
+        wb.remove(base)
+        wb.active = 0
+    wb.save(fileobj)
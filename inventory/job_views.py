@@ -0,0 +1,80 @@
+"""
+Export job views - queue an export in the background, poll its progress and
+download the file when it is ready (see inventory/export_jobs.py).
+"""
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+
+from .export_jobs import EXPORT_KINDS, build_export, submit
+from .models import ExportJob
+from .utils.keyset import wants_json
+
+
+def wants_background(request):
+    """?background=1 on an export URL queues a job instead of rendering in the request"""
+    return request.GET.get('background', '').lower() in ('1', 'true', 'yes')
+
+
+def run_export(request, kind, params):
+    """
+    Body of an export view: build the file in the request, or with
+    ?background=1 queue a job (reusing an identical running one) and send
+    the user to its progress page - or a 202 JSON status for API callers.
+    """
+    if not wants_background(request):
+        return build_export(kind, params).response()
+    job, _ = submit(kind, params, user=request.user)
+    if wants_json(request):
+        return JsonResponse(job_payload(request, job), status=202)
+    return redirect('export_job_detail', job_id=job.pk)
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def job_payload(request, job):
+    ready = job.status == 'done' and bool(job.file)
+    return {
+        'id': job.pk,
+        'kind': job.kind,
+        'label': EXPORT_KINDS[job.kind][1] if job.kind in EXPORT_KINDS else job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'message': job.message,
+        'error': job.error if job.status == 'failed' else '',
+        'created_at': _isoformat(job.created_at),
+        'started_at': _isoformat(job.started_at),
+        'finished_at': _isoformat(job.finished_at),
+        'expires_at': _isoformat(job.expires_at),
+        'status_url': request.build_absolute_uri(reverse('export_job_status', args=[job.pk])),
+        'download_url': request.build_absolute_uri(reverse('export_job_download', args=[job.pk])) if ready else None,
+    }
+
+
+@login_required
+def export_job_detail(request, job_id):
+    """Progress page; polls export_job_status until the file is ready"""
+    job = get_object_or_404(ExportJob, pk=job_id)
+    return render(request, 'jobs/export_job.html', {'job': job, 'payload': job_payload(request, job)})
+
+
+@login_required
+def export_job_status(request, job_id):
+    job = get_object_or_404(ExportJob, pk=job_id)
+    return JsonResponse(job_payload(request, job))
+
+
+@login_required
+def export_job_download(request, job_id):
+    job = get_object_or_404(ExportJob, pk=job_id)
+    if job.status != 'done' or not job.file:
+        raise Http404("This export is not ready or has expired.")
+    return FileResponse(
+        job.file.open('rb'),
+        as_attachment=job.content_type != 'application/pdf',
+        filename=job.filename,
+        content_type=job.content_type,
+    )
@@ -0,0 +1,449 @@
+"""
+Management command to populate a database with synthetic inventory data
+for scale testing.
+
+Usage:
+    python manage.py generate_synthetic_data --packages 20000 --laptops 5000 --seed 42
+
+Everything is written with bulk_create (no per-row save()/signals), so model
+side effects are reproduced by hand: normalized serial numbers are filled in
+and QR codes are left empty. All random values come from one seeded RNG so the
+same arguments always produce the same dataset.
+"""
+import random
+import uuid
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from inventory.asset_index import rebuild_asset_index
+from inventory.dashboard_snapshot import mark_dashboard_snapshot_stale
+from inventory.utils.pm_summary import invalidate_pending_pm_summary
+from inventory.models import (
+    normalize_sn,
+    Brand, OfficeSection, Employee, Profile,
+    Equipment_Package, DesktopDetails, MonitorDetails, KeyboardDetails, MouseDetails, UPSDetails,
+    DocumentsDetails, UserDetails,
+    LaptopPackage, LaptopDetails, PrinterPackage, PrinterDetails,
+    QuarterSchedule, PMSectionSchedule, PMScheduleAssignment, PreventiveMaintenance,
+    PMChecklistTemplate, PMChecklistSchedule, PMChecklistCompletion, PMChecklistItemCompletion,
+    EquipmentDowntimeEvent, Notification, EndUserChangeHistory, AssetOwnerChangeHistory,
+)
+
+BRANDS = ['Dell', 'HP', 'Lenovo', 'Acer', 'Asus', 'MSI', 'Epson', 'Canon', 'Brother', 'APC', 'Logitech', 'A4Tech']
+FIRST_NAMES = ['Juan', 'Maria', 'Jose', 'Ana', 'Pedro', 'Rosa', 'Carlo', 'Liza', 'Mark', 'Grace', 'Paolo', 'Joy']
+LAST_NAMES = ['Santos', 'Reyes', 'Cruz', 'Bautista', 'Garcia', 'Mendoza', 'Torres', 'Flores', 'Ramos', 'Villanueva']
+POSITIONS = ['Engineer II', 'Admin Aide', 'Clerk', 'Accountant', 'Draftsman', 'Foreman', 'Chief']
+PROCESSORS = ['Intel Core i3', 'Intel Core i5', 'Intel Core i7', 'AMD Ryzen 5', 'AMD Ryzen 7']
+MEMORY = ['4GB', '8GB', '16GB', '32GB']
+DRIVES = ['256GB SSD', '512GB SSD', '1TB HDD', '1TB SSD']
+SEVERITIES = ['MINOR', 'MODERATE', 'MAJOR', 'CRITICAL']
+QUARTER_MONTHS = {'Q1': 1, 'Q2': 4, 'Q3': 7, 'Q4': 10}
+
+
+class Command(BaseCommand):
+    help = 'Populate the database with reproducible synthetic inventory data (bulk inserts, seedable RNG)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--packages', type=int, default=1000, help='Desktop equipment packages to create')
+        parser.add_argument('--laptops', type=int, default=250, help='Laptop packages to create')
+        parser.add_argument('--printers', type=int, default=100, help='Printer packages to create')
+        parser.add_argument('--employees', type=int, default=500, help='Employees to create')
+        parser.add_argument('--sections', type=int, default=20, help='Office sections to spread employees across')
+        parser.add_argument('--staff', type=int, default=3, help='Staff users to create (notification recipients)')
+        parser.add_argument('--years', type=int, default=2, help='Years of PM/checklist/downtime history')
+        parser.add_argument('--seed', type=int, default=42, help='RNG seed (same seed = same dataset)')
+        parser.add_argument('--prefix', default='SYN', help='Prefix for generated names/serials (must be unique per run)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='bulk_create batch size')
+
+    # ------------------------------------------------------------------ helpers
+
+    def _bulk(self, model, objs):
+        created = model.objects.bulk_create(objs, batch_size=self.batch_size)
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(created)
+        return created
+
+    def _date_between(self, start, end):
+        span = (end - start).days
+        return start + timedelta(days=self.rng.randint(0, max(span, 0)))
+
+    def _aware(self, d, hour=9):
+        return timezone.make_aware(datetime.combine(d, time(hour, 0)))
+
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    # ------------------------------------------------------------------ main
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+        self.counts = {}
+        self.today = timezone.now().date()
+        self.start_year = self.today.year - options['years'] + 1
+
+        if Employee.objects.filter(employee_lname__startswith=f"{self.prefix}-").exists():
+            raise CommandError(f"Data with prefix '{self.prefix}' already exists; use another --prefix.")
+
+        started = timezone.now()
+        with transaction.atomic():
+            self.create_reference_data(options['sections'])
+            self.create_staff(options['staff'])
+            self.create_employees(options['employees'])
+            self.create_desktops(options['packages'])
+            self.create_laptops(options['laptops'])
+            self.create_printers(options['printers'])
+            self.create_pm_schedules()
+            self.create_change_history()
+
+        # Checklist templates are created by their own command
+        if not PMChecklistTemplate.objects.exists():
+            call_command('populate_pm_templates', stdout=self.stdout)
+        with transaction.atomic():
+            self.create_checklists()
+            self.create_downtime_events()
+            self.create_notifications()
+
+        # bulk_create skips signals, so invalidate the read models by hand
+        mark_dashboard_snapshot_stale()
+        invalidate_pending_pm_summary()
+        rebuild_asset_index(batch_size=self.batch_size)
+
+        elapsed = (timezone.now() - started).total_seconds()
+        for name, count in sorted(self.counts.items()):
+            self.stdout.write(f'  {name:<28} {count:>10}')
+        self.stdout.write(self.style.SUCCESS(f'\nSynthetic dataset created in {elapsed:.1f}s'))
+
+    # ------------------------------------------------------------------ steps
+
+    def create_reference_data(self, section_count):
+        Brand.objects.bulk_create(
+            [Brand(name=name, is_desktop=True, is_laptop=True, is_monitor=True, is_keyboard=True,
+                   is_mouse=True, is_ups=True, is_printer=True) for name in BRANDS],
+            ignore_conflicts=True,
+        )
+        self.brands = list(Brand.objects.filter(name__in=BRANDS))
+
+        names = [f"{self.prefix} Section {i + 1:03d}" for i in range(section_count)]
+        OfficeSection.objects.bulk_create([OfficeSection(name=n) for n in names], ignore_conflicts=True)
+        self.sections = list(OfficeSection.objects.filter(name__in=names).order_by('name'))
+
+    def create_staff(self, count):
+        users = self._bulk(User, [
+            User(username=f"{self.prefix.lower()}_staff_{i + 1}", is_staff=True, password='!')
+            for i in range(count)
+        ])
+        # post_save normally creates the profile
+        self._bulk(Profile, [Profile(user=u, qr_token=self._uuid()) for u in users])
+        self.staff = users
+
+    def create_employees(self, count):
+        rng = self.rng
+        self.employees = self._bulk(Employee, [
+            Employee(
+                employee_fname=rng.choice(FIRST_NAMES),
+                employee_lname=f"{self.prefix}-{rng.choice(LAST_NAMES)}-{i + 1}",
+                employee_position=rng.choice(POSITIONS),
+                employee_office_section=self.sections[i % len(self.sections)],
+                employee_status='Active',
+                qr_token=self._uuid(),
+            )
+            for i in range(count)
+        ])
+
+    def _user_details(self, field, packages):
+        rng = self.rng
+        return [
+            UserDetails(**{
+                field: pkg,
+                'user_Enduser': rng.choice(self.employees),
+                'user_Assetowner': rng.choice(self.employees),
+            })
+            for pkg in packages
+        ]
+
+    def _docs(self, field, packages):
+        rng = self.rng
+        return [
+            DocumentsDetails(**{
+                field: pkg,
+                'docs_PAR': f"PAR-{pkg.pk:06d}",
+                'docs_Propertyno': f"{self.prefix}-PN-{field[:1].upper()}{pkg.pk:07d}",
+                'docs_Acquisition_Type': rng.choice(['Purchased', 'Donated']),
+                'docs_Value': str(rng.randint(15, 90) * 1000),
+                'docs_Status': 'Serviceable',
+            })
+            for pkg in packages
+        ]
+
+    def create_desktops(self, count):
+        rng, p = self.rng, self.prefix
+        packages = self._bulk(Equipment_Package, [Equipment_Package() for _ in range(count)])
+        disposed_ids = {pkg.pk for pkg in rng.sample(packages, k=count // 20)} if count >= 20 else set()
+
+        desktops, monitors, keyboards, mice, ups = [], [], [], [], []
+        for i, pkg in enumerate(packages):
+            is_disposed = pkg.pk in disposed_ids
+            created = self._aware(self._date_between(date(self.start_year, 1, 1), self.today))
+            sn = f"{p}-DT-{i + 1:07d}"
+            desktops.append(DesktopDetails(
+                equipment_package=pkg, serial_no=sn, serial_no_norm=normalize_sn(sn),
+                computer_name=f"{p}-PC-{i + 1:07d}", brand_name=rng.choice(self.brands),
+                model=f"Model {rng.randint(100, 999)}", processor=rng.choice(PROCESSORS),
+                memory=rng.choice(MEMORY), drive=rng.choice(DRIVES),
+                desktop_OS='Windows 11 Pro', desktop_Office='Office 2021',
+                is_disposed=is_disposed, created_at=created,
+            ))
+            for n in range(rng.choice([1, 1, 1, 2])):
+                sn = f"{p}-MN-{i + 1:07d}-{n}"
+                monitors.append(MonitorDetails(
+                    equipment_package=pkg, monitor_sn_db=sn, monitor_sn_norm=normalize_sn(sn),
+                    monitor_brand_db=rng.choice(self.brands), monitor_model_db=f"M{rng.randint(10, 99)}",
+                    monitor_size_db=rng.choice(['19"', '22"', '24"', '27"']),
+                    is_disposed=is_disposed, created_at=created,
+                ))
+            sn = f"{p}-KB-{i + 1:07d}"
+            keyboards.append(KeyboardDetails(
+                equipment_package=pkg, keyboard_sn_db=sn, keyboard_sn_norm=normalize_sn(sn),
+                keyboard_brand_db=rng.choice(self.brands), keyboard_model_db=f"K{rng.randint(100, 999)}",
+                is_disposed=is_disposed, created_at=created,
+            ))
+            sn = f"{p}-MS-{i + 1:07d}"
+            mice.append(MouseDetails(
+                equipment_package=pkg, mouse_sn_db=sn, mouse_sn_norm=normalize_sn(sn),
+                mouse_brand_db=rng.choice(self.brands), mouse_model_db=f"MS{rng.randint(100, 999)}",
+                is_disposed=is_disposed, created_at=created,
+            ))
+            if rng.random() < 0.8:
+                sn = f"{p}-UP-{i + 1:07d}"
+                ups.append(UPSDetails(
+                    equipment_package=pkg, ups_sn_db=sn, ups_sn_norm=normalize_sn(sn),
+                    ups_brand_db=rng.choice(self.brands), ups_model_db=f"BX{rng.randint(500, 1500)}",
+                    ups_capacity_db=rng.choice(['650VA', '1000VA', '1500VA']),
+                    is_disposed=is_disposed, created_at=created,
+                ))
+
+        self._bulk(DesktopDetails, desktops)
+        self._bulk(MonitorDetails, monitors)
+        self._bulk(KeyboardDetails, keyboards)
+        self._bulk(MouseDetails, mice)
+        self._bulk(UPSDetails, ups)
+        self._bulk(DocumentsDetails, self._docs('equipment_package', packages))
+        self._bulk(UserDetails, self._user_details('equipment_package', packages))
+
+        if disposed_ids:
+            Equipment_Package.objects.filter(pk__in=disposed_ids).update(
+                is_disposed=True, disposal_date=self.today
+            )
+        self.desktop_packages = [pkg for pkg in packages if pkg.pk not in disposed_ids]
+
+    def create_laptops(self, count):
+        rng, p = self.rng, self.prefix
+        packages = self._bulk(LaptopPackage, [LaptopPackage() for _ in range(count)])
+        laptops = []
+        for i, pkg in enumerate(packages):
+            sn = f"{p}-LT-{i + 1:07d}"
+            laptops.append(LaptopDetails(
+                laptop_package=pkg, laptop_sn_db=sn, serial_no_norm=normalize_sn(sn),
+                computer_name=f"{p}-LT-{i + 1:07d}", brand_name=rng.choice(self.brands),
+                model=f"Notebook {rng.randint(100, 999)}", processor=rng.choice(PROCESSORS),
+                memory=rng.choice(MEMORY), drive=rng.choice(DRIVES),
+                laptop_OS='Windows 11 Pro', laptop_Office='Office 2021',
+                created_at=self._aware(self._date_between(date(self.start_year, 1, 1), self.today)),
+            ))
+        self._bulk(LaptopDetails, laptops)
+        self._bulk(DocumentsDetails, self._docs('laptop_package', packages))
+        self._bulk(UserDetails, self._user_details('laptop_package', packages))
+        self.laptop_packages = packages
+
+    def create_printers(self, count):
+        rng, p = self.rng, self.prefix
+        packages = self._bulk(PrinterPackage, [PrinterPackage() for _ in range(count)])
+        printers = []
+        for i, pkg in enumerate(packages):
+            sn = f"{p}-PR-{i + 1:07d}"
+            printers.append(PrinterDetails(
+                printer_package=pkg, printer_sn_db=sn, printer_sn_norm=normalize_sn(sn),
+                printer_brand_db=rng.choice(self.brands), printer_model_db=f"L{rng.randint(100, 9999)}",
+                printer_type=rng.choice(['Inkjet', 'Laser', 'Dot Matrix']),
+                printer_color=rng.random() < 0.6, printer_duplex=rng.random() < 0.4,
+            ))
+        self._bulk(PrinterDetails, printers)
+        self._bulk(DocumentsDetails, self._docs('printer_package', packages))
+        self._bulk(UserDetails, self._user_details('printer_package', packages))
+
+    def create_pm_schedules(self):
+        """Quarters x sections, one assignment per device per quarter, PM records for completed ones"""
+        rng = self.rng
+        years = range(self.start_year, self.today.year + 1)
+
+        QuarterSchedule.objects.bulk_create(
+            [QuarterSchedule(year=y, quarter=q) for y in years for q in QUARTER_MONTHS],
+            ignore_conflicts=True,
+        )
+        quarters = list(QuarterSchedule.objects.filter(year__in=list(years)))
+
+        schedules = []
+        for quarter in quarters:
+            month = QUARTER_MONTHS[quarter.quarter]
+            for section in self.sections:
+                start = date(quarter.year, month, 1) + timedelta(days=rng.randint(0, 45))
+                schedules.append(PMSectionSchedule(
+                    quarter_schedule=quarter, section=section,
+                    start_date=start, end_date=start + timedelta(days=14),
+                ))
+        schedules = self._bulk(PMSectionSchedule, schedules)
+        by_section = {}
+        for sched in schedules:
+            by_section.setdefault(sched.section_id, []).append(sched)
+
+        # Device -> section via its end user
+        device_sections = {}
+        rows = UserDetails.objects.filter(
+            user_Enduser__employee_office_section__in=self.sections
+        ).values_list('equipment_package_id', 'laptop_package_id', 'user_Enduser__employee_office_section_id')
+        for desktop_id, laptop_id, section_id in rows:
+            if desktop_id:
+                device_sections[('equipment_package_id', desktop_id)] = section_id
+            elif laptop_id:
+                device_sections[('laptop_package_id', laptop_id)] = section_id
+
+        devices = (
+            [('equipment_package_id', pkg.pk) for pkg in self.desktop_packages] +
+            [('laptop_package_id', pkg.pk) for pkg in self.laptop_packages]
+        )
+        assignments = []
+        for field, pk in devices:
+            for sched in by_section.get(device_sections.get((field, pk)), []):
+                done = sched.end_date < self.today and rng.random() < 0.85
+                assignments.append(PMScheduleAssignment(
+                    **{field: pk}, pm_section_schedule=sched, is_completed=done,
+                ))
+        assignments = self._bulk(PMScheduleAssignment, assignments)
+
+        sched_by_id = {s.pk: s for s in schedules}
+        maintenances = []
+        for a in assignments:
+            if not a.is_completed:
+                continue
+            sched = sched_by_id[a.pm_section_schedule_id]
+            done_on = self._date_between(sched.start_date, sched.end_date)
+            maintenances.append(PreventiveMaintenance(
+                equipment_package_id=a.equipment_package_id, laptop_package_id=a.laptop_package_id,
+                pm_schedule_assignment=a, maintenance_date=done_on, date_accomplished=done_on,
+                performed_by='Synthetic Technician', is_completed=True,
+                **{f'task_{n}': True for n in range(1, 10)},
+            ))
+        self._bulk(PreventiveMaintenance, maintenances)
+
+    def create_change_history(self):
+        rng = self.rng
+        ct = ContentType.objects.get_for_model(Equipment_Package)
+        sample = rng.sample(self.desktop_packages, k=min(len(self.desktop_packages), max(1, len(self.desktop_packages) // 5)))
+        enduser, owner = [], []
+        for pkg in sample:
+            old, new = rng.sample(self.employees, k=2) if len(self.employees) > 1 else (None, self.employees[0])
+            enduser.append(EndUserChangeHistory(content_type=ct, object_id=pkg.pk, old_enduser=old, new_enduser=new))
+            owner.append(AssetOwnerChangeHistory(content_type=ct, object_id=pkg.pk, old_assetowner=old, new_assetowner=new))
+        self._bulk(EndUserChangeHistory, enduser)
+        self._bulk(AssetOwnerChangeHistory, owner)
+
+    def create_checklists(self):
+        """PMChecklistSchedule rows per template frequency with completions for past dates"""
+        rng = self.rng
+        start = date(self.start_year, 1, 1)
+        completer = self.staff[0] if self.staff else None
+
+        schedules = []
+        for template in PMChecklistTemplate.objects.filter(is_active=True):
+            day = start
+            while day <= self.today:
+                if template.frequency == 'DAILY':
+                    if day.weekday() < 5:
+                        schedules.append(PMChecklistSchedule(template=template, scheduled_date=day, due_date=day))
+                    day += timedelta(days=1)
+                    continue
+                if day.day == 1:
+                    if template.frequency in ('WEEKLY', 'MONTHLY') or (
+                        template.frequency == 'SEMI_ANNUAL' and day.month in (1, 7)
+                    ):
+                        due = (day.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+                        schedules.append(PMChecklistSchedule(template=template, scheduled_date=day, due_date=due))
+                day += timedelta(days=1)
+
+        for sched in schedules:
+            if sched.due_date < self.today:
+                sched.status = 'COMPLETED' if rng.random() < 0.9 else 'OVERDUE'
+        schedules = self._bulk(PMChecklistSchedule, schedules)
+
+        completions = self._bulk(PMChecklistCompletion, [
+            PMChecklistCompletion(schedule=s, completed_by=completer, completion_date=s.due_date,
+                                  printed_name='Synthetic Technician')
+            for s in schedules if s.status == 'COMPLETED'
+        ])
+
+        items_by_template = {}
+        for template in PMChecklistTemplate.objects.prefetch_related('items'):
+            items_by_template[template.pk] = list(template.items.all())
+        sched_template = {s.pk: s.template_id for s in schedules}
+
+        item_completions = []
+        for completion in completions:
+            for item in items_by_template.get(sched_template[completion.schedule_id], []):
+                item_completions.append(PMChecklistItemCompletion(
+                    completion=completion, item=item, is_completed=True,
+                    monday=True, tuesday=True, wednesday=True, thursday=True, friday=True,
+                    week1=True, week2=True, week3=True, week4=True,
+                ))
+        self.item_completions = self._bulk(PMChecklistItemCompletion, item_completions)
+
+    def create_downtime_events(self):
+        rng = self.rng
+        start = date(self.start_year, 1, 1)
+        events = []
+        for _ in range(max(1, (self.today - start).days // 3)):
+            day = self._date_between(start, self.today)
+            begin = time(rng.randint(7, 16), rng.choice([0, 15, 30, 45]))
+            minutes = rng.randint(5, 240)
+            end_dt = datetime.combine(day, begin) + timedelta(minutes=minutes)
+            events.append(EquipmentDowntimeEvent(
+                item_completion=rng.choice(self.item_completions) if self.item_completions and rng.random() < 0.5 else None,
+                system_reference=f"{self.prefix}-PC-{rng.randint(1, 9999):07d}",
+                occurrence_date=day, start_time=begin,
+                end_time=end_dt.time() if end_dt.date() == day else None,
+                duration_minutes=minutes if end_dt.date() == day else None,
+                equipment_name=rng.choice(['Main Server', 'Core Switch', 'UPS Unit A', 'AC Unit 2', 'Firewall']),
+                severity=rng.choice(SEVERITIES),
+                cause_description='Synthetic downtime event',
+                reported_by=self.staff[0] if self.staff else None,
+            ))
+        self._bulk(EquipmentDowntimeEvent, events)
+
+    def create_notifications(self):
+        rng = self.rng
+        assignment_ct = ContentType.objects.get_for_model(PMScheduleAssignment)
+        pending = list(
+            PMScheduleAssignment.objects.filter(
+                is_completed=False, pm_section_schedule__section__in=self.sections
+            ).values_list('id', flat=True)[:2000]
+        )
+        notifications = []
+        for user in self.staff:
+            for assignment_id in pending:
+                overdue = rng.random() < 0.5
+                notifications.append(Notification(
+                    user=user,
+                    notification_type='pm_overdue' if overdue else 'pm_due',
+                    title='PM Maintenance Overdue' if overdue else 'PM Maintenance Due',
+                    message=f'Preventive maintenance for assignment #{assignment_id}',
+                    priority='urgent' if overdue else 'high',
+                    is_read=rng.random() < 0.6,
+                    content_type=assignment_ct, object_id=assignment_id,
+                ))
+        self._bulk(Notification, notifications)
@@ -0,0 +1,57 @@
+"""
+Management command to print desktop/laptop asset sheets into one PDF, e.g.
+every sheet of a section before an audit:
+
+    python manage.py print_asset_sheets --section "Planning and Design" -o planning.pdf
+    python manage.py print_asset_sheets --desktop 12 15 --laptop 3 -o sheets.pdf
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import Http404
+
+from inventory.asset_sheets import batch_title, select_packages, write_asset_sheets_pdf
+from inventory.models import OfficeSection
+
+
+class Command(BaseCommand):
+    help = 'Print the asset sheets of a section, an asset owner or given packages into one PDF'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-o', '--output', required=True, help='PDF file to write')
+        parser.add_argument('--section', help="End users' office section (ID or name)")
+        parser.add_argument('--owner', type=int, help='Asset owner (employee ID)')
+        parser.add_argument('--desktop', type=int, nargs='+', default=[], help='Desktop package IDs')
+        parser.add_argument('--laptop', type=int, nargs='+', default=[], help='Laptop package IDs')
+        parser.add_argument('--base-url', default='http://localhost/',
+                            help='Site URL the QR code and logo links are built from')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Render processes (default: ASSET_SHEET_BATCH_WORKERS)')
+
+    def handle(self, *args, **options):
+        section_id = None
+        if options['section']:
+            section = options['section']
+            match = OfficeSection.objects.filter(pk=int(section)) if section.isdigit() else \
+                OfficeSection.objects.filter(name__iexact=section)
+            section_id = match.values_list('pk', flat=True).first()
+            if section_id is None:
+                raise CommandError(f'No office section "{section}"')
+        if not (section_id or options['owner'] or options['desktop'] or options['laptop']):
+            raise CommandError('Choose --section, --owner, --desktop or --laptop')
+
+        try:
+            title = batch_title(section_id, options['owner'])
+        except Http404:
+            raise CommandError(f'No employee with ID {options["owner"]}')
+        selection = select_packages(section_id, options['owner'], options['desktop'], options['laptop'])
+
+        def progress(done, total, message=''):
+            self.stdout.write(f'  {message}')
+
+        started = time.perf_counter()
+        with open(options['output'], 'wb') as fh:
+            count = write_asset_sheets_pdf(fh, selection, options['base_url'], title, progress, options['workers'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} asset sheets written to {options["output"]} in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,53 @@
+"""
+Management command to drain the notification outbox.
+
+Usage:
+    python manage.py process_notification_outbox              # drain once (cron)
+    python manage.py process_notification_outbox --loop 30    # keep polling every 30s
+    python manage.py process_notification_outbox --retry-failed --purge-days 7
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from inventory.models import NotificationOutbox
+from inventory.notification_outbox import process_outbox, purge_outbox
+
+
+class Command(BaseCommand):
+    help = 'Write the notifications queued in the notification outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Events per batch (default: NOTIFICATION_OUTBOX_BATCH_SIZE)')
+        parser.add_argument('--max-batches', type=int, default=None)
+        parser.add_argument('--loop', type=int, default=0, metavar='SECONDS',
+                            help='Keep running, polling every SECONDS')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Put failed events back in the queue first')
+        parser.add_argument('--purge-days', type=int, default=None,
+                            help='Delete processed events older than this many days')
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            requeued = NotificationOutbox.objects.filter(status='failed').update(
+                status='pending', attempts=0, available_at=timezone.now(),
+            )
+            self.stdout.write(f'Requeued {requeued} failed event(s)')
+
+        while True:
+            totals = process_outbox(options['batch_size'], options['max_batches'])
+            if any(totals.values()) or not options['loop']:
+                self.stdout.write(
+                    f"Outbox: {totals['done']} done, {totals['retry']} to retry, {totals['failed']} failed"
+                )
+            if options['purge_days'] is not None:
+                purged = purge_outbox(options['purge_days'])
+                if purged:
+                    self.stdout.write(f'Purged {purged} processed event(s)')
+            if not options['loop']:
+                break
+            close_old_connections()
+            time.sleep(options['loop'])
@@ -0,0 +1,24 @@
+"""
+Management command to rebuild the PM compliance matrix (PMComplianceCell)
+from scratch. Signals keep it in sync afterwards; run it after deploying,
+bulk imports or raw SQL.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from inventory.pm_compliance import rebuild_pm_compliance
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the device x quarter PM compliance matrix'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = rebuild_pm_compliance()
+        elapsed = time.perf_counter() - started
+
+        for asset_type, total in counts.items():
+            self.stdout.write(f'  {asset_type:<8} {total}')
+        self.stdout.write(
+            self.style.SUCCESS(f'PM compliance matrix rebuilt: {sum(counts.values())} cells in {elapsed:.1f}s')
+        )
@@ -0,0 +1,50 @@
+"""
+Management command to create the missing PM schedule assignments, e.g. after
+importing section schedules or end users in bulk:
+
+    python manage.py reconcile_pm_assignments                 # whole inventory
+    python manage.py reconcile_pm_assignments --section "Planning and Design"
+    python manage.py reconcile_pm_assignments --desktop 12 15 --laptop 3
+    python manage.py reconcile_pm_assignments --dry-run
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.models import OfficeSection
+from inventory.pm_assignments import missing_pairs, reconcile_pm_assignments
+
+
+class Command(BaseCommand):
+    help = "Assign every active desktop/laptop to its end user's section PM schedules"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--section', action='append', default=[],
+                            help="End users' office section (ID or name, repeatable)")
+        parser.add_argument('--desktop', type=int, nargs='+', help='Desktop package IDs')
+        parser.add_argument('--laptop', type=int, nargs='+', help='Laptop package IDs')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the missing assignments')
+
+    def handle(self, *args, **options):
+        section_ids = None
+        if options['section']:
+            section_ids = []
+            for section in options['section']:
+                match = OfficeSection.objects.filter(pk=int(section)) if section.isdigit() else \
+                    OfficeSection.objects.filter(name__iexact=section)
+                section_id = match.values_list('pk', flat=True).first()
+                if section_id is None:
+                    raise CommandError(f'No office section "{section}"')
+                section_ids.append(section_id)
+
+        if options['dry_run']:
+            by_package = options['desktop'] is not None or options['laptop'] is not None
+            for kind, package_ids in (('desktop', options['desktop']), ('laptop', options['laptop'])):
+                count = 0 if by_package and not package_ids else len(missing_pairs(kind, package_ids, section_ids))
+                self.stdout.write(f'{kind}: {count} assignment(s) missing')
+            return
+
+        created = reconcile_pm_assignments(
+            desktop_ids=options['desktop'], laptop_ids=options['laptop'], section_ids=section_ids,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created['desktop']} desktop and {created['laptop']} laptop PM assignment(s)"
+        ))
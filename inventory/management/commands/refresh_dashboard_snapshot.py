@@ -0,0 +1,31 @@
+"""
+Management command to rebuild the materialized dashboard snapshot.
+Schedule it (cron / Task Scheduler) to keep dashboard numbers warm.
+"""
+
+from django.core.management.base import BaseCommand
+from inventory.dashboard_snapshot import refresh_dashboard_snapshot, get_dashboard_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the dashboard KPI snapshot used by the main dashboard'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--if-stale',
+            action='store_true',
+            help='Only rebuild when the snapshot is missing, flagged stale or older than DASHBOARD_SNAPSHOT_MAX_AGE',
+        )
+
+    def handle(self, *args, **options):
+        if options['if_stale']:
+            snapshot = get_dashboard_snapshot()
+        else:
+            snapshot = refresh_dashboard_snapshot()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Dashboard snapshot as of {snapshot.refreshed_at:%Y-%m-%d %H:%M:%S} '
+                f'(built in {snapshot.build_ms} ms)'
+            )
+        )
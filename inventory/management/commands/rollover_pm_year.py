@@ -0,0 +1,32 @@
+"""
+Management command to copy a year's PM section schedules into another year
+and assign the devices (same as "Copy to Year" on the PM schedules page):
+
+    python manage.py rollover_pm_year 2025 2026 --dry-run   # show the diff only
+    python manage.py rollover_pm_year 2025 2026
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.pm_rollover import rollover_pm_year
+
+
+class Command(BaseCommand):
+    help = "Mirror one year's quarters and PM section schedules into another year"
+
+    def add_arguments(self, parser):
+        parser.add_argument('source_year', type=int)
+        parser.add_argument('target_year', type=int)
+        parser.add_argument('--dry-run', action='store_true', help='Report the changes and roll them back')
+
+    def handle(self, *args, **options):
+        source_year, target_year = options['source_year'], options['target_year']
+        if source_year == target_year:
+            raise CommandError('Source and target year must differ')
+
+        report = rollover_pm_year(source_year, target_year, dry_run=options['dry_run'])
+        if not report.source_count:
+            raise CommandError(f'No schedules found for {source_year} to copy from')
+
+        for line in report.lines():
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS(report.summary()))
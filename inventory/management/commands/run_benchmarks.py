@@ -0,0 +1,127 @@
+"""
+Management command to benchmark the hot views and exports.
+
+Usage:
+    # optional: seed a scratch database first (point DATABASE_URL at a copy!)
+    python manage.py run_benchmarks --generate 5000 --seed 42
+    python manage.py run_benchmarks --iterations 10 --save-baseline
+    python manage.py run_benchmarks --fail-on-regression
+    python manage.py run_benchmarks --startup       # also cold-start time/RSS
+    python manage.py run_benchmarks --pm-pdf 50     # also CPU time per PM checklist PDF
+"""
+import os
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.runner import (
+    BASELINE_PATH, compare_to_baseline, load_report, run_suite, write_report,
+)
+from benchmarks.pm_pdf import compare_pm_pdf, run_pm_pdf
+from benchmarks.scenarios import get_scenarios
+from benchmarks.startup import compare_startup, run_startup
+from inventory.models import Equipment_Package, LaptopPackage
+
+
+class Command(BaseCommand):
+    help = 'Benchmark hot views/exports (p50/p95 latency, query count, peak memory) and compare with a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--generate', type=int, default=0,
+                            help='Seed N desktop packages with generate_synthetic_data before running')
+        parser.add_argument('--seed', type=int, default=42, help='RNG seed for --generate')
+        parser.add_argument('--scenario', action='append', dest='scenarios',
+                            help='Only run this scenario (repeatable)')
+        parser.add_argument('--iterations', type=int, default=5)
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument('--output', help='Write the JSON report here (default: benchmarks/results/)')
+        parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline JSON to compare against')
+        parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p95 slowdown (0.2 = 20%%)')
+        parser.add_argument('--fail-on-regression', action='store_true')
+        parser.add_argument('--startup', action='store_true',
+                            help='Also measure cold start (django.setup / WSGI worker) time and RSS in fresh processes')
+        parser.add_argument('--startup-samples', type=int, default=5)
+        parser.add_argument('--pm-pdf', type=int, default=0, metavar='N',
+                            help='Also export N PM checklist PDFs per exporter in a loop and report CPU ms per PDF')
+
+    def handle(self, *args, **options):
+        if options['generate']:
+            call_command(
+                'generate_synthetic_data',
+                packages=options['generate'],
+                laptops=max(1, options['generate'] // 4),
+                printers=max(1, options['generate'] // 10),
+                employees=max(10, options['generate'] // 4),
+                seed=options['seed'],
+                prefix=f"BENCH{options['seed']}",
+                stdout=self.stdout,
+            )
+
+        user = User.objects.filter(is_superuser=True, is_active=True).order_by('pk').first()
+        if user is None:
+            raise CommandError('A superuser is required to render the benchmarked pages.')
+
+        scenarios = get_scenarios(options['scenarios'])
+        if not scenarios:
+            raise CommandError('No matching scenarios.')
+
+        dataset = {
+            'desktop_packages': Equipment_Package.objects.count(),
+            'laptop_packages': LaptopPackage.objects.count(),
+            'generated_with_seed': options['seed'] if options['generate'] else None,
+        }
+        report = run_suite(user, scenarios, options['iterations'], options['warmup'], dataset)
+        if options['startup']:
+            report['startup'] = run_startup(options['startup_samples'])
+        if options['pm_pdf']:
+            report['pm_pdf'] = run_pm_pdf(user, options['pm_pdf'])
+
+        self.stdout.write(f"{'scenario':<34}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}{'peak KB':>11}")
+        for r in report['results']:
+            if r['status'] != 'ok':
+                self.stdout.write(self.style.WARNING(f"{r['name']:<34}{r['status']}: {r.get('reason', r.get('http_status'))}"))
+                continue
+            self.stdout.write(
+                f"{r['name']:<34}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['queries']:>9}{r['peak_mem_kb']:>11}"
+            )
+
+        if report.get('startup'):
+            self.stdout.write(f"\n{'cold start':<34}{'ms':>10}{'RSS KB':>10}  heavy modules loaded")
+            for r in report['startup']:
+                if r['status'] != 'ok':
+                    self.stdout.write(self.style.WARNING(f"{r['name']:<34}{r['status']}: {r['reason']}"))
+                    continue
+                self.stdout.write(
+                    f"{r['name']:<34}{r['startup_ms']:>10}{r['max_rss_kb']:>10}  {', '.join(r['heavy_loaded']) or '-'}"
+                )
+
+        if report.get('pm_pdf'):
+            self.stdout.write(f"\n{'PM checklist PDF':<34}{'PDFs':>10}{'CPU ms':>10}{'wall ms':>9}")
+            for r in report['pm_pdf']:
+                if r['status'] != 'ok':
+                    self.stdout.write(self.style.WARNING(f"{r['name']:<34}{r['status']}: {r['reason']}"))
+                    continue
+                self.stdout.write(f"{r['name']:<34}{r['pdfs']:>10}{r['cpu_ms_per_pdf']:>10}{r['wall_ms_per_pdf']:>9}")
+
+        path = write_report(report, options['output'])
+        self.stdout.write(self.style.SUCCESS(f'\nReport written to {path}'))
+
+        if options['save_baseline']:
+            write_report(report, options['baseline'])
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+            return
+
+        if os.path.exists(options['baseline']):
+            baseline = load_report(options['baseline'])
+            regressions = compare_to_baseline(report, baseline, options['tolerance'])
+            regressions += compare_startup(report.get('startup', []), baseline, options['tolerance'])
+            regressions += compare_pm_pdf(report.get('pm_pdf', []), baseline, options['tolerance'])
+            if regressions:
+                for line in regressions:
+                    self.stdout.write(self.style.ERROR(f'REGRESSION {line}'))
+                if options['fail_on_regression']:
+                    raise CommandError(f'{len(regressions)} benchmark regression(s)')
+            else:
+                self.stdout.write(self.style.SUCCESS('No regressions against baseline'))
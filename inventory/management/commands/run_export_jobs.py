@@ -0,0 +1,62 @@
+"""
+Management command to run queued export jobs (exports requested with ?background=1).
+
+Usage:
+    python manage.py run_export_jobs                 # run what is queued, then exit (cron)
+    python manage.py run_export_jobs --loop 5        # worker: keep polling every 5s
+    python manage.py run_export_jobs --retry-failed --purge
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import Max
+
+from inventory import asset_pdf_cache
+from inventory.export_jobs import process_jobs, purge_expired_jobs
+from inventory.models import ExportJob
+
+
+class Command(BaseCommand):
+    help = 'Render queued export jobs and store their files under MEDIA_ROOT'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-jobs', type=int, default=None,
+                            help='Stop after this many jobs (per poll with --loop)')
+        parser.add_argument('--loop', type=int, default=0, metavar='SECONDS',
+                            help='Keep running, polling every SECONDS')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Put failed jobs back in the queue first')
+        parser.add_argument('--purge', action='store_true',
+                            help='Delete the files of expired jobs and stale cached asset sheet PDFs (every poll with --loop)')
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            # Only one active job per dedupe_key: skip exports that were requested
+            # again since, and requeue just the latest failure of each
+            latest = (
+                ExportJob.objects.filter(status='failed')
+                .exclude(dedupe_key__in=ExportJob.objects.filter(status__in=ExportJob.ACTIVE_STATUSES)
+                         .values('dedupe_key'))
+                .values('dedupe_key').annotate(latest=Max('pk')).order_by().values('latest')
+            )
+            requeued = ExportJob.objects.filter(pk__in=latest).update(status='queued', attempts=0)
+            self.stdout.write(f'Requeued {requeued} failed job(s)')
+
+        while True:
+            counts = process_jobs(options['max_jobs'])
+            if any(counts.values()) or not options['loop']:
+                self.stdout.write(
+                    f"Export jobs: {counts['done']} done, {counts['queued']} to retry, {counts['failed']} failed"
+                )
+            if options['purge']:
+                purged = purge_expired_jobs()
+                if purged:
+                    self.stdout.write(f'Expired {purged} export file(s)')
+                purged = asset_pdf_cache.purge()
+                if purged:
+                    self.stdout.write(f'Removed {purged} cached asset sheet PDF(s)')
+            if not options['loop']:
+                break
+            close_old_connections()
+            time.sleep(options['loop'])
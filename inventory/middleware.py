@@ -0,0 +1,172 @@
+"""
+Per-request query budget / timing instrumentation (opt-in).
+
+Enable with QUERY_INSTRUMENTATION=True (see settings.py). For every request
+it records the number of SQL queries, total SQL time, duplicate query
+fingerprints and total response time, keyed by URL name. Results go to:
+
+- response headers (X-Query-Count, X-Query-Time-ms, X-Query-Duplicates,
+  X-Response-Time-ms, X-Query-Budget)
+- a rolling JSON-lines log (QUERY_INSTRUMENTATION_LOG)
+
+Budgets per URL name live in QUERY_BUDGETS; QUERY_BUDGET_MODE='raise'
+turns an exceeded budget into a QueryBudgetExceeded error (for tests).
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('inventory.query_budget')
+
+_NUMBER_RE = re.compile(r"\b\d+(\.\d+)?\b")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_IN_LIST_RE = re.compile(r"\bIN \((?:\s*%s\s*,?)+\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in 'raise' mode when a view goes over its query/time budget"""
+
+
+def fingerprint_sql(sql):
+    """Normalize literals so the same query with different params matches"""
+    sql = _STRING_RE.sub('%s', sql)
+    sql = _NUMBER_RE.sub('%s', sql)
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    sql = _SPACE_RE.sub(' ', sql).strip()
+    return hashlib.sha1(sql.encode('utf-8')).hexdigest()[:12], sql
+
+
+class _QueryRecorder:
+    """connection.execute_wrapper callable collecting per-query timings"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.fingerprints = Counter()
+        self.samples = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.total_ms += (time.perf_counter() - started) * 1000
+            key, normalized = fingerprint_sql(sql)
+            self.fingerprints[key] += 1
+            self.samples.setdefault(key, normalized[:300])
+
+    def duplicates(self):
+        return {
+            key: {'count': n, 'sql': self.samples[key]}
+            for key, n in self.fingerprints.most_common()
+            if n > 1
+        }
+
+
+def _get_budget(url_name):
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    return budgets.get(url_name) or budgets.get('*')
+
+
+def _budget_violations(budget, stats):
+    if not budget:
+        return []
+    violations = []
+    max_queries = budget.get('queries')
+    if max_queries is not None and stats['queries'] > max_queries:
+        violations.append(f"{stats['queries']} queries > budget {max_queries}")
+    max_sql_ms = budget.get('sql_ms')
+    if max_sql_ms is not None and stats['sql_ms'] > max_sql_ms:
+        violations.append(f"{stats['sql_ms']} ms SQL > budget {max_sql_ms} ms")
+    max_total_ms = budget.get('total_ms')
+    if max_total_ms is not None and stats['total_ms'] > max_total_ms:
+        violations.append(f"{stats['total_ms']} ms total > budget {max_total_ms} ms")
+    max_dupes = budget.get('duplicates')
+    if max_dupes is not None and stats['duplicate_queries'] > max_dupes:
+        violations.append(f"{stats['duplicate_queries']} duplicated queries > budget {max_dupes}")
+    return violations
+
+
+def _configure_log_handler():
+    log_path = getattr(settings, 'QUERY_INSTRUMENTATION_LOG', None)
+    if not log_path or any(getattr(h, '_query_budget', False) for h in logger.handlers):
+        return
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    handler = RotatingFileHandler(
+        log_path,
+        maxBytes=getattr(settings, 'QUERY_INSTRUMENTATION_LOG_MAX_BYTES', 5 * 1024 * 1024),
+        backupCount=getattr(settings, 'QUERY_INSTRUMENTATION_LOG_BACKUPS', 5),
+        encoding='utf-8',
+    )
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    handler._query_budget = True
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+class QueryInstrumentationMiddleware:
+    """Records SQL count/time, duplicate queries and response time per URL name"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.mode = getattr(settings, 'QUERY_BUDGET_MODE', 'warn')
+        _configure_log_handler()
+
+    def __call__(self, request):
+        recorder = _QueryRecorder()
+        started = time.perf_counter()
+
+        wrappers = [conn.execute_wrapper(recorder) for conn in connections.all()]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        try:
+            response = self.get_response(request)
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+
+        match = getattr(request, 'resolver_match', None)
+        url_name = (match.view_name if match else None) or request.path
+        duplicates = recorder.duplicates()
+        stats = {
+            'url_name': url_name,
+            'path': request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'sql_ms': round(recorder.total_ms, 1),
+            'total_ms': round((time.perf_counter() - started) * 1000, 1),
+            'duplicate_queries': sum(d['count'] - 1 for d in duplicates.values()),
+            'duplicates': duplicates,
+        }
+        violations = _budget_violations(_get_budget(url_name), stats)
+        stats['budget_violations'] = violations
+
+        response['X-Query-Count'] = str(stats['queries'])
+        response['X-Query-Time-ms'] = str(stats['sql_ms'])
+        response['X-Query-Duplicates'] = str(stats['duplicate_queries'])
+        response['X-Response-Time-ms'] = str(stats['total_ms'])
+        response['X-Query-Budget'] = 'exceeded' if violations else 'ok'
+
+        logger.info(json.dumps(stats, default=str))
+
+        if violations:
+            message = f"Query budget exceeded for '{url_name}': " + '; '.join(violations)
+            if self.mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(json.dumps({'url_name': url_name, 'warning': message}))
+
+        return response
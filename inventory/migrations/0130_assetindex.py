@@ -0,0 +1,48 @@
+# Generated by Django 5.0.4 on 2026-10-18 06:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0129_dashboardsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(choices=[('desktop', 'Desktop'), ('laptop', 'Laptop'), ('printer', 'Printer'), ('office_supplies', 'Office Supplies')], max_length=20)),
+                ('package_id', models.PositiveIntegerField()),
+                ('detail_id', models.PositiveIntegerField(blank=True, help_text='First *Details row of the package', null=True)),
+                ('computer_name', models.CharField(blank=True, default='', max_length=255)),
+                ('serial_no', models.CharField(blank=True, default='', max_length=255)),
+                ('serial_no_norm', models.CharField(blank=True, db_index=True, default='', max_length=255)),
+                ('brand', models.CharField(blank=True, default='', max_length=255)),
+                ('model', models.CharField(blank=True, default='', max_length=255)),
+                ('end_user_name', models.CharField(blank=True, default='', max_length=255)),
+                ('asset_owner_name', models.CharField(blank=True, default='', max_length=255)),
+                ('section_name', models.CharField(blank=True, default='', max_length=255)),
+                ('is_disposed', models.BooleanField(default=False)),
+                ('disposal_date', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+                ('asset_owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='inventory.employee')),
+                ('end_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='inventory.employee')),
+                ('section', models.ForeignKey(blank=True, help_text='Office section of the end user', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='inventory.officesection')),
+            ],
+            options={
+                'verbose_name': 'Asset Index Entry',
+                'verbose_name_plural': 'Asset Index',
+                'indexes': [models.Index(fields=['is_disposed', 'asset_type', '-created_at'], name='inventory_a_is_disp_68f853_idx'), models.Index(fields=['section', 'is_disposed'], name='inventory_a_section_596fb9_idx'), models.Index(fields=['end_user'], name='inventory_a_end_use_7af83a_idx'), models.Index(fields=['asset_owner'], name='inventory_a_asset_o_2bfe15_idx'), models.Index(fields=['computer_name'], name='inventory_a_compute_fe9241_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='assetindex',
+            constraint=models.UniqueConstraint(fields=('asset_type', 'package_id'), name='unique_asset_index_package'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.4 on 2026-10-18 06:38
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def mark_duplicate_unread_as_read(apps, schema_editor):
+    """Keep only the newest unread copy of each notification so the constraint can be added"""
+    Notification = apps.get_model('inventory', 'Notification')
+    key = ('user_id', 'notification_type', 'content_type_id', 'object_id')
+    duplicates = (
+        Notification.objects.filter(is_read=False, content_type__isnull=False, object_id__isnull=False)
+        .values(*key)
+        .annotate(n=Count('id'), newest=Max('id'))
+        .filter(n__gt=1)
+    )
+    for group in duplicates:
+        (
+            Notification.objects
+            .filter(is_read=False, **{field: group[field] for field in key})
+            .exclude(pk=group['newest'])
+            .update(is_read=True)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('inventory', '0130_assetindex'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_duplicate_unread_as_read, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_read', False)), fields=('user', 'notification_type', 'content_type', 'object_id'), name='unique_unread_notification'),
+        ),
+    ]
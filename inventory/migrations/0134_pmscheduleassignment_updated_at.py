@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:30
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0133_exportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pmscheduleassignment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
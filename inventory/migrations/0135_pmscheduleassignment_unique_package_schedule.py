@@ -0,0 +1,54 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:29
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicate_assignments(apps, schema_editor):
+    """
+    Keep one assignment per package and section schedule so the constraints
+    can be added: a completed one if any, else the oldest. PM records of the
+    dropped copies are moved to the kept one.
+    """
+    PMScheduleAssignment = apps.get_model('inventory', 'PMScheduleAssignment')
+    PreventiveMaintenance = apps.get_model('inventory', 'PreventiveMaintenance')
+    for fk in ('equipment_package', 'laptop_package'):
+        duplicates = (
+            PMScheduleAssignment.objects.filter(**{f'{fk}__isnull': False})
+            .values(fk, 'pm_section_schedule')
+            .annotate(n=Count('id'))
+            .filter(n__gt=1)
+        )
+        for group in duplicates:
+            ids = list(
+                PMScheduleAssignment.objects
+                .filter(**{fk: group[fk]}, pm_section_schedule=group['pm_section_schedule'])
+                .order_by('-is_completed', 'pk')
+                .values_list('pk', flat=True)
+            )
+            keep, drop = ids[0], ids[1:]
+            PreventiveMaintenance.objects.filter(pm_schedule_assignment__in=drop).update(pm_schedule_assignment=keep)
+            PMScheduleAssignment.objects.filter(pk__in=drop).delete()
+
+
+class Migration(migrations.Migration):
+    # The merge commits on its own before the constraints are added: on
+    # PostgreSQL the deferred FK checks of its UPDATE/DELETE would otherwise
+    # still be pending and ALTER TABLE refuses to run
+    atomic = False
+
+    dependencies = [
+        ('inventory', '0134_pmscheduleassignment_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_assignments, migrations.RunPython.noop, atomic=True),
+        migrations.AddConstraint(
+            model_name='pmscheduleassignment',
+            constraint=models.UniqueConstraint(fields=('equipment_package', 'pm_section_schedule'), name='unique_desktop_pm_assignment'),
+        ),
+        migrations.AddConstraint(
+            model_name='pmscheduleassignment',
+            constraint=models.UniqueConstraint(fields=('laptop_package', 'pm_section_schedule'), name='unique_laptop_pm_assignment'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:37
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0135_pmscheduleassignment_unique_package_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PMAlertState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('state', models.CharField(choices=[('due', 'Due soon'), ('overdue', 'Overdue')], max_length=10)),
+                ('alerted_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('assignment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='alert_state', to='inventory.pmscheduleassignment')),
+            ],
+            options={
+                'verbose_name': 'PM Alert State',
+                'verbose_name_plural': 'PM Alert States',
+            },
+        ),
+    ]
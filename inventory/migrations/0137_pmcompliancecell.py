@@ -0,0 +1,35 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0136_pmalertstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PMComplianceCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(choices=[('desktop', 'Desktop'), ('laptop', 'Laptop')], max_length=10)),
+                ('package_id', models.PositiveIntegerField()),
+                ('is_completed', models.BooleanField(default=False)),
+                ('due_date', models.DateField()),
+                ('quarter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='inventory.quarterschedule')),
+                ('section', models.ForeignKey(blank=True, help_text='Section of the PM schedule the cell counts towards', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='inventory.officesection')),
+            ],
+            options={
+                'verbose_name': 'PM Compliance Cell',
+                'verbose_name_plural': 'PM Compliance Matrix',
+                'indexes': [models.Index(fields=['section', 'quarter', 'is_completed', 'due_date'], name='inventory_p_section_4fc908_idx'), models.Index(fields=['quarter', 'is_completed', 'due_date'], name='inventory_p_quarter_5cae9f_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='pmcompliancecell',
+            constraint=models.UniqueConstraint(fields=('asset_type', 'package_id', 'quarter'), name='unique_pm_compliance_cell'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:10
+
+from django.db import migrations
+from django.db.models import Exists, OuterRef
+
+BATCH_SIZE = 2000
+
+
+def fill_compliance_cells(apps, schema_editor):
+    """
+    Build PMComplianceCell from the existing assignments, as
+    inventory.pm_compliance.build_cells does: completed beats pending, and
+    among pending the earliest end date counts.
+    """
+    PMComplianceCell = apps.get_model('inventory', 'PMComplianceCell')
+    PMScheduleAssignment = apps.get_model('inventory', 'PMScheduleAssignment')
+    PreventiveMaintenance = apps.get_model('inventory', 'PreventiveMaintenance')
+
+    PMComplianceCell.objects.all().delete()
+    for kind, fk in (('desktop', 'equipment_package'), ('laptop', 'laptop_package')):
+        rows = (
+            PMScheduleAssignment.objects.filter(**{f'{fk}__is_disposed': False})
+            .annotate(pm_done=Exists(PreventiveMaintenance.objects.filter(
+                pm_schedule_assignment=OuterRef('pk'), is_completed=True,
+            )))
+            .values_list(f'{fk}_id', 'pm_section_schedule__quarter_schedule_id', 'is_completed', 'pm_done',
+                         'pm_section_schedule__end_date', 'pm_section_schedule__section_id')
+            .order_by()
+            .iterator(chunk_size=BATCH_SIZE)
+        )
+        cells = {}
+        for package_id, quarter_id, is_completed, pm_done, end_date, section_id in rows:
+            done = is_completed or pm_done
+            cell = cells.get((package_id, quarter_id))
+            if cell is None:
+                cells[(package_id, quarter_id)] = PMComplianceCell(
+                    asset_type=kind, package_id=package_id, quarter_id=quarter_id,
+                    section_id=section_id, is_completed=done, due_date=end_date,
+                )
+            elif (done, -end_date.toordinal()) > (cell.is_completed, -cell.due_date.toordinal()):
+                cell.is_completed, cell.due_date, cell.section_id = done, end_date, section_id
+        PMComplianceCell.objects.bulk_create(cells.values(), batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0137_pmcompliancecell'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_compliance_cells, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,8 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils.text import slugify
 from django.utils import timezone 
 from django.contrib.auth.models import User     # Import the User model if you have a custom user model, otherwise use the default Django User model  
 from django.utils.timezone import now
-import qrcode
 from django.core.files import File # Import File to save the QR code image
 from django.urls import reverse # Import reverse to generate URLs for the QR code image
 from io import BytesIO  # Import BytesIO to handle the image in memory
@@ -31,6 +30,8 @@ def normalize_sn(value: str | None) -> str | None:
 
 def generate_qr_for_laptop(instance):
     """Generate a QR code for LaptopPackage and attach it to the model."""
+    import qrcode  # only needed when a package is first saved
+
     try:
         qr_url = f"{settings.SITE_URL}{reverse('laptop_details_view', args=[instance.id])}"
         qr = qrcode.make(qr_url)
@@ -743,6 +744,21 @@ class PMScheduleAssignment(models.Model):
     assigned_date = models.DateField(auto_now_add=True)
     is_completed = models.BooleanField(default=False)
     remarks = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            # One assignment per package and section schedule;
+            # reconcile_pm_assignments() relies on this to insert in bulk
+            models.UniqueConstraint(
+                fields=['equipment_package', 'pm_section_schedule'],
+                name='unique_desktop_pm_assignment',
+            ),
+            models.UniqueConstraint(
+                fields=['laptop_package', 'pm_section_schedule'],
+                name='unique_laptop_pm_assignment',
+            ),
+        ]
 
     def __str__(self):
         target = self.equipment_package or self.laptop_package
@@ -1238,6 +1254,15 @@ class Notification(models.Model):
             models.Index(fields=['user', 'is_read', '-created_at']),
             models.Index(fields=['notification_type', '-created_at']),
         ]
+        constraints = [
+            # One unread notification per user, type and related object;
+            # notify_many() relies on this to drop duplicates in bulk
+            models.UniqueConstraint(
+                fields=['user', 'notification_type', 'content_type', 'object_id'],
+                condition=models.Q(is_read=False),
+                name='unique_unread_notification',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.title}"
@@ -1316,23 +1341,85 @@ def create_notification(user, notification_type, title, message, priority='norma
             link_text='View Details'
         )
     """
-    notification = Notification.objects.create(
-        user=user,
+    content_type, object_id = _related_key(related_object)
+    fields = dict(
         notification_type=notification_type,
         title=title,
         message=message,
         priority=priority,
         link_url=link_url,
         link_text=link_text,
+        content_type=content_type,
+        object_id=object_id,
     )
-    
-    if related_object:
-        from django.contrib.contenttypes.models import ContentType
-        notification.content_type = ContentType.objects.get_for_model(related_object)
-        notification.object_id = related_object.id
-        notification.save()
-    
-    return notification
+    try:
+        with transaction.atomic():
+            return Notification.objects.create(user=user, **fields)
+    except IntegrityError:
+        # Same unread notification already exists (unique_unread_notification)
+        return Notification.objects.get(
+            user=user, notification_type=notification_type,
+            content_type=content_type, object_id=object_id, is_read=False,
+        )
+
+
+def _related_key(related_object):
+    if related_object is None:
+        return None, None
+    return ContentType.objects.get_for_model(related_object), related_object.pk
+
+
+def notify_many(users, notification_type, title, message, priority='normal',
+                link_url=None, link_text=None, related_object=None):
+    """
+    Send the same notification to many users with one INSERT.
+
+    `users` is a queryset or an iterable of users / user ids. Users who still
+    have the same unread notification for `related_object` are skipped; the
+    unique_unread_notification constraint catches concurrent duplicates.
+    Returns the rows that were written (pk is not set on every database).
+
+    Usage:
+        notify_many(
+            User.objects.filter(is_staff=True),
+            notification_type='asset_added',
+            title='New Desktop Added',
+            message='Desktop PC-001 has been added to inventory',
+            related_object=desktop,
+        )
+    """
+    if isinstance(users, models.QuerySet):
+        user_ids = list(users.values_list('pk', flat=True))
+    else:
+        user_ids = [getattr(user, 'pk', user) for user in users]
+
+    content_type, object_id = _related_key(related_object)
+    if user_ids and content_type is not None:
+        already = set(
+            Notification.objects.filter(
+                user_id__in=user_ids, notification_type=notification_type,
+                content_type=content_type, object_id=object_id, is_read=False,
+            ).values_list('user_id', flat=True)
+        )
+        user_ids = [pk for pk in user_ids if pk not in already]
+
+    rows = [
+        Notification(
+            user_id=user_id,
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            priority=priority,
+            link_url=link_url,
+            link_text=link_text,
+            content_type=content_type,
+            object_id=object_id,
+        )
+        for user_id in dict.fromkeys(user_ids)
+    ]
+    if rows:
+        Notification.objects.bulk_create(rows, ignore_conflicts=True)
+    return rows
 
 
 def create_pm_notification(assignment):
@@ -1342,29 +1429,28 @@ def create_pm_notification(assignment):
     """
     users = User.objects.filter(is_staff=True)  # Or specific users
     
-    for user in users:
-        if assignment.is_overdue:
-            create_notification(
-                user=user,
-                notification_type='pm_overdue',
-                title='PM Maintenance Overdue',
-                message=f'Preventive maintenance for {assignment.computer_name_display} is overdue',
-                priority='urgent',
-                link_url=f'/maintenance/history/{assignment.equipment_package.id}/',
-                link_text='View Details',
-                related_object=assignment
-            )
-        else:
-            create_notification(
-                user=user,
-                notification_type='pm_due',
-                title='PM Maintenance Due',
-                message=f'Preventive maintenance for {assignment.computer_name_display} is due',
-                priority='high',
-                link_url=f'/maintenance/history/{assignment.equipment_package.id}/',
-                link_text='View Details',
-                related_object=assignment
-            )
+    if assignment.is_overdue:
+        notify_many(
+            users,
+            notification_type='pm_overdue',
+            title='PM Maintenance Overdue',
+            message=f'Preventive maintenance for {assignment.computer_name_display} is overdue',
+            priority='urgent',
+            link_url=f'/maintenance/history/{assignment.equipment_package.id}/',
+            link_text='View Details',
+            related_object=assignment
+        )
+    else:
+        notify_many(
+            users,
+            notification_type='pm_due',
+            title='PM Maintenance Due',
+            message=f'Preventive maintenance for {assignment.computer_name_display} is due',
+            priority='high',
+            link_url=f'/maintenance/history/{assignment.equipment_package.id}/',
+            link_text='View Details',
+            related_object=assignment
+        )
 
 
 def notify_asset_disposal(asset, user):
@@ -2152,4 +2238,280 @@ class HDREntry(models.Model):
         verbose_name_plural = 'HDR Entries'
 
     def __str__(self):
-        return f"{self.report} - {self.ref_number}: {self.description[:50]}"
\ No newline at end of file
+        return f"{self.report} - {self.ref_number}: {self.description[:50]}"
+
+# ==================== DASHBOARD SNAPSHOT (read model) ====================
+
+class DashboardSnapshot(models.Model):
+    """
+    Materialized dashboard numbers (KPIs, charts, recent items, audit trail).
+    Rebuilt by inventory.dashboard_snapshot; signals only flag it as stale.
+    """
+
+    key = models.CharField(max_length=50, unique=True, default='default')
+    data = models.JSONField(default=dict, blank=True)
+    is_stale = models.BooleanField(default=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+    build_ms = models.PositiveIntegerField(default=0, help_text="Time taken by the last rebuild")
+
+    class Meta:
+        verbose_name = 'Dashboard Snapshot'
+        verbose_name_plural = 'Dashboard Snapshots'
+
+    def __str__(self):
+        return f"Dashboard snapshot ({self.key}) - {self.refreshed_at or 'never built'}"
+
+    @property
+    def age(self):
+        """Time since the last rebuild (None if never built)"""
+        if not self.refreshed_at:
+            return None
+        return timezone.now() - self.refreshed_at
+
+
+# ==================== ASSET INDEX (read model) ====================
+
+class AssetIndex(models.Model):
+    """
+    One denormalized row per asset package (desktop, laptop, printer, office
+    supplies) for cross-type listing, counting and searching.
+    Kept in sync by signals (inventory.asset_index); rebuild with
+    `python manage.py rebuild_asset_index`.
+    """
+
+    ASSET_TYPES = [
+        ('desktop', 'Desktop'),
+        ('laptop', 'Laptop'),
+        ('printer', 'Printer'),
+        ('office_supplies', 'Office Supplies'),
+    ]
+
+    asset_type = models.CharField(max_length=20, choices=ASSET_TYPES)
+    package_id = models.PositiveIntegerField()
+    detail_id = models.PositiveIntegerField(
+        null=True, blank=True, help_text="First *Details row of the package"
+    )
+
+    computer_name = models.CharField(max_length=255, blank=True, default='')
+    serial_no = models.CharField(max_length=255, blank=True, default='')
+    serial_no_norm = models.CharField(max_length=255, blank=True, default='', db_index=True)
+    brand = models.CharField(max_length=255, blank=True, default='')
+    model = models.CharField(max_length=255, blank=True, default='')
+
+    end_user = models.ForeignKey(
+        Employee, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    end_user_name = models.CharField(max_length=255, blank=True, default='')
+    asset_owner = models.ForeignKey(
+        Employee, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    asset_owner_name = models.CharField(max_length=255, blank=True, default='')
+    section = models.ForeignKey(
+        OfficeSection, on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+        help_text="Office section of the end user"
+    )
+    section_name = models.CharField(max_length=255, blank=True, default='')
+
+    is_disposed = models.BooleanField(default=False)
+    disposal_date = models.DateField(null=True, blank=True)
+    created_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(null=True, blank=True)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Asset Index Entry'
+        verbose_name_plural = 'Asset Index'
+        constraints = [
+            models.UniqueConstraint(fields=['asset_type', 'package_id'], name='unique_asset_index_package'),
+        ]
+        indexes = [
+            models.Index(fields=['is_disposed', 'asset_type', '-created_at']),
+            models.Index(fields=['section', 'is_disposed']),
+            models.Index(fields=['end_user']),
+            models.Index(fields=['asset_owner']),
+            models.Index(fields=['computer_name']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_asset_type_display()} #{self.package_id}: {self.computer_name or 'N/A'}"
+
+    def get_absolute_url(self):
+        # Printer pages are keyed by PrinterDetails, the others by package
+        if self.asset_type == 'printer':
+            return reverse('printer_details_view', args=[self.detail_id]) if self.detail_id else None
+        url_name = {
+            'desktop': 'desktop_details_view',
+            'laptop': 'laptop_details_view',
+            'office_supplies': 'office_supplies_details_view',
+        }[self.asset_type]
+        return reverse(url_name, args=[self.package_id])
+
+
+# ==================== NOTIFICATION OUTBOX ====================
+
+class NotificationOutbox(models.Model):
+    """
+    Notification events written in the same transaction as the change that
+    caused them. inventory.notification_outbox drains the table in batches
+    (process_notification_outbox command or the optional scheduler) and
+    writes the actual Notification rows.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    event_type = models.CharField(max_length=50)
+    idempotency_key = models.CharField(
+        max_length=255, unique=True,
+        help_text="Same key = same event; enqueueing it again is a no-op"
+    )
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True)
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    available_at = models.DateTimeField(default=timezone.now, help_text="Not picked up before this time (retry backoff)")
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Notification Outbox Event'
+        verbose_name_plural = 'Notification Outbox'
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} [{self.status}] {self.idempotency_key}"
+
+
+class PMAlertState(models.Model):
+    """
+    Last due/overdue alert sent for a pending PM assignment. The PM alert
+    scanner (inventory.pm_alerts) notifies only when an assignment's bucket
+    differs from the one recorded here, and drops the row once the
+    assignment is completed or no longer due.
+    """
+
+    STATE_CHOICES = [
+        ('due', 'Due soon'),
+        ('overdue', 'Overdue'),
+    ]
+
+    assignment = models.OneToOneField(
+        PMScheduleAssignment, on_delete=models.CASCADE, related_name='alert_state'
+    )
+    state = models.CharField(max_length=10, choices=STATE_CHOICES)
+    alerted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'PM Alert State'
+        verbose_name_plural = 'PM Alert States'
+
+    def __str__(self):
+        return f"{self.assignment_id}: {self.state}"
+
+
+class PMComplianceCell(models.Model):
+    """
+    One device x quarter cell of the PM compliance matrix: the device has a
+    PM assignment that quarter, completed or due by due_date (overdue once
+    that has passed). No row = not assigned. Disposed devices have no rows.
+    Maintained by inventory.pm_compliance from signals; rebuild with
+    `python manage.py rebuild_pm_compliance`.
+    """
+
+    ASSET_TYPES = [
+        ('desktop', 'Desktop'),
+        ('laptop', 'Laptop'),
+    ]
+
+    asset_type = models.CharField(max_length=10, choices=ASSET_TYPES)
+    package_id = models.PositiveIntegerField()
+    quarter = models.ForeignKey(QuarterSchedule, on_delete=models.CASCADE, related_name='+')
+    section = models.ForeignKey(
+        OfficeSection, on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+        help_text="Section of the PM schedule the cell counts towards"
+    )
+    is_completed = models.BooleanField(default=False)
+    due_date = models.DateField()
+
+    class Meta:
+        verbose_name = 'PM Compliance Cell'
+        verbose_name_plural = 'PM Compliance Matrix'
+        constraints = [
+            models.UniqueConstraint(fields=['asset_type', 'package_id', 'quarter'], name='unique_pm_compliance_cell'),
+        ]
+        indexes = [
+            models.Index(fields=['section', 'quarter', 'is_completed', 'due_date']),
+            models.Index(fields=['quarter', 'is_completed', 'due_date']),
+        ]
+
+    def __str__(self):
+        return f"{self.asset_type} #{self.package_id} {self.quarter_id}: {'completed' if self.is_completed else self.due_date}"
+
+
+# ==================== EXPORT JOBS ====================
+
+class ExportJob(models.Model):
+    """
+    An export/report rendered by the job worker (inventory.export_jobs)
+    instead of inside the request. The finished file is stored under
+    MEDIA_ROOT/exports/ and removed once `expires_at` has passed.
+    """
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('expired', 'Expired'),
+    ]
+    ACTIVE_STATUSES = ('queued', 'running')
+
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)
+    dedupe_key = models.CharField(
+        max_length=64, db_index=True,
+        help_text="Hash of kind + params; one queued/running job per key"
+    )
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='export_jobs')
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    progress = models.PositiveSmallIntegerField(default=0, help_text="0-100")
+    message = models.CharField(max_length=255, blank=True, default='')
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+
+    file = models.FileField(upload_to='exports/%Y/%m/', blank=True)
+    filename = models.CharField(max_length=255, blank=True, default='')
+    content_type = models.CharField(max_length=100, blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True, help_text="Last progress report of the worker")
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='unique_active_export_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} [{self.status}]"
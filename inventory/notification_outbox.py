@@ -0,0 +1,407 @@
+"""
+Notification outbox - model signals append an event here instead of writing
+notifications inside the request.
+
+    enqueue('desktop_added', desktop)   # post_save, same transaction as the save
+    process_outbox()                    # worker: claim a batch, expand recipients, notify
+
+Delivery is at-least-once: a batch is claimed, handled and marked done, and
+events left 'processing' by a worker that died are claimed again once their
+lease runs out. Handlers write through notify_many(), which skips users who
+already have the same unread notification, so a replayed event does not
+notify twice. Failing events are retried with backoff and end up 'failed'
+after NOTIFICATION_OUTBOX_MAX_ATTEMPTS.
+
+Run `python manage.py process_notification_outbox` from cron/systemd, or set
+NOTIFICATION_OUTBOX_SCHEDULER=True to drain it from an in-process APScheduler job
+(which also runs the PM due/overdue scan, inventory/pm_alerts.py).
+"""
+import logging
+import os
+import sys
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import NotificationOutbox, notify_many
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def handler(event_type):
+    """Register `func(event, obj)` as the handler of `event_type`"""
+    def register(func):
+        HANDLERS[event_type] = func
+        return func
+    return register
+
+
+def enqueue(event_type, instance, payload=None, key=None):
+    """
+    Append an event for `instance`. `key` is the idempotency key; by default
+    there is one event per type and object, so re-saving an object does not
+    queue the same "added"/"disposed" event twice.
+    """
+    content_type = ContentType.objects.get_for_model(instance)
+    if key is None:
+        key = f'{event_type}:{content_type.pk}:{instance.pk}'
+    NotificationOutbox.objects.bulk_create([NotificationOutbox(
+        event_type=event_type,
+        idempotency_key=key[:255],
+        content_type=content_type,
+        object_id=instance.pk,
+        payload=payload or {},
+    )], ignore_conflicts=True)
+
+
+def unique_key(event_type, instance):
+    """Idempotency key for events that happen more than once per object (updates)"""
+    return f'{event_type}:{instance._meta.label_lower}:{instance.pk}:{uuid.uuid4().hex}'
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+def _claim_batch(batch_size, lease_seconds):
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            NotificationOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status='pending', available_at__lte=now)
+                | Q(status='processing', claimed_at__lt=now - timedelta(seconds=lease_seconds))
+            )
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if ids:
+            NotificationOutbox.objects.filter(pk__in=ids).update(status='processing', claimed_at=now)
+    return list(NotificationOutbox.objects.filter(pk__in=ids).select_related('content_type').order_by('id'))
+
+
+def _load_objects(events):
+    """{(content_type_id, object_id): instance} with one query per model"""
+    ids_by_type = {}
+    for event in events:
+        if event.content_type_id:
+            ids_by_type.setdefault(event.content_type, set()).add(event.object_id)
+    objects = {}
+    for content_type, ids in ids_by_type.items():
+        model = content_type.model_class()
+        if model is None:
+            continue
+        for pk, obj in model._default_manager.in_bulk(ids).items():
+            objects[(content_type.pk, pk)] = obj
+    return objects
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(30 * 2 ** (attempts - 1), 3600))
+
+
+def process_batch(batch_size=None, max_attempts=None, lease_seconds=None):
+    """Claim and handle one batch; returns {'done': n, 'retry': n, 'failed': n}"""
+    batch_size = batch_size or settings.NOTIFICATION_OUTBOX_BATCH_SIZE
+    max_attempts = max_attempts or settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS
+    lease_seconds = lease_seconds or settings.NOTIFICATION_OUTBOX_LEASE_SECONDS
+
+    counts = {'done': 0, 'retry': 0, 'failed': 0}
+    events = _claim_batch(batch_size, lease_seconds)
+    if not events:
+        return counts
+
+    objects = _load_objects(events)
+    done = []
+    for event in events:
+        try:
+            func = HANDLERS.get(event.event_type)
+            if func is None:
+                raise LookupError(f'No handler for event type {event.event_type!r}')
+            obj = objects.get((event.content_type_id, event.object_id))
+            # Deleted before we got to it: nothing left to notify about
+            if obj is not None or event.content_type_id is None:
+                with transaction.atomic():
+                    func(event, obj)
+            done.append(event.pk)
+        except Exception as e:
+            logger.exception('Notification outbox event %s failed', event.pk)
+            event.attempts += 1
+            event.last_error = f'{type(e).__name__}: {e}'
+            event.claimed_at = None
+            if event.attempts >= max_attempts:
+                event.status = 'failed'
+                counts['failed'] += 1
+            else:
+                event.status = 'pending'
+                event.available_at = timezone.now() + _retry_delay(event.attempts)
+                counts['retry'] += 1
+            event.save(update_fields=['attempts', 'last_error', 'claimed_at', 'status', 'available_at'])
+
+    if done:
+        NotificationOutbox.objects.filter(pk__in=done).update(
+            status='done', processed_at=timezone.now(), claimed_at=None,
+        )
+    counts['done'] = len(done)
+    return counts
+
+
+def process_outbox(batch_size=None, max_batches=None):
+    """Drain the outbox batch by batch until it is empty (or `max_batches` ran)"""
+    totals = {'done': 0, 'retry': 0, 'failed': 0}
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        counts = process_batch(batch_size)
+        batches += 1
+        for name, n in counts.items():
+            totals[name] += n
+        if not any(counts.values()):
+            break
+    return totals
+
+
+def purge_outbox(older_than_days=7):
+    """Delete processed events older than `older_than_days`; returns the number deleted"""
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    deleted, _ = NotificationOutbox.objects.filter(status='done', processed_at__lt=cutoff).delete()
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# Optional in-process scheduler (NOTIFICATION_OUTBOX_SCHEDULER=True)
+# ---------------------------------------------------------------------------
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def _scheduled_run():
+    close_old_connections()
+    try:
+        process_outbox()
+    finally:
+        close_old_connections()
+
+
+def _scheduled_pm_scan():
+    from .pm_alerts import scan_pm_alerts
+    close_old_connections()
+    try:
+        scan_pm_alerts()
+    finally:
+        close_old_connections()
+
+
+def _is_server_process():
+    """Skip the scheduler in manage.py commands and in runserver's reloader parent"""
+    if os.path.basename(sys.argv[0]) != 'manage.py':
+        return True
+    return sys.argv[1:2] == ['runserver'] and os.environ.get('RUN_MAIN') == 'true'
+
+
+def start_scheduler(interval=None):
+    """Start background APScheduler jobs draining the outbox and scanning PM alerts (once per process)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None or not _is_server_process():
+            return _scheduler
+        from apscheduler.schedulers.background import BackgroundScheduler
+
+        _scheduler = BackgroundScheduler(daemon=True)
+        _scheduler.add_job(
+            _scheduled_run, 'interval',
+            seconds=interval or settings.NOTIFICATION_OUTBOX_INTERVAL,
+            id='notification_outbox', max_instances=1, coalesce=True,
+        )
+        if settings.PM_ALERT_SCAN_INTERVAL:
+            _scheduler.add_job(
+                _scheduled_pm_scan, 'interval', seconds=settings.PM_ALERT_SCAN_INTERVAL,
+                id='pm_alert_scan', max_instances=1, coalesce=True,
+            )
+        _scheduler.start()
+        logger.info('Notification outbox scheduler started')
+        return _scheduler
+
+
+# ---------------------------------------------------------------------------
+# Handlers: recipients and wording of each notification
+# ---------------------------------------------------------------------------
+
+def _it_staff():
+    return User.objects.filter(is_staff=True)
+
+
+def _admins():
+    return User.objects.filter(is_staff=True, is_superuser=True)
+
+
+def _pm_device(obj):
+    """(device name, history link) of the desktop/laptop a PM record belongs to"""
+    if obj.equipment_package:
+        desktop = obj.equipment_package.desktop_details.first()
+        name = desktop.computer_name if desktop else f"Desktop #{obj.equipment_package.id}"
+        return name, reverse('maintenance_history', args=[obj.equipment_package.id])
+    if obj.laptop_package:
+        laptop = obj.laptop_package.laptop_details.first()
+        name = laptop.computer_name if laptop else f"Laptop #{obj.laptop_package.id}"
+        return name, reverse('maintenance_history_laptop', args=[obj.laptop_package.id])
+    return "Unknown Device", "#"
+
+
+@handler('pm_completed')
+def handle_pm_completed(event, pm):
+    device_name, link_url = _pm_device(pm)
+    notify_many(
+        _it_staff(),
+        notification_type='pm_completed',
+        title='PM Maintenance Completed',
+        message=f'Preventive maintenance for {device_name} has been successfully completed',
+        priority='normal',
+        link_url=link_url,
+        link_text='View Report',
+        related_object=pm,
+    )
+
+
+@handler('pm_status')
+def handle_pm_status(event, assignment):
+    """Events queued per assignment save before the scheduled scan: scan that assignment"""
+    from .pm_alerts import scan_pm_alerts
+    scan_pm_alerts(assignment_ids=[assignment.pk])
+
+
+@handler('desktop_added')
+def handle_desktop_added(event, desktop):
+    notify_many(
+        _it_staff(),
+        notification_type='asset_added',
+        title='New Desktop Added',
+        message=f'Desktop {desktop.computer_name or "PC-" + str(desktop.equipment_package_id)} has been added to inventory',
+        priority='normal',
+        link_url=reverse('desktop_details_view', kwargs={'package_id': desktop.equipment_package_id}),
+        link_text='View Asset',
+        related_object=desktop,
+    )
+
+
+@handler('desktop_updated')
+def handle_desktop_updated(event, desktop):
+    notify_many(
+        _it_staff(),
+        notification_type='asset_updated',
+        title='Desktop Information Updated',
+        message=f'Desktop {desktop.computer_name} has been updated ({", ".join(event.payload.get("changes", []))})',
+        priority='low',
+        link_url=reverse('desktop_details_view', kwargs={'package_id': desktop.equipment_package_id}),
+        link_text='View Changes',
+        related_object=desktop,
+    )
+
+
+@handler('laptop_added')
+def handle_laptop_added(event, laptop):
+    notify_many(
+        _it_staff(),
+        notification_type='asset_added',
+        title='New Laptop Added',
+        message=f'Laptop {laptop.computer_name or "LT-" + str(laptop.laptop_package_id)} has been added to inventory',
+        priority='normal',
+        link_url=reverse('laptop_details_view', kwargs={'package_id': laptop.laptop_package_id}),
+        link_text='View Asset',
+        related_object=laptop,
+    )
+
+
+@handler('printer_added')
+def handle_printer_added(event, printer):
+    notify_many(
+        _it_staff(),
+        notification_type='asset_added',
+        title='New Printer Added',
+        message=f'Printer {printer.printer_brand_db} {printer.printer_model_db} has been added to inventory',
+        priority='normal',
+        link_url=reverse('printer_details_view', kwargs={'printer_id': printer.id}),
+        link_text='View Asset',
+        related_object=printer,
+    )
+
+
+@handler('desktop_disposed')
+def handle_desktop_disposed(event, disposal):
+    notify_many(
+        _it_staff(),
+        notification_type='asset_disposed',
+        title='Desktop Moved to Disposal',
+        message=f'Desktop {disposal.desktop.computer_name if disposal.desktop else "Unknown"} has been moved to disposal area',
+        priority='normal',
+        link_url=reverse('disposal_overview'),
+        link_text='View Disposal Area',
+        related_object=disposal,
+    )
+
+
+@handler('laptop_disposed')
+def handle_laptop_disposed(event, disposal):
+    notify_many(
+        _it_staff(),
+        notification_type='asset_disposed',
+        title='Laptop Moved to Disposal',
+        message=f'Laptop {disposal.laptop.computer_name if disposal.laptop else "Unknown"} has been moved to disposal area',
+        priority='normal',
+        link_url=reverse('disposal_overview'),
+        link_text='View Disposal Area',
+        related_object=disposal,
+    )
+
+
+@handler('printer_disposed')
+def handle_printer_disposed(event, disposal):
+    notify_many(
+        _it_staff(),
+        notification_type='asset_disposed',
+        title='Printer Moved to Disposal',
+        message=f'Printer {disposal.printer_brand} {disposal.printer_model} has been moved to disposal area',
+        priority='normal',
+        link_url=reverse('disposal_overview'),
+        link_text='View Disposal Area',
+        related_object=disposal,
+    )
+
+
+@handler('employee_added')
+def handle_employee_added(event, employee):
+    notify_many(
+        _admins(),
+        notification_type='employee_added',
+        title='New Employee Added',
+        message=f'{employee.full_name} has been added to {employee.employee_office_section or "the system"}',
+        priority='low',
+        link_url=reverse('employee_list'),
+        link_text='View Employees',
+        related_object=employee,
+    )
+
+
+@handler('employee_updated')
+def handle_employee_updated(event, employee):
+    notify_many(
+        _admins(),
+        notification_type='employee_updated',
+        title='Employee Information Updated',
+        message=f'{employee.full_name} profile has been updated',
+        priority='low',
+        link_url=reverse('employee_list'),
+        link_text='View Employees',
+        related_object=employee,
+    )
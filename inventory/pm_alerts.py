@@ -0,0 +1,140 @@
+"""
+PM due/overdue alerts - one set-based scan instead of a check per
+assignment save.
+
+    scan_pm_alerts()   # check_pm_schedules command or the scheduler job
+
+The scan buckets every pending assignment of an active package in one query
+(overdue: the schedule ended; due: it ends within DUE_SOON_DAYS) and compares
+the bucket with PMAlertState, the alert last sent for that assignment. Only
+assignments whose bucket changed are notified, all in one bulk insert.
+States of assignments that were completed or are no longer due are dropped,
+so they alert again if they become due later.
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Case, CharField, F, OuterRef, Q, Subquery, Value, When
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import AssetIndex, Notification, PMAlertState, PMScheduleAssignment
+
+DUE_SOON_DAYS = 7
+BATCH_SIZE = 500
+
+
+def _computer_name(kind, package_field):
+    return Subquery(
+        AssetIndex.objects.filter(asset_type=kind, package_id=OuterRef(package_field)).values('computer_name')[:1]
+    )
+
+
+def bucketed_assignments(today, assignment_ids=None):
+    """Pending assignments of active packages that are due or overdue, with their `bucket`"""
+    assignments = PMScheduleAssignment.objects.filter(
+        Q(equipment_package__is_disposed=False) | Q(laptop_package__is_disposed=False),
+        is_completed=False,
+        pm_section_schedule__end_date__lte=today + timedelta(days=DUE_SOON_DAYS),
+    )
+    if assignment_ids is not None:
+        assignments = assignments.filter(pk__in=assignment_ids)
+    return assignments.annotate(
+        end_date=F('pm_section_schedule__end_date'),
+        bucket=Case(
+            When(pm_section_schedule__end_date__lt=today, then=Value('overdue')),
+            default=Value('due'),
+            output_field=CharField(),
+        ),
+    )
+
+
+def _recipients():
+    """IT staff, minus those who turned PM alerts off on their profile"""
+    return list(
+        User.objects.filter(is_staff=True).exclude(profile__notify_pm_due=False).values_list('pk', flat=True)
+    )
+
+
+def _notification(row, today):
+    if row['equipment_package_id']:
+        name = row['desktop_name'] or f"Desktop #{row['equipment_package_id']}"
+        link_url = reverse('maintenance_history', args=[row['equipment_package_id']])
+    else:
+        name = row['laptop_name'] or f"Laptop #{row['laptop_package_id']}"
+        link_url = reverse('maintenance_history_laptop', args=[row['laptop_package_id']])
+
+    if row['bucket'] == 'overdue':
+        return dict(
+            notification_type='pm_overdue',
+            title='URGENT: PM Maintenance Overdue',
+            message=f"Preventive maintenance for {name} is {(today - row['end_date']).days} days overdue! Please complete immediately.",
+            priority='urgent',
+            link_url=link_url,
+            link_text='Fix Now',
+        )
+    return dict(
+        notification_type='pm_due',
+        title='PM Maintenance Due Soon',
+        message=f"Preventive maintenance for {name} is due in {(row['end_date'] - today).days} days",
+        priority='high',
+        link_url=link_url,
+        link_text='View Details',
+    )
+
+
+def scan_pm_alerts(today=None, assignment_ids=None):
+    """
+    Alert IT staff of assignments that became due or overdue since the last
+    scan. Returns {'due': n, 'overdue': n, 'cleared': n} (assignments, not
+    notifications). assignment_ids limits the scan to those assignments.
+    """
+    today = today or timezone.localdate()
+    bucketed = bucketed_assignments(today, assignment_ids)
+    transitions = list(
+        bucketed
+        .annotate(
+            alerted=F('alert_state__state'),
+            desktop_name=_computer_name('desktop', 'equipment_package_id'),
+            laptop_name=_computer_name('laptop', 'laptop_package_id'),
+        )
+        .filter(Q(alerted__isnull=True) | ~Q(alerted=F('bucket')))
+        .values('pk', 'bucket', 'end_date', 'equipment_package_id', 'laptop_package_id',
+                'desktop_name', 'laptop_name')
+    )
+    stale = PMAlertState.objects.exclude(assignment__in=bucketed.values('pk'))
+    if assignment_ids is not None:
+        stale = stale.filter(assignment__in=assignment_ids)
+
+    counts = {'due': 0, 'overdue': 0}
+    for row in transitions:
+        counts[row['bucket']] += 1
+
+    with transaction.atomic():
+        counts['cleared'], _ = stale.delete()
+        if not transitions:
+            return counts
+
+        now = timezone.now()
+        PMAlertState.objects.bulk_create(
+            [PMAlertState(assignment_id=row['pk'], state=row['bucket'], alerted_at=now) for row in transitions],
+            batch_size=BATCH_SIZE,
+            update_conflicts=True, unique_fields=['assignment'], update_fields=['state', 'alerted_at'],
+        )
+
+        # One INSERT for every (transition, staff member); the
+        # unique_unread_notification constraint skips unread duplicates
+        content_type = ContentType.objects.get_for_model(PMScheduleAssignment)
+        user_ids = _recipients()
+        Notification.objects.bulk_create(
+            [
+                Notification(user_id=user_id, content_type=content_type, object_id=row['pk'], **fields)
+                for row in transitions
+                for fields in [_notification(row, today)]
+                for user_id in user_ids
+            ],
+            batch_size=BATCH_SIZE, ignore_conflicts=True,
+        )
+    return counts
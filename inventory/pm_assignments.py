@@ -0,0 +1,115 @@
+"""
+PM schedule assignments - every active desktop/laptop gets one
+PMScheduleAssignment per PMSectionSchedule of its end user's office section.
+
+reconcile_pm_assignments() finds the missing (package, section schedule)
+pairs with one anti-join per package type and inserts them with
+bulk_create(ignore_conflicts=True); the unique constraints on
+PMScheduleAssignment make concurrent runs safe. It is called:
+
+    - when a PMSectionSchedule is created (that section)
+    - when a package's UserDetails or an end user's section changes
+      (signals.py, after commit)
+    - by `python manage.py reconcile_pm_assignments` (whole inventory)
+    - by the PM year rollover (inventory/pm_rollover.py, the new schedules)
+
+A quarter the package already completed under another section (kept there
+by auto_transfer_pm_schedule) is not assigned again. bulk_create fires no
+signals, so the caches the post_save receivers would have dropped are
+refreshed here; due/overdue alerts for the new rows come from the next PM
+alert scan (inventory/pm_alerts.py).
+"""
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+
+from . import asset_pdf_cache
+from . import pm_compliance
+from .dashboard_snapshot import mark_dashboard_snapshot_stale
+from .models import Equipment_Package, LaptopPackage, PMScheduleAssignment, UserDetails
+from .utils.pm_summary import invalidate_pending_pm_summary
+
+BATCH_SIZE = 500
+
+# kind -> package model and its PMScheduleAssignment foreign key
+PM_PACKAGES = {
+    'desktop': (Equipment_Package, 'equipment_package'),
+    'laptop': (LaptopPackage, 'laptop_package'),
+}
+
+_SECTION = 'user_details__user_Enduser__employee_office_section'
+
+
+def missing_pairs(kind, package_ids=None, section_ids=None, schedule_ids=None):
+    """[(package_id, section_schedule_id)] without an assignment, in one query"""
+    model, fk = PM_PACKAGES[kind]
+    packages = model.objects.filter(is_disposed=False, **{f'{_SECTION}__isnull': False})
+    if package_ids is not None:
+        packages = packages.filter(pk__in=package_ids)
+    if section_ids is not None:
+        packages = packages.filter(**{f'{_SECTION}__in': section_ids})
+    return list(
+        packages
+        .annotate(
+            schedule_id=F(f'{_SECTION}__pmsectionschedule__id'),
+            quarter_id=F(f'{_SECTION}__pmsectionschedule__quarter_schedule_id'),
+        )
+        .filter(schedule_id__isnull=False)
+        .filter(**({'schedule_id__in': schedule_ids} if schedule_ids is not None else {}))
+        .filter(~Exists(PMScheduleAssignment.objects.filter(
+            **{fk: OuterRef('pk')}, pm_section_schedule=OuterRef('schedule_id'),
+        )))
+        .filter(~Exists(PMScheduleAssignment.objects.filter(
+            **{fk: OuterRef('pk')}, pm_section_schedule__quarter_schedule=OuterRef('quarter_id'), is_completed=True,
+        )))
+        .values_list('pk', 'schedule_id')
+        .distinct()
+    )
+
+
+def _after_insert(kind, pairs):
+    package_ids = sorted({package_id for package_id, _ in pairs})
+    transaction.on_commit(invalidate_pending_pm_summary)
+    transaction.on_commit(mark_dashboard_snapshot_stale)
+    transaction.on_commit(lambda: asset_pdf_cache.invalidate(kind, package_ids))
+    pm_compliance.queue_refresh(kind, package_ids)
+
+
+def reconcile_pm_assignments(desktop_ids=None, laptop_ids=None, section_ids=None, schedule_ids=None,
+                             remarks=None):
+    """
+    Create the missing assignments and return {kind: created}.
+
+    No arguments reconciles the whole inventory; section_ids limits it to
+    packages whose end user is in those sections, schedule_ids to those
+    section schedules; desktop_ids/laptop_ids to those packages (a kind with
+    no ids given is skipped when the other has).
+    """
+    scopes = {'desktop': desktop_ids, 'laptop': laptop_ids}
+    by_package = desktop_ids is not None or laptop_ids is not None
+    created = {}
+    for kind, package_ids in scopes.items():
+        if by_package and not package_ids:
+            created[kind] = 0
+            continue
+        _, fk = PM_PACKAGES[kind]
+        with transaction.atomic():
+            pairs = missing_pairs(kind, package_ids, section_ids, schedule_ids)
+            PMScheduleAssignment.objects.bulk_create(
+                [PMScheduleAssignment(**{f'{fk}_id': package_id}, pm_section_schedule_id=schedule_id,
+                                      remarks=remarks)
+                 for package_id, schedule_id in pairs],
+                batch_size=BATCH_SIZE, ignore_conflicts=True,
+            )
+            if pairs:
+                _after_insert(kind, pairs)
+        created[kind] = len(pairs)
+    return created
+
+
+def reconcile_end_user_packages(employee_ids):
+    """Reconcile the desktops/laptops used by these employees (e.g. after a section change)"""
+    rows = UserDetails.objects.filter(user_Enduser__in=employee_ids)
+    return reconcile_pm_assignments(
+        desktop_ids=list(rows.filter(equipment_package__isnull=False).values_list('equipment_package_id', flat=True)),
+        laptop_ids=list(rows.filter(laptop_package__isnull=False).values_list('laptop_package_id', flat=True)),
+    )
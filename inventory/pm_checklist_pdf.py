@@ -0,0 +1,191 @@
+"""
+Quarterly PM checklist (ANNEX "E", workstation) rendered with ReportLab.
+
+Draws the layout of static/excel_template/PM checklist.xlsx straight from
+PreventiveMaintenance rows, in memory - no Excel, no files under MEDIA_ROOT,
+and nothing shared between calls, so any number of requests/workers can
+render at once.
+
+    render_pm_checklists([pm])                          # one checklist
+    render_pm_checklists(section_schedule_pms(schedule)) # whole section, one page each
+"""
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from xml.sax.saxutils import escape
+
+from .models import DesktopDetails, LaptopDetails, PreventiveMaintenance
+
+BATCH_SIZE = 200
+
+# Rows 14-22 of the template, in task_1..task_9 order
+PM_TASKS = [
+    "Check if configured and connected to the DPWH domain",
+    "Check if able to access the intranet services",
+    "Check if installed with anti-virus software authorized by IMS",
+    "Check if anti-virus definition files are up-to-date",
+    "Perform full virus scan using updated virus removal tool",
+    "Remove all un-authorized software installations (e.g. games, pirated software, "
+    "freeware, free for personal use, trial)",
+    "Remove all un-authorized files (e.g. movies)",
+    "Check working condition of hardware devices/ components",
+    "Clean hardware and components, and organize cables",
+]
+
+ANNEX_STYLE = ParagraphStyle('PMAnnex', fontName='Helvetica', fontSize=11, alignment=TA_RIGHT)
+TITLE_STYLE = ParagraphStyle('PMTitle', fontName='Helvetica-Bold', fontSize=14, leading=18, alignment=TA_CENTER)
+LABEL_STYLE = ParagraphStyle('PMLabel', fontName='Helvetica-Bold', fontSize=11, leading=14)
+VALUE_STYLE = ParagraphStyle('PMValue', fontName='Helvetica', fontSize=11, leading=14)
+HEAD_STYLE = ParagraphStyle('PMHead', fontName='Helvetica-Bold', fontSize=10, leading=12, alignment=TA_CENTER)
+CELL_STYLE = ParagraphStyle('PMCell', fontName='Helvetica', fontSize=10, leading=12)
+CENTER_STYLE = ParagraphStyle('PMCenter', parent=CELL_STYLE, alignment=TA_CENTER)
+CHECK_STYLE = ParagraphStyle('PMCheck', fontName='ZapfDingbats', fontSize=12, leading=14, alignment=TA_CENTER)
+SIGNATURE_STYLE = ParagraphStyle('PMSignature', fontName='Helvetica', fontSize=10, leading=13, alignment=TA_CENTER)
+
+# Template columns A | B:C | D | E, scaled to the A4 printable width
+TASK_COL_WIDTHS = [18 * mm, 58 * mm, 30 * mm, 64 * mm]
+INFO_COL_WIDTHS = [40 * mm, 130 * mm]
+
+TASK_TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
+    ('VALIGN', (0, 1), (-1, -1), 'TOP'),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+])
+INFO_TABLE_STYLE = TableStyle([
+    ('LINEBELOW', (1, 0), (1, -1), 0.5, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'BOTTOM'),
+    ('LEFTPADDING', (0, 0), (0, -1), 0),
+])
+SIGNATURE_TABLE_STYLE = TableStyle([
+    ('LINEABOVE', (0, 1), (0, 1), 0.5, colors.black),
+    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+])
+
+
+def _text(value, style):
+    return Paragraph(escape(str(value)) if value not in (None, '') else '', style)
+
+
+def checklist_flowables(pm, computer_name=''):
+    """The flowables of one checklist page"""
+    info = Table([
+        [_text('Office:', LABEL_STYLE), _text(pm.office, VALUE_STYLE)],
+        [_text('Computer Name:', LABEL_STYLE), _text(computer_name, VALUE_STYLE)],
+        [_text('End user:', LABEL_STYLE), _text(pm.end_user, VALUE_STYLE)],
+        [_text('Date accomplished:', LABEL_STYLE), _text(pm.date_accomplished, VALUE_STYLE)],
+    ], colWidths=INFO_COL_WIDTHS, hAlign='LEFT')
+    info.setStyle(INFO_TABLE_STYLE)
+
+    rows = [[
+        _text('Item No.', HEAD_STYLE), _text('Task', HEAD_STYLE),
+        Paragraph('Status (put <font name="ZapfDingbats">4</font> if done)', HEAD_STYLE),
+        _text('Problems Encountered/ Action', HEAD_STYLE),
+    ]]
+    for i, task in enumerate(PM_TASKS, start=1):
+        rows.append([
+            _text(i, CENTER_STYLE),
+            _text(task, CELL_STYLE),
+            # ZapfDingbats '4' is the check mark glyph
+            Paragraph('4' if getattr(pm, f'task_{i}') else '', CHECK_STYLE),
+            _text(getattr(pm, f'note_{i}'), CELL_STYLE),
+        ])
+    tasks = Table(rows, colWidths=TASK_COL_WIDTHS, repeatRows=1)
+    tasks.setStyle(TASK_TABLE_STYLE)
+
+    signature = Table(
+        [[_text(pm.performed_by, SIGNATURE_STYLE)], [_text('(Signature over printed name)', SIGNATURE_STYLE)]],
+        colWidths=[76 * mm], hAlign='LEFT',
+    )
+    signature.setStyle(SIGNATURE_TABLE_STYLE)
+
+    return [
+        Paragraph('ANNEX "E"', ANNEX_STYLE),
+        Spacer(1, 8 * mm),
+        Paragraph('Preventive Maintenance Checklist/Activities', TITLE_STYLE),
+        Paragraph('For Workstation (Quarterly)', TITLE_STYLE),
+        Spacer(1, 6 * mm),
+        Paragraph('Schedule: As approved by head Office', LABEL_STYLE),
+        info,
+        Spacer(1, 8 * mm),
+        tasks,
+        Spacer(1, 10 * mm),
+        Paragraph('Accomplished by:', VALUE_STYLE),
+        Spacer(1, 8 * mm),
+        signature,
+    ]
+
+
+def computer_names(pms):
+    """{pm.id: computer name} for a batch of PMs - two queries, whatever the batch size"""
+    desktop_ids = {pm.equipment_package_id for pm in pms if pm.equipment_package_id}
+    laptop_ids = {pm.laptop_package_id for pm in pms if pm.laptop_package_id}
+    desktops, laptops = {}, {}
+    for package_id, name in (DesktopDetails.objects.filter(equipment_package_id__in=desktop_ids)
+                             .order_by('equipment_package_id', 'pk')
+                             .values_list('equipment_package_id', 'computer_name')):
+        desktops.setdefault(package_id, name)
+    for package_id, name in (LaptopDetails.objects.filter(laptop_package_id__in=laptop_ids)
+                             .order_by('laptop_package_id', 'pk')
+                             .values_list('laptop_package_id', 'computer_name')):
+        laptops.setdefault(package_id, name)
+    return {
+        pm.id: (desktops.get(pm.equipment_package_id) if pm.equipment_package_id
+                else laptops.get(pm.laptop_package_id)) or ''
+        for pm in pms
+    }
+
+
+def section_schedule_pms(schedule):
+    """PMs recorded against a section's quarter schedule, oldest first"""
+    return PreventiveMaintenance.objects.filter(
+        pm_schedule_assignment__pm_section_schedule=schedule
+    ).order_by('date_accomplished', 'pk')
+
+
+def _batches(pms, size=BATCH_SIZE):
+    if isinstance(pms, (list, tuple)):
+        yield list(pms)
+        return
+    batch = []
+    for pm in pms.iterator(chunk_size=size):
+        batch.append(pm)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def render_pm_checklists(pms, progress=None):
+    """
+    PDF bytes with one checklist page per PM. `pms` is a list or a queryset;
+    querysets are read in batches of BATCH_SIZE with one computer-name lookup
+    per batch. progress(done, total, message) is called per page.
+    """
+    total = len(pms) if isinstance(pms, (list, tuple)) else pms.count()
+    story = []
+    done = 0
+    for batch in _batches(pms):
+        names = computer_names(batch)
+        for pm in batch:
+            if story:
+                story.append(PageBreak())
+            story.extend(checklist_flowables(pm, names[pm.id]))
+            done += 1
+            if progress:
+                progress(done, total, f'{done} of {total} checklists')
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer, pagesize=A4, title='Preventive Maintenance Checklist',
+        leftMargin=20 * mm, rightMargin=20 * mm, topMargin=15 * mm, bottomMargin=15 * mm,
+    )
+    doc.build(story or [Paragraph('No preventive maintenance records.', VALUE_STYLE)])
+    return buffer.getvalue()
@@ -0,0 +1,177 @@
+"""
+PM compliance matrix - one PMComplianceCell per device and quarter with a PM
+assignment, so the device x quarter grid, the per-section percentages and the
+CSV are plain index scans of one table instead of a join of assignments,
+maintenances and quarters per cell.
+
+A cell is completed when any of the device's assignments that quarter is
+completed (or has a completed PreventiveMaintenance); otherwise it is due by
+the earliest end date of those schedules and overdue once that has passed,
+which is decided when reading, so cells do not go stale as days pass.
+
+Cells are rebuilt per package (or per quarter, when a section schedule's
+dates change) after commit by the signals in signals.py and by the bulk
+assignment paths. Migration 0138 fills the table from the existing
+assignments; `python manage.py rebuild_pm_compliance` rebuilds it all
+(after bulk imports or raw SQL).
+"""
+import threading
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+
+from .models import PMComplianceCell, PMScheduleAssignment, PreventiveMaintenance
+
+BATCH_SIZE = 2000
+
+# asset_type -> PMScheduleAssignment package field
+PACKAGE_FIELDS = {
+    'desktop': 'equipment_package',
+    'laptop': 'laptop_package',
+}
+
+STATUSES = [
+    ('completed', 'Completed'),
+    ('overdue', 'Overdue'),
+    ('scheduled', 'Scheduled'),
+    ('not_assigned', 'Not assigned'),
+]
+
+
+def build_cells(kind, package_ids=None, quarter_ids=None):
+    """PMComplianceCell rows (unsaved) for the scope, from one pass over the assignments"""
+    fk = PACKAGE_FIELDS[kind]
+    assignments = PMScheduleAssignment.objects.filter(**{f'{fk}__is_disposed': False})
+    if package_ids is not None:
+        assignments = assignments.filter(**{f'{fk}_id__in': package_ids})
+    if quarter_ids is not None:
+        assignments = assignments.filter(pm_section_schedule__quarter_schedule_id__in=quarter_ids)
+    rows = (
+        assignments
+        .annotate(pm_done=Exists(PreventiveMaintenance.objects.filter(
+            pm_schedule_assignment=OuterRef('pk'), is_completed=True,
+        )))
+        .values_list(f'{fk}_id', 'pm_section_schedule__quarter_schedule_id', 'is_completed', 'pm_done',
+                     'pm_section_schedule__end_date', 'pm_section_schedule__section_id')
+        .order_by()
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+
+    # Completed beats pending; among pending the earliest end date counts
+    cells = {}
+    for package_id, quarter_id, is_completed, pm_done, end_date, section_id in rows:
+        done = is_completed or pm_done
+        cell = cells.get((package_id, quarter_id))
+        if cell is None:
+            cells[(package_id, quarter_id)] = PMComplianceCell(
+                asset_type=kind, package_id=package_id, quarter_id=quarter_id,
+                section_id=section_id, is_completed=done, due_date=end_date,
+            )
+        elif (done, -end_date.toordinal()) > (cell.is_completed, -cell.due_date.toordinal()):
+            cell.is_completed, cell.due_date, cell.section_id = done, end_date, section_id
+    return list(cells.values())
+
+
+def refresh_cells(kind, package_ids=None, quarter_ids=None):
+    """Replace the cells of the given packages and/or quarters (all cells of `kind` if neither)"""
+    cells = build_cells(kind, package_ids, quarter_ids)
+    stale = PMComplianceCell.objects.filter(asset_type=kind)
+    if package_ids is not None:
+        stale = stale.filter(package_id__in=package_ids)
+    if quarter_ids is not None:
+        stale = stale.filter(quarter_id__in=quarter_ids)
+    with transaction.atomic():
+        stale.delete()
+        PMComplianceCell.objects.bulk_create(cells, batch_size=BATCH_SIZE)
+    return len(cells)
+
+
+def rebuild_pm_compliance():
+    """Rebuild the whole matrix; returns {kind: cells}"""
+    return {kind: refresh_cells(kind) for kind in PACKAGE_FIELDS}
+
+
+# ---------------------------------------------------------------------------
+# Deferred refreshes: many saves in one transaction (a cascade delete, a
+# reconcile) refresh each package/quarter once, after commit
+# ---------------------------------------------------------------------------
+
+_pending = threading.local()
+
+
+def _pending_scope():
+    if not hasattr(_pending, 'scope'):
+        _pending.scope = {'quarters': set(), **{kind: set() for kind in PACKAGE_FIELDS}}
+    return _pending.scope
+
+
+def _flush():
+    scope = _pending_scope()
+    quarter_ids, scope['quarters'] = scope['quarters'], set()
+    for kind in PACKAGE_FIELDS:
+        package_ids, scope[kind] = scope[kind], set()
+        if quarter_ids:
+            refresh_cells(kind, quarter_ids=sorted(quarter_ids))
+        if package_ids:
+            refresh_cells(kind, package_ids=sorted(package_ids))
+
+
+def queue_refresh(kind, package_ids):
+    """Refresh these packages' cells once the transaction commits"""
+    _pending_scope()[kind].update(pk for pk in package_ids if pk is not None)
+    transaction.on_commit(_flush)
+
+
+def queue_quarter_refresh(quarter_ids):
+    """Refresh every cell of these quarters once the transaction commits"""
+    _pending_scope()['quarters'].update(quarter_ids)
+    transaction.on_commit(_flush)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def cell_status(cell, today):
+    if cell is None:
+        return 'not_assigned'
+    if cell['is_completed']:
+        return 'completed'
+    return 'overdue' if cell['due_date'] < today else 'scheduled'
+
+
+def cells_for(devices, quarter_ids):
+    """{(asset_type, package_id, quarter_id): cell values} for a page of devices, in one query"""
+    by_kind = {}
+    for asset_type, package_id in devices:
+        by_kind.setdefault(asset_type, []).append(package_id)
+    match = Q(pk__in=[])
+    for asset_type, package_ids in by_kind.items():
+        match |= Q(asset_type=asset_type, package_id__in=package_ids)
+    return {
+        (cell['asset_type'], cell['package_id'], cell['quarter_id']): cell
+        for cell in PMComplianceCell.objects.filter(match, quarter_id__in=quarter_ids)
+        .values('asset_type', 'package_id', 'quarter_id', 'is_completed', 'due_date')
+    }
+
+
+def section_compliance(quarter_ids, today, section_id=None):
+    """
+    [{section_id, quarter_id, assigned, completed, overdue, percent}] - one
+    grouped scan of the cells; percent is completed / assigned.
+    """
+    cells = PMComplianceCell.objects.filter(quarter_id__in=quarter_ids)
+    if section_id:
+        cells = cells.filter(section_id=section_id)
+    rows = list(
+        cells.values('section_id', 'quarter_id')
+        .annotate(
+            assigned=Count('pk'),
+            completed=Count('pk', filter=Q(is_completed=True)),
+            overdue=Count('pk', filter=Q(is_completed=False, due_date__lt=today)),
+        )
+        .order_by('section_id', 'quarter_id')
+    )
+    for row in rows:
+        row['percent'] = round(100 * row['completed'] / row['assigned'], 1)
+    return rows
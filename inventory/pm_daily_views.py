@@ -15,10 +15,7 @@ from .models import (
     PMChecklistTemplate, PMChecklistSchedule, PMChecklistCompletion,
     PMChecklistItem, PMChecklistItemCompletion
 )
-from .pm_daily_weekly_export import (
-    generate_daily_pm_pdf, generate_weekly_pm_pdf,
-    get_week_start_end, get_week_completions
-)
+from .utils.pm_weeks import get_week_start_end, get_week_completions
 
 
 def auto_create_week_schedules(template, reference_date):
@@ -378,6 +375,8 @@ def complete_daily_pm(request, schedule_id):
 def export_daily_pm_pdf(request, completion_id):
     """Export a single day's PM checklist as PDF"""
 
+    from .pm_daily_weekly_export import generate_daily_pm_pdf
+
     completion = get_object_or_404(PMChecklistCompletion, id=completion_id)
 
     # Generate PDF
@@ -419,6 +418,7 @@ def export_weekly_pm_pdf(request):
         return redirect('pm_daily_dashboard')
 
     # Generate weekly PDF
+    from .pm_daily_weekly_export import generate_weekly_pm_pdf
     pdf_buffer = generate_weekly_pm_pdf(template, reference_date, request.user)
 
     # Create response
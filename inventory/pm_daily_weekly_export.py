@@ -4,55 +4,17 @@ Each day (Mon-Fri) has its own completion. Weekly report aggregates all 5 days.
 """
 
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from django.utils import timezone
 from io import BytesIO
-from datetime import timedelta
 import calendar
 
-from .models import PMChecklistCompletion, PMChecklistItem
-
-
-def get_week_start_end(date):
-    """Get Monday and Friday of the week containing the given date"""
-    # Get the weekday (0=Monday, 6=Sunday)
-    weekday = date.weekday()
-
-    # Calculate Monday of this week
-    monday = date - timedelta(days=weekday)
-
-    # Calculate Friday of this week
-    friday = monday + timedelta(days=4)
-
-    return monday, friday
-
-
-def get_week_completions(template, week_start_date):
-    """
-    Get all completions for a week (Mon-Fri) for a specific template
-    Returns dict: {0: monday_completion, 1: tuesday_completion, ...}
-    where keys are weekday numbers (0=Mon, 4=Fri)
-    """
-    monday, friday = get_week_start_end(week_start_date)
-
-    completions = PMChecklistCompletion.objects.filter(
-        schedule__template=template,
-        completion_date__gte=monday,
-        completion_date__lte=friday
-    ).select_related('schedule', 'schedule__template', 'completed_by')
-
-    # Organize by weekday
-    week_completions = {}
-    for comp in completions:
-        weekday = comp.completion_date.weekday()
-        if weekday < 5:  # Only Mon-Fri
-            week_completions[weekday] = comp
-
-    return week_completions
+from .models import PMChecklistItem
+from .pm_pdf_styles import (
+    A4_FORM_MARGINS, ANNEX_A_DAILY, ANNEX_STYLE, CENTER_CELL_STYLE, SCHEDULE_INFO_STYLE, SIGNATURE_STYLE,
+    TASK_CELL_STYLE, TITLE_STYLE, day_cells,
+)
+from .utils.pm_weeks import get_week_start_end, get_week_completions
 
 
 def generate_daily_pm_pdf(completion):
@@ -61,51 +23,18 @@ def generate_daily_pm_pdf(completion):
     Shows the full form but only the relevant day column is filled
     """
     buffer = BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=20*mm,
-        leftMargin=20*mm,
-        topMargin=15*mm,
-        bottomMargin=15*mm
-    )
+    doc = SimpleDocTemplate(buffer, pagesize=A4, **A4_FORM_MARGINS)
 
     elements = []
-    styles = getSampleStyleSheet()
-
-    # Title and header styling
-    annex_style = ParagraphStyle(
-        'AnnexStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        alignment=TA_RIGHT,
-        fontName='Helvetica-Bold'
-    )
-
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        alignment=TA_CENTER,
-        spaceAfter=12,
-        fontName='Helvetica-Bold'
-    )
-
-    schedule_info_style = ParagraphStyle(
-        'ScheduleInfo',
-        parent=styles['Normal'],
-        fontSize=10,
-        fontName='Helvetica'
-    )
 
     template = completion.schedule.template
 
     # Annex code
-    elements.append(Paragraph(f'ANNEX "{template.annex_code}"', annex_style))
+    elements.append(Paragraph(f'ANNEX "{template.annex_code}"', ANNEX_STYLE))
     elements.append(Spacer(1, 10))
 
     # Title
-    elements.append(Paragraph(template.title, title_style))
+    elements.append(Paragraph(template.title, TITLE_STYLE))
     elements.append(Spacer(1, 10))
 
     # Schedule info
@@ -114,26 +43,20 @@ def generate_daily_pm_pdf(completion):
     schedule_text = f"<b>Schedule:</b> {template.schedule_note}<br/>"
     schedule_text += f"<b>Date accomplished:</b> {date_str} ({day_name})"
 
-    elements.append(Paragraph(schedule_text, schedule_info_style))
+    elements.append(Paragraph(schedule_text, SCHEDULE_INFO_STYLE))
     elements.append(Spacer(1, 15))
 
     # Build table - only show the current day's data
     table_data = build_daily_table(completion)
 
-    # Column widths
-    col_widths = [12*mm, 75*mm, 9*mm, 9*mm, 9*mm, 9*mm, 9*mm, 45*mm]
-
-    table = Table(table_data, colWidths=col_widths, repeatRows=2)
-
-    # Apply table style
-    table_style = create_annex_a_table_style(completion)
-    table.setStyle(table_style)
-
-    elements.append(table)
+    # Annex A layout with the weekly task rows (items 6-11) shaded
+    item_numbers = (completion.item_completions.order_by('item__item_number')
+                    .values_list('item__item_number', flat=True))
+    elements.append(ANNEX_A_DAILY.table(table_data, item_numbers))
     elements.append(Spacer(1, 20))
 
     # Signature section
-    add_signature_section(elements, completion, styles)
+    add_signature_section(elements, completion)
 
     doc.build(elements)
     buffer.seek(0)
@@ -146,49 +69,16 @@ def generate_weekly_pm_pdf(template, week_start_date, user):
     Shows the full form with all days filled from their respective completions
     """
     buffer = BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=20*mm,
-        leftMargin=20*mm,
-        topMargin=15*mm,
-        bottomMargin=15*mm
-    )
+    doc = SimpleDocTemplate(buffer, pagesize=A4, **A4_FORM_MARGINS)
 
     elements = []
-    styles = getSampleStyleSheet()
-
-    # Title and header styling
-    annex_style = ParagraphStyle(
-        'AnnexStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        alignment=TA_RIGHT,
-        fontName='Helvetica-Bold'
-    )
-
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        alignment=TA_CENTER,
-        spaceAfter=12,
-        fontName='Helvetica-Bold'
-    )
-
-    schedule_info_style = ParagraphStyle(
-        'ScheduleInfo',
-        parent=styles['Normal'],
-        fontSize=10,
-        fontName='Helvetica'
-    )
 
     # Annex code
-    elements.append(Paragraph(f'ANNEX "{template.annex_code}"', annex_style))
+    elements.append(Paragraph(f'ANNEX "{template.annex_code}"', ANNEX_STYLE))
     elements.append(Spacer(1, 10))
 
     # Title
-    elements.append(Paragraph(template.title, title_style))
+    elements.append(Paragraph(template.title, TITLE_STYLE))
     elements.append(Spacer(1, 10))
 
     # Week info
@@ -196,7 +86,7 @@ def generate_weekly_pm_pdf(template, week_start_date, user):
     schedule_text = f"<b>Schedule:</b> {template.schedule_note}<br/>"
     schedule_text += f"<b>Week of:</b> {monday.strftime('%B %d')} - {friday.strftime('%B %d, %Y')}"
 
-    elements.append(Paragraph(schedule_text, schedule_info_style))
+    elements.append(Paragraph(schedule_text, SCHEDULE_INFO_STYLE))
     elements.append(Spacer(1, 15))
 
     # Get all week's completions
@@ -205,31 +95,18 @@ def generate_weekly_pm_pdf(template, week_start_date, user):
     # Build weekly aggregated table
     table_data = build_weekly_table(template, week_completions)
 
-    # Column widths
-    col_widths = [12*mm, 75*mm, 9*mm, 9*mm, 9*mm, 9*mm, 9*mm, 45*mm]
-
-    table = Table(table_data, colWidths=col_widths, repeatRows=2)
-
-    # Apply table style
-    table_style = create_annex_a_table_style_for_weekly(template)
-    table.setStyle(table_style)
-
-    elements.append(table)
+    # Annex A layout with the weekly task rows (items 6-11) shaded
+    item_numbers = (PMChecklistItem.objects.filter(template=template, is_active=True)
+                    .order_by('item_number').values_list('item_number', flat=True))
+    elements.append(ANNEX_A_DAILY.table(table_data, item_numbers))
     elements.append(Spacer(1, 20))
 
     # Signature section - show who generated the weekly report
-    signature_style = ParagraphStyle(
-        'SignatureStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        fontName='Helvetica'
-    )
-
-    elements.append(Paragraph("<b>Weekly report generated by:</b>", signature_style))
+    elements.append(Paragraph("<b>Weekly report generated by:</b>", SIGNATURE_STYLE))
     elements.append(Spacer(1, 30))
-    elements.append(Paragraph("_" * 50, signature_style))
-    elements.append(Paragraph(f"({user.get_full_name() or user.username})", signature_style))
-    elements.append(Paragraph(f"Generated on: {timezone.now().strftime('%B %d, %Y')}", signature_style))
+    elements.append(Paragraph("_" * 50, SIGNATURE_STYLE))
+    elements.append(Paragraph(f"({user.get_full_name() or user.username})", SIGNATURE_STYLE))
+    elements.append(Paragraph(f"Generated on: {timezone.now().strftime('%B %d, %Y')}", SIGNATURE_STYLE))
 
     doc.build(elements)
     buffer.seek(0)
@@ -239,59 +116,14 @@ def generate_weekly_pm_pdf(template, week_start_date, user):
 def build_daily_table(completion):
     """Build table for a SINGLE day's completion - only one column filled"""
 
-    from reportlab.platypus import Paragraph
-    from reportlab.lib.styles import ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-
     item_completions = completion.item_completions.all().select_related('item').order_by('item__item_number')
 
     # Determine which day this completion is for
     weekday = completion.completion_date.weekday()  # 0=Monday, 4=Friday
 
-    # Create styles
-    header_style = ParagraphStyle(
-        'HeaderStyle',
-        fontName='Helvetica-Bold',
-        fontSize=8,
-        leading=9,
-        alignment=TA_CENTER,
-    )
-
-    task_style = ParagraphStyle(
-        'TaskStyle',
-        fontName='Helvetica',
-        fontSize=8,
-        leading=10,
-        alignment=TA_LEFT,
-    )
-
-    center_style = ParagraphStyle(
-        'CenterStyle',
-        fontName='Helvetica',
-        fontSize=8,
-        alignment=TA_CENTER,
-    )
-
     # Header rows
-    header_row1 = [
-        Paragraph('<b>Item<br/>No.</b>', header_style),
-        Paragraph('<b>Task</b>', header_style),
-        Paragraph('<b>Status<br/>(put ✓ if done)</b>', header_style),
-        '', '', '', '',
-        Paragraph('<b>Problems<br/>Encountered/Action</b>', header_style)
-    ]
-
-    header_row2 = [
-        '', '',
-        Paragraph('<b>M</b>', center_style),
-        Paragraph('<b>T</b>', center_style),
-        Paragraph('<b>W</b>', center_style),
-        Paragraph('<b>Th</b>', center_style),
-        Paragraph('<b>F</b>', center_style),
-        ''
-    ]
-
-    table_data = [header_row1, header_row2]
+    table_data = ANNEX_A_DAILY.header_rows()
+    day = day_cells()
 
     # Add data rows
     for item_comp in item_completions:
@@ -312,7 +144,7 @@ def build_daily_table(completion):
             task_text += "<br/><br/><i>(Completed on Friday)</i>"
 
         # Checkmarks - only fill the current day's column
-        checks = ["", "", "", "", ""]  # M, T, W, Th, F
+        checks = [False, False, False, False, False]  # M, T, W, Th, F
 
         # For weekly Friday-only items (6-8, 11), don't show checkmark on Mon-Thu
         if not is_disabled_today:
@@ -330,7 +162,7 @@ def build_daily_table(completion):
                 is_completed = item_comp.friday
 
             if is_completed:
-                checks[weekday] = "✓"
+                checks[weekday] = True
 
         # Problems/Actions - don't show for disabled items
         problems_text = ""
@@ -343,14 +175,14 @@ def build_daily_table(completion):
                 problems_text += item_comp.action_taken
 
         table_data.append([
-            Paragraph(str(item.item_number), center_style),
-            Paragraph(task_text, task_style),
-            Paragraph(checks[0], center_style),  # Monday
-            Paragraph(checks[1], center_style),  # Tuesday
-            Paragraph(checks[2], center_style),  # Wednesday
-            Paragraph(checks[3], center_style),  # Thursday
-            Paragraph(checks[4], center_style),  # Friday
-            Paragraph(problems_text, task_style) if problems_text else ""
+            Paragraph(str(item.item_number), CENTER_CELL_STYLE),
+            Paragraph(task_text, TASK_CELL_STYLE),
+            day[checks[0]],  # Monday
+            day[checks[1]],  # Tuesday
+            day[checks[2]],  # Wednesday
+            day[checks[3]],  # Thursday
+            day[checks[4]],  # Friday
+            Paragraph(problems_text, TASK_CELL_STYLE) if problems_text else ""
         ])
 
     return table_data
@@ -359,57 +191,12 @@ def build_daily_table(completion):
 def build_weekly_table(template, week_completions):
     """Build table aggregating ALL 5 days of completions"""
 
-    from reportlab.platypus import Paragraph
-    from reportlab.lib.styles import ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-
     # Get all items for this template
     items = PMChecklistItem.objects.filter(template=template, is_active=True).order_by('item_number')
 
-    # Create styles
-    header_style = ParagraphStyle(
-        'HeaderStyle',
-        fontName='Helvetica-Bold',
-        fontSize=8,
-        leading=9,
-        alignment=TA_CENTER,
-    )
-
-    task_style = ParagraphStyle(
-        'TaskStyle',
-        fontName='Helvetica',
-        fontSize=8,
-        leading=10,
-        alignment=TA_LEFT,
-    )
-
-    center_style = ParagraphStyle(
-        'CenterStyle',
-        fontName='Helvetica',
-        fontSize=8,
-        alignment=TA_CENTER,
-    )
-
     # Header rows
-    header_row1 = [
-        Paragraph('<b>Item<br/>No.</b>', header_style),
-        Paragraph('<b>Task</b>', header_style),
-        Paragraph('<b>Status<br/>(put ✓ if done)</b>', header_style),
-        '', '', '', '',
-        Paragraph('<b>Problems<br/>Encountered/Action</b>', header_style)
-    ]
-
-    header_row2 = [
-        '', '',
-        Paragraph('<b>M</b>', center_style),
-        Paragraph('<b>T</b>', center_style),
-        Paragraph('<b>W</b>', center_style),
-        Paragraph('<b>Th</b>', center_style),
-        Paragraph('<b>F</b>', center_style),
-        ''
-    ]
-
-    table_data = [header_row1, header_row2]
+    table_data = ANNEX_A_DAILY.header_rows()
+    day = day_cells()
 
     # For each item, aggregate completion status across all 5 days
     for item in items:
@@ -420,7 +207,7 @@ def build_weekly_table(template, week_completions):
             task_text = f"{task_text}<br/><br/><b>Times:</b> {time_list}"
 
         # Checkmarks for each day
-        checks = ["", "", "", "", ""]  # M, T, W, Th, F
+        checks = [False, False, False, False, False]  # M, T, W, Th, F
 
         # Aggregate problems from all days
         all_problems = []
@@ -446,7 +233,7 @@ def build_weekly_table(template, week_completions):
                         is_completed = item_comp.friday
 
                     if is_completed:
-                        checks[weekday] = "✓"
+                        checks[weekday] = True
 
                     # Collect problems
                     if item_comp.problems_encountered:
@@ -460,136 +247,23 @@ def build_weekly_table(template, week_completions):
         problems_text = "<br/>".join(all_problems)
 
         table_data.append([
-            Paragraph(str(item.item_number), center_style),
-            Paragraph(task_text, task_style),
-            Paragraph(checks[0], center_style),  # Monday
-            Paragraph(checks[1], center_style),  # Tuesday
-            Paragraph(checks[2], center_style),  # Wednesday
-            Paragraph(checks[3], center_style),  # Thursday
-            Paragraph(checks[4], center_style),  # Friday
-            Paragraph(problems_text, task_style) if problems_text else ""
+            Paragraph(str(item.item_number), CENTER_CELL_STYLE),
+            Paragraph(task_text, TASK_CELL_STYLE),
+            day[checks[0]],  # Monday
+            day[checks[1]],  # Tuesday
+            day[checks[2]],  # Wednesday
+            day[checks[3]],  # Thursday
+            day[checks[4]],  # Friday
+            Paragraph(problems_text, TASK_CELL_STYLE) if problems_text else ""
         ])
 
     return table_data
 
 
-def create_annex_a_table_style(completion):
-    """Create table style for Annex A with proper formatting"""
-
-    item_completions = completion.item_completions.all().select_related('item').order_by('item__item_number')
-
-    table_style_list = [
-        # Header rows
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('BACKGROUND', (0, 1), (-1, 1), colors.lightgrey),
-
-        # Merge cells
-        ('SPAN', (0, 0), (0, 1)),  # Item No.
-        ('SPAN', (1, 0), (1, 1)),  # Task
-        ('SPAN', (2, 0), (6, 0)),  # Status spans M-F
-        ('SPAN', (7, 0), (7, 1)),  # Problems
-
-        # Alignment
-        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('ALIGN', (2, 0), (6, -1), 'CENTER'),
-        ('ALIGN', (7, 0), (7, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-
-        # Fonts
-        ('FONTNAME', (0, 0), (-1, 1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 1), 8),
-        ('FONTSIZE', (0, 2), (-1, -1), 8),
-
-        # Padding
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('LEFTPADDING', (0, 0), (-1, -1), 3),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-
-        # Grid
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-    ]
-
-    # Dark gray for weekly tasks (items 6-11)
-    # Only shade columns 0-5 (Item No, Task, M, T, W, Th)
-    # Leave column 6 (F/Friday) and column 7 (Problems) unshaded
-    weekly_task_color = colors.Color(0.45, 0.45, 0.45)
-
-    for idx, item_comp in enumerate(item_completions):
-        row_index = idx + 2
-        if item_comp.item.item_number in [6, 7, 8, 9, 10, 11]:
-            # Shade only columns 0-5, not column 6 (Friday) or column 7 (Problems)
-            table_style_list.append(('BACKGROUND', (0, row_index), (5, row_index), weekly_task_color))
-            table_style_list.append(('TEXTCOLOR', (0, row_index), (5, row_index), colors.white))
-
-    return TableStyle(table_style_list)
-
-
-def create_annex_a_table_style_for_weekly(template):
-    """Create table style for weekly aggregated report"""
-
-    items = PMChecklistItem.objects.filter(template=template, is_active=True).order_by('item_number')
-
-    table_style_list = [
-        # Header rows
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('BACKGROUND', (0, 1), (-1, 1), colors.lightgrey),
-
-        # Merge cells
-        ('SPAN', (0, 0), (0, 1)),  # Item No.
-        ('SPAN', (1, 0), (1, 1)),  # Task
-        ('SPAN', (2, 0), (6, 0)),  # Status spans M-F
-        ('SPAN', (7, 0), (7, 1)),  # Problems
-
-        # Alignment
-        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('ALIGN', (2, 0), (6, -1), 'CENTER'),
-        ('ALIGN', (7, 0), (7, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-
-        # Fonts
-        ('FONTNAME', (0, 0), (-1, 1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 1), 8),
-        ('FONTSIZE', (0, 2), (-1, -1), 8),
-
-        # Padding
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('LEFTPADDING', (0, 0), (-1, -1), 3),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-
-        # Grid
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-    ]
-
-    # Dark gray for weekly tasks (items 6-11)
-    # Only shade columns 0-5 (Item No, Task, M, T, W, Th)
-    # Leave column 6 (F/Friday) and column 7 (Problems) unshaded
-    weekly_task_color = colors.Color(0.45, 0.45, 0.45)
-
-    for idx, item in enumerate(items):
-        row_index = idx + 2
-        if item.item_number in [6, 7, 8, 9, 10, 11]:
-            # Shade only columns 0-5, not column 6 (Friday) or column 7 (Problems)
-            table_style_list.append(('BACKGROUND', (0, row_index), (5, row_index), weekly_task_color))
-            table_style_list.append(('TEXTCOLOR', (0, row_index), (5, row_index), colors.white))
-
-    return TableStyle(table_style_list)
-
-
-def add_signature_section(elements, completion, styles):
+def add_signature_section(elements, completion):
     """Add signature section to PDF"""
-    signature_style = ParagraphStyle(
-        'SignatureStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        fontName='Helvetica'
-    )
-
-    elements.append(Paragraph("<b>Accomplished by:</b>", signature_style))
+    elements.append(Paragraph("<b>Accomplished by:</b>", SIGNATURE_STYLE))
     elements.append(Spacer(1, 30))
-    elements.append(Paragraph("_" * 50, signature_style))
-    elements.append(Paragraph(f"({completion.printed_name or completion.completed_by.get_full_name() or completion.completed_by.username})", signature_style))
-    elements.append(Paragraph("(Signature over printed name)", signature_style))
+    elements.append(Paragraph("_" * 50, SIGNATURE_STYLE))
+    elements.append(Paragraph(f"({completion.printed_name or completion.completed_by.get_full_name() or completion.completed_by.username})", SIGNATURE_STYLE))
+    elements.append(Paragraph("(Signature over printed name)", SIGNATURE_STYLE))
@@ -4,14 +4,13 @@ PDF Export for Annex B (Monthly) and Annex C (Weekly) PM Checklists
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from datetime import datetime
 
 from .models import PMChecklistCompletion
+from .pm_pdf_styles import (
+    LETTER_ANNEX_B, LETTER_ANNEX_C, LETTER_FORM_MARGINS, LETTER_NORMAL_STYLE, LETTER_TITLE_STYLE,
+)
 
 
 def export_monthly_pm_pdf(request, completion_id):
@@ -27,43 +26,21 @@ def export_monthly_pm_pdf(request, completion_id):
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
     # Create PDF
-    doc = SimpleDocTemplate(response, pagesize=letter,
-                           topMargin=0.5*inch, bottomMargin=0.5*inch,
-                           leftMargin=0.5*inch, rightMargin=0.5*inch)
+    doc = SimpleDocTemplate(response, pagesize=letter, **LETTER_FORM_MARGINS)
 
     elements = []
-    styles = getSampleStyleSheet()
 
     # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        textColor=colors.black,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-
-    elements.append(Paragraph(f'ANNEX "B"', title_style))
-    elements.append(Paragraph(template.title, title_style))
+    elements.append(Paragraph(f'ANNEX "B"', LETTER_TITLE_STYLE))
+    elements.append(Paragraph(template.title, LETTER_TITLE_STYLE))
 
     # Schedule and Date
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        fontName='Helvetica'
-    )
-
-    elements.append(Paragraph(f'<b>Schedule:</b> {template.schedule_note}', normal_style))
-    elements.append(Paragraph(f'<b>Date accomplished:</b> {completion.completion_date.strftime("%B %d, %Y")}', normal_style))
+    elements.append(Paragraph(f'<b>Schedule:</b> {template.schedule_note}', LETTER_NORMAL_STYLE))
+    elements.append(Paragraph(f'<b>Date accomplished:</b> {completion.completion_date.strftime("%B %d, %Y")}', LETTER_NORMAL_STYLE))
     elements.append(Spacer(1, 12))
 
     # Create table data
-    table_data = [
-        ['Item\nNo.', 'Task', 'Status\n(put ✓ if done)', 'Problems\nEncountered/Action']
-    ]
+    table_data = LETTER_ANNEX_B.header_rows()
 
     # Get item completions
     item_completions = completion.item_completions.all().order_by('item__item_number')
@@ -72,7 +49,7 @@ def export_monthly_pm_pdf(request, completion_id):
         item = item_comp.item
 
         # Task description
-        task_text = Paragraph(item.task_description.replace('\n', '<br/>'), normal_style)
+        task_text = Paragraph(item.task_description.replace('\n', '<br/>'), LETTER_NORMAL_STYLE)
 
         # Status (checkmark if completed)
         status = '✓' if item_comp.is_completed else ''
@@ -83,7 +60,7 @@ def export_monthly_pm_pdf(request, completion_id):
             problems_action += f"<b>Problems:</b> {item_comp.problems_encountered}<br/>"
         if item_comp.action_taken:
             problems_action += f"<b>Action:</b> {item_comp.action_taken}"
-        problems_action_text = Paragraph(problems_action if problems_action else '', normal_style)
+        problems_action_text = Paragraph(problems_action if problems_action else '', LETTER_NORMAL_STYLE)
 
         table_data.append([
             str(item.item_number),
@@ -93,40 +70,16 @@ def export_monthly_pm_pdf(request, completion_id):
         ])
 
     # Create table
-    table = Table(table_data, colWidths=[0.6*inch, 3.5*inch, 0.9*inch, 2.5*inch])
-
-    # Table style
-    table_style = TableStyle([
-        # Header row
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-
-        # All cells
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Item number center
-        ('ALIGN', (2, 1), (2, -1), 'CENTER'),  # Status center
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-
-        # Grid
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.Color(0.95, 0.95, 0.95)]),
-    ])
-
-    table.setStyle(table_style)
+    table = LETTER_ANNEX_B.table(table_data)
     elements.append(table)
 
     # Signature section
     elements.append(Spacer(1, 30))
-    elements.append(Paragraph('<b>Accomplished by:</b>', normal_style))
+    elements.append(Paragraph('<b>Accomplished by:</b>', LETTER_NORMAL_STYLE))
     elements.append(Spacer(1, 30))
-    elements.append(Paragraph('_' * 50, normal_style))
-    elements.append(Paragraph(f'({completion.printed_name or completion.completed_by.get_full_name() or completion.completed_by.username})', normal_style))
-    elements.append(Paragraph('(Signature over printed name)', normal_style))
+    elements.append(Paragraph('_' * 50, LETTER_NORMAL_STYLE))
+    elements.append(Paragraph(f'({completion.printed_name or completion.completed_by.get_full_name() or completion.completed_by.username})', LETTER_NORMAL_STYLE))
+    elements.append(Paragraph('(Signature over printed name)', LETTER_NORMAL_STYLE))
 
     # Build PDF
     doc.build(elements)
@@ -146,45 +99,23 @@ def export_weekly_pm_pdf(request, completion_id):
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
     # Create PDF
-    doc = SimpleDocTemplate(response, pagesize=letter,
-                           topMargin=0.5*inch, bottomMargin=0.5*inch,
-                           leftMargin=0.5*inch, rightMargin=0.5*inch)
+    doc = SimpleDocTemplate(response, pagesize=letter, **LETTER_FORM_MARGINS)
 
     elements = []
-    styles = getSampleStyleSheet()
 
     # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        textColor=colors.black,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-
-    elements.append(Paragraph(f'ANNEX "C"', title_style))
-    elements.append(Paragraph(template.title, title_style))
+    elements.append(Paragraph(f'ANNEX "C"', LETTER_TITLE_STYLE))
+    elements.append(Paragraph(template.title, LETTER_TITLE_STYLE))
 
     # Schedule, Location, and Date
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        fontName='Helvetica'
-    )
-
-    elements.append(Paragraph(f'<b>Schedule:</b> {template.schedule_note}', normal_style))
+    elements.append(Paragraph(f'<b>Schedule:</b> {template.schedule_note}', LETTER_NORMAL_STYLE))
     if schedule.location:
-        elements.append(Paragraph(f'<b>Location of FD/BD:</b> {schedule.location}', normal_style))
-    elements.append(Paragraph(f'<b>Date accomplished:</b> {completion.completion_date.strftime("%B %Y")}', normal_style))
+        elements.append(Paragraph(f'<b>Location of FD/BD:</b> {schedule.location}', LETTER_NORMAL_STYLE))
+    elements.append(Paragraph(f'<b>Date accomplished:</b> {completion.completion_date.strftime("%B %Y")}', LETTER_NORMAL_STYLE))
     elements.append(Spacer(1, 12))
 
     # Create table data with 4 weeks
-    table_data = [
-        ['Item\nNo.', 'Task', 'Wk1', 'Wk2', 'Wk3', 'Wk4', 'Problems\nEncountered/Action']
-    ]
+    table_data = LETTER_ANNEX_C.header_rows()
 
     # Get item completions
     item_completions = completion.item_completions.all().order_by('item__item_number')
@@ -193,7 +124,7 @@ def export_weekly_pm_pdf(request, completion_id):
         item = item_comp.item
 
         # Task description
-        task_text = Paragraph(item.task_description.replace('\n', '<br/>'), normal_style)
+        task_text = Paragraph(item.task_description.replace('\n', '<br/>'), LETTER_NORMAL_STYLE)
 
         # Week checkmarks
         wk1 = '✓' if item_comp.week1 else ''
@@ -207,7 +138,7 @@ def export_weekly_pm_pdf(request, completion_id):
             problems_action += f"{item_comp.problems_encountered}<br/>"
         if item_comp.action_taken:
             problems_action += f"{item_comp.action_taken}"
-        problems_action_text = Paragraph(problems_action if problems_action else '', normal_style)
+        problems_action_text = Paragraph(problems_action if problems_action else '', LETTER_NORMAL_STYLE)
 
         table_data.append([
             str(item.item_number),
@@ -220,40 +151,16 @@ def export_weekly_pm_pdf(request, completion_id):
         ])
 
     # Create table
-    table = Table(table_data, colWidths=[0.5*inch, 2.8*inch, 0.5*inch, 0.5*inch, 0.5*inch, 0.5*inch, 2.2*inch])
-
-    # Table style
-    table_style = TableStyle([
-        # Header row
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-
-        # All cells
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Item number center
-        ('ALIGN', (2, 1), (5, -1), 'CENTER'),  # Week columns center
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-
-        # Grid
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.Color(0.95, 0.95, 0.95)]),
-    ])
-
-    table.setStyle(table_style)
+    table = LETTER_ANNEX_C.table(table_data)
     elements.append(table)
 
     # Signature section
     elements.append(Spacer(1, 30))
-    elements.append(Paragraph('<b>Accomplished by:</b>', normal_style))
+    elements.append(Paragraph('<b>Accomplished by:</b>', LETTER_NORMAL_STYLE))
     elements.append(Spacer(1, 30))
-    elements.append(Paragraph('_' * 50, normal_style))
-    elements.append(Paragraph(f'({completion.printed_name or completion.completed_by.get_full_name() or completion.completed_by.username})', normal_style))
-    elements.append(Paragraph('(Signature over printed name)', normal_style))
+    elements.append(Paragraph('_' * 50, LETTER_NORMAL_STYLE))
+    elements.append(Paragraph(f'({completion.printed_name or completion.completed_by.get_full_name() or completion.completed_by.username})', LETTER_NORMAL_STYLE))
+    elements.append(Paragraph('(Signature over printed name)', LETTER_NORMAL_STYLE))
 
     # Build PDF
     doc.build(elements)
@@ -5,16 +5,17 @@ Generates A4 format PDFs matching the original paper forms
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, Image
 from django.conf import settings
 from io import BytesIO
 import os
 
 from .models import PMChecklistCompletion, PMChecklistItemCompletion
+from .pm_pdf_styles import (
+    A4_FORM_MARGINS, ANNEX_A, ANNEX_B, ANNEX_C, ANNEX_LAYOUTS, ANNEX_STYLE, CENTER_CELL_STYLE, REPORT_DETAIL_TABLE_STYLE,
+    REPORT_SUMMARY_TABLE_STYLE, REPORT_TITLE_STYLE, SAMPLE_STYLES, SCHEDULE_INFO_STYLE, SIGNATURE_STYLE,
+    TASK_CELL_STYLE, TITLE_STYLE, day_cells,
+)
 
 
 def generate_pm_checklist_pdf(completion):
@@ -24,66 +25,32 @@ def generate_pm_checklist_pdf(completion):
     """
     
     buffer = BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=20*mm,
-        leftMargin=20*mm,
-        topMargin=15*mm,
-        bottomMargin=15*mm
-    )
+    doc = SimpleDocTemplate(buffer, pagesize=A4, **A4_FORM_MARGINS)
     
     # Container for PDF elements
     elements = []
     
-    # Styles
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        alignment=TA_CENTER,
-        spaceAfter=12,
-        fontName='Helvetica-Bold'
-    )
-    
-    annex_style = ParagraphStyle(
-        'AnnexStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        alignment=TA_RIGHT,
-        fontName='Helvetica-Bold'
-    )
-    
     schedule = completion.schedule
     template = schedule.template
     
     # Annex code (top right)
     annex_text = f'ANNEX "{template.annex_code}"'
-    elements.append(Paragraph(annex_text, annex_style))
+    elements.append(Paragraph(annex_text, ANNEX_STYLE))
     elements.append(Spacer(1, 10))
     
     # Title
-    title = Paragraph(template.title, title_style)
+    title = Paragraph(template.title, TITLE_STYLE)
     elements.append(title)
     elements.append(Spacer(1, 10))
     
     # Schedule information
-    schedule_info_style = ParagraphStyle(
-        'ScheduleInfo',
-        parent=styles['Normal'],
-        fontSize=10,
-        fontName='Helvetica'
-    )
-    
     schedule_text = f"<b>Schedule:</b> {template.schedule_note}<br/>"
     schedule_text += f"<b>Date accomplished:</b> {completion.completion_date.strftime('%B %d, %Y')}"
     
     if schedule.location:
         schedule_text += f"<br/><b>Location of FD/BD:</b> {schedule.location}"
     
-    elements.append(Paragraph(schedule_text, schedule_info_style))
+    elements.append(Paragraph(schedule_text, SCHEDULE_INFO_STYLE))
     elements.append(Spacer(1, 15))
 
     # Get item completions for styling (needed for Annex A weekly tasks shading)
@@ -101,93 +68,15 @@ def generate_pm_checklist_pdf(completion):
     else:
         table_data = build_simple_table(completion)
 
-    # Create table with different column widths based on annex type
-    if template.annex_code == 'A':
-        # 8 columns: Item No | Task | M | T | W | Th | F | Problems
-        col_widths = [12*mm, 75*mm, 9*mm, 9*mm, 9*mm, 9*mm, 9*mm, 45*mm]
-    elif template.annex_code == 'C':
-        col_widths = [15*mm, 80*mm, 45*mm, 50*mm]
-    else:
-        col_widths = [15*mm, 100*mm, 35*mm, 40*mm]
-
-    table = Table(table_data, colWidths=col_widths, repeatRows=2 if template.annex_code == 'A' else 1)
-
-    # Table style
-    if template.annex_code == 'A':
-        table_style_list = [
-            # Header row 1 - gray background
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            # Header row 2 - gray background
-            ('BACKGROUND', (0, 1), (-1, 1), colors.lightgrey),
-
-            # Merge cells for header row 1
-            ('SPAN', (0, 0), (0, 1)),  # Item No. spans 2 rows
-            ('SPAN', (1, 0), (1, 1)),  # Task spans 2 rows
-            ('SPAN', (2, 0), (6, 0)),  # Status spans 5 columns (M T W Th F)
-            ('SPAN', (7, 0), (7, 1)),  # Problems spans 2 rows
-
-            # Alignment
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),  # Item No. centered
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),    # Task left-aligned
-            ('ALIGN', (2, 0), (6, -1), 'CENTER'),  # Status columns centered
-            ('ALIGN', (7, 0), (7, -1), 'LEFT'),    # Problems left-aligned
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-
-            # Fonts
-            ('FONTNAME', (0, 0), (-1, 1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 1), 8),
-            ('FONTSIZE', (0, 2), (-1, -1), 8),
-
-            # Padding
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('LEFTPADDING', (0, 0), (-1, -1), 3),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-
-            # Grid lines
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ]
-
-        # Add VERY dark gray shading for weekly tasks (items 7-11)
-        # Weekly tasks start at row index 2 (after 2 header rows) + position in filtered items
-        weekly_task_color = colors.Color(0.45, 0.45, 0.45)  # Dark gray matching template
-
-        # Find which rows contain items 7-11
-        for idx, item_comp in enumerate(item_completions):
-            row_index = idx + 2  # +2 for the 2 header rows
-            if item_comp.item.item_number in [7, 8, 9, 10, 11]:
-                table_style_list.append(('BACKGROUND', (0, row_index), (-1, row_index), weekly_task_color))
-                # Make text white on dark background
-                table_style_list.append(('TEXTCOLOR', (0, row_index), (-1, row_index), colors.white))
-    else:
-        table_style_list = [
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('TOPPADDING', (0, 1), (-1, -1), 5),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ]
-
-    table_style = TableStyle(table_style_list)
-    table.setStyle(table_style)
-    elements.append(table)
+    # Column widths, header rows and table style come from the annex layout;
+    # Annex A also shades its weekly task rows (items 7-11)
+    layout = ANNEX_LAYOUTS.get(template.annex_code, ANNEX_B)
+    item_numbers = [item_comp.item.item_number for item_comp in item_completions] if layout.shaded_items else ()
+    elements.append(layout.table(table_data, item_numbers))
     elements.append(Spacer(1, 20))
     
     # Signature section
-    signature_style = ParagraphStyle(
-        'SignatureStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        fontName='Helvetica'
-    )
-    
-    elements.append(Paragraph("<b>Accomplished by:</b>", signature_style))
+    elements.append(Paragraph("<b>Accomplished by:</b>", SIGNATURE_STYLE))
     elements.append(Spacer(1, 30))
     
     # Add signature image if available
@@ -201,9 +90,9 @@ def generate_pm_checklist_pdf(completion):
             pass
     
     elements.append(Spacer(1, 5))
-    elements.append(Paragraph("_" * 50, signature_style))
-    elements.append(Paragraph(f"({completion.printed_name or completion.completed_by.get_full_name() or completion.completed_by.username})", signature_style))
-    elements.append(Paragraph("(Signature over printed name)", signature_style))
+    elements.append(Paragraph("_" * 50, SIGNATURE_STYLE))
+    elements.append(Paragraph(f"({completion.printed_name or completion.completed_by.get_full_name() or completion.completed_by.username})", SIGNATURE_STYLE))
+    elements.append(Paragraph("(Signature over printed name)", SIGNATURE_STYLE))
     
     # Build PDF
     doc.build(elements)
@@ -215,60 +104,11 @@ def generate_pm_checklist_pdf(completion):
 def build_annex_a_table(completion):
     """Build table for Annex A (Daily/Weekly) - matches exact template format"""
 
-    from reportlab.platypus import Paragraph
-    from reportlab.lib.styles import ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-
     item_completions = completion.item_completions.all().select_related('item').order_by('item__item_number')
 
-    # Create styles
-    header_style = ParagraphStyle(
-        'HeaderStyle',
-        fontName='Helvetica-Bold',
-        fontSize=8,
-        leading=9,
-        alignment=TA_CENTER,
-    )
-
-    task_style = ParagraphStyle(
-        'TaskStyle',
-        fontName='Helvetica',
-        fontSize=8,
-        leading=10,
-        alignment=TA_LEFT,
-    )
-
-    center_style = ParagraphStyle(
-        'CenterStyle',
-        fontName='Helvetica',
-        fontSize=8,
-        alignment=TA_CENTER,
-    )
-
     # Header rows - Status column spans 5 sub-columns
-    header_row1 = [
-        Paragraph('<b>Item<br/>No.</b>', header_style),
-        Paragraph('<b>Task</b>', header_style),
-        Paragraph('<b>Status<br/>(put ✓ if done)</b>', header_style),  # This will span 5 columns
-        '',  # Placeholder for colspan
-        '',  # Placeholder for colspan
-        '',  # Placeholder for colspan
-        '',  # Placeholder for colspan
-        Paragraph('<b>Problems<br/>Encountered/Action</b>', header_style)
-    ]
-
-    header_row2 = [
-        '',  # Empty for Item No.
-        '',  # Empty for Task
-        Paragraph('<b>M</b>', center_style),
-        Paragraph('<b>T</b>', center_style),
-        Paragraph('<b>W</b>', center_style),
-        Paragraph('<b>Th</b>', center_style),
-        Paragraph('<b>F</b>', center_style),
-        '',  # Empty for Problems
-    ]
-
-    table_data = [header_row1, header_row2]
+    table_data = ANNEX_A.header_rows()
+    day = day_cells()
 
     for item_comp in item_completions:
         item = item_comp.item
@@ -280,12 +120,6 @@ def build_annex_a_table(completion):
             time_list = "<br/>".join(item.schedule_times)
             task_text = f"{task_text}<br/><br/>{time_list}"
 
-        # Status checkmarks for each day
-        mon = "✓" if item_comp.monday else ""
-        tue = "✓" if item_comp.tuesday else ""
-        wed = "✓" if item_comp.wednesday else ""
-        thu = "✓" if item_comp.thursday else ""
-        fri = "✓" if item_comp.friday else ""
 
         # Problems/Actions
         problems_text = ""
@@ -297,14 +131,15 @@ def build_annex_a_table(completion):
             problems_text += item_comp.action_taken
 
         table_data.append([
-            Paragraph(str(item.item_number), center_style),
-            Paragraph(task_text, task_style),
-            Paragraph(mon, center_style),
-            Paragraph(tue, center_style),
-            Paragraph(wed, center_style),
-            Paragraph(thu, center_style),
-            Paragraph(fri, center_style),
-            Paragraph(problems_text, task_style) if problems_text else ""
+            Paragraph(str(item.item_number), CENTER_CELL_STYLE),
+            Paragraph(task_text, TASK_CELL_STYLE),
+            # Status checkmarks for each day
+            day[item_comp.monday],
+            day[item_comp.tuesday],
+            day[item_comp.wednesday],
+            day[item_comp.thursday],
+            day[item_comp.friday],
+            Paragraph(problems_text, TASK_CELL_STYLE) if problems_text else ""
         ])
 
     return table_data
@@ -315,15 +150,7 @@ def build_annex_b_table(completion):
     
     item_completions = completion.item_completions.all().select_related('item').order_by('item__item_number')
     
-    # Header row
-    header = [
-        'Item\nNo.',
-        'Task',
-        'Status\n(put ✓ if done)',
-        'Problems Encountered/Action'
-    ]
-    
-    table_data = [header]
+    table_data = ANNEX_B.header_rows()
     
     for item_comp in item_completions:
         item = item_comp.item
@@ -353,15 +180,7 @@ def build_annex_c_table(completion):
     
     item_completions = completion.item_completions.all().select_related('item').order_by('item__item_number')
     
-    # Header row
-    header = [
-        'Item\nNo.',
-        'Task',
-        'Status\n(put ✓ if done)\nWk1  Wk2  Wk3  Wk4',
-        'Problems\nEncountered/Action'
-    ]
-    
-    table_data = [header]
+    table_data = ANNEX_C.header_rows()
     
     for item_comp in item_completions:
         item = item_comp.item
@@ -408,34 +227,17 @@ def generate_monthly_report_pdf(report):
     """
     
     buffer = BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=20*mm,
-        leftMargin=20*mm,
-        topMargin=15*mm,
-        bottomMargin=15*mm
-    )
+    doc = SimpleDocTemplate(buffer, pagesize=A4, **A4_FORM_MARGINS)
     
     elements = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'ReportTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        alignment=TA_CENTER,
-        spaceAfter=20,
-        fontName='Helvetica-Bold'
-    )
     
     # Title
     title_text = f"Preventive Maintenance Report<br/>{report.get_report_type_display()}"
-    elements.append(Paragraph(title_text, title_style))
+    elements.append(Paragraph(title_text, REPORT_TITLE_STYLE))
     
     # Period
     period_text = f"Period: {report.period_start.strftime('%B %d, %Y')} to {report.period_end.strftime('%B %d, %Y')}"
-    elements.append(Paragraph(period_text, styles['Normal']))
+    elements.append(Paragraph(period_text, SAMPLE_STYLES['Normal']))
     elements.append(Spacer(1, 20))
     
     # Summary statistics
@@ -449,16 +251,7 @@ def generate_monthly_report_pdf(report):
     ]
     
     summary_table = Table(summary_data, colWidths=[120*mm, 50*mm])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-    ]))
+    summary_table.setStyle(REPORT_SUMMARY_TABLE_STYLE)
     
     elements.append(summary_table)
     elements.append(Spacer(1, 30))
@@ -476,7 +269,7 @@ def generate_monthly_report_pdf(report):
     
     # Completed checklists detail
     if completions.exists():
-        elements.append(Paragraph("Completed Checklists Detail", styles['Heading2']))
+        elements.append(Paragraph("Completed Checklists Detail", SAMPLE_STYLES['Heading2']))
         elements.append(Spacer(1, 10))
         
         detail_data = [['Date', 'Checklist Type', 'Completed By', 'Issues']]
@@ -492,15 +285,7 @@ def generate_monthly_report_pdf(report):
             ])
         
         detail_table = Table(detail_data, colWidths=[30*mm, 70*mm, 50*mm, 20*mm])
-        detail_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-        ]))
+        detail_table.setStyle(REPORT_DETAIL_TABLE_STYLE)
         
         elements.append(detail_table)
     
@@ -508,7 +293,7 @@ def generate_monthly_report_pdf(report):
     elements.append(Spacer(1, 30))
     footer_text = f"Generated by: {report.generated_by.get_full_name() or report.generated_by.username}<br/>"
     footer_text += f"Generated on: {report.generated_at.strftime('%B %d, %Y at %I:%M %p')}"
-    elements.append(Paragraph(footer_text, styles['Normal']))
+    elements.append(Paragraph(footer_text, SAMPLE_STYLES['Normal']))
     
     doc.build(elements)
     
@@ -0,0 +1,270 @@
+"""
+Shared ReportLab styles and table layouts for the PM checklist PDFs
+(pm_pdf_export, pm_daily_weekly_export, pm_monthly_weekly_export).
+
+The sample stylesheet, the ParagraphStyles and the TableStyle command lists
+never change between exports, so they are built once at import instead of
+on every PDF. Styles are only read while a document is built and are safe to
+share between threads; flowables are not (Paragraph and Table keep layout
+state), so AnnexLayout hands out new header rows and a new Table per PDF.
+
+    table_data = ANNEX_A.header_rows() + rows
+    table = ANNEX_A.table(table_data, item_numbers)
+"""
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch, mm
+from reportlab.platypus import Paragraph, Table, TableStyle
+
+SAMPLE_STYLES = getSampleStyleSheet()
+
+# A4 forms (pm_pdf_export, pm_daily_weekly_export)
+A4_FORM_MARGINS = dict(rightMargin=20*mm, leftMargin=20*mm, topMargin=15*mm, bottomMargin=15*mm)
+
+ANNEX_STYLE = ParagraphStyle(
+    'AnnexStyle', parent=SAMPLE_STYLES['Normal'], fontSize=10, alignment=TA_RIGHT, fontName='Helvetica-Bold',
+)
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle', parent=SAMPLE_STYLES['Heading1'], fontSize=14, alignment=TA_CENTER, spaceAfter=12,
+    fontName='Helvetica-Bold',
+)
+SCHEDULE_INFO_STYLE = ParagraphStyle(
+    'ScheduleInfo', parent=SAMPLE_STYLES['Normal'], fontSize=10, fontName='Helvetica',
+)
+SIGNATURE_STYLE = ParagraphStyle(
+    'SignatureStyle', parent=SAMPLE_STYLES['Normal'], fontSize=10, fontName='Helvetica',
+)
+REPORT_TITLE_STYLE = ParagraphStyle(
+    'ReportTitle', parent=SAMPLE_STYLES['Heading1'], fontSize=16, alignment=TA_CENTER, spaceAfter=20,
+    fontName='Helvetica-Bold',
+)
+
+# Annex A table cells
+HEADER_CELL_STYLE = ParagraphStyle('HeaderStyle', fontName='Helvetica-Bold', fontSize=8, leading=9, alignment=TA_CENTER)
+TASK_CELL_STYLE = ParagraphStyle('TaskStyle', fontName='Helvetica', fontSize=8, leading=10, alignment=TA_LEFT)
+CENTER_CELL_STYLE = ParagraphStyle('CenterStyle', fontName='Helvetica', fontSize=8, alignment=TA_CENTER)
+
+# Letter forms (pm_monthly_weekly_export)
+LETTER_FORM_MARGINS = dict(topMargin=0.5*inch, bottomMargin=0.5*inch, leftMargin=0.5*inch, rightMargin=0.5*inch)
+
+LETTER_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle', parent=SAMPLE_STYLES['Heading1'], fontSize=14, textColor=colors.black, spaceAfter=30,
+    alignment=TA_CENTER, fontName='Helvetica-Bold',
+)
+LETTER_NORMAL_STYLE = ParagraphStyle(
+    'CustomNormal', parent=SAMPLE_STYLES['Normal'], fontSize=10, fontName='Helvetica',
+)
+
+# Dark gray of the weekly tasks on the paper Annex A form
+WEEKLY_TASK_COLOR = colors.Color(0.45, 0.45, 0.45)
+
+
+class AnnexLayout:
+    """
+    Column widths, header rows, base TableStyle and weekly-task shading of
+    one checklist table. Header cells are plain strings or (markup, style)
+    pairs; shaded_items rows get WEEKLY_TASK_COLOR with white text from
+    column 0 to shade_to_col.
+    """
+
+    def __init__(self, col_widths, header, style_commands, repeat_rows=0, shaded_items=(), shade_to_col=-1):
+        self.col_widths = col_widths
+        self.header = header
+        self.style = TableStyle(style_commands)
+        self.repeat_rows = repeat_rows
+        self.shaded_items = frozenset(shaded_items)
+        self.shade_to_col = shade_to_col
+
+    def header_rows(self):
+        return [
+            [Paragraph(*cell) if isinstance(cell, tuple) else cell for cell in row]
+            for row in self.header
+        ]
+
+    def shading(self, item_numbers):
+        """Style commands for the body rows whose item number is shaded"""
+        commands = []
+        first_row = len(self.header)
+        for idx, number in enumerate(item_numbers):
+            if number in self.shaded_items:
+                row = first_row + idx
+                commands.append(('BACKGROUND', (0, row), (self.shade_to_col, row), WEEKLY_TASK_COLOR))
+                commands.append(('TEXTCOLOR', (0, row), (self.shade_to_col, row), colors.white))
+        return commands
+
+    def table(self, table_data, item_numbers=()):
+        """A Table of `table_data` (header rows included) in this layout"""
+        table = Table(table_data, colWidths=self.col_widths, repeatRows=self.repeat_rows)
+        table.setStyle(self.style)
+        shading = self.shading(item_numbers) if self.shaded_items else None
+        if shading:
+            table.setStyle(shading)
+        return table
+
+
+def day_cells():
+    """
+    {done: Paragraph} for the M-F status cells of one Annex A table. The day
+    columns share one width, so a single blank and a single check mark
+    Paragraph can fill all of them; call once per table, never share across
+    PDFs.
+    """
+    return {False: Paragraph('', CENTER_CELL_STYLE), True: Paragraph('✓', CENTER_CELL_STYLE)}
+
+
+# Item No | Task | Status M T W Th F | Problems
+_DAILY_WEEKLY_HEADER = [
+    [
+        ('<b>Item<br/>No.</b>', HEADER_CELL_STYLE),
+        ('<b>Task</b>', HEADER_CELL_STYLE),
+        ('<b>Status<br/>(put ✓ if done)</b>', HEADER_CELL_STYLE),  # spans the 5 day columns
+        '', '', '', '',
+        ('<b>Problems<br/>Encountered/Action</b>', HEADER_CELL_STYLE),
+    ],
+    [
+        '', '',
+        ('<b>M</b>', CENTER_CELL_STYLE),
+        ('<b>T</b>', CENTER_CELL_STYLE),
+        ('<b>W</b>', CENTER_CELL_STYLE),
+        ('<b>Th</b>', CENTER_CELL_STYLE),
+        ('<b>F</b>', CENTER_CELL_STYLE),
+        '',
+    ],
+]
+
+_DAILY_WEEKLY_STYLE = [
+    # Header rows - gray background
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('BACKGROUND', (0, 1), (-1, 1), colors.lightgrey),
+
+    # Merge cells
+    ('SPAN', (0, 0), (0, 1)),  # Item No. spans 2 rows
+    ('SPAN', (1, 0), (1, 1)),  # Task spans 2 rows
+    ('SPAN', (2, 0), (6, 0)),  # Status spans M-F
+    ('SPAN', (7, 0), (7, 1)),  # Problems spans 2 rows
+
+    # Alignment
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('ALIGN', (2, 0), (6, -1), 'CENTER'),
+    ('ALIGN', (7, 0), (7, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+
+    # Fonts
+    ('FONTNAME', (0, 0), (-1, 1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 1), 8),
+    ('FONTSIZE', (0, 2), (-1, -1), 8),
+
+    # Padding
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ('LEFTPADDING', (0, 0), (-1, -1), 3),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+
+    # Grid
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+]
+
+_DAILY_WEEKLY_WIDTHS = [12*mm, 75*mm, 9*mm, 9*mm, 9*mm, 9*mm, 9*mm, 45*mm]
+
+# Annex A in the generic checklist PDF: weekly tasks 7-11 shaded across the row
+ANNEX_A = AnnexLayout(
+    _DAILY_WEEKLY_WIDTHS, _DAILY_WEEKLY_HEADER, _DAILY_WEEKLY_STYLE, repeat_rows=2,
+    shaded_items=(7, 8, 9, 10, 11),
+)
+
+# Annex A in the daily/weekly PDFs: weekly tasks 6-11 are done on Friday, so
+# only Item No..Th is shaded and F/Problems stay white
+ANNEX_A_DAILY = AnnexLayout(
+    _DAILY_WEEKLY_WIDTHS, _DAILY_WEEKLY_HEADER, _DAILY_WEEKLY_STYLE, repeat_rows=2,
+    shaded_items=(6, 7, 8, 9, 10, 11), shade_to_col=5,
+)
+
+_SIMPLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    ('TOPPADDING', (0, 1), (-1, -1), 5),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+]
+
+# Annex B (monthly), F (semi-annual) and any other template
+ANNEX_B = AnnexLayout(
+    [15*mm, 100*mm, 35*mm, 40*mm],
+    [['Item\nNo.', 'Task', 'Status\n(put ✓ if done)', 'Problems Encountered/Action']],
+    _SIMPLE_STYLE, repeat_rows=1,
+)
+ANNEX_F = ANNEX_B
+
+# Annex C (weekly building): the four weeks share one status column
+ANNEX_C = AnnexLayout(
+    [15*mm, 80*mm, 45*mm, 50*mm],
+    [['Item\nNo.', 'Task', 'Status\n(put ✓ if done)\nWk1  Wk2  Wk3  Wk4', 'Problems\nEncountered/Action']],
+    _SIMPLE_STYLE, repeat_rows=1,
+)
+
+ANNEX_LAYOUTS = {'A': ANNEX_A, 'B': ANNEX_B, 'C': ANNEX_C, 'F': ANNEX_F}
+
+
+def _letter_style(center_cols):
+    return [
+        # Header row
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+
+        # All cells
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Item number center
+        ('ALIGN', (center_cols[0], 1), (center_cols[1], -1), 'CENTER'),  # Status / week columns center
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+
+        # Grid
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.Color(0.95, 0.95, 0.95)]),
+    ]
+
+
+# Letter-size Annex B / C forms of pm_monthly_weekly_export
+LETTER_ANNEX_B = AnnexLayout(
+    [0.6*inch, 3.5*inch, 0.9*inch, 2.5*inch],
+    [['Item\nNo.', 'Task', 'Status\n(put ✓ if done)', 'Problems\nEncountered/Action']],
+    _letter_style((2, 2)),
+)
+LETTER_ANNEX_C = AnnexLayout(
+    [0.5*inch, 2.8*inch, 0.5*inch, 0.5*inch, 0.5*inch, 0.5*inch, 2.2*inch],
+    [['Item\nNo.', 'Task', 'Wk1', 'Wk2', 'Wk3', 'Wk4', 'Problems\nEncountered/Action']],
+    _letter_style((2, 5)),
+)
+
+# Monthly compilation report (generate_monthly_report_pdf)
+REPORT_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+])
+REPORT_DETAIL_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+])
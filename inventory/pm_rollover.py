@@ -0,0 +1,140 @@
+"""
+PM year rollover - mirror one year's quarters and section schedules into
+another year and assign the devices, all in one transaction:
+
+    report = rollover_pm_year(2025, 2026)                # apply
+    report = rollover_pm_year(2025, 2026, dry_run=True)  # same work, rolled back
+
+Used by the "Copy Schedules to New Year" action of section_schedule_list_view
+and by `python manage.py rollover_pm_year`. A dry run does every insert and
+update and then rolls the transaction back, so its report is exactly what
+applying would do.
+
+Dates keep their day and month. February 29 becomes February 28 in a common
+year; an end date on the last day of a month stays on the last day (Feb 28
+-> Feb 29 in a leap year).
+"""
+import calendar
+from datetime import date
+
+from django.db import transaction
+
+from . import asset_pdf_cache
+from . import pm_compliance
+from .models import PMSectionSchedule, QuarterSchedule
+from .pm_assignments import reconcile_pm_assignments
+from .utils.pm_summary import invalidate_pending_pm_summary
+
+BATCH_SIZE = 500
+
+
+def mirror_date(value, year, month_end=False):
+    """`value` in `year`, clamped to the month's length; month_end keeps a last day on the last day"""
+    last_day = calendar.monthrange(year, value.month)[1]
+    if month_end and value.day == calendar.monthrange(value.year, value.month)[1]:
+        return date(year, value.month, last_day)
+    return date(year, value.month, min(value.day, last_day))
+
+
+class RolloverReport:
+    """What a rollover created and changed (rolled back again when dry_run)"""
+
+    def __init__(self, source_year, target_year, dry_run):
+        self.source_year = source_year
+        self.target_year = target_year
+        self.dry_run = dry_run
+        self.source_count = 0
+        self.quarters_created = []
+        self.created = []    # (section, quarter, start, end)
+        self.updated = []    # (section, quarter, old start, old end, start, end)
+        self.unchanged = 0
+        self.assignments = {'desktop': 0, 'laptop': 0}
+
+    @property
+    def changed(self):
+        return bool(self.quarters_created or self.created or self.updated or any(self.assignments.values()))
+
+    def summary(self):
+        verb = 'Would copy' if self.dry_run else 'Copied'
+        return (
+            f"{verb} {self.source_year} → {self.target_year}: {len(self.created)} new + "
+            f"{len(self.updated)} updated schedule(s), {self.unchanged} unchanged, "
+            f"{len(self.quarters_created)} new quarter(s), {self.assignments['desktop']} desktop and "
+            f"{self.assignments['laptop']} laptop assignment(s)."
+        )
+
+    def lines(self):
+        """The diff, one line per quarter/schedule change"""
+        for code in self.quarters_created:
+            yield f"+ quarter {dict(QuarterSchedule.QUARTERS)[code]} {self.target_year}"
+        for section, quarter, start, end in self.created:
+            yield f"+ {section} — {quarter}: {start:%b %d} – {end:%b %d, %Y}"
+        for section, quarter, old_start, old_end, start, end in self.updated:
+            yield (f"~ {section} — {quarter}: {old_start:%b %d} – {old_end:%b %d, %Y}"
+                   f" → {start:%b %d} – {end:%b %d, %Y}")
+
+
+def rollover_pm_year(source_year, target_year, dry_run=False):
+    """Mirror source_year's section schedules into target_year; returns a RolloverReport"""
+    report = RolloverReport(source_year, target_year, dry_run)
+    sources = list(
+        PMSectionSchedule.objects.filter(quarter_schedule__year=source_year)
+        .select_related('quarter_schedule', 'section')
+        .order_by('section__name', 'quarter_schedule__quarter')
+    )
+    report.source_count = len(sources)
+    if not sources or source_year == target_year:
+        return report
+
+    with transaction.atomic():
+        have = set(QuarterSchedule.objects.filter(year=target_year).values_list('quarter', flat=True))
+        report.quarters_created = sorted({src.quarter_schedule.quarter for src in sources} - have)
+        QuarterSchedule.objects.bulk_create(
+            [QuarterSchedule(year=target_year, quarter=code) for code in report.quarters_created]
+        )
+        quarters = {q.quarter: q for q in QuarterSchedule.objects.filter(year=target_year)}
+
+        existing = {
+            (s.section_id, s.quarter_schedule_id): s
+            for s in PMSectionSchedule.objects.filter(quarter_schedule__year=target_year)
+        }
+        to_create, to_update = [], []
+        for src in sources:
+            quarter = quarters[src.quarter_schedule.quarter]
+            start = mirror_date(src.start_date, target_year)
+            end = mirror_date(src.end_date, target_year, month_end=True)
+            target = existing.get((src.section_id, quarter.pk))
+            if target is None:
+                to_create.append(PMSectionSchedule(
+                    quarter_schedule=quarter, section=src.section,
+                    start_date=start, end_date=end, notes=src.notes or '',
+                ))
+                report.created.append((src.section.name, quarter, start, end))
+            elif (target.start_date, target.end_date) != (start, end) or (src.notes and src.notes != target.notes):
+                # Overwrite existing with the source year's dates
+                report.updated.append((src.section.name, quarter, target.start_date, target.end_date, start, end))
+                target.start_date, target.end_date = start, end
+                target.notes = src.notes or target.notes
+                to_update.append(target)
+            else:
+                report.unchanged += 1
+
+        PMSectionSchedule.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        PMSectionSchedule.objects.bulk_update(to_update, ['start_date', 'end_date', 'notes'], batch_size=BATCH_SIZE)
+
+        # bulk_create/bulk_update fire no signals: assign the devices and drop
+        # the caches the PMSectionSchedule receivers would have
+        report.assignments = reconcile_pm_assignments(schedule_ids=list(
+            PMSectionSchedule.objects.filter(
+                quarter_schedule__year=target_year, section__in={src.section_id for src in sources},
+            ).values_list('pk', flat=True)
+        ))
+        if to_create or to_update:
+            transaction.on_commit(invalidate_pending_pm_summary)
+            transaction.on_commit(asset_pdf_cache.invalidate_all)
+        if to_update:
+            pm_compliance.queue_quarter_refresh({target.quarter_schedule_id for target in to_update})
+
+        if dry_run:
+            transaction.set_rollback(True)
+    return report
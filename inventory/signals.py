@@ -1,24 +1,40 @@
 # signals.py - FIXED VERSION
 
-import qrcode
 from io import BytesIO
 from django.core.files import File
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 from django.urls import reverse
+from django.utils import timezone
 from .models import (
     Equipment_Package, LaptopPackage, PrinterPackage,
     DesktopDetails, LaptopDetails, PrinterDetails,
     DisposedDesktopDetail, DisposedLaptop, DisposedPrinter,
-    Employee, PreventiveMaintenance, PMScheduleAssignment,
-    Notification, create_notification
+    Employee, PreventiveMaintenance, PMScheduleAssignment, PMSectionSchedule,
+    Notification, notify_many,
+    MonitorDetails, KeyboardDetails, MouseDetails, UPSDetails, UserDetails,
+    DisposedMonitor, DisposedKeyboard, DisposedMouse, DisposedUPS,
+    EndUserChangeHistory, AssetOwnerChangeHistory,
+    Brand, OfficeSection, AssetIndex,
+    DocumentsDetails, QuarterSchedule,
 )
+from .utils.pm_summary import invalidate_pending_pm_summary
+from .dashboard_snapshot import mark_dashboard_snapshot_stale
+from . import asset_index
+from . import asset_pdf_cache
+from . import notification_outbox as outbox
+from .pm_assignments import reconcile_end_user_packages, reconcile_pm_assignments
+from . import pm_compliance
 
 # This signal will generate a QR code when a new Equipment_Package instance is created
 @receiver(post_save, sender=Equipment_Package)
 def generate_qr_code(sender, instance, created, **kwargs):
     if created and not instance.qr_code:
+        import qrcode
+
         # Build full URL for this desktop package
         url = reverse('desktop_details_view', kwargs={'package_id': instance.pk})
         full_url = f"http://127.0.0.1:8000{url}"  # Replace with your domain in production
@@ -48,121 +64,19 @@ def generate_qr_code(sender, instance, created, **kwargs):
 
 # ============================ NOTIFICATION SIGNALS ===================
 
+# Receivers only append an event to the notification outbox, in the same
+# transaction as the save; inventory.notification_outbox builds and writes
+# the notifications off the request path.
+
 # ==================== PM MAINTENANCE SIGNALS ====================
+# Due/overdue alerts come from the scheduled scan in inventory/pm_alerts.py,
+# not from assignment saves.
 
 @receiver(post_save, sender=PreventiveMaintenance)
 def notify_pm_completed(sender, instance, created, **kwargs):
     """Notify when PM maintenance is completed"""
-    if created and instance.is_completed:
-        # Get all IT staff
-        it_staff = User.objects.filter(is_staff=True)
-        
-        # Get device name
-        device_name = "Unknown Device"
-        link_url = "#"
-        
-        if instance.equipment_package:
-            desktop = instance.equipment_package.desktop_details.first()
-            device_name = desktop.computer_name if desktop else f"Desktop #{instance.equipment_package.id}"
-            link_url = reverse('maintenance_history', args=[instance.equipment_package.id])
-        elif instance.laptop_package:
-            laptop = instance.laptop_package.laptop_details.first()
-            device_name = laptop.computer_name if laptop else f"Laptop #{instance.laptop_package.id}"
-            link_url = reverse('maintenance_history_laptop', args=[instance.laptop_package.id])
-        
-        # Create notification for all IT staff
-        for staff in it_staff:
-            create_notification(
-                user=staff,
-                notification_type='pm_completed',
-                title='PM Maintenance Completed',
-                message=f'Preventive maintenance for {device_name} has been successfully completed',
-                priority='normal',
-                link_url=link_url,
-                link_text='View Report',
-                related_object=instance
-            )
-
-
-@receiver(post_save, sender=PMScheduleAssignment)
-def check_pm_schedule_status(sender, instance, created, **kwargs):
-    """Check PM schedule and create notifications for overdue/due tasks"""
-    from django.utils import timezone
-    from datetime import timedelta
-    
-    today = timezone.now().date()
-    
-    # Skip if already completed
-    if instance.is_completed:
-        return
-    
-    # Get device name
-    device_name = "Unknown Device"
-    link_url = "#"
-    package_id = None
-    
-    if instance.equipment_package:
-        desktop = instance.equipment_package.desktop_details.first()
-        device_name = desktop.computer_name if desktop else f"Desktop #{instance.equipment_package.id}"
-        link_url = reverse('maintenance_history', args=[instance.equipment_package.id])
-        package_id = instance.equipment_package.id
-    elif instance.laptop_package:
-        laptop = instance.laptop_package.laptop_details.first()
-        device_name = laptop.computer_name if laptop else f"Laptop #{instance.laptop_package.id}"
-        link_url = reverse('maintenance_history_laptop', args=[instance.laptop_package.id])
-        package_id = instance.laptop_package.id
-    
-    # Get all IT staff
-    it_staff = User.objects.filter(is_staff=True)
-    
-    # Check if overdue
-    if instance.pm_section_schedule.end_date < today:
-        days_overdue = (today - instance.pm_section_schedule.end_date).days
-        
-        # Check if notification already exists (avoid duplicates)
-        for staff in it_staff:
-            existing = Notification.objects.filter(
-                user=staff,
-                notification_type='pm_overdue',
-                object_id=instance.id,
-                is_read=False
-            ).exists()
-            
-            if not existing:
-                create_notification(
-                    user=staff,
-                    notification_type='pm_overdue',
-                    title='URGENT: PM Maintenance Overdue',
-                    message=f'Preventive maintenance for {device_name} is {days_overdue} days overdue! Please complete immediately.',
-                    priority='urgent',
-                    link_url=link_url,
-                    link_text='Fix Now',
-                    related_object=instance
-                )
-    
-    # Check if due soon (within 7 days)
-    elif instance.pm_section_schedule.end_date <= today + timedelta(days=7):
-        days_until_due = (instance.pm_section_schedule.end_date - today).days
-        
-        for staff in it_staff:
-            existing = Notification.objects.filter(
-                user=staff,
-                notification_type='pm_due',
-                object_id=instance.id,
-                is_read=False
-            ).exists()
-            
-            if not existing:
-                create_notification(
-                    user=staff,
-                    notification_type='pm_due',
-                    title='PM Maintenance Due Soon',
-                    message=f'Preventive maintenance for {device_name} is due in {days_until_due} days',
-                    priority='high',
-                    link_url=link_url,
-                    link_text='View Details',
-                    related_object=instance
-                )
+    if created and instance.is_completed and not kwargs.get('raw'):
+        outbox.enqueue('pm_completed', instance)
 
 
 # ==================== ASSET SIGNALS ====================
@@ -170,61 +84,22 @@ def check_pm_schedule_status(sender, instance, created, **kwargs):
 @receiver(post_save, sender=DesktopDetails)
 def notify_desktop_added(sender, instance, created, **kwargs):
     """Notify when new desktop is added"""
-    if created:
-        it_staff = User.objects.filter(is_staff=True)
-        
-        for staff in it_staff:
-            create_notification(
-                user=staff,
-                notification_type='asset_added',
-                title='New Desktop Added',
-                message=f'Desktop {instance.computer_name or "PC-" + str(instance.equipment_package.id)} has been added to inventory',
-                priority='normal',
-                # 🔧 FIX: Changed from 'equipment_package_detail' to 'desktop_details_view'
-                link_url=reverse('desktop_details_view', kwargs={'package_id': instance.equipment_package.id}),
-                link_text='View Asset',
-                related_object=instance
-            )
+    if created and not kwargs.get('raw'):
+        outbox.enqueue('desktop_added', instance)
 
 
 @receiver(post_save, sender=LaptopDetails)
 def notify_laptop_added(sender, instance, created, **kwargs):
     """Notify when new laptop is added"""
-    if created:
-        it_staff = User.objects.filter(is_staff=True)
-        
-        for staff in it_staff:
-            create_notification(
-                user=staff,
-                notification_type='asset_added',
-                title='New Laptop Added',
-                message=f'Laptop {instance.computer_name or "LT-" + str(instance.laptop_package.id)} has been added to inventory',
-                priority='normal',
-                # ✅ This one was already correct
-                link_url=reverse('laptop_details_view', kwargs={'package_id': instance.laptop_package.id}),
-                link_text='View Asset',
-                related_object=instance
-            )
+    if created and not kwargs.get('raw'):
+        outbox.enqueue('laptop_added', instance)
 
 
 @receiver(post_save, sender=PrinterDetails)
 def notify_printer_added(sender, instance, created, **kwargs):
     """Notify when new printer is added"""
-    if created:
-        it_staff = User.objects.filter(is_staff=True)
-        
-        for staff in it_staff:
-            create_notification(
-                user=staff,
-                notification_type='asset_added',
-                title='New Printer Added',
-                message=f'Printer {instance.printer_brand_db} {instance.printer_model_db} has been added to inventory',
-                priority='normal',
-                # 🔧 FIX: Added proper printer URL
-                link_url=reverse('printer_details_view', kwargs={'printer_id': instance.id}),
-                link_text='View Asset',
-                related_object=instance
-            )
+    if created and not kwargs.get('raw'):
+        outbox.enqueue('printer_added', instance)
 
 
 # ==================== DISPOSAL SIGNALS ====================
@@ -232,58 +107,22 @@ def notify_printer_added(sender, instance, created, **kwargs):
 @receiver(post_save, sender=DisposedDesktopDetail)
 def notify_desktop_disposed(sender, instance, created, **kwargs):
     """Notify when desktop is disposed"""
-    if created:
-        it_staff = User.objects.filter(is_staff=True)
-        
-        for staff in it_staff:
-            create_notification(
-                user=staff,
-                notification_type='asset_disposed',
-                title='Desktop Moved to Disposal',
-                message=f'Desktop {instance.desktop.computer_name if instance.desktop else "Unknown"} has been moved to disposal area',
-                priority='normal',
-                link_url=reverse('disposal_overview'),
-                link_text='View Disposal Area',
-                related_object=instance
-            )
+    if created and not kwargs.get('raw'):
+        outbox.enqueue('desktop_disposed', instance)
 
 
 @receiver(post_save, sender=DisposedLaptop)
 def notify_laptop_disposed(sender, instance, created, **kwargs):
     """Notify when laptop is disposed"""
-    if created:
-        it_staff = User.objects.filter(is_staff=True)
-        
-        for staff in it_staff:
-            create_notification(
-                user=staff,
-                notification_type='asset_disposed',
-                title='Laptop Moved to Disposal',
-                message=f'Laptop {instance.laptop.computer_name if instance.laptop else "Unknown"} has been moved to disposal area',
-                priority='normal',
-                link_url=reverse('disposal_overview'),
-                link_text='View Disposal Area',
-                related_object=instance
-            )
+    if created and not kwargs.get('raw'):
+        outbox.enqueue('laptop_disposed', instance)
 
 
 @receiver(post_save, sender=DisposedPrinter)
 def notify_printer_disposed(sender, instance, created, **kwargs):
     """Notify when printer is disposed"""
-    if created:
-        it_staff = User.objects.filter(is_staff=True)
-        
-        for staff in it_staff:
-            create_notification(
-                user=staff,
-                notification_type='asset_disposed',
-                title='Printer Moved to Disposal',
-                message=f'Printer {instance.printer_brand} {instance.printer_model} has been moved to disposal area',
-                priority='normal',
-                link_url=reverse('disposal_overview'),
-                link_text='View Disposal Area',
-                related_object=instance
-            )
+    if created and not kwargs.get('raw'):
+        outbox.enqueue('printer_disposed', instance)
 
 
 # ==================== EMPLOYEE SIGNALS ====================
@@ -291,38 +130,12 @@ def notify_printer_disposed(sender, instance, created, **kwargs):
 @receiver(post_save, sender=Employee)
 def notify_employee_added_or_updated(sender, instance, created, **kwargs):
     """Notify when employee is added or updated"""
-    admins = User.objects.filter(is_staff=True, is_superuser=True)
-    
+    if kwargs.get('raw'):
+        return
     if created:
-        # New employee added
-        for admin in admins:
-            create_notification(
-                user=admin,
-                notification_type='employee_added',
-                title='New Employee Added',
-                message=f'{instance.full_name} has been added to {instance.employee_office_section or "the system"}',
-                priority='low',
-                # 🔧 NOTE: You'll need to check if 'employee_detail' URL exists in your urls.py
-                # If not, change this to '#' or the correct URL name
-                link_url=reverse('employee_list'),  # Changed to employee_list since employee_detail might not exist
-                link_text='View Employees',
-                related_object=instance
-            )
+        outbox.enqueue('employee_added', instance)
     else:
-        # Employee updated
-        for admin in admins:
-            # Only create notification if significant fields changed
-            # You can add more logic here if needed
-            create_notification(
-                user=admin,
-                notification_type='employee_updated',
-                title='Employee Information Updated',
-                message=f'{instance.full_name} profile has been updated',
-                priority='low',
-                link_url=reverse('employee_list'),  # Changed to employee_list since employee_detail might not exist
-                link_text='View Employees',
-                related_object=instance
-            )
+        outbox.enqueue('employee_updated', instance, key=outbox.unique_key('employee_updated', instance))
 
 
 # ==================== ASSET UPDATE DETECTION ====================
@@ -348,35 +161,258 @@ def notify_desktop_updated(sender, instance, created, **kwargs):
     """Notify when desktop is updated"""
     if not created and hasattr(instance, '_old_values'):
         # Check if significant fields changed
-        changed = False
         changes = []
         
         if instance._old_values['computer_name'] != instance.computer_name:
-            changed = True
             changes.append('computer name')
         if instance._old_values['processor'] != instance.processor:
-            changed = True
             changes.append('processor')
         if instance._old_values['memory'] != instance.memory:
-            changed = True
             changes.append('memory')
         
-        if changed:
-            it_staff = User.objects.filter(is_staff=True)
-            changes_text = ', '.join(changes)
-            
-            for staff in it_staff:
-                create_notification(
-                    user=staff,
-                    notification_type='asset_updated',
-                    title='Desktop Information Updated',
-                    message=f'Desktop {instance.computer_name} has been updated ({changes_text})',
-                    priority='low',
-                    # 🔧 FIX: Changed from 'equipment_package_detail' to 'desktop_details_view'
-                    link_url=reverse('desktop_details_view', kwargs={'package_id': instance.equipment_package.id}),
-                    link_text='View Changes',
-                    related_object=instance
-                )
+        if changes:
+            outbox.enqueue(
+                'desktop_updated', instance,
+                payload={'changes': changes},
+                key=outbox.unique_key('desktop_updated', instance),
+            )
+
+
+# ==================== PENDING PM SUMMARY CACHE ====================
+
+@receiver([post_save, post_delete], sender=PMScheduleAssignment)
+@receiver([post_save, post_delete], sender=PMSectionSchedule)
+@receiver(post_save, sender=DisposedDesktopDetail)
+@receiver(post_save, sender=DisposedLaptop)
+def invalidate_pm_summary_cache(sender, **kwargs):
+    """Drop the cached pending-PM summary whenever its inputs change"""
+    transaction.on_commit(invalidate_pending_pm_summary)
+
+
+@receiver(post_save, sender=Equipment_Package)
+@receiver(post_save, sender=LaptopPackage)
+def invalidate_pm_summary_on_disposal(sender, instance, **kwargs):
+    """Disposed packages drop out of the summary"""
+    if instance.is_disposed:
+        transaction.on_commit(invalidate_pending_pm_summary)
+
+
+# ==================== PM SCHEDULE ASSIGNMENTS ====================
+# Packages get their section's PM schedules when a schedule is added or the
+# end user (or the end user's section) changes; see inventory/pm_assignments.py.
+
+@receiver(post_save, sender=PMSectionSchedule)
+def assign_section_schedule(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        transaction.on_commit(lambda: reconcile_pm_assignments(section_ids=[instance.section_id]))
+
+
+@receiver(post_save, sender=UserDetails)
+def assign_end_user_schedules(sender, instance, **kwargs):
+    if kwargs.get('raw') or not (instance.equipment_package_id or instance.laptop_package_id):
+        return
+    desktop_ids = [instance.equipment_package_id] if instance.equipment_package_id else None
+    laptop_ids = [instance.laptop_package_id] if instance.laptop_package_id else None
+    transaction.on_commit(lambda: reconcile_pm_assignments(desktop_ids=desktop_ids, laptop_ids=laptop_ids))
+
+
+@receiver(post_save, sender=Employee)
+def assign_employee_section_schedules(sender, instance, created, **kwargs):
+    if not created and not kwargs.get('raw'):
+        transaction.on_commit(lambda: reconcile_end_user_packages([instance.pk]))
+
+
+# ==================== PM COMPLIANCE MATRIX ====================
+# The device x quarter cells (inventory/pm_compliance.py) are rebuilt per
+# package, or per quarter when a section schedule's dates change, after commit.
+
+@receiver([post_save, post_delete], sender=PMScheduleAssignment)
+@receiver([post_save, post_delete], sender=PreventiveMaintenance)
+def refresh_compliance_package(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    pm_compliance.queue_refresh('desktop', [instance.equipment_package_id])
+    pm_compliance.queue_refresh('laptop', [instance.laptop_package_id])
+
+
+@receiver(post_save, sender=Equipment_Package)
+@receiver(post_save, sender=LaptopPackage)
+def refresh_compliance_on_disposal(sender, instance, **kwargs):
+    """Disposed packages drop out of the matrix (and come back when restored)"""
+    if not kwargs.get('raw'):
+        pm_compliance.queue_refresh('desktop' if sender is Equipment_Package else 'laptop', [instance.pk])
+
+
+@receiver(post_save, sender=PMSectionSchedule)
+def refresh_compliance_quarter(sender, instance, created, **kwargs):
+    if not created and not kwargs.get('raw'):
+        pm_compliance.queue_quarter_refresh([instance.quarter_schedule_id])
+
+
+# ==================== DASHBOARD SNAPSHOT ====================
+
+DASHBOARD_SOURCE_MODELS = [
+    Equipment_Package, DesktopDetails, MonitorDetails, KeyboardDetails,
+    MouseDetails, UPSDetails, UserDetails, LaptopPackage, LaptopDetails, PrinterDetails,
+    DisposedDesktopDetail, DisposedMonitor, DisposedKeyboard, DisposedMouse,
+    DisposedUPS, DisposedLaptop, DisposedPrinter,
+    PMScheduleAssignment, EndUserChangeHistory, AssetOwnerChangeHistory,
+]
+
+
+def flag_dashboard_snapshot(sender, **kwargs):
+    """Mark the dashboard snapshot stale when any of its source tables change"""
+    if not kwargs.get('raw'):
+        transaction.on_commit(mark_dashboard_snapshot_stale)
+
+
+for _model in DASHBOARD_SOURCE_MODELS:
+    post_save.connect(flag_dashboard_snapshot, sender=_model)
+    post_delete.connect(flag_dashboard_snapshot, sender=_model)
+
+
+# ==================== ASSET INDEX ====================
+# Every change is re-indexed per package after commit; sync_assets drops the
+# row when the package itself is gone.
+
+def _queue_asset_sync(asset_type, package_id):
+    if package_id is not None:
+        transaction.on_commit(lambda: asset_index.sync_assets(asset_type, [package_id]))
+
+
+def index_asset_package(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        _queue_asset_sync(asset_index.asset_type_for(sender), instance.pk)
+
+
+def index_asset_details(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        source = asset_index.ASSET_SOURCES[asset_index.asset_type_for(sender)]
+        _queue_asset_sync(asset_index.asset_type_for(sender), getattr(instance, source['details_fk']))
+
+
+for _source in asset_index.ASSET_SOURCES.values():
+    for _signal in (post_save, post_delete):
+        _signal.connect(index_asset_package, sender=_source['package'])
+        _signal.connect(index_asset_details, sender=_source['details'])
+
+
+@receiver(post_save, sender=UserDetails)
+@receiver(post_delete, sender=UserDetails)
+def index_asset_assignment(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    for asset_type, source in asset_index.ASSET_SOURCES.items():
+        _queue_asset_sync(asset_type, getattr(instance, source['user_fk']))
+
+
+@receiver(post_save, sender=Employee)
+def index_asset_employee(sender, instance, created, **kwargs):
+    if not created and not kwargs.get('raw'):
+        transaction.on_commit(lambda: asset_index.sync_assets_for_employees([instance.pk]))
+
+
+@receiver(post_save, sender=Brand)
+def index_asset_brand(sender, instance, created, **kwargs):
+    if not created and not kwargs.get('raw'):
+        transaction.on_commit(lambda: asset_index.sync_assets_for_brand(instance.pk))
+
+
+@receiver(post_save, sender=OfficeSection)
+def index_asset_section(sender, instance, created, **kwargs):
+    if not created and not kwargs.get('raw'):
+        AssetIndex.objects.filter(section=instance).update(section_name=instance.name)
+
+
+# ==================== ASSET SHEET PDF CACHE ====================
+# A change to any row shown on a desktop/laptop asset sheet makes that
+# package's cached PDF be re-checked on its next request; changes to shared
+# rows (names, brands, sections, PM schedules) re-check every sheet.
+
+ASSET_SHEET_MODELS = [
+    Equipment_Package, DesktopDetails, MonitorDetails, KeyboardDetails, MouseDetails, UPSDetails,
+    DisposedDesktopDetail, DisposedMonitor, DisposedKeyboard, DisposedMouse, DisposedUPS,
+    LaptopPackage, LaptopDetails, DisposedLaptop, PreventiveMaintenance, PMScheduleAssignment,
+    DocumentsDetails, UserDetails, EndUserChangeHistory, AssetOwnerChangeHistory,
+]
+ASSET_SHEET_SHARED_MODELS = [Employee, Brand, OfficeSection, PMSectionSchedule, QuarterSchedule]
+
+
+def _sheet_packages(sender, instance):
+    """{kind: [package_id]} of the asset sheets showing this row"""
+    if sender is Equipment_Package:
+        return {'desktop': [instance.pk]}
+    if sender is LaptopPackage:
+        return {'laptop': [instance.pk]}
+    if sender is DisposedDesktopDetail:
+        return {'desktop': DesktopDetails.objects.filter(pk=instance.desktop_id).values_list('equipment_package_id', flat=True)}
+    if sender is DisposedLaptop:
+        return {'laptop': LaptopDetails.objects.filter(pk=instance.laptop_id).values_list('laptop_package_id', flat=True)}
+    if sender in (EndUserChangeHistory, AssetOwnerChangeHistory):
+        if not instance.content_type_id:
+            return {}
+        model = ContentType.objects.get_for_id(instance.content_type_id).model_class()
+        kind = {Equipment_Package: 'desktop', LaptopPackage: 'laptop'}.get(model)
+        return {kind: [instance.object_id]} if kind else {}
+    return {
+        'desktop': [getattr(instance, 'equipment_package_id', None)],
+        'laptop': [getattr(instance, 'laptop_package_id', None)],
+    }
+
+
+def invalidate_asset_sheet_pdf(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    for kind, package_ids in _sheet_packages(sender, instance).items():
+        package_ids = [package_id for package_id in package_ids if package_id]
+        if package_ids:
+            transaction.on_commit(lambda kind=kind, ids=package_ids: asset_pdf_cache.invalidate(kind, ids))
+
+
+def invalidate_all_asset_sheet_pdfs(sender, **kwargs):
+    if not kwargs.get('raw'):
+        transaction.on_commit(asset_pdf_cache.invalidate_all)
+
+
+for _model in ASSET_SHEET_MODELS:
+    post_save.connect(invalidate_asset_sheet_pdf, sender=_model)
+    post_delete.connect(invalidate_asset_sheet_pdf, sender=_model)
+for _model in ASSET_SHEET_SHARED_MODELS:
+    post_save.connect(invalidate_all_asset_sheet_pdfs, sender=_model)
+    post_delete.connect(invalidate_all_asset_sheet_pdfs, sender=_model)
+
+
+# ==================== INCREMENTAL DATA EXPORT ====================
+# The raw data feeds (inventory/data_export.py) select changed desktops,
+# laptops, printers and components by their package's updated_at, so a change
+# to any row of a package bumps it. update() fires no signals of its own.
+
+PACKAGE_ROW_MODELS = {
+    DesktopDetails: ('equipment_package',),
+    MonitorDetails: ('equipment_package',),
+    KeyboardDetails: ('equipment_package',),
+    MouseDetails: ('equipment_package',),
+    UPSDetails: ('equipment_package',),
+    LaptopDetails: ('laptop_package',),
+    PrinterDetails: ('printer_package',),
+    UserDetails: ('equipment_package', 'laptop_package', 'printer_package'),
+    DocumentsDetails: ('equipment_package', 'laptop_package', 'printer_package'),
+}
+
+
+def touch_package(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    for name in PACKAGE_ROW_MODELS[sender]:
+        field = sender._meta.get_field(name)
+        package_id = getattr(instance, field.attname)
+        if package_id:
+            field.related_model.objects.filter(pk=package_id).update(updated_at=timezone.now())
+
+
+for _model in PACKAGE_ROW_MODELS:
+    post_save.connect(touch_package, sender=_model)
+    post_delete.connect(touch_package, sender=_model)
 
 
 # ==================== DISPOSAL APPROVAL SYSTEM ====================
@@ -399,24 +435,20 @@ def check_pending_disposals():
         # Notify approvers
         approvers = User.objects.filter(is_staff=True, is_superuser=True)
         
-        for approver in approvers:
-            # Check if notification already exists
-            existing = Notification.objects.filter(
-                user=approver,
-                notification_type='disposal_pending',
-                is_read=False
-            ).exists()
-            
-            if not existing:
-                create_notification(
-                    user=approver,
-                    notification_type='disposal_pending',
-                    title='Disposal Approval Needed',
-                    message=f'{total_count} items are waiting for disposal approval',
-                    priority='high',
-                    link_url=reverse('disposal_overview'),
-                    link_text='Review Items'
-                )
+        # Skip approvers who have not read the last reminder yet
+        approvers = approvers.exclude(pk__in=Notification.objects.filter(
+            notification_type='disposal_pending', is_read=False,
+        ).values('user_id'))
+        
+        notify_many(
+            approvers,
+            notification_type='disposal_pending',
+            title='Disposal Approval Needed',
+            message=f'{total_count} items are waiting for disposal approval',
+            priority='high',
+            link_url=reverse('disposal_overview'),
+            link_text='Review Items'
+        )
 
 # ==========================NOTIFICATION SIGNALS END==========================
 
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.contrib.auth import views as auth_views
-from inventory import views, pm_daily_views, pm_monthly_views, pm_weekly_views, pm_monthly_weekly_export, pm_main_dashboard, pm_downtime_views, asir_views, hdr_views
+from inventory import views, pm_daily_views, pm_monthly_views, pm_weekly_views, pm_main_dashboard, pm_downtime_views, asir_views, hdr_views, job_views, data_export
+from inventory.utils.lazy_views import lazy_view
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -97,10 +98,10 @@ urlpatterns = [
     path('add_brand/', views.add_brand, name='add_brand'),
     path('edit_brand/', views.edit_brand, name='edit_brand'),
     #print
-    path('desktop/<int:package_id>/pdf/', views.generate_desktop_pdf, name='generate_desktop_pdf'),
+    path('desktop/<int:package_id>/pdf/', lazy_view('inventory.export_views.generate_desktop_pdf'), name='generate_desktop_pdf'),
 
     #excel export
-    path('export/desktop/', views.export_equipment_packages_excel, name='export_desktop_excel'),
+    path('export/desktop/', lazy_view('inventory.export_views.export_equipment_packages_excel'), name='export_desktop_excel'),
     
     #login
     path('login/', auth_views.LoginView.as_view(template_name='login.html'), name='login'),
@@ -117,11 +118,13 @@ urlpatterns = [
 
 
 
-    path('maintenance/pdf/<int:pm_id>/', views.generate_pm_excel_report, name='generate_pm_pdf'), #pdf prevenitve maintenance
+    path('maintenance/pdf/<int:pm_id>/', lazy_view('inventory.export_views.generate_pm_checklist_pdf'), name='generate_pm_pdf'), #pdf prevenitve maintenance
+    path('maintenance/schedules/<int:schedule_id>/checklists/pdf/', lazy_view('inventory.export_views.generate_section_pm_checklists_pdf'), name='section_pm_checklists_pdf'),
     
     
     #pm overview
     path('maintenance/overview/', views.pm_overview_view, name='pm_overview'),
+    path('maintenance/compliance/', views.pm_compliance_view, name='pm_compliance'),
     path('maintenance/assign_pm_schedule/', views.assign_pm_schedule, name='assign_pm_schedule'),
     path('maintenance/schedules/', views.section_schedule_list_view, name='section_schedule_list'), # section schedule list view of pm
     path('maintenance/schedules/<int:schedule_id>/edit/', views.edit_pm_section_schedule, name='edit_pm_section_schedule'),
@@ -140,8 +143,8 @@ urlpatterns = [
     path("salvaged/mouse/<int:pk>/", views.salvaged_mouse_detail, name="salvaged_mouse_detail"),
     path("salvaged/ups/<int:pk>/", views.salvaged_ups_detail, name="salvaged_ups_detail"),
 
-    path('export_salvage_excel/', views.export_salvage_excel, name='export_salvage_excel'),
-    path('print_salvage_overview/', views.print_salvage_overview, name='print_salvage_overview'),
+    path('export_salvage_excel/', lazy_view('inventory.export_views.export_salvage_excel'), name='export_salvage_excel'),
+    path('print_salvage_overview/', lazy_view('inventory.export_views.print_salvage_overview'), name='print_salvage_overview'),
 
     #dashboard chart
     path('dashboard/chart/', views.dashboard_view_chart, name='dashboard_view_chart'),
@@ -177,7 +180,8 @@ urlpatterns = [
     path("laptops/", views.laptop_list, name="laptop_list"),
     path("laptops/<int:package_id>/", views.laptop_details_view, name="laptop_details_view"),
 
-    path('laptop/<int:package_id>/pdf/', views.generate_laptop_pdf, name='generate_laptop_pdf'),
+    path('asset-sheets/pdf/', lazy_view('inventory.export_views.asset_sheets_pdf'), name='asset_sheets_pdf'),
+    path('laptop/<int:package_id>/pdf/', lazy_view('inventory.export_views.generate_laptop_pdf'), name='generate_laptop_pdf'),
 
     path("laptops/edit/<int:laptop_id>/", views.edit_laptop, name="edit_laptop"),
     # Laptop User & Document Management
@@ -233,6 +237,9 @@ urlpatterns = [
     
     # API Endpoint
     path('api/notifications/count/', views.get_notification_count, name='notification_count_api'),
+    path('api/assets/search/', views.asset_search_api, name='asset_search_api'),
+    path('api/export/', data_export.data_export_index, name='data_export_index'),
+    path('api/export/<str:dataset>/', data_export.data_export_api, name='data_export_api'),
 
 
     # ================================
@@ -256,13 +263,13 @@ urlpatterns = [
     # ANNEX B - Monthly PM Dashboard and Completion
     path('pm/monthly/', pm_monthly_views.monthly_pm_dashboard, name='monthly_pm_dashboard'),
     path('pm/monthly/complete/<int:schedule_id>/', pm_monthly_views.complete_monthly_pm, name='complete_monthly_pm'),
-    path('pm/monthly/export/<int:completion_id>/', pm_monthly_weekly_export.export_monthly_pm_pdf, name='export_monthly_pm_pdf'),
+    path('pm/monthly/export/<int:completion_id>/', lazy_view('inventory.pm_monthly_weekly_export.export_monthly_pm_pdf'), name='export_monthly_pm_pdf'),
 
     # ================================
     # ANNEX C - Weekly FD/BD (4 weeks/month) PM Dashboard and Completion
     path('pm/weekly-fdbd/', pm_weekly_views.weekly_pm_dashboard, name='weekly_fdbd_dashboard'),
     path('pm/weekly-fdbd/complete/<int:schedule_id>/<int:week_number>/', pm_weekly_views.complete_weekly_pm, name='complete_weekly_pm'),
-    path('pm/weekly-fdbd/export/<int:completion_id>/', pm_monthly_weekly_export.export_weekly_pm_pdf, name='export_weekly_fdbd_pdf'),
+    path('pm/weekly-fdbd/export/<int:completion_id>/', lazy_view('inventory.pm_monthly_weekly_export.export_weekly_pm_pdf'), name='export_weekly_fdbd_pdf'),
 
     # ================================
     # Equipment Downtime Tracking
@@ -279,7 +286,7 @@ urlpatterns = [
     path('reports/snmr/<int:report_id>/', views.snmr_view, name='snmr_view'),
     path('reports/snmr/<int:report_id>/edit/', views.snmr_edit, name='snmr_edit'),
     path('reports/snmr/<int:report_id>/delete/', views.snmr_delete, name='snmr_delete'),
-    path('reports/snmr/<int:report_id>/export/excel/', views.snmr_export_excel, name='snmr_export_excel'),
+    path('reports/snmr/<int:report_id>/export/excel/', lazy_view('inventory.export_views.snmr_export_excel'), name='snmr_export_excel'),
     path('reports/snmr/<int:report_id>/finalize/', views.snmr_finalize, name='snmr_finalize'),
 
     # ================================
@@ -303,6 +310,13 @@ urlpatterns = [
     path('reports/hdr/entry/<int:entry_id>/export/', hdr_views.hdr_entry_export, name='hdr_entry_export'),
     path('reports/hdr/<int:report_id>/delete/', hdr_views.hdr_delete, name='hdr_delete'),
     path('reports/hdr/<int:report_id>/export/excel/', hdr_views.hdr_export_excel, name='hdr_export_excel'),
+    path('reports/hdr/<int:report_id>/export/job-sheets/', hdr_views.hdr_job_sheets_export, name='hdr_job_sheets_export'),
     path('reports/hdr/<int:report_id>/finalize/', hdr_views.hdr_finalize, name='hdr_finalize'),
 
+    # ================================
+    # Export jobs - exports queued with ?background=1
+    path('jobs/<int:job_id>/', job_views.export_job_detail, name='export_job_detail'),
+    path('jobs/<int:job_id>/status/', job_views.export_job_status, name='export_job_status'),
+    path('jobs/<int:job_id>/download/', job_views.export_job_download, name='export_job_download'),
+
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,275 @@
+# inventory/utils/keyset.py
+"""
+Shared paginated-list layer for the inventory list views.
+
+Keyset (cursor) pagination: every page is "the next N rows after the last
+sort key seen", so a page costs the same whether the table holds a hundred
+rows or a hundred thousand (no OFFSET, no COUNT(*)).
+
+    page = paginate(
+        request, DesktopDetails.objects.select_related('brand_name'),
+        sorts={'newest': ('-created_at',), 'serial': ('serial_no',)},
+        filters={
+            'serial': 'serial_no__icontains',                      # lookup
+            'status': {'active': Q(is_disposed=False),            # choices
+                       'disposed': Q(is_disposed=True)},
+            'user': lambda qs, value: qs.filter(...),              # callable
+        },
+        search=('computer_name', 'serial_no'),   # fields, or callable(qs, term)
+    )
+    if wants_json(request):
+        return page.json_response(lambda d: {...})
+
+Query parameters: q, <filter names>, sort, per_page, cursor.
+Sort keys must be non-null (annotate Coalesce(...) for nullable columns);
+the primary key is always appended as the tie-breaker.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from urllib.parse import urlencode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import JsonResponse
+
+DEFAULT_PER_PAGE = 25
+PER_PAGE_CHOICES = (10, 25, 50, 100)
+
+
+def wants_json(request):
+    """JSON variant of a list view: ?format=json or an Accept: application/json request"""
+    return (
+        request.GET.get('format') == 'json'
+        or 'application/json' in request.headers.get('Accept', '')
+    )
+
+
+# ---------------------------------------------------------------------------
+# Cursor encoding
+# ---------------------------------------------------------------------------
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return ['dt', value.isoformat()]
+    if isinstance(value, date):
+        return ['d', value.isoformat()]
+    if isinstance(value, Decimal):
+        return ['dec', str(value)]
+    return ['v', value]
+
+
+def _decode_value(item):
+    tag, value = item
+    if tag == 'dt':
+        return datetime.fromisoformat(value)
+    if tag == 'd':
+        return date.fromisoformat(value)
+    if tag == 'dec':
+        return Decimal(value)
+    return value
+
+
+def encode_cursor(direction, values):
+    payload = json.dumps({'d': direction, 'k': [_encode_value(v) for v in values]}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(direction, values) or None for a missing/invalid cursor"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload['d'] not in ('n', 'p'):
+            return None
+        return payload['d'], [_decode_value(item) for item in payload['k']]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Keyset filtering
+# ---------------------------------------------------------------------------
+
+def _parse_ordering(ordering):
+    """('-created_at', 'name') -> [('created_at', True), ('name', False), ('pk', desc_of_first)]"""
+    fields = [(f.lstrip('-'), f.startswith('-')) for f in ordering]
+    if not any(name in ('pk', 'id') for name, _ in fields):
+        fields.append(('pk', fields[0][1] if fields else False))
+    return fields
+
+
+def _keyset_q(fields, values, forward):
+    """Rows strictly after (forward) / before the given key in the ordering"""
+    clauses = Q(pk__in=[])
+    for i, (name, descending) in enumerate(fields):
+        op = 'lt' if descending == forward else 'gt'
+        clause = Q(**{f'{name}__{op}': values[i]})
+        for j in range(i):
+            clause &= Q(**{fields[j][0]: values[j]})
+        clauses |= clause
+    return clauses
+
+
+def _key_of(obj, fields):
+    return [getattr(obj, name) for name, _ in fields]
+
+
+class KeysetPage:
+    """One page of a keyset-paginated list plus what the templates need to link around it"""
+
+    def __init__(self, request, object_list, *, fields, per_page, sort, sort_options,
+                 params, has_next, has_previous):
+        self.request = request
+        self.object_list = object_list
+        self.per_page = per_page
+        self.sort = sort
+        self.sort_options = sort_options
+        self.params = params
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self._fields = fields
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def next_cursor(self):
+        if not self.has_next or not self.object_list:
+            return None
+        return encode_cursor('n', _key_of(self.object_list[-1], self._fields))
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous or not self.object_list:
+            return None
+        return encode_cursor('p', _key_of(self.object_list[0], self._fields))
+
+    @property
+    def per_page_choices(self):
+        return sorted(set(PER_PAGE_CHOICES) | {self.per_page})
+
+    @property
+    def filter_params(self):
+        """Current search/filter values as (name, value) pairs, for hidden form inputs"""
+        return [(k, v) for k, v in self.params.items() if v]
+
+    def querystring(self, **overrides):
+        query = {k: v for k, v in self.params.items() if v}
+        query.update(sort=self.sort, per_page=self.per_page)
+        query.update(overrides)
+        return urlencode({k: v for k, v in query.items() if v not in (None, '')})
+
+    @property
+    def next_url(self):
+        cursor = self.next_cursor
+        return f'{self.request.path}?{self.querystring(cursor=cursor)}' if cursor else None
+
+    @property
+    def previous_url(self):
+        cursor = self.previous_cursor
+        return f'{self.request.path}?{self.querystring(cursor=cursor)}' if cursor else None
+
+    @property
+    def first_url(self):
+        return f'{self.request.path}?{self.querystring()}'
+
+    def json_response(self, serialize, **extra):
+        """JsonResponse with serialized rows and next/previous links"""
+        def absolute(url):
+            return self.request.build_absolute_uri(url) if url else None
+
+        data = {
+            'results': [serialize(obj) for obj in self.object_list],
+            'next': absolute(self.next_url and f'{self.next_url}&format=json'),
+            'previous': absolute(self.previous_url and f'{self.previous_url}&format=json'),
+            'per_page': self.per_page,
+            'sort': self.sort,
+            'filters': {k: v for k, v in self.params.items() if v},
+        }
+        data.update(extra)
+        return JsonResponse(data)
+
+
+def apply_filter(queryset, spec, value):
+    if callable(spec):
+        return spec(queryset, value)
+    if isinstance(spec, dict):
+        q = spec.get(value)
+        return queryset.filter(q) if q is not None else queryset
+    try:
+        return queryset.filter(**{spec: value})
+    except (ValueError, ValidationError):
+        return queryset  # ?section=abc on an ID lookup: ignored like an unknown choice
+
+
+def paginate(request, queryset, *, sorts, default_sort=None, filters=None, search=None,
+             per_page=DEFAULT_PER_PAGE, max_per_page=max(PER_PAGE_CHOICES)):
+    """
+    Filter, search, sort and keyset-paginate `queryset` from request.GET.
+
+    sorts:   {name: ordering tuple}; the first entry is the default sort
+    filters: {param: lookup string | {value: Q} | callable(qs, value)}
+    search:  iterable of fields searched with icontains for ?q=, or callable(qs, term)
+    """
+    filters = filters or {}
+    params = {}
+
+    term = request.GET.get('q', '').strip()
+    if search is not None:
+        params['q'] = term
+        if term:
+            if callable(search):
+                queryset = search(queryset, term)
+            else:
+                match = Q()
+                for field in search:
+                    match |= Q(**{f'{field}__icontains': term})
+                queryset = queryset.filter(match)
+
+    for name, spec in filters.items():
+        value = request.GET.get(name, '').strip()
+        params[name] = value
+        if value:
+            queryset = apply_filter(queryset, spec, value)
+
+    sort = request.GET.get('sort', '')
+    if sort not in sorts:
+        sort = default_sort or next(iter(sorts))
+    fields = _parse_ordering(sorts[sort])
+
+    try:
+        per_page = min(max(int(request.GET.get('per_page', per_page)), 1), max_per_page)
+    except ValueError:
+        pass
+
+    cursor = decode_cursor(request.GET.get('cursor'))
+    if cursor and len(cursor[1]) != len(fields):
+        cursor = None  # cursor from another sort order
+    forward = cursor is None or cursor[0] == 'n'
+
+    # Backward pages run the ordering reversed and are flipped back after slicing
+    ordering = [f"{'-' if desc == forward else ''}{name}" for name, desc in fields]
+    if cursor:
+        queryset = queryset.filter(_keyset_q(fields, cursor[1], forward))
+    rows = list(queryset.order_by(*ordering)[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if forward:
+        has_next, has_previous = has_more, cursor is not None
+    else:
+        rows.reverse()
+        has_next, has_previous = True, has_more
+
+    return KeysetPage(
+        request, rows, fields=fields, per_page=per_page, sort=sort,
+        sort_options=list(sorts), params=params,
+        has_next=has_next, has_previous=has_previous,
+    )
@@ -0,0 +1,28 @@
+# inventory/utils/lazy_views.py
+"""
+URL routes to views whose modules are imported on first request.
+
+    path('desktop/<int:package_id>/pdf/', lazy_view('inventory.export_views.generate_desktop_pdf'), ...)
+
+Used for the export/report views so that loading the URLconf (every WSGI
+worker, `manage.py check`, ...) does not import WeasyPrint, openpyxl,
+ReportLab and friends.
+"""
+from django.utils.module_loading import import_string
+
+
+def lazy_view(dotted_path):
+    """A view that imports `dotted_path` the first time it is called"""
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path)
+        return view(request, *args, **kwargs)
+
+    wrapper.__name__ = dotted_path.rsplit('.', 1)[-1]
+    wrapper.__qualname__ = wrapper.__name__
+    wrapper.__module__ = dotted_path.rsplit('.', 1)[0]
+    wrapper.lazy_view_path = dotted_path
+    return wrapper
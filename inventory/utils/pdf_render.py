@@ -0,0 +1,98 @@
+# inventory/utils/pdf_render.py
+"""
+WeasyPrint rendering that reads our own static/media files from disk.
+
+The PDF templates reference images by absolute URL (logo, QR code). Left to
+WeasyPrint's default fetcher, each of those is an HTTP request back to this
+server while a worker is busy rendering - slow, and a deadlock when there is
+only one worker. local_url_fetcher() maps STATIC_URL / MEDIA_URL paths on an
+allowed host to files and keeps recently used ones (images, fonts, CSS) in
+memory, re-reading a file when its mtime or size changes. Anything else goes
+to WeasyPrint's default fetcher.
+
+Every WeasyPrint render goes through html_to_pdf().
+"""
+import mimetypes
+import os
+from functools import lru_cache
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import SuspiciousFileOperation
+from django.http.request import validate_host
+from django.utils._os import safe_join
+
+FILE_CACHE_SIZE = 128                 # files kept in memory
+FILE_CACHE_MAX_BYTES = 5 * 1024 * 1024  # larger files are read but not kept
+
+
+def _allowed_hosts():
+    if settings.ALLOWED_HOSTS:
+        return settings.ALLOWED_HOSTS
+    return ['.localhost', '127.0.0.1', '[::1]'] if settings.DEBUG else []
+
+
+def _static_path(relative):
+    if settings.STATIC_ROOT:
+        try:
+            path = safe_join(settings.STATIC_ROOT, relative)
+        except SuspiciousFileOperation:
+            return None
+        if os.path.isfile(path):
+            return path
+    return finders.find(relative)
+
+
+def local_path(url):
+    """Filesystem path behind a STATIC_URL / MEDIA_URL URL on one of our hosts, or None"""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not validate_host(parts.hostname or '', _allowed_hosts()):
+        return None
+    path = unquote(parts.path)
+    if settings.MEDIA_URL and path.startswith(settings.MEDIA_URL):
+        try:
+            path = safe_join(settings.MEDIA_ROOT, path[len(settings.MEDIA_URL):])
+        except SuspiciousFileOperation:
+            return None
+        return path if os.path.isfile(path) else None
+    if settings.STATIC_URL and path.startswith(settings.STATIC_URL):
+        return _static_path(path[len(settings.STATIC_URL):])
+    return None
+
+
+@lru_cache(maxsize=FILE_CACHE_SIZE)
+def _cached_read(path, mtime_ns, size):
+    with open(path, 'rb') as fh:
+        return fh.read()
+
+
+def read_local_file(path):
+    stat = os.stat(path)
+    if stat.st_size > FILE_CACHE_MAX_BYTES:
+        with open(path, 'rb') as fh:
+            return fh.read()
+    return _cached_read(path, stat.st_mtime_ns, stat.st_size)
+
+
+def local_url_fetcher(url, *args, **kwargs):
+    """WeasyPrint url_fetcher: our static/media files from disk, the rest as usual"""
+    path = local_path(url)
+    if path is None:
+        from weasyprint import default_url_fetcher
+        return default_url_fetcher(url, *args, **kwargs)
+    mime_type, encoding = mimetypes.guess_type(path)
+    return {
+        'string': read_local_file(path),
+        'mime_type': mime_type or 'application/octet-stream',
+        'encoding': encoding,
+        'redirected_url': url,
+        'filename': os.path.basename(path),
+    }
+
+
+def html_to_pdf(html, target=None, base_url=None):
+    """PDF bytes of `html` (or write them to `target`, a path or file object)"""
+    from weasyprint import HTML
+
+    return HTML(string=html, base_url=base_url, url_fetcher=local_url_fetcher).write_pdf(target)
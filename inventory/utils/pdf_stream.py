@@ -0,0 +1,176 @@
+# inventory/utils/pdf_stream.py
+"""
+Concatenate PDFs into one file without holding the result in memory.
+
+pypdf's PdfWriter keeps every page it was given until write(), so a batch of
+a few thousand sheets needs all of them in RAM at once. PdfStreamWriter
+copies one source PDF at a time: its pages and everything they reference are
+renumbered and written straight to the output, and only the object offsets,
+the page order and the bookmarks are kept. The page tree, the outline and
+the cross-reference table are written by close().
+
+    writer = PdfStreamWriter(fileobj)
+    writer.append('sheet.pdf', outline_item='PC-001 (desktop)')
+    writer.append(contents_buffer, position=0)   # in front of the sheets
+    writer.close(title='Asset sheets')
+
+Inherited page attributes (resources, media box) are copied onto each page,
+as pypdf flattens them when reading; named destinations and other
+document-level data of the sources are not copied.
+"""
+from io import BytesIO
+
+from pypdf import PdfReader
+from pypdf.generic import (
+    ArrayObject, DictionaryObject, IndirectObject, NameObject, NullObject, NumberObject, StreamObject,
+    create_string_object,
+)
+
+CATALOG, PAGES, OUTLINES = 1, 2, 3
+
+
+def _ref(number):
+    return IndirectObject(number, 0, None)
+
+
+def _is_page_tree(value):
+    node = value.get_object()
+    return isinstance(node, DictionaryObject) and node.get('/Type') == '/Pages'
+
+
+class PdfStreamWriter:
+    """Writes appended PDFs' pages to `fileobj` as they come; close() finishes the file"""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.offset = 0
+        self.offsets = [None, None, None, None]  # by object number; 1-3 are written by close()
+        self.page_refs = []
+        self.outline = []  # (title, page object number)
+        self._write(b'%PDF-1.7\n%\xe2\xe3\xcf\xd3\n')
+
+    @property
+    def page_count(self):
+        return len(self.page_refs)
+
+    def _write(self, data):
+        self.fileobj.write(data)
+        self.offset += len(data)
+
+    def _reserve(self):
+        self.offsets.append(None)
+        return len(self.offsets) - 1
+
+    def _write_object(self, number, obj):
+        buffer = BytesIO()
+        buffer.write(f'{number} 0 obj\n'.encode())
+        obj.write_to_stream(buffer)
+        buffer.write(b'\nendobj\n')
+        self.offsets[number] = self.offset
+        self._write(buffer.getvalue())
+
+    def append(self, source, outline_item=None, position=None):
+        """Copy every page of `source` (path or file); `position` inserts them there instead of at the end"""
+        reader = PdfReader(source)
+        pages = list(reader.pages)
+        mapping = {}
+        for page in pages:
+            mapping[page.indirect_reference.idnum, page.indirect_reference.generation] = self._reserve()
+        pending = []
+
+        def renumber(ref):
+            key = (ref.idnum, ref.generation)
+            if key not in mapping:
+                mapping[key] = self._reserve()
+                pending.append(ref)
+            return _ref(mapping[key])
+
+        def copy(obj):
+            if isinstance(obj, IndirectObject):
+                return renumber(obj)
+            if isinstance(obj, StreamObject):
+                new = StreamObject()
+                new.set_data(obj._data)  # as stored, still encoded
+            elif isinstance(obj, DictionaryObject):
+                new = DictionaryObject()
+            elif isinstance(obj, ArrayObject):
+                return ArrayObject(copy(item) for item in obj)
+            else:
+                return obj
+            for key, value in obj.items():
+                if key == '/Parent' and _is_page_tree(value):
+                    new[NameObject(key)] = _ref(PAGES)
+                else:
+                    new[NameObject(key)] = copy(value)
+            return new
+
+        numbers = []
+        for page in pages:
+            number = mapping[page.indirect_reference.idnum, page.indirect_reference.generation]
+            self._write_object(number, copy(page))
+            numbers.append(number)
+        while pending:
+            ref = pending.pop()
+            self._write_object(mapping[ref.idnum, ref.generation], copy(ref.get_object()))
+
+        if outline_item and numbers:
+            self.outline.append((outline_item, numbers[0]))
+        if position is None:
+            self.page_refs.extend(numbers)
+        else:
+            self.page_refs[position:position] = numbers
+        return len(numbers)
+
+    def _write_outline(self):
+        numbers = [self._reserve() for _ in self.outline]
+        for index, (title, page) in enumerate(self.outline):
+            item = DictionaryObject({
+                NameObject('/Title'): create_string_object(title),
+                NameObject('/Parent'): _ref(OUTLINES),
+                NameObject('/Dest'): ArrayObject([_ref(page), NameObject('/XYZ'),
+                                                  NullObject(), NullObject(), NullObject()]),
+            })
+            if index:
+                item[NameObject('/Prev')] = _ref(numbers[index - 1])
+            if index + 1 < len(numbers):
+                item[NameObject('/Next')] = _ref(numbers[index + 1])
+            self._write_object(numbers[index], item)
+        self._write_object(OUTLINES, DictionaryObject({
+            NameObject('/Type'): NameObject('/Outlines'),
+            NameObject('/First'): _ref(numbers[0]),
+            NameObject('/Last'): _ref(numbers[-1]),
+            NameObject('/Count'): NumberObject(len(numbers)),
+        }))
+
+    def close(self, title=None):
+        """Write the page tree, outline, document info and cross-reference table"""
+        self._write_object(PAGES, DictionaryObject({
+            NameObject('/Type'): NameObject('/Pages'),
+            NameObject('/Kids'): ArrayObject(_ref(number) for number in self.page_refs),
+            NameObject('/Count'): NumberObject(len(self.page_refs)),
+        }))
+        catalog = DictionaryObject({
+            NameObject('/Type'): NameObject('/Catalog'),
+            NameObject('/Pages'): _ref(PAGES),
+        })
+        if self.outline:
+            self._write_outline()
+            catalog[NameObject('/Outlines')] = _ref(OUTLINES)
+            catalog[NameObject('/PageMode')] = NameObject('/UseOutlines')
+        else:
+            self.offsets[OUTLINES] = 0  # unused number, listed as free
+        self._write_object(CATALOG, catalog)
+        info = self._reserve()
+        self._write_object(info, DictionaryObject({
+            NameObject('/Title'): create_string_object(title or ''),
+        }))
+
+        xref = self.offset
+        lines = [f'xref\n0 {len(self.offsets)}\n', '0000000000 65535 f \n']
+        for offset in self.offsets[1:]:
+            lines.append(f'{offset:010d} 00000 n \n' if offset else '0000000000 00000 f \n')
+        self._write(''.join(lines).encode())
+        self._write(
+            f'trailer\n<< /Size {len(self.offsets)} /Root {CATALOG} 0 R /Info {info} 0 R >>\n'
+            f'startxref\n{xref}\n%%EOF\n'.encode()
+        )
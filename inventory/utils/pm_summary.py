@@ -0,0 +1,102 @@
+# inventory/utils/pm_summary.py
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+
+from inventory.models import PMScheduleAssignment, DesktopDetails, LaptopDetails
+
+PENDING_PM_CACHE_PREFIX = "pending_pm_summary"
+PENDING_PM_CACHE_TIMEOUT = 300  # seconds; signals invalidate earlier on changes
+PENDING_PM_LIST_SIZE = 5
+PENDING_PM_LOOKAHEAD_DAYS = 3
+
+
+def _cache_key(today):
+    # The overdue flag depends on the date, so each day gets its own entry
+    return f"{PENDING_PM_CACHE_PREFIX}:{today.isoformat()}"
+
+
+def pending_pm_queryset(today=None):
+    """
+    Pending (not completed) PM assignments that are overdue or start within
+    the lookahead window, excluding disposed desktops/laptops.
+    """
+    today = today or date.today()
+    near_future = today + timedelta(days=PENDING_PM_LOOKAHEAD_DAYS)
+    return PMScheduleAssignment.objects.filter(
+        is_completed=False,
+        pm_section_schedule__start_date__lte=near_future
+    ).exclude(
+        equipment_package__is_disposed=True
+    ).exclude(
+        laptop_package__is_disposed=True
+    )
+
+
+def build_pending_pm_summary(today=None):
+    """
+    Build the sidebar/topbar PM summary in two queries:
+    one COUNT and one SELECT for the top entries with computer names
+    resolved through subqueries (no per-assignment lookups).
+    """
+    today = today or date.today()
+    pending = pending_pm_queryset(today)
+
+    desktop_name = DesktopDetails.objects.filter(
+        equipment_package=OuterRef('equipment_package')
+    ).order_by('id').values('computer_name')[:1]
+    laptop_name = LaptopDetails.objects.filter(
+        laptop_package=OuterRef('laptop_package')
+    ).order_by('id').values('computer_name')[:1]
+
+    rows = pending.annotate(
+        desktop_name=Subquery(desktop_name),
+        laptop_name=Subquery(laptop_name),
+    ).order_by(
+        'pm_section_schedule__start_date', 'id'
+    ).values(
+        'id', 'equipment_package_id', 'laptop_package_id',
+        'desktop_name', 'laptop_name',
+        'pm_section_schedule__start_date', 'pm_section_schedule__end_date',
+    )[:PENDING_PM_LIST_SIZE]
+
+    entries = []
+    for row in rows:
+        if row['equipment_package_id']:
+            name = row['desktop_name'] or f"Desktop #{row['equipment_package_id']}"
+        elif row['laptop_package_id']:
+            name = row['laptop_name'] or f"Laptop #{row['laptop_package_id']}"
+        else:
+            name = "N/A"
+
+        entries.append({
+            'id': row['id'],
+            'equipment_package_id': row['equipment_package_id'],
+            'laptop_package_id': row['laptop_package_id'],
+            'computer_name_display': name,
+            'start_date': row['pm_section_schedule__start_date'],
+            'end_date': row['pm_section_schedule__end_date'],
+            'is_overdue': row['pm_section_schedule__start_date'] < today,
+        })
+
+    return {
+        'count': pending.count(),
+        'entries': entries,
+    }
+
+
+def get_pending_pm_summary(today=None):
+    """Return the cached PM summary, rebuilding it on a cache miss."""
+    today = today or date.today()
+    key = _cache_key(today)
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_pending_pm_summary(today)
+        cache.set(key, summary, PENDING_PM_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_pending_pm_summary():
+    """Drop today's cached summary so the next render rebuilds it."""
+    cache.delete(_cache_key(date.today()))
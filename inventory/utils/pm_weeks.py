@@ -0,0 +1,48 @@
+# inventory/utils/pm_weeks.py
+"""
+Week helpers for the daily PM checklists (Mon-Fri weeks).
+
+Kept apart from pm_daily_weekly_export so the checklist pages can use them
+without importing ReportLab.
+"""
+from datetime import timedelta
+
+from inventory.models import PMChecklistCompletion
+
+
+def get_week_start_end(date):
+    """Get Monday and Friday of the week containing the given date"""
+    # Get the weekday (0=Monday, 6=Sunday)
+    weekday = date.weekday()
+
+    # Calculate Monday of this week
+    monday = date - timedelta(days=weekday)
+
+    # Calculate Friday of this week
+    friday = monday + timedelta(days=4)
+
+    return monday, friday
+
+
+def get_week_completions(template, week_start_date):
+    """
+    Get all completions for a week (Mon-Fri) for a specific template
+    Returns dict: {0: monday_completion, 1: tuesday_completion, ...}
+    where keys are weekday numbers (0=Mon, 4=Fri)
+    """
+    monday, friday = get_week_start_end(week_start_date)
+
+    completions = PMChecklistCompletion.objects.filter(
+        schedule__template=template,
+        completion_date__gte=monday,
+        completion_date__lte=friday
+    ).select_related('schedule', 'schedule__template', 'completed_by')
+
+    # Organize by weekday
+    week_completions = {}
+    for comp in completions:
+        weekday = comp.completion_date.weekday()
+        if weekday < 5:  # Only Mon-Fri
+            week_completions[weekday] = comp
+
+    return week_completions
@@ -1,21 +1,10 @@
 # Standard library
-import io
-import os
 import json
-import qrcode
 import traceback
 from io import BytesIO
 from datetime import datetime, timedelta
 from calendar import month_abbr
 from collections import defaultdict
-try:
-    import pythoncom
-    from win32com.client import Dispatch
-    HAS_WIN32 = True
-except ImportError:
-    # Windows-specific modules not available on Linux
-    HAS_WIN32 = False
-from django.http import HttpResponse, Http404
 
 
 # Django
@@ -27,12 +16,10 @@ from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
 from django.db import IntegrityError, transaction
-from django.db.models import Count, F, Prefetch, Max, Q
-from django.db.models.functions import TruncDay, TruncMonth, Upper, Trim
-from django.http import FileResponse, HttpResponse, JsonResponse
+from django.db.models import Count, F, OuterRef, Prefetch, Max, Q, Subquery
+from django.db.models.functions import Coalesce, Lower, TruncDay, TruncMonth, Upper, Trim
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.template.loader import render_to_string
-from django.templatetags.static import static
 from django.urls import NoReverseMatch, reverse
 from django.utils import timezone
 from django.utils.dateformat import DateFormat
@@ -40,30 +27,6 @@ from django.utils.timezone import now
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
-# Third-party (keep if used anywhere in file)
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import PatternFill
-try:
-    from weasyprint import HTML
-    HAS_WEASYPRINT = True
-except ImportError:
-    HAS_WEASYPRINT = False
-try:
-    from fpdf import FPDF
-    HAS_FPDF = True
-except ImportError:
-    HAS_FPDF = False
-try:
-    from docx import Document
-    HAS_DOCX = True
-except ImportError:
-    HAS_DOCX = False
-try:
-    from docx2pdf import convert
-    HAS_DOCX2PDF = True
-except ImportError:
-    HAS_DOCX2PDF = False
-
 # Local
 from inventory.models import (
     Equipment_Package, DesktopDetails, KeyboardDetails, MouseDetails, MonitorDetails,
@@ -78,7 +41,7 @@ from inventory.models import (
     OfficeSuppliesPackage, OfficeSuppliesDetails, DisposedOfficeSupplies, PMChecklistTemplate, PMChecklistItem, PMChecklistSchedule,
     PMChecklistCompletion, PMChecklistItemCompletion, PMChecklistReport,
     PMIssueLog, EquipmentDowntimeEvent,
-    SNMRAreaCategory, SNMRReport, SNMREntry
+    SNMRAreaCategory, SNMRReport, SNMREntry, AssetIndex
 )
 
 
@@ -89,6 +52,12 @@ from django.db.models import F, Value
 from django.db.models.functions import Upper, Trim
 
 from inventory.utils.pm_helpers import transfer_pm_schedule_on_user_change
+from inventory.pm_assignments import reconcile_pm_assignments
+from inventory.pm_rollover import rollover_pm_year
+from inventory import pm_compliance
+from inventory.data_export import csv_lines
+from inventory.utils.keyset import apply_filter, paginate, wants_json
+from inventory.asset_index import filter_by_index, indexed_package_ids, search_by_index
 
 from django.contrib.contenttypes.models import ContentType
 
@@ -135,27 +104,11 @@ def auto_transfer_pm_schedule(equipment_package, new_enduser):
 
         with transaction.atomic():
 
-            # 🔹 1. Get all assignments for this equipment
-            all_assignments = PMScheduleAssignment.objects.filter(
-                equipment_package=equipment_package
-            ).select_related('pm_section_schedule__quarter_schedule', 'pm_section_schedule__section')
-
-            # Track which quarters are already completed (keep in original section)
-            completed_quarters = set()
-            pending_assignments = []
-
-            for assignment in all_assignments:
-                quarter_key = (
-                    assignment.pm_section_schedule.quarter_schedule.year,
-                    assignment.pm_section_schedule.quarter_schedule.quarter
-                )
-                
-                if assignment.is_completed:
-                    # ✅ Keep completed assignments in their original section
-                    completed_quarters.add(quarter_key)
-                else:
-                    # ❌ Mark pending assignments for deletion and recreation
-                    pending_assignments.append(assignment)
+            # 🔹 1. Get the PENDING assignments for this equipment
+            # (✅ completed assignments stay in their original section)
+            pending_assignments = list(PMScheduleAssignment.objects.filter(
+                equipment_package=equipment_package, is_completed=False
+            ))
 
             # 🔹 2. Delete only PENDING assignments (will be recreated in new section)
             deleted_count = len(pending_assignments)
@@ -174,24 +127,11 @@ def auto_transfer_pm_schedule(equipment_package, new_enduser):
                 return f"⚠️ No PM schedules found for {new_section.name} section."
 
             # 🔹 4. Create assignments in NEW section for quarters that aren't completed
-            created_count = 0
-            for sched in new_section_schedules:
-                quarter_key = (sched.quarter_schedule.year, sched.quarter_schedule.quarter)
-                
-                # Skip if this quarter was already completed in the old section
-                if quarter_key in completed_quarters:
-                    continue
-                
-                # Create new assignment for pending quarters
-                PMScheduleAssignment.objects.get_or_create(
-                    equipment_package=equipment_package,
-                    pm_section_schedule=sched,
-                    defaults={
-                        'is_completed': False,
-                        'remarks': f'Transferred from previous section to {new_section.name}'
-                    }
-                )
-                created_count += 1
+            # (quarters already completed in the old section are skipped)
+            created_count = reconcile_pm_assignments(
+                desktop_ids=[equipment_package.pk],
+                remarks=f'Transferred from previous section to {new_section.name}',
+            )['desktop']
 
             # 🔹 5. Build informative message
             if created_count > 0:
@@ -232,27 +172,11 @@ def auto_transfer_pm_schedule_laptop(laptop_package, new_enduser):
 
         with transaction.atomic():
 
-            # 🔹 1. Get all assignments for this LAPTOP
-            all_assignments = PMScheduleAssignment.objects.filter(
-                laptop_package=laptop_package
-            ).select_related('pm_section_schedule__quarter_schedule', 'pm_section_schedule__section')
-
-            # Track which quarters are already completed (keep in original section)
-            completed_quarters = set()
-            pending_assignments = []
-
-            for assignment in all_assignments:
-                quarter_key = (
-                    assignment.pm_section_schedule.quarter_schedule.year,
-                    assignment.pm_section_schedule.quarter_schedule.quarter
-                )
-                
-                if assignment.is_completed:
-                    # ✅ Keep completed assignments in their original section
-                    completed_quarters.add(quarter_key)
-                else:
-                    # ❌ Mark pending assignments for deletion and recreation
-                    pending_assignments.append(assignment)
+            # 🔹 1. Get the PENDING assignments for this LAPTOP
+            # (✅ completed assignments stay in their original section)
+            pending_assignments = list(PMScheduleAssignment.objects.filter(
+                laptop_package=laptop_package, is_completed=False
+            ))
 
             # 🔹 2. Delete only PENDING assignments (will be recreated in new section)
             deleted_count = len(pending_assignments)
@@ -271,24 +195,11 @@ def auto_transfer_pm_schedule_laptop(laptop_package, new_enduser):
                 return f"⚠️ No PM schedules found for {new_section.name} section."
 
             # 🔹 4. Create assignments in NEW section for quarters that aren't completed
-            created_count = 0
-            for sched in new_section_schedules:
-                quarter_key = (sched.quarter_schedule.year, sched.quarter_schedule.quarter)
-                
-                # Skip if this quarter was already completed in the old section
-                if quarter_key in completed_quarters:
-                    continue
-                
-                # Create new assignment for pending quarters
-                PMScheduleAssignment.objects.get_or_create(
-                    laptop_package=laptop_package,
-                    pm_section_schedule=sched,
-                    defaults={
-                        'is_completed': False,
-                        'remarks': f'Transferred from previous section to {new_section.name}'
-                    }
-                )
-                created_count += 1
+            # (quarters already completed in the old section are skipped)
+            created_count = reconcile_pm_assignments(
+                laptop_ids=[laptop_package.pk],
+                remarks=f'Transferred from previous section to {new_section.name}',
+            )['laptop']
 
             # 🔹 5. Build informative message
             if created_count > 0:
@@ -593,26 +504,73 @@ def success_page(request, package_id):
     
 
 
+# Shared status filter for list views over models with an is_disposed flag
+ACTIVE_DISPOSED_FILTER = {'active': Q(is_disposed=False), 'disposed': Q(is_disposed=True)}
+
+
+def _index_filter(asset_type, package_field, lookup):
+    """keyset filter backed by the AssetIndex (end user / owner names etc.)"""
+    return lambda qs, value: filter_by_index(qs, asset_type, package_field, **{lookup: value})
+
+
+def _index_search(asset_type, package_field):
+    return lambda qs, term: search_by_index(qs, asset_type, package_field, term)
+
+
 #Template: Desktop_details_view
 @login_required
 def equipment_package_base(request):
-    # Fetch all desktop details
-    desktop_details = DesktopDetails.objects.all()
-    
-    # Create a combined list where each desktop is paired with its keyboards
-    desktops_with_items = []
-    for desktop in desktop_details:
-        keyboards = KeyboardDetails.objects.filter(equipment_package=desktop.equipment_package, is_disposed=False)
-        user = UserDetails.objects.filter(equipment_package=desktop.equipment_package)
-        desktops_with_items.append({
-            'desktop': desktop,
-            'keyboards': keyboards,  # This can have multiple entries per desktop
-            'user': user
+    desktops = (
+        DesktopDetails.objects
+        .select_related('equipment_package', 'brand_name')
+        .prefetch_related(Prefetch(
+            'equipment_package__user_details',
+            queryset=UserDetails.objects.select_related(
+                'user_Enduser__employee_office_section', 'user_Assetowner__employee_office_section'
+            ),
+        ))
+        .annotate(sort_name=Coalesce('computer_name', Value('')))
+    )
+    page = paginate(
+        request, desktops,
+        sorts={
+            'name': ('sort_name',),
+            'serial': ('serial_no',),
+            'newest': ('-created_at',),
+            'oldest': ('created_at',),
+        },
+        filters={
+            'name': 'computer_name__icontains',
+            'serial': 'serial_no__icontains',
+            'brand': 'brand_name__name__icontains',
+            'user': _index_filter('desktop', 'equipment_package_id', 'end_user_name__icontains'),
+            'owner': _index_filter('desktop', 'equipment_package_id', 'asset_owner_name__icontains'),
+            'status': ACTIVE_DISPOSED_FILTER,
+        },
+        search=_index_search('desktop', 'equipment_package_id'),
+    )
+
+    desktops_with_items = [
+        {'desktop': desktop, 'user': desktop.equipment_package.user_details.all()}
+        for desktop in page
+    ]
+
+    if wants_json(request):
+        return page.json_response(lambda d: {
+            'package_id': d.equipment_package_id,
+            'computer_name': d.computer_name,
+            'serial_no': d.serial_no,
+            'brand': d.brand_name.name if d.brand_name else None,
+            'model': d.model,
+            'end_user': ', '.join(u.user_Enduser.full_name for u in d.equipment_package.user_details.all() if u.user_Enduser),
+            'asset_owner': ', '.join(u.user_Assetowner.full_name for u in d.equipment_package.user_details.all() if u.user_Assetowner),
+            'is_disposed': d.is_disposed,
         })
 
     return render(request, 'desktop_details.html', {
         'desktops_with_items': desktops_with_items,
-    })   
+        'page': page,
+    })
 
 
 
@@ -662,18 +620,8 @@ def desktop_details_view(request, package_id):
     mouse_brands    = Brand.objects.filter(is_mouse=True)
     ups_brands      = Brand.objects.filter(is_ups=True)
 
-    #Preventive Maintenance
-    # Auto-create missing PMScheduleAssignment records for the desktop's section
-    # (covers cases where new year schedules were added after the desktop was registered)
-    if user_details and user_details.user_Enduser and user_details.user_Enduser.employee_office_section:
-        section = user_details.user_Enduser.employee_office_section
-        for section_schedule in PMSectionSchedule.objects.filter(section=section):
-            PMScheduleAssignment.objects.get_or_create(
-                equipment_package=equipment_package,
-                pm_section_schedule=section_schedule,
-            )
-
     # Preventive Maintenance Schedule Assignments
+    # (kept in step with the end user's section by inventory/pm_assignments.py)
     pm_assignments = PMScheduleAssignment.objects.filter(
         equipment_package=equipment_package
     ).select_related(
@@ -1192,80 +1140,174 @@ def disposed_keyboards(request):
 # END ################ (KEYBOARD END)
 
 
-#This function retrieves all mouse records and renders them in a similar way as mouse_details.
-def monitor_details(request):
+# ==================== COMPONENT LISTS (monitor / keyboard / mouse / UPS) ====================
+# One page shows one status: active details, or salvaged records by state.
+# `columns` maps the template keys to the SalvagedX fields; the first one is the serial.
+COMPONENT_LISTS = {
+    "monitor": {
+        "details": MonitorDetails,
+        "salvaged": SalvagedMonitor,
+        "brand": "monitor_brand_db",
+        "columns": {
+            "monitor_sn_db": "monitor_sn",
+            "monitor_brand_db": "monitor_brand",
+            "monitor_model_db": "monitor_model",
+            "monitor_size_db": "monitor_size",
+        },
+        "filters": {"serial": "monitor_sn_db", "brand": "monitor_brand_db",
+                    "model": "monitor_model_db", "size": "monitor_size_db"},
+    },
+    "keyboard": {
+        "details": KeyboardDetails,
+        "salvaged": SalvagedKeyboard,
+        "brand": "keyboard_brand_db",
+        "columns": {
+            "keyboard_sn_db": "keyboard_sn",
+            "keyboard_brand_db": "keyboard_brand",
+            "keyboard_model_db": "keyboard_model",
+        },
+        "filters": {"serial": "keyboard_sn_db", "brand": "keyboard_brand_db", "model": "keyboard_model_db"},
+    },
+    "mouse": {
+        "details": MouseDetails,
+        "salvaged": SalvagedMouse,
+        "brand": "mouse_brand_db",
+        "columns": {
+            "mouse_sn_db": "mouse_sn",
+            "mouse_brand_db": "mouse_brand",
+            "mouse_model_db": "mouse_model",
+        },
+        "filters": {"serial": "mouse_sn_db", "brand": "mouse_brand_db", "model": "mouse_model_db"},
+    },
+    "ups": {
+        "details": UPSDetails,
+        "salvaged": SalvagedUPS,
+        "brand": "ups_brand_db",
+        "columns": {
+            "ups_sn_db": "ups_sn",
+            "ups_brand_db": "ups_brand",
+            "ups_model_db": "ups_model",
+        },
+        "filters": {"serial": "ups_sn_db", "brand": "ups_brand_db", "model": "ups_model_db"},
+    },
+}
+
+SALVAGED_STATUS = {
+    "salvaged": Q(is_disposed=False, is_reassigned=False),
+    "reassigned": Q(is_disposed=False, is_reassigned=True),
+    "disposed": Q(is_disposed=True),
+}
+
+_END_USERS = UserDetails.objects.select_related("user_Enduser").order_by("pk")
+
+
+def _normalized_sn(field):
+    return Lower(Trim(Coalesce(field, Value(""))))
+
+
+def _first_end_user(package):
+    user = next(iter(package.user_details.all()), None) if package else None
+    return user.user_Enduser if user else None
+
+
+def _component_page(request, kind):
     """
-    Show all monitor states per serial:
-    - Active: MonitorDetails (is_disposed=False) whose serial is NOT in salvaged list
-    - Salvaged/Reassigned/Disposed: ALL SalvagedMonitor records (regardless of flags)
+    (page, rows) for a component list. Active rows are details whose serial
+    is not in the salvaged table; salvaged rows come from SalvagedX, filtered
+    by ?status=salvaged|reassigned|disposed.
     """
-    # 1) Get ALL salvaged monitors (no filter needed!)
-    salvaged_qs = (
-        SalvagedMonitor.objects
-        .all()  # ← Get ALL salvaged monitors including disposed
-        .select_related("reassigned_to")
-        .prefetch_related("reassigned_to__user_details__user_Enduser")
-    )
-
-    # Normalize serials to avoid duplicates
-    salvaged_serials = {
-        (s.monitor_sn or "").strip().lower()
-        for s in salvaged_qs
-    }
+    spec = COMPONENT_LISTS[kind]
+    columns = spec["columns"]
+    sn_key = next(iter(columns))
+    status = request.GET.get("status", "")
+
+    if status in SALVAGED_STATUS:
+        items = (
+            spec["salvaged"].objects.filter(SALVAGED_STATUS[status])
+            .select_related("equipment_package", "reassigned_to")
+            .prefetch_related(
+                Prefetch("equipment_package__user_details", queryset=_END_USERS),
+                Prefetch("reassigned_to__user_details", queryset=_END_USERS),
+            )
+            .annotate(sort_sn=Coalesce(columns[sn_key], Value("")))
+        )
+        lookups = {param: f"{columns[key]}__icontains" for param, key in spec["filters"].items()}
 
-    # 2) Active monitors EXCLUDING any serial that's in salvaged table
-    active_qs = (
-        MonitorDetails.objects
-        .filter(is_disposed=False)
-        .select_related("equipment_package", "monitor_brand_db")
-        .prefetch_related("equipment_package__user_details__user_Enduser")
-    )
+        def user_filter(qs, value):
+            packages = indexed_package_ids("desktop", end_user_name__icontains=value)
+            return qs.filter(
+                Q(reassigned_to_id__in=packages)
+                | Q(reassigned_to__isnull=True, equipment_package_id__in=packages)
+            )
+    else:
+        salvaged_sns = spec["salvaged"].objects.annotate(sn_norm=_normalized_sn(columns[sn_key])).values("sn_norm")
+        items = (
+            spec["details"].objects.filter(is_disposed=False)
+            .annotate(sn_norm=_normalized_sn(sn_key))
+            .exclude(sn_norm__in=salvaged_sns)
+            .select_related("equipment_package", spec["brand"])
+            .prefetch_related(Prefetch("equipment_package__user_details", queryset=_END_USERS))
+            .annotate(sort_sn=Coalesce(sn_key, Value("")))
+        )
+        lookups = {
+            param: f"{key}__name__icontains" if key == spec["brand"] else f"{key}__icontains"
+            for param, key in spec["filters"].items()
+        }
 
-    active_data = []
-    for m in active_qs:
-        sn_norm = (m.monitor_sn_db or "").strip().lower()
-        if sn_norm in salvaged_serials:
-            continue
+        def user_filter(qs, value):
+            return qs.filter(equipment_package_id__in=indexed_package_ids("desktop", end_user_name__icontains=value))
 
-        active_data.append({
-            "id": m.id,
-            "monitor_sn_db": m.monitor_sn_db,
-            "monitor_brand_db": m.monitor_brand_db,
-            "monitor_model_db": m.monitor_model_db,
-            "monitor_size_db": m.monitor_size_db,
-            "equipment_package": m.equipment_package,
-            "status": "active",
-            "salvaged_id": None,
-        })
+    page = paginate(
+        request, items,
+        sorts={"newest": ("-id",), "serial": ("sort_sn",)},
+        filters={
+            "status": lambda qs, value: qs,  # picks the source above
+            **lookups,
+            "user": user_filter,
+        },
+    )
 
-    # 3) Format salvaged rows - ALL of them!
-    salvaged_data = []
-    for s in salvaged_qs:
-        # ✅ Determine status based on flags
-        if s.is_disposed:
-            status = "disposed"      # 🆕 fixed to show disposed properly
-        elif s.is_reassigned:
-            status = "reassigned"
+    rows = []
+    for obj in page:
+        if status in SALVAGED_STATUS:
+            package = obj.reassigned_to or obj.equipment_package
+            row = {key: getattr(obj, field) for key, field in columns.items()}
+            row.update(status=status, salvaged_id=obj.id)
         else:
-            status = "salvaged"      # newly salvaged and available
-
-        # Use reassigned_to if available, otherwise original equipment_package
-        display_package = s.reassigned_to if s.reassigned_to else s.equipment_package
-
-        salvaged_data.append({
-            "id": s.id,
-            "monitor_sn_db": s.monitor_sn,
-            "monitor_brand_db": s.monitor_brand,
-            "monitor_model_db": s.monitor_model,
-            "monitor_size_db": s.monitor_size,
-            "equipment_package": display_package,
-            "status": status,
-            "salvaged_id": s.id,
-        })
+            package = obj.equipment_package
+            row = {key: getattr(obj, key) for key in columns}
+            row.update(status="active", salvaged_id=None)
+        row.update(id=obj.id, equipment_package=package, end_user=_first_end_user(package))
+        rows.append(row)
+    return page, rows
+
+
+def _component_json(page, rows, kind):
+    columns = COMPONENT_LISTS[kind]["columns"]
+    by_id = {row["id"]: row for row in rows}
+
+    def serialize(obj):
+        row = by_id[obj.id]
+        package, end_user = row["equipment_package"], row["end_user"]
+        data = {key: str(row[key]) if row[key] is not None else None for key in columns}
+        data.update(
+            id=row["id"],
+            status=row["status"],
+            salvaged_id=row["salvaged_id"],
+            package_id=package.id if package else None,
+            end_user=end_user.full_name if end_user else None,
+        )
+        return data
+    return page.json_response(serialize)
 
-    monitors = active_data + salvaged_data
 
-    return render(request, "monitor_details.html", {"monitors": monitors})
+#This function retrieves all mouse records and renders them in a similar way as mouse_details.
+def monitor_details(request):
+    """Monitors by state (active / salvaged / reassigned / disposed), one keyset page at a time"""
+    page, monitors = _component_page(request, "monitor")
+    if wants_json(request):
+        return _component_json(page, monitors, "monitor")
+    return render(request, "monitor_details.html", {"monitors": monitors, "page": page})
 
 
 
@@ -1295,77 +1337,11 @@ def monitor_timeline_detail(request, salvaged_id):
 
 # ==================== KEYBOARD DETAILS ====================
 def keyboard_details(request):
-    """
-    Show all keyboard states per serial:
-    - Active: KeyboardDetails (is_disposed=False) whose serial is NOT in salvaged list
-    - Salvaged/Reassigned: ALL SalvagedKeyboard records (regardless of flags)
-    """
-    # 1) Get ALL salvaged keyboards (no filter!)
-    # This includes newly salvaged (available), reassigned, and disposed
-    salvaged_qs = (
-        SalvagedKeyboard.objects
-        .all()  # ← FIXED: Get ALL salvaged keyboards
-        .select_related("reassigned_to")
-        .prefetch_related("reassigned_to__user_details__user_Enduser")
-    )
-
-    # Normalize serials to avoid duplicates
-    salvaged_serials = {
-        (s.keyboard_sn or "").strip().lower()
-        for s in salvaged_qs
-    }
-
-    # 2) Active keyboards EXCLUDING any serial that's in salvaged table
-    active_qs = (
-        KeyboardDetails.objects
-        .filter(is_disposed=False)
-        .select_related("equipment_package", "keyboard_brand_db")
-        .prefetch_related("equipment_package__user_details__user_Enduser")
-    )
-
-    active_data = []
-    for k in active_qs:
-        sn_norm = (k.keyboard_sn_db or "").strip().lower()
-        if sn_norm in salvaged_serials:
-            continue
-
-        active_data.append({
-            "id": k.id,
-            "keyboard_sn_db": k.keyboard_sn_db,
-            "keyboard_brand_db": k.keyboard_brand_db,
-            "keyboard_model_db": k.keyboard_model_db,
-            "equipment_package": k.equipment_package,
-            "status": "active",
-            "salvaged_id": None,
-        })
-
-    # 3) Format salvaged keyboards - ALL of them!
-    salvaged_data = []
-    for s in salvaged_qs:
-        # Determine status
-        if s.is_disposed:
-            status = "disposed"
-        elif s.is_reassigned:
-            status = "reassigned"
-        else:
-            # Newly salvaged (available for reassignment)
-            status = "salvaged"
-        
-        # Use reassigned_to if available, otherwise original equipment_package
-        display_package = s.reassigned_to if s.reassigned_to else s.equipment_package
-        
-        salvaged_data.append({
-            "id": s.id,
-            "keyboard_sn_db": s.keyboard_sn,
-            "keyboard_brand_db": s.keyboard_brand,
-            "keyboard_model_db": s.keyboard_model,
-            "equipment_package": display_package,
-            "status": status,
-            "salvaged_id": s.id,
-        })
-
-    keyboards = active_data + salvaged_data
-    return render(request, "keyboard_details.html", {"keyboards": keyboards})
+    """Keyboards by state (active / salvaged / reassigned / disposed), one keyset page at a time"""
+    page, keyboards = _component_page(request, "keyboard")
+    if wants_json(request):
+        return _component_json(page, keyboards, "keyboard")
+    return render(request, "keyboard_details.html", {"keyboards": keyboards, "page": page})
 
 
 def keyboard_timeline_detail(request, salvaged_id):
@@ -1394,72 +1370,11 @@ def keyboard_timeline_detail(request, salvaged_id):
 # ==================== MOUSE DETAILS ====================
 # ==================== MOUSE DETAILS ====================
 def mouse_details(request):
-    """
-    Show all mouse states per serial:
-    - Active: MouseDetails (is_disposed=False) whose serial is NOT in salvaged list
-    - Salvaged/Reassigned/Disposed: ALL SalvagedMouse records (regardless of flags)
-    """
-    # 1) Get ALL salvaged mice (including newly salvaged, reassigned, and disposed)
-    salvaged_qs = (
-        SalvagedMouse.objects
-        .all()
-        .select_related("reassigned_to")
-        .prefetch_related("reassigned_to__user_details__user_Enduser")
-    )
-
-    # Normalize serials to avoid duplicates
-    salvaged_serials = {
-        (s.mouse_sn or "").strip().lower()
-        for s in salvaged_qs
-    }
-
-    # 2) Active mice EXCLUDING those already salvaged
-    active_qs = (
-        MouseDetails.objects
-        .filter(is_disposed=False)
-        .select_related("equipment_package", "mouse_brand_db")
-        .prefetch_related("equipment_package__user_details__user_Enduser")
-    )
-
-    active_data = []
-    for m in active_qs:
-        sn_norm = (m.mouse_sn_db or "").strip().lower()
-        if sn_norm in salvaged_serials:
-            continue
-        active_data.append({
-            "id": m.id,
-            "mouse_sn_db": m.mouse_sn_db,
-            "mouse_brand_db": m.mouse_brand_db,
-            "mouse_model_db": m.mouse_model_db,
-            "equipment_package": m.equipment_package,
-            "status": "active",
-            "salvaged_id": None,
-        })
-
-    # 3) Salvaged mice records
-    salvaged_data = []
-    for s in salvaged_qs:
-        if s.is_disposed:
-            status = "disposed"
-        elif s.is_reassigned:
-            status = "reassigned"
-        else:
-            status = "salvaged"
-
-        display_package = s.reassigned_to if s.reassigned_to else s.equipment_package
-
-        salvaged_data.append({
-            "id": s.id,
-            "mouse_sn_db": s.mouse_sn,
-            "mouse_brand_db": s.mouse_brand,
-            "mouse_model_db": s.mouse_model,
-            "equipment_package": display_package,
-            "status": status,
-            "salvaged_id": s.id,
-        })
-
-    mice = active_data + salvaged_data
-    return render(request, "mouse_details.html", {"mice": mice})
+    """Mice by state (active / salvaged / reassigned / disposed), one keyset page at a time"""
+    page, mice = _component_page(request, "mouse")
+    if wants_json(request):
+        return _component_json(page, mice, "mouse")
+    return render(request, "mouse_details.html", {"mice": mice, "page": page})
 
 
 
@@ -1488,74 +1403,11 @@ def mouse_timeline_detail(request, salvaged_id):
 
 # ==================== UPS DETAILS ====================
 def ups_details(request):
-    """
-    Show all UPS states per serial:
-    - Active: UPSDetails (is_disposed=False) whose serial is NOT in salvaged list
-    - Salvaged/Reassigned: ALL SalvagedUPS records (regardless of flags)
-    """
-    # 1) Get ALL salvaged UPS units (no filter!)
-    salvaged_qs = (
-        SalvagedUPS.objects
-        .all()  # ← FIXED: Get ALL salvaged UPS
-        .select_related("reassigned_to")
-        .prefetch_related("reassigned_to__user_details__user_Enduser")
-    )
-
-    # Normalize serials
-    salvaged_serials = {
-        (s.ups_sn or "").strip().lower()
-        for s in salvaged_qs
-    }
-
-    # 2) Active UPS units EXCLUDING salvaged serials
-    active_qs = (
-        UPSDetails.objects
-        .filter(is_disposed=False)
-        .select_related("equipment_package", "ups_brand_db")
-        .prefetch_related("equipment_package__user_details__user_Enduser")
-    )
-
-    active_data = []
-    for u in active_qs:
-        sn_norm = (u.ups_sn_db or "").strip().lower()
-        if sn_norm in salvaged_serials:
-            continue
-
-        active_data.append({
-            "id": u.id,
-            "ups_sn_db": u.ups_sn_db,
-            "ups_brand_db": u.ups_brand_db,
-            "ups_model_db": u.ups_model_db,
-            "equipment_package": u.equipment_package,
-            "status": "active",
-            "salvaged_id": None,
-        })
-
-    # 3) Format salvaged UPS units
-    salvaged_data = []
-    for s in salvaged_qs:
-        # Determine status
-        if s.is_disposed:
-            status = "disposed"
-        elif s.is_reassigned:
-            status = "reassigned"
-        else:
-            status = "salvaged"
-        
-        display_package = s.reassigned_to if s.reassigned_to else s.equipment_package
-        
-        salvaged_data.append({
-            "id": s.id,
-            "ups_sn_db": s.ups_sn,
-            "ups_brand_db": s.ups_brand,
-            "ups_model_db": s.ups_model,
-            "equipment_package": display_package,
-            "status": status,
-            "salvaged_id": s.id,
-        })
-
-    ups_list = active_data + salvaged_data
-    return render(request, "ups_details.html", {"ups_list": ups_list})
+    """UPS units by state (active / salvaged / reassigned / disposed), one keyset page at a time"""
+    page, ups_list = _component_page(request, "ups")
+    if wants_json(request):
+        return _component_json(page, ups_list, "ups")
+    return render(request, "ups_details.html", {"ups_list": ups_list, "page": page})
 
 
 def ups_timeline_detail(request, salvaged_id):
@@ -2363,13 +2215,7 @@ def add_equipment_package_with_details(request):
                         user_Assetowner=assetowner
                     )
 
-                    if enduser and enduser.employee_office_section:
-                        for schedule in PMSectionSchedule.objects.filter(section=enduser.employee_office_section):
-                            PMScheduleAssignment.objects.get_or_create(
-                                equipment_package=equipment_package,
-                                pm_section_schedule=schedule
-                            )
-
+                    # PM schedule assignments follow from UserDetails (signals.py)
                     messages.success(request, "✅ Desktop Package added successfully.", extra_tags='equipment')
                     return redirect(f'/success_add/{equipment_package.id}/?type=Desktop')
 
@@ -2462,14 +2308,7 @@ def add_equipment_package_with_details(request):
                         user_Assetowner=assetowner
                     )
 
-                    # ✅ PM schedule
-                    if enduser and enduser.employee_office_section:
-                        for schedule in PMSectionSchedule.objects.filter(section=enduser.employee_office_section):
-                            PMScheduleAssignment.objects.get_or_create(
-                                laptop_package=laptop_package,
-                                pm_section_schedule=schedule
-                            )
-
+                    # ✅ PM schedule assignments follow from UserDetails (signals.py)
                     messages.success(request, "✅ Laptop Package added successfully.", extra_tags='equipment')
                     return redirect(f'/success_add/{laptop_package.id}/?type=Laptop')
 
@@ -2633,10 +2472,47 @@ def employee_list(request):
         messages.success(request, f"✅ {first_name} {last_name} has been added successfully!", extra_tags='employee')
         return redirect('employee_list')
 
-    employees = Employee.objects.all()
+    employees = Employee.objects.select_related('employee_office_section').annotate(
+        sort_fname=Coalesce(Lower('employee_fname'), Value('')),
+        sort_lname=Coalesce(Lower('employee_lname'), Value('')),
+    )
+    page = paginate(
+        request, employees,
+        sorts={
+            'name': ('sort_fname', 'sort_lname'),
+            'surname': ('sort_lname', 'sort_fname'),
+            'newest': ('-id',),
+        },
+        filters={
+            'name': lambda qs, value: qs.filter(
+                Q(employee_fname__icontains=value)
+                | Q(employee_mname__icontains=value)
+                | Q(employee_lname__icontains=value)
+            ),
+            'position': 'employee_position__icontains',
+            'office': 'employee_office_section__name__icontains',
+            'section': 'employee_office_section_id',
+            'status': {
+                'active': Q(employee_status='Active'),
+                'inactive': ~Q(employee_status='Active') | Q(employee_status__isnull=True),
+            },
+        },
+        search=('employee_fname', 'employee_lname', 'employee_position', 'email'),
+    )
+
+    if wants_json(request):
+        return page.json_response(lambda e: {
+            'id': e.id,
+            'name': e.full_name,
+            'position': e.employee_position,
+            'office_section': e.employee_office_section.name if e.employee_office_section else None,
+            'status': e.employee_status,
+        })
+
     office_sections = OfficeSection.objects.all()
     return render(request, 'employees.html', {
-        'employees': employees,
+        'employees': page.object_list,
+        'page': page,
         'office_sections': office_sections
     })
 
@@ -3462,224 +3338,8 @@ def edit_brand(request):
     return redirect('add_brand')
 
 #print
-from django.templatetags.static import static
 from django.contrib.contenttypes.models import ContentType
 
-def generate_desktop_pdf(request, package_id):
-    # ✅ Use Equipment_Package instead of DesktopDetails
-    equipment_package = get_object_or_404(Equipment_Package, id=package_id)
-    desktop_details = equipment_package.desktop_details.first()
-
-    if not desktop_details:
-        raise Http404("No DesktopDetails found for this package.")
-
-    # Current (non-disposed) components
-    keyboard_details = KeyboardDetails.objects.filter(
-        equipment_package=equipment_package, is_disposed=False
-    ).first()
-    mouse_details = MouseDetails.objects.filter(
-        equipment_package=equipment_package, is_disposed=False
-    ).first()
-    monitor_details = MonitorDetails.objects.filter(
-        equipment_package=equipment_package, is_disposed=False
-    ).first()
-    ups_details = UPSDetails.objects.filter(
-        equipment_package=equipment_package, is_disposed=False
-    ).first()
-
-    # Documents
-    documents_details = DocumentsDetails.objects.filter(equipment_package=equipment_package)
-
-    # Current user assignment
-    user_details = UserDetails.objects.filter(equipment_package=equipment_package).first()
-
-    # ✅ FIXED: History data using GenericForeignKey pattern
-    equipment_package_ct = ContentType.objects.get_for_model(Equipment_Package)
-    
-    asset_owner_history = AssetOwnerChangeHistory.objects.filter(
-        content_type=equipment_package_ct,
-        object_id=equipment_package.id
-    ).order_by("-changed_at")
-    
-    enduser_history = EndUserChangeHistory.objects.filter(
-        content_type=equipment_package_ct,
-        object_id=equipment_package.id
-    ).order_by("-changed_at")
-
-    disposed_desktops = DisposedDesktopDetail.objects.filter(
-        desktop__equipment_package=equipment_package
-    ).order_by("-date_disposed")
-    disposed_monitors = DisposedMonitor.objects.filter(
-        equipment_package=equipment_package
-    ).order_by("-disposal_date")
-    disposed_keyboards = DisposedKeyboard.objects.filter(
-        equipment_package=equipment_package
-    ).order_by("-disposal_date")
-    disposed_mice = DisposedMouse.objects.filter(
-        equipment_package=equipment_package
-    ).order_by("-disposal_date")
-    disposed_ups = DisposedUPS.objects.filter(
-        equipment_package=equipment_package
-    ).order_by("-disposal_date")
-
-    # QR code
-    qr_code_url = None
-    if equipment_package.qr_code:
-        qr_code_url = request.build_absolute_uri(equipment_package.qr_code.url)
-
-    # ✅ Logo fix – build absolute URL
-    logo_url = request.build_absolute_uri(static('img/logo.png'))
-
-    # ✅ Smart filename
-    filename = f"desktop_{desktop_details.computer_name or equipment_package.id}_details.pdf"
-
-    # Render PDF template
-    html_string = render_to_string('pdf_template.html', {
-        'desktop_detailsx': desktop_details,
-        'equipment_package': equipment_package,
-        'keyboard_detailse': keyboard_details,
-        'mouse_detailse': mouse_details,
-        'monitor_detailse': monitor_details,
-        'ups_detailse': ups_details,
-        'user_details': user_details,
-        'documents_detailse': documents_details,
-        'qr_code_url': qr_code_url,
-        'logo_url': logo_url,
-
-        # ✅ Added history
-        'asset_owner_history': asset_owner_history,
-        'enduser_history': enduser_history,
-        'disposed_desktops': disposed_desktops,
-        'disposed_monitors': disposed_monitors,
-        'disposed_keyboards': disposed_keyboards,
-        'disposed_mice': disposed_mice,
-        'disposed_ups': disposed_ups,
-    })
-
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'inline; filename={filename}'
-    HTML(string=html_string).write_pdf(response)
-
-    return response
-#export to excel
-def export_equipment_packages_excel(request):
-    template_path = 'static/excel_template/3f2e3faf-8c25-426f-b673-a2b5fb38e34a.xlsx'
-    wb = load_workbook(template_path)
-    ws = wb.active
-
-    red_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-
-    start_row = 9
-    row = start_row
-
-    desktops = DesktopDetails.objects.select_related('equipment_package', 'brand_name').all()
-
-    for i, desktop in enumerate(desktops, start=1):
-        dp = desktop.equipment_package
-        doc = DocumentsDetails.objects.filter(equipment_package=dp).first()
-        user = UserDetails.objects.filter(equipment_package=dp).first()
-
-        status = "Active" if not desktop.is_disposed else "Disposed"
-
-        ws[f'A{row}'] = f"{i}a"
-        ws[f'B{row}'] = "Desktop"
-        ws[f'C{row}'] = doc.docs_Acquisition_Type if doc else ''
-        ws[f'D{row}'] = desktop.processor
-        ws[f'E{row}'] = desktop.memory
-        ws[f'F{row}'] = desktop.drive
-        ws[f'G{row}'] = desktop.desktop_OS
-        ws[f'H{row}'] = desktop.desktop_Office
-        ws[f'I{row}'] = status
-        ws[f'J{row}'] = doc.docs_PAR if doc else ''
-        ws[f'K{row}'] = desktop.serial_no
-        ws[f'L{row}'] = doc.docs_Propertyno if doc else ''
-        ws[f'M{row}'] = desktop.model
-        ws[f'N{row}'] = desktop.brand_name.name if desktop.brand_name else ''
-        ws[f'O{row}'] = doc.docs_Value if doc else ''
-        ws[f'P{row}'] = f"{user.user_Enduser.employee_fname} {user.user_Enduser.employee_lname}" if user and user.user_Enduser else ''
-        ws[f'Q{row}'] = user.user_Enduser.employee_position if user and user.user_Enduser else ''
-        ws[f'R{row}'] = user.user_Enduser.employee_office_section.name if user and user.user_Enduser and user.user_Enduser.employee_office_section else ''
-        ws[f'S{row}'] = "Region VIII"
-        ws[f'T{row}'] = "Leyte 4th DEO"
-        ws[f'U{row}'] = f"{user.user_Assetowner.employee_fname} {user.user_Assetowner.employee_lname}" if user and user.user_Assetowner else ''
-        ws[f'V{row}'] = doc.docs_Datereceived if doc else ''
-        ws[f'W{row}'] = doc.docs_Supplier if doc else ''
-        ws[f'X{row}'] = doc.docs_Dateinspected if doc else ''
-        ws[f'Y{row}'] = desktop.computer_name
-        ws[f'Z{row}'] = status
-
-        if status == "Disposed":
-            for col in range(1, 27):
-                ws.cell(row=row, column=col).fill = red_fill
-
-        row += 1
-
-        # Components - FIXED MODEL FIELD NAMES
-        components = [
-            ('Monitor', MonitorDetails.objects.filter(equipment_package=dp), 'b'),
-            ('Keyboard', KeyboardDetails.objects.filter(equipment_package=dp), 'c'),
-            ('Mouse', MouseDetails.objects.filter(equipment_package=dp), 'd'),
-            ('UPS', UPSDetails.objects.filter(equipment_package=dp), 'e'),
-        ]
-
-        for label, items, suffix in components:
-            for item in items:
-                status = "Active" if not item.is_disposed else "Disposed"
-
-                ws[f'A{row}'] = f"{i}{suffix}"
-                ws[f'B{row}'] = label
-                ws[f'C{row}'] = doc.docs_Acquisition_Type if doc else ''
-                ws[f'D{row}'] = ws[f'E{row}'] = ws[f'F{row}'] = ws[f'G{row}'] = ws[f'H{row}'] = "N/A"
-                ws[f'I{row}'] = status
-                ws[f'J{row}'] = doc.docs_PAR if doc else ''
-                ws[f'L{row}'] = doc.docs_Propertyno if doc else ''
-                ws[f'O{row}'] = doc.docs_Value if doc else ''
-                ws[f'P{row}'] = f"{user.user_Enduser.employee_fname} {user.user_Enduser.employee_lname}" if user and user.user_Enduser else ''
-                ws[f'Q{row}'] = user.user_Enduser.employee_position if user and user.user_Enduser else ''
-                ws[f'R{row}'] = user.user_Enduser.employee_office_section.name if user and user.user_Enduser and user.user_Enduser.employee_office_section else ''
-                ws[f'S{row}'] = "Region VIII"
-                ws[f'T{row}'] = "Leyte 4th DEO"
-                ws[f'U{row}'] = f"{user.user_Assetowner.employee_fname} {user.user_Assetowner.employee_lname}" if user and user.user_Assetowner else ''
-                ws[f'V{row}'] = doc.docs_Datereceived if doc else ''
-                ws[f'W{row}'] = doc.docs_Supplier if doc else ''
-                ws[f'X{row}'] = doc.docs_Dateinspected if doc else ''
-                ws[f'Y{row}'] = "N/A"
-                ws[f'Z{row}'] = status
-
-                # Component-specific fields - FIXED FIELD NAMES
-                if label == "Monitor":
-                    ws[f'K{row}'] = item.monitor_sn_db  # ✅ Fixed from monitor_sn
-                    ws[f'M{row}'] = item.monitor_model_db  # ✅ Fixed from monitor_model
-                    ws[f'N{row}'] = item.monitor_brand_db.name if item.monitor_brand_db else ''  # ✅ Fixed from monitor_brand
-                elif label == "Keyboard":
-                    ws[f'K{row}'] = item.keyboard_sn_db  # ✅ Fixed from keyboard_sn
-                    ws[f'M{row}'] = item.keyboard_model_db  # ✅ Fixed from keyboard_model
-                    ws[f'N{row}'] = item.keyboard_brand_db.name if item.keyboard_brand_db else ''  # ✅ Fixed from keyboard_brand
-                elif label == "Mouse":
-                    ws[f'K{row}'] = item.mouse_sn_db  # ✅ Correct
-                    ws[f'M{row}'] = item.mouse_model_db  # ✅ Correct
-                    ws[f'N{row}'] = item.mouse_brand_db.name if item.mouse_brand_db else ''  # ✅ Correct
-                elif label == "UPS":
-                    ws[f'K{row}'] = item.ups_sn_db  # ✅ Correct
-                    ws[f'M{row}'] = item.ups_model_db  # ✅ Correct
-                    ws[f'N{row}'] = item.ups_brand_db.name if item.ups_brand_db else ''  # ✅ Correct
-
-                if status == "Disposed":
-                    for col in range(1, 27):
-                        ws.cell(row=row, column=col).fill = red_fill
-
-                row += 1
-
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-
-    response = HttpResponse(
-        output,
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename=desktop_bundle_export_{datetime.today().date()}.xlsx'
-    return response
 
 def add_maintenance(request, desktop_id):
     desktop = get_object_or_404(Equipment_Package, id=desktop_id)
@@ -3951,143 +3611,241 @@ def checklist(request, desktop_id):
     })
 
 
-def generate_pm_excel_report(request, pm_id):
-    pythoncom.CoInitialize()
+PM_OVERVIEW_DEVICES = {
+    # device (also the AssetIndex asset_type) -> PMScheduleAssignment package field, history url
+    'desktop': ('equipment_package', 'maintenance_history'),
+    'laptop': ('laptop_package', 'maintenance_history_laptop'),
+}
 
-    # Get preventive maintenance and related desktop details
-    pm = get_object_or_404(PreventiveMaintenance, pk=pm_id)
-    desktop_details = DesktopDetails.objects.filter(equipment_package=pm.equipment_package).first()
 
-    # Define paths
-    template_path = os.path.join(settings.BASE_DIR, 'static', 'excel_template', 'PM checklist.xlsx')
-    output_xlsx_path = os.path.join(settings.MEDIA_ROOT, f'PM_Report_{pm.id}.xlsx')
-    output_pdf_path = os.path.join(settings.MEDIA_ROOT, f'PM_Report_{pm.id}.pdf')
+def _indexed(kind, package_ref, field):
+    """AssetIndex column of the package `package_ref` points at, as a subquery"""
+    return Subquery(
+        AssetIndex.objects.filter(asset_type=kind, package_id=OuterRef(package_ref)).values(field)[:1]
+    )
 
-    # Load Excel template
-    wb = load_workbook(template_path)
-    ws = wb.active
 
-    # Fill basic info
-    ws['C7'] = pm.office or ''
-    ws['C8'] = desktop_details.computer_name if desktop_details else ''
-    ws['C9'] = pm.end_user or ''
-    ws['C10'] = str(pm.date_accomplished or '')
+def _pm_overview_packages(kind):
+    """Packages with computer name, end user and section, for the assign modal"""
+    model = Equipment_Package if kind == 'desktop' else LaptopPackage
+    return (
+        model.objects.annotate(
+            computer_name_display=_indexed(kind, 'pk', 'computer_name'),
+            enduser_name=_indexed(kind, 'pk', 'end_user_name'),
+            section_name=_indexed(kind, 'pk', 'section_name'),
+        )
+        .order_by('pk')
+        .values('id', 'computer_name_display', 'enduser_name', 'section_name')
+    )
 
-    # Fill checklist: checkmarks and notes
-    for i in range(1, 10):
-        # Checkmark (✓) in column D
-        is_checked = getattr(pm, f"task_{i}", False)
-        check_cell = f'D{13 + i}'  # D14 to D22
-        ws[check_cell] = "✓" if is_checked else ""
 
-        # Notes in column E
-        note_value = getattr(pm, f'note_{i}', '')
-        note_cell = f'E{13 + i}'  # E14 to E22
-        ws[note_cell] = note_value
+def _pm_overview_json(request):
+    """PM assignments of one device type, filtered and keyset-paginated"""
+    device = request.GET.get('device')
+    if device not in PM_OVERVIEW_DEVICES:
+        device = 'desktop'
+    fk, history_url = PM_OVERVIEW_DEVICES[device]
+    today = timezone.localdate()
 
-    # Save updated Excel file
-    wb.save(output_xlsx_path)
+    assignments = (
+        PMScheduleAssignment.objects.filter(**{f'{fk}__isnull': False})
+        .annotate(
+            package_id=F(f'{fk}_id'),
+            quarter_id=F('pm_section_schedule__quarter_schedule_id'),
+            quarter=F('pm_section_schedule__quarter_schedule__quarter'),
+            year=F('pm_section_schedule__quarter_schedule__year'),
+            section_name=F('pm_section_schedule__section__name'),
+            start_date=F('pm_section_schedule__start_date'),
+            end_date=F('pm_section_schedule__end_date'),
+            computer_name=Coalesce(_indexed(device, fk, 'computer_name'), Value('')),
+            end_user=_indexed(device, fk, 'end_user_name'),
+        )
+    )
 
-    # Convert to PDF using Excel COM
-    excel = Dispatch("Excel.Application")
-    excel.Visible = False
-    wb_com = excel.Workbooks.Open(output_xlsx_path)
-    wb_com.ExportAsFixedFormat(0, output_pdf_path)  # 0 = PDF format
-    wb_com.Close(False)
-    excel.Quit()
-    pythoncom.CoUninitialize()
+    page = paginate(
+        request, assignments,
+        sorts={'due': ('-end_date',), 'computer': ('computer_name',)},
+        filters={
+            'device': lambda qs, value: qs,  # picks the package field above
+            'section': 'pm_section_schedule__section_id',
+            'quarter': 'pm_section_schedule__quarter_schedule_id',
+            'package': f'{fk}_id',
+            'status': {
+                'completed': Q(is_completed=True),
+                'overdue': Q(is_completed=False, end_date__lt=today),
+                'in_progress': Q(is_completed=False, start_date__lte=today, end_date__gte=today),
+                'scheduled': Q(is_completed=False, start_date__gt=today),
+            },
+        },
+        search=lambda qs, term: search_by_index(qs, device, fk, term),
+    )
 
-    # Return the PDF file as download
-    return FileResponse(open(output_pdf_path, 'rb'), as_attachment=True, filename=f'PM_Report_{pm.id}.pdf')
+    def status(a):
+        if a.is_completed:
+            return 'completed'
+        if a.end_date < today:
+            return 'overdue'
+        return 'in_progress' if a.start_date <= today else 'scheduled'
+
+    quarters = dict(QuarterSchedule.QUARTERS)
+    return page.json_response(lambda a: {
+        'id': a.pk,
+        'package_id': a.package_id,
+        'computer_name': a.computer_name or None,
+        'end_user': a.end_user or None,
+        'section': a.section_name,
+        'quarter_id': a.quarter_id,
+        'quarter': quarters.get(a.quarter, a.quarter),
+        'year': a.year,
+        'start_date': a.start_date,
+        'end_date': a.end_date,
+        'status': status(a),
+        'url': reverse(history_url, args=[a.package_id]),
+    }, device=device)
 
 
 def pm_overview_view(request):
-    pm_assignments = PMScheduleAssignment.objects.select_related(
-        'equipment_package',
-        'laptop_package',
-        'pm_section_schedule__quarter_schedule',
-        'pm_section_schedule__section'
-    ).all()
-
-    # Attach computer_name_display for assignments
-    for assignment in pm_assignments:
-        if assignment.equipment_package:
-            desktop_detail = DesktopDetails.objects.filter(equipment_package=assignment.equipment_package).first()
-            assignment.computer_name_display = desktop_detail.computer_name if desktop_detail else "N/A"
-        elif assignment.laptop_package:
-            laptop_detail = assignment.laptop_package.laptop_details.first()
-            assignment.computer_name_display = laptop_detail.computer_name if laptop_detail else "N/A"
-        else:
-            assignment.computer_name_display = "N/A"
-
-    # ✅ Build lookup for quarters already assigned (desktop + laptop)
-    assigned_quarters_by_device = {}
-    for a in pm_assignments:
-        qid = a.pm_section_schedule.quarter_schedule_id
-        if a.equipment_package:
-            key = f"desktop-{a.equipment_package_id}"
-            assigned_quarters_by_device.setdefault(key, set()).add(qid)
-        if a.laptop_package_id:
-            key = f"laptop-{a.laptop_package_id}"
-            assigned_quarters_by_device.setdefault(key, set()).add(qid)
-
-    # ✅ Desktops list with user + section
-    desktops = list(
-        Equipment_Package.objects.prefetch_related(
-            Prefetch(
-                'user_details',
-                queryset=UserDetails.objects.select_related('user_Enduser__employee_office_section')
-            )
-        )
-    )
-    for desktop in desktops:
-        desktop_detail = DesktopDetails.objects.filter(equipment_package=desktop).first()
-        desktop.computer_name_display = desktop_detail.computer_name if desktop_detail else "N/A"
-        u = desktop.user_details.first()
-        desktop.section_name = u.user_Enduser.employee_office_section.name if u and u.user_Enduser and u.user_Enduser.employee_office_section else None
-        desktop.enduser_name = u.user_Enduser.full_name if u and u.user_Enduser else None
-
-    # ✅ Laptops list with user + section
-    laptops = list(
-        LaptopPackage.objects.prefetch_related(
-            Prefetch(
-                'user_details',
-                queryset=UserDetails.objects.select_related('user_Enduser__employee_office_section')
-            ),
-            'laptop_details'
-        )
-    )
-    for package in laptops:
-        laptop_detail = package.laptop_details.first()
-        package.computer_name_display = laptop_detail.computer_name if laptop_detail else "N/A"
-        u = package.user_details.first()
-        package.section_name = u.user_Enduser.employee_office_section.name if u and u.user_Enduser and u.user_Enduser.employee_office_section else None
-        package.enduser_name = u.user_Enduser.full_name if u and u.user_Enduser else None
-
-    # Schedules
-    schedules = PMSectionSchedule.objects.select_related('section', 'quarter_schedule')
-    schedules_by_section = {}
-    for s in schedules:
-        section_name = s.section.name if s.section else 'Other'
-        schedules_by_section.setdefault(section_name, []).append(s)
+    """
+    PM assignments overview. The assignment tables load from the JSON variant
+    (?format=json&device=desktop|laptop plus section/quarter/status/package/q
+    filters) one keyset page at a time; the page itself only carries the
+    assign modal's choices.
+    """
+    if wants_json(request):
+        return _pm_overview_json(request)
 
-    quarters = QuarterSchedule.objects.all().order_by('-year', 'quarter')
-    sections = OfficeSection.objects.all()
+    schedules = PMSectionSchedule.objects.select_related('section', 'quarter_schedule')
 
     return render(request, 'maintenance/overview.html', {
-        'pm_assignments': pm_assignments,
-        'desktops': desktops,
-        'laptops': laptops,
+        'desktops': _pm_overview_packages('desktop'),
+        'laptops': _pm_overview_packages('laptop'),
         'schedules': schedules,
-        'schedules_by_section': schedules_by_section,
+        'quarters': QuarterSchedule.objects.all().order_by('-year', 'quarter'),
+        'sections': OfficeSection.objects.all().order_by('name'),
+    })
+
+COMPLIANCE_CSV_CHUNK = 2000
+
+# Grid filters; `year` picks the quarter columns and only rides along in the pager links
+COMPLIANCE_FILTERS = {
+    'section': 'section_id',
+    'type': 'asset_type',
+    'year': lambda qs, value: qs,
+}
+
+
+def _compliance_csv(request, devices, quarters, today):
+    """The whole filtered grid, streamed a chunk of devices (and their cells) at a time"""
+    for name, spec in COMPLIANCE_FILTERS.items():
+        value = request.GET.get(name, '').strip()
+        if value:
+            devices = apply_filter(devices, spec, value)
+    term = request.GET.get('q', '').strip()
+    if term:
+        devices = devices.filter(Q(computer_name__icontains=term) | Q(end_user_name__icontains=term))
+    columns = ['asset_type', 'package_id', 'computer_name', 'end_user', 'section'] + [str(q) for q in quarters]
+    quarter_ids = [q.pk for q in quarters]
+
+    def rows():
+        last_pk = 0
+        while True:
+            chunk = list(
+                devices.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', 'asset_type', 'package_id', 'computer_name', 'end_user_name', 'section_name')
+                [:COMPLIANCE_CSV_CHUNK]
+            )
+            if not chunk:
+                return
+            last_pk = chunk[-1][0]
+            cells = pm_compliance.cells_for([row[1:3] for row in chunk], quarter_ids)
+            for _, asset_type, package_id, *names in chunk:
+                yield [asset_type, package_id, *names] + [
+                    pm_compliance.cell_status(cells.get((asset_type, package_id, quarter_id)), today)
+                    for quarter_id in quarter_ids
+                ]
+
+    response = StreamingHttpResponse(csv_lines(columns, rows()), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="pm_compliance_{today:%Y%m%d}.csv"'
+    return response
+
+
+@login_required
+def pm_compliance_view(request):
+    """
+    PM compliance grid: every active desktop/laptop against every quarter
+    (?year= narrows the columns), read from the precomputed PMComplianceCell
+    table a keyset page of devices at a time, plus completion percentages
+    per section. ?format=csv streams the whole filtered grid.
+    """
+    today = timezone.localdate()
+    all_quarters = list(QuarterSchedule.objects.order_by('year', 'quarter'))
+    years = sorted({q.year for q in all_quarters}, reverse=True)
+    year = request.GET.get('year', '')
+    quarters = [q for q in all_quarters if str(q.year) == year] if year else all_quarters
+    quarter_ids = [q.pk for q in quarters]
+
+    devices = AssetIndex.objects.filter(asset_type__in=pm_compliance.PACKAGE_FIELDS, is_disposed=False)
+    if request.GET.get('format') == 'csv':
+        return _compliance_csv(request, devices, quarters, today)
+
+    page = paginate(
+        request, devices,
+        sorts={'name': ('computer_name',), 'section': ('section_name', 'computer_name')},
+        filters=COMPLIANCE_FILTERS,
+        search=('computer_name', 'end_user_name'),
+    )
+    cells = pm_compliance.cells_for([(d.asset_type, d.package_id) for d in page], quarter_ids)
+    rows = [
+        {'device': d, 'cells': [
+            pm_compliance.cell_status(cells.get((d.asset_type, d.package_id, quarter_id)), today)
+            for quarter_id in quarter_ids
+        ]}
+        for d in page
+    ]
+
+    if wants_json(request):
+        statuses = {(row['device'].asset_type, row['device'].package_id): row['cells'] for row in rows}
+        return page.json_response(lambda d: {
+            'asset_type': d.asset_type,
+            'package_id': d.package_id,
+            'computer_name': d.computer_name or None,
+            'end_user': d.end_user_name or None,
+            'section': d.section_name or None,
+            'quarters': dict(zip(map(str, quarters), statuses[(d.asset_type, d.package_id)])),
+        }, quarters=[str(q) for q in quarters])
+
+    # Completed / assigned per section and quarter (section of the PM schedule)
+    section_id = page.params['section'] if page.params['section'].isdigit() else None
+    by_section = {}
+    for cell in pm_compliance.section_compliance(quarter_ids, today, section_id):
+        by_section.setdefault(cell['section_id'], {})[cell['quarter_id']] = cell
+    section_names = dict(OfficeSection.objects.filter(pk__in=[pk for pk in by_section if pk]).values_list('pk', 'name'))
+    sections = []
+    for pk, per_quarter in by_section.items():
+        assigned = sum(cell['assigned'] for cell in per_quarter.values())
+        completed = sum(cell['completed'] for cell in per_quarter.values())
+        sections.append({
+            'name': section_names.get(pk, 'No section'),
+            'quarters': [per_quarter.get(quarter_id) for quarter_id in quarter_ids],
+            'assigned': assigned,
+            'completed': completed,
+            'overdue': sum(cell['overdue'] for cell in per_quarter.values()),
+            'percent': round(100 * completed / assigned, 1),
+        })
+    sections.sort(key=lambda s: s['name'])
+
+    return render(request, 'maintenance/compliance.html', {
+        'page': page,
+        'rows': rows,
         'quarters': quarters,
-        'sections': sections,
-        'assigned_quarters_by_device_json': json.dumps(
-            {k: sorted(list(v)) for k, v in assigned_quarters_by_device.items()}
-        ),
-        'today': timezone.now().date(),   # ✅ for "Due" check
+        'years': years,
+        'year': year,
+        'section_compliance': sections,
+        'office_sections': OfficeSection.objects.order_by('name'),
+        'statuses': pm_compliance.STATUSES,
     })
 
+
 def assign_pm_schedule(request):
     if request.method == 'POST':
         device_type = request.POST.get('device_type')
@@ -4145,54 +3903,24 @@ def section_schedule_list_view(request):
             except (TypeError, ValueError):
                 messages.error(request, "Invalid year selection.")
                 return redirect('section_schedule_list')
+            if source_year == target_year:
+                messages.error(request, "Source and target year must differ.")
+                return redirect('section_schedule_list')
 
-            # Fetch all section schedules from the source year
-            source_schedules = PMSectionSchedule.objects.filter(
-                quarter_schedule__year=source_year
-            ).select_related('quarter_schedule', 'section')
-
-            if not source_schedules.exists():
+            report = rollover_pm_year(source_year, target_year, dry_run=bool(request.POST.get('dry_run')))
+            if not report.source_count:
                 messages.warning(request, f"No schedules found for {source_year} to copy from.")
                 return redirect('section_schedule_list')
-
-            created_quarters = 0
-            created_schedules = 0
-            skipped_schedules = 0
-
-            for src in source_schedules:
-                # Get or create the matching quarter for the target year
-                target_quarter, q_created = QuarterSchedule.objects.get_or_create(
-                    year=target_year,
-                    quarter=src.quarter_schedule.quarter,
-                )
-                if q_created:
-                    created_quarters += 1
-
-                # Mirror the same day/month, just change year
-                new_start = src.start_date.replace(year=target_year)
-                new_end = src.end_date.replace(year=target_year)
-
-                obj, s_created = PMSectionSchedule.objects.get_or_create(
-                    quarter_schedule=target_quarter,
-                    section=src.section,
-                    defaults={
-                        'start_date': new_start,
-                        'end_date': new_end,
-                        'notes': src.notes or '',
-                    },
-                )
-                if s_created:
-                    created_schedules += 1
-                else:
-                    # Overwrite existing with correct dates from source year
-                    obj.start_date = new_start
-                    obj.end_date = new_end
-                    obj.notes = src.notes or obj.notes
-                    obj.save()
-                    skipped_schedules += 1
-
-            msg = f"Copied {source_year} → {target_year}: {created_schedules} new + {skipped_schedules} updated. All dates now match {source_year} exactly (same day/month, year changed to {target_year})."
-            messages.success(request, msg)
+            if report.dry_run:
+                # Show the diff with an "Apply" button instead of redirecting
+                return render(request, 'maintenance/section_schedule_list.html', {
+                    'schedules': schedules,
+                    'quarters': quarters,
+                    'sections': sections,
+                    'existing_years': existing_years,
+                    'rollover_report': report,
+                })
+            messages.success(request, report.summary())
             return redirect('section_schedule_list')
 
         quarter_id = request.POST.get('quarter_schedule_id')
@@ -4319,22 +4047,101 @@ def disposal_overview(request):
 
     return render(request, "disposal/disposal_overview.html", {"categories": categories})
 
+DISPOSAL_EPOCH = timezone.make_aware(datetime(1970, 1, 1))
+
+# category -> (label, model, date field, select_related, {column filter: lookup})
+DISPOSAL_CATEGORIES = {
+    "desktop": ("Desktop Disposal History", DisposedDesktopDetail, "date_disposed", ("desktop__equipment_package",), {
+        "package": "desktop__equipment_package_id",
+        "name": "desktop__computer_name__icontains",
+        "serial": "serial_no__icontains",
+        "model": "model__icontains",
+        "brand": "brand_name__icontains",
+        "reason": "reason__icontains",
+    }),
+    "monitor": ("Monitor Disposal History", DisposedMonitor, "disposal_date", ("equipment_package",), {
+        "package": "equipment_package_id",
+        "name": "package_computer_name__icontains",
+        "serial": "monitor_sn__icontains",
+        "model": "monitor_model__icontains",
+        "brand": "monitor_brand__icontains",
+        "reason": "reason__icontains",
+    }),
+    "keyboard": ("Keyboard Disposal History", DisposedKeyboard, "disposal_date",
+                 ("equipment_package", "keyboard_dispose_db__keyboard_brand_db"), {
+        "package": "equipment_package_id",
+        "name": "package_computer_name__icontains",
+        "serial": "keyboard_dispose_db__keyboard_sn_db__icontains",
+        "model": "keyboard_dispose_db__keyboard_model_db__icontains",
+        "brand": "keyboard_dispose_db__keyboard_brand_db__name__icontains",
+    }),
+    "mouse": ("Mouse Disposal History", DisposedMouse, "disposal_date",
+              ("equipment_package", "mouse_db__mouse_brand_db"), {
+        "package": "equipment_package_id",
+        "name": "package_computer_name__icontains",
+        "serial": "mouse_db__mouse_sn_db__icontains",
+        "model": "mouse_db__mouse_model_db__icontains",
+        "brand": "mouse_db__mouse_brand_db__name__icontains",
+    }),
+    "ups": ("UPS Disposal History", DisposedUPS, "disposal_date",
+            ("equipment_package", "ups_db__ups_brand_db"), {
+        "package": "equipment_package_id",
+        "name": "package_computer_name__icontains",
+        "serial": "ups_db__ups_sn_db__icontains",
+        "model": "ups_db__ups_model_db__icontains",
+        "brand": "ups_db__ups_brand_db__name__icontains",
+    }),
+}
+
+
 def disposal_history(request):
-    desktops = DisposedDesktopDetail.objects.all().order_by("-date_disposed")
-    monitors = DisposedMonitor.objects.all().order_by("-disposal_date")
-    keyboards = DisposedKeyboard.objects.all().order_by("-disposal_date")
-    mice = DisposedMouse.objects.all().order_by("-disposal_date")
-    ups_list = DisposedUPS.objects.all().order_by("-disposal_date")
+    category = request.GET.get("category")
+    if category not in DISPOSAL_CATEGORIES:
+        category = "desktop"
+    _, model, date_field, related, column_filters = DISPOSAL_CATEGORIES[category]
+
+    items = model.objects.select_related(*related)
+    if category != "desktop":
+        # Equipment_Package.computer_name is a per-row query; fetch it with the page
+        items = items.annotate(package_computer_name=Subquery(
+            DesktopDetails.objects.filter(equipment_package=OuterRef("equipment_package"))
+            .order_by("pk").values("computer_name")[:1]
+        ))
+    sort_key = date_field
+    if model._meta.get_field(date_field).null:
+        # keyset sort keys must be non-null
+        items = items.annotate(sort_date=Coalesce(date_field, Value(DISPOSAL_EPOCH)))
+        sort_key = "sort_date"
+
+    page = paginate(
+        request, items,
+        sorts={"newest": (f"-{sort_key}",), "oldest": (sort_key,)},
+        filters={
+            "category": lambda qs, value: qs,  # only carried along in the pager links
+            **column_filters,
+        },
+    )
+
+    if wants_json(request):
+        return page.json_response(lambda item: {
+            "id": item.pk,
+            "package_id": (item.desktop.equipment_package_id if category == "desktop"
+                           else item.equipment_package_id),
+            "disposal_date": getattr(item, date_field),
+            "reason": getattr(item, "reason", None),
+        }, category=category)
 
     categories = [
-        {"label": "Desktop Disposal History", "items": desktops, "category": "desktop"},
-        {"label": "Monitor Disposal History", "items": monitors, "category": "monitor"},
-        {"label": "Keyboard Disposal History", "items": keyboards, "category": "keyboard"},
-        {"label": "Mouse Disposal History", "items": mice, "category": "mouse"},
-        {"label": "UPS Disposal History", "items": ups_list, "category": "ups"},
+        {"label": cat_label, "category": key, "active": key == category,
+         "items": page if key == category else []}
+        for key, (cat_label, *_rest) in DISPOSAL_CATEGORIES.items()
     ]
 
-    return render(request, "disposal/disposal_history.html", {"categories": categories})
+    return render(request, "disposal/disposal_history.html", {
+        "categories": categories,
+        "category": category,
+        "page": page,
+    })
 
 
 
@@ -4572,121 +4379,6 @@ def delete_laptop_photo(request, laptop_id):
         }, status=500)
 
 
-def export_salvage_excel(request):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Salvaged Equipment"
-
-    headers = [
-        "Category", "SN", "Brand", "Model", "Size/Capacity",
-        "Computer Name", "Asset Owner", "Date Salvaged", "Notes", "Status"
-    ]
-    ws.append(headers)
-
-    def get_asset_owner(equipment_package):
-        if not equipment_package:
-            return ""
-        user = UserDetails.objects.filter(equipment_package=equipment_package).first()
-        if user and user.user_Assetowner:
-            return user.user_Assetowner.full_name
-        return ""
-
-    def fmt_date(dt):
-        if not dt:
-            return ""
-        try:
-            return dt.strftime("%Y-%m-%d %H:%M")  # works if datetime
-        except Exception:
-            return dt.strftime("%Y-%m-%d")        # fallback for date
-
-    # Monitors
-    for m in DisposedMonitor.objects.all():
-        computer_name = m.equipment_package.computer_name if m.equipment_package else ""
-        asset_owner = get_asset_owner(m.equipment_package)
-        ws.append([
-            "Monitor", m.monitor_sn, m.monitor_brand, m.monitor_model, m.monitor_size,
-            computer_name, asset_owner,
-            fmt_date(m.disposal_date),
-            m.reason or "", "Disposed"
-        ])
-
-    # Keyboards
-    for k in DisposedKeyboard.objects.all():
-        computer_name = k.equipment_package.computer_name if k.equipment_package else ""
-        asset_owner = get_asset_owner(k.equipment_package)
-        ws.append([
-            "Keyboard",
-            k.keyboard_dispose_db.keyboard_sn_db,
-            str(k.keyboard_dispose_db.keyboard_brand_db),
-            k.keyboard_dispose_db.keyboard_model_db,
-            "",
-            computer_name, asset_owner,
-            fmt_date(k.disposal_date),
-            "", "Disposed"
-        ])
-
-    # Mice
-    for mo in DisposedMouse.objects.all():
-        computer_name = mo.equipment_package.computer_name if mo.equipment_package else ""
-        asset_owner = get_asset_owner(mo.equipment_package)
-        ws.append([
-            "Mouse",
-            mo.mouse_db.mouse_sn_db,
-            str(mo.mouse_db.mouse_brand_db),
-            mo.mouse_db.mouse_model_db,
-            "",
-            computer_name, asset_owner,
-            fmt_date(mo.disposal_date),
-            "", "Disposed"
-        ])
-
-    # UPS
-    for u in DisposedUPS.objects.all():
-        computer_name = u.equipment_package.computer_name if u.equipment_package else ""
-        asset_owner = get_asset_owner(u.equipment_package)
-        ws.append([
-            "UPS",
-            u.ups_db.ups_sn_db,
-            str(u.ups_db.ups_brand_db),
-            u.ups_db.ups_model_db,
-            u.ups_db.ups_capacity_db,
-            computer_name, asset_owner,
-            fmt_date(u.disposal_date),
-            "", "Disposed"
-        ])
-
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    response = HttpResponse(
-        output,
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
-    response['Content-Disposition'] = 'attachment; filename=salvaged_equipment.xlsx'
-    return response
-
-
-
-def print_salvage_overview(request):
-    salvaged_monitors = DisposedMonitor.objects.all()
-    salvaged_keyboards = DisposedKeyboard.objects.all()
-    salvaged_mice = DisposedMouse.objects.all()
-    salvaged_ups = DisposedUPS.objects.all()
-
-    html_string = render_to_string("salvage/print_salvage.html", {
-        "salvaged_monitors": salvaged_monitors,
-        "salvaged_keyboards": salvaged_keyboards,
-        "salvaged_mice": salvaged_mice,
-        "salvaged_ups": salvaged_ups,
-    })
-
-    response = HttpResponse(content_type="application/pdf")
-    response['Content-Disposition'] = 'inline; filename=salvage_overview.pdf'
-    HTML(string=html_string).write_pdf(response)
-    return response
-
-
-
 #the dashboard
 
 # views_dashboard_snippet.py — paste this into your views.py
@@ -4733,315 +4425,20 @@ from collections import defaultdict
 def dashboard_pro(request):
     """
     Dashboard with KPIs, charts, recent items, and audit trail.
-    Updated to work with GenericForeignKey for change history.
+    Rendered from the materialized DashboardSnapshot row (see
+    inventory/dashboard_snapshot.py); ?refresh=1 rebuilds it on demand.
     """
-    
-    # ===================== KPIs =====================
-    total_packages = Equipment_Package.objects.count()
-    active_packages = Equipment_Package.objects.filter(is_disposed=False).count()
-    disposed_all = (
-        DisposedDesktopDetail.objects.count() +
-        DisposedKeyboard.objects.count() +
-        DisposedMouse.objects.count() +
-        DisposedMonitor.objects.count() +
-        DisposedUPS.objects.count() +
-        DisposedLaptop.objects.count() +
-        DisposedPrinter.objects.count()
-    )
-    pm_pending = PMScheduleAssignment.objects.filter(is_completed=False).count()
-
-    # Individual device counts
-    total_desktops = DesktopDetails.objects.filter(is_disposed=False).count()
-    total_monitors = MonitorDetails.objects.filter(is_disposed=False).count()
-    total_keyboards = KeyboardDetails.objects.filter(is_disposed=False).count()
-    total_mice = MouseDetails.objects.filter(is_disposed=False).count()
-    total_ups = UPSDetails.objects.filter(is_disposed=False).count()
-    total_laptops = LaptopDetails.objects.filter(is_disposed=False).count()
-    total_printers = PrinterDetails.objects.filter(is_disposed=False).count()
-
-    # Health score (simple calculation)
-    health_score = 100
-    if total_packages > 0:
-        health_score = int((active_packages / total_packages) * 100)
-
-    # ===================== CHARTS DATA =====================
-    # Disposal trend - last 6 months
-    from datetime import datetime, timedelta
-    from django.db.models import Count
-    from django.db.models.functions import TruncMonth
-
-    months = 6
-    today = timezone.now()
-    start = today - timedelta(days=30 * months)
-
-    # ✅ FIXED: Each model uses its correct field name
-    # DisposedDesktopDetail uses 'date_disposed'
-    desktop_disp = (
-        DisposedDesktopDetail.objects.filter(date_disposed__gte=start)
-        .annotate(month=TruncMonth("date_disposed"))
-        .values("month")
-        .annotate(cnt=Count("id"))
-        .order_by("month")
-    )
-    
-    # DisposedMouse uses 'disposal_date'
-    mouse_disp = (
-        DisposedMouse.objects.filter(disposal_date__gte=start)
-        .annotate(month=TruncMonth("disposal_date"))
-        .values("month")
-        .annotate(cnt=Count("id"))
-        .order_by("month")
+    from inventory.dashboard_snapshot import (
+        get_dashboard_snapshot, refresh_dashboard_snapshot, snapshot_context,
     )
-    
-    # DisposedKeyboard uses 'disposal_date'
-    keyboard_disp = (
-        DisposedKeyboard.objects.filter(disposal_date__gte=start)
-        .annotate(month=TruncMonth("disposal_date"))
-        .values("month")
-        .annotate(cnt=Count("id"))
-        .order_by("month")
-    )
-    
-    # DisposedUPS uses 'disposal_date'
-    ups_disp = (
-        DisposedUPS.objects.filter(disposal_date__gte=start)
-        .annotate(month=TruncMonth("disposal_date"))
-        .values("month")
-        .annotate(cnt=Count("id"))
-        .order_by("month")
-    )
-
-    # Build labels
-    lbls = []
-    month_keys = []
-    for i in range(months, 0, -1):
-        dt = today - timedelta(days=30 * i)
-        lbls.append(dt.strftime("%b %Y"))
-        month_keys.append(dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0))
-
-    # Build series
-    def build_series(queryset, month_keys):
-        data_dict = {d["month"]: d["cnt"] for d in queryset}
-        return [data_dict.get(mk, 0) for mk in month_keys]
-
-    desktop_series = build_series(desktop_disp, month_keys)
-    mouse_series = build_series(mouse_disp, month_keys)
-    keyboard_series = build_series(keyboard_disp, month_keys)
-    ups_series = build_series(ups_disp, month_keys)
-
-    # Disposed by category (pie chart)
-    disposed_labels = ["Desktop", "Monitor", "Keyboard", "Mouse", "UPS"]
-    disposed_data = [
-        DisposedDesktopDetail.objects.count(),
-        DisposedMonitor.objects.count(),
-        DisposedKeyboard.objects.count(),
-        DisposedMouse.objects.count(),
-        DisposedUPS.objects.count(),
-    ]
-
-    # Active vs Disposed stacked bar
-    stack_labels = ["Desktop", "Monitor", "Keyboard", "Mouse", "UPS"]
-    active_counts = [
-        total_desktops,
-        total_monitors,
-        total_keyboards,
-        total_mice,
-        total_ups,
-    ]
-    disposed_counts = [
-        DisposedDesktopDetail.objects.count(),
-        DisposedMonitor.objects.count(),
-        DisposedKeyboard.objects.count(),
-        DisposedMouse.objects.count(),
-        DisposedUPS.objects.count(),
-    ]
-
-    # Top 5 brands
-    brand_counts = {}
-    for desktop in DesktopDetails.objects.filter(is_disposed=False).select_related("brand_name"):
-        if desktop.brand_name:
-            brand_counts[desktop.brand_name.name] = brand_counts.get(desktop.brand_name.name, 0) + 1
-    for laptop in LaptopDetails.objects.filter(is_disposed=False).select_related("brand_name"):
-        if laptop.brand_name:
-            brand_counts[laptop.brand_name.name] = brand_counts.get(laptop.brand_name.name, 0) + 1
-    
-    top_brands = sorted(brand_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    brand_labels = [b[0] for b in top_brands]
-    brand_data = [b[1] for b in top_brands]
-
-    # Assets by section
-    section_counts = {}
-    for user in UserDetails.objects.select_related("user_Enduser__employee_office_section"):
-        if user.user_Enduser and user.user_Enduser.employee_office_section:
-            sec_name = str(user.user_Enduser.employee_office_section)
-            section_counts[sec_name] = section_counts.get(sec_name, 0) + 1
-
-    section_labels = list(section_counts.keys())
-    section_data = list(section_counts.values())
-
-    # ===================== RECENT ITEMS (FIXED) =====================
-    recent = []
-    
-    # Get recent Desktop packages
-    recent_desktops = Equipment_Package.objects.filter(
-        is_disposed=False
-    ).prefetch_related('desktop_details__brand_name').order_by("-created_at")[:10]
-    
-    for pkg in recent_desktops:
-        desktop = pkg.desktop_details.first()
-        if desktop:
-            recent.append({
-                'id': pkg.id,
-                'computer_name': desktop.computer_name or 'N/A',
-                'serial_no': desktop.serial_no or 'N/A',
-                'brand_name': desktop.brand_name.name if desktop.brand_name else 'N/A',
-                'model': desktop.model or 'N/A',
-                'created_at': pkg.created_at,
-                'type': 'Desktop',
-                'url_name': 'desktop_details_view'
-            })
-    
-    # Get recent Laptop packages
-    recent_laptops = LaptopPackage.objects.filter(
-        is_disposed=False
-    ).prefetch_related('laptop_details__brand_name').order_by("-created_at")[:10]
-    
-    for pkg in recent_laptops:
-        laptop = pkg.laptop_details.first()
-        if laptop:
-            recent.append({
-                'id': pkg.id,
-                'computer_name': laptop.computer_name or 'N/A',
-                'serial_no': laptop.laptop_sn_db or 'N/A',
-                'brand_name': laptop.brand_name.name if laptop.brand_name else 'N/A',
-                'model': laptop.model or 'N/A',
-                'created_at': pkg.created_at,
-                'type': 'Laptop',
-                'url_name': 'laptop_details_view'
-            })
-    
-    # Sort combined list by created_at (most recent first) and take top 10
-    recent = sorted(recent, key=lambda x: x['created_at'], reverse=True)[:10]
-
-    # ===================== UPCOMING PM =====================
-    pm_upcoming = PMScheduleAssignment.objects.filter(
-        is_completed=False
-    ).select_related(
-        "pm_section_schedule__section",
-        "pm_section_schedule__quarter_schedule",
-        "equipment_package"
-    ).order_by("pm_section_schedule__quarter_schedule__year", "pm_section_schedule__quarter_schedule__quarter")[:5]
-
-    # ===================== AUDIT TRAIL (FIXED FOR GenericForeignKey) =====================
-    from django.contrib.contenttypes.models import ContentType
-    
-    # Get content types for Equipment_Package and LaptopPackage
-    equipment_ct = ContentType.objects.get_for_model(Equipment_Package)
-    laptop_ct = ContentType.objects.get_for_model(LaptopPackage)
-
-    # ✅ FIXED: Only get records with content_type (skip old broken records)
-    enduser = EndUserChangeHistory.objects.filter(
-        content_type__isnull=False
-    ).select_related(
-        "new_enduser", "old_enduser", "changed_by", "content_type"
-    ).order_by("-changed_at")[:5]
-
-    assetowner = AssetOwnerChangeHistory.objects.filter(
-        content_type__isnull=False
-    ).select_related(
-        "new_assetowner", "old_assetowner", "changed_by", "content_type"
-    ).order_by("-changed_at")[:5]
-
-    audit = []
-    
-    # Process End User changes
-    for e in enduser:
-        old_name = e.old_enduser.full_name if e.old_enduser else 'None'
-        new_name = e.new_enduser.full_name if e.new_enduser else 'None'
-        
-        # ✅ Safety check for content_type
-        if not e.content_type:
-            continue
-        
-        # Determine device type
-        if e.content_type == equipment_ct:
-            device_type = "Desktop"
-        elif e.content_type == laptop_ct:
-            device_type = "Laptop"
-        else:
-            device_type = e.content_type.model.capitalize()
-        
-        audit.append({
-            "type": "End User",
-            "when": e.changed_at.strftime("%Y-%m-%d %H:%M"),
-            "text": f"{device_type} Package #{e.object_id}: <strong>{old_name}</strong> → <strong>{new_name}</strong>",
-        })
-    
-    # Process Asset Owner changes
-    for a in assetowner:
-        old_name = a.old_assetowner.full_name if a.old_assetowner else 'None'
-        new_name = a.new_assetowner.full_name if a.new_assetowner else 'None'
-        
-        # ✅ Safety check for content_type
-        if not a.content_type:
-            continue
-        
-        # Determine device type
-        if a.content_type == equipment_ct:
-            device_type = "Desktop"
-        elif a.content_type == laptop_ct:
-            device_type = "Laptop"
-        else:
-            device_type = a.content_type.model.capitalize()
-        
-        audit.append({
-            "type": "Asset Owner",
-            "when": a.changed_at.strftime("%Y-%m-%d %H:%M"),
-            "text": f"{device_type} Package #{a.object_id}: <strong>{old_name}</strong> → <strong>{new_name}</strong>",
-        })
-    
-    # Sort by time and limit to 10 most recent
-    audit = sorted(audit, key=lambda x: x["when"], reverse=True)[:10]
 
-    # ===================== CONTEXT =====================
-    context = {
-        "kpis": {
-            "total_packages": total_packages,
-            "active_packages": active_packages,
-            "disposed_all": disposed_all,
-            "pm_pending": pm_pending,
-            "total_desktops": total_desktops,
-            "total_monitors": total_monitors,
-            "total_keyboards": total_keyboards,
-            "total_mice": total_mice,
-            "total_ups": total_ups,
-            "total_laptops": total_laptops,
-            "total_printers": total_printers,
-            "health_score": health_score,
-        },
-        "charts": {
-            "months": months,
-            "labels": lbls,
-            "desktop": desktop_series,
-            "mouse": mouse_series,
-            "keyboard": keyboard_series,
-            "ups": ups_series,
-            "disposed_by_cat_labels": disposed_labels,
-            "disposed_by_cat_data": disposed_data,
-            "stack_labels": stack_labels,
-            "stack_active": active_counts,
-            "stack_disposed": disposed_counts,
-            "brand_labels": brand_labels,
-            "brand_data": brand_data,
-            "section_labels": section_labels,
-            "section_data": section_data,
-        },
-        "recent": recent,
-        "audit": audit,
-        "pm_upcoming": pm_upcoming,
-    }
+    if request.GET.get("refresh") == "1":
+        refresh_dashboard_snapshot()
+        messages.success(request, "Dashboard numbers refreshed.")
+        return redirect("dashboard")
 
-    return render(request, "dashboard.html", context)
+    snapshot = get_dashboard_snapshot()
+    return render(request, "dashboard.html", snapshot_context(snapshot))
 
 
 #end all for dashboard
@@ -5052,6 +4449,7 @@ def _ensure_user_qr(profile, request):
     """Generate and persist a QR PNG for this profile if missing."""
     if profile.qr_code:
         return
+    import qrcode
     url = request.build_absolute_uri(reverse('user_assets_public', args=[str(profile.qr_token)]))
     img = qrcode.make(url)
     buf = BytesIO()
@@ -5287,16 +4685,32 @@ def user_assets_public(request, token):
 # =========================================Laptops ========================================
 @login_required
 def laptop_list(request):
-    # Grab all LaptopPackages
-    packages = LaptopPackage.objects.all().select_related()
+    packages = LaptopPackage.objects.prefetch_related(
+        Prefetch(
+            'laptop_details',
+            queryset=LaptopDetails.objects.select_related('brand_name').order_by('-created_at'),
+        ),
+        Prefetch('user_details', queryset=UserDetails.objects.select_related('user_Enduser')),
+    )
+    page = paginate(
+        request, packages,
+        sorts={'newest': ('-created_at',), 'oldest': ('created_at',)},
+        filters={
+            'name': _index_filter('laptop', 'id', 'computer_name__icontains'),
+            'serial': _index_filter('laptop', 'id', 'serial_no__icontains'),
+            'brand': _index_filter('laptop', 'id', 'brand__icontains'),
+            'model': _index_filter('laptop', 'id', 'model__icontains'),
+            'user': _index_filter('laptop', 'id', 'end_user_name__icontains'),
+            'status': ACTIVE_DISPOSED_FILTER,
+        },
+        search=_index_search('laptop', 'id'),
+    )
 
     laptops = []
-    for pkg in packages:
-        # Current active details (if any)
-        details = LaptopDetails.objects.filter(laptop_package=pkg).order_by('-created_at').first()
-
-        # User assignment
-        user = UserDetails.objects.filter(laptop_package=pkg).select_related("user_Enduser").first()
+    for pkg in page:
+        # Current active details (if any) and user assignment, from the prefetch
+        details = next(iter(pkg.laptop_details.all()), None)
+        user = next(iter(pkg.user_details.all()), None)
 
         laptops.append({
             "package": pkg,              # ✅ for item.package.id
@@ -5304,7 +4718,22 @@ def laptop_list(request):
             "end_user": user.user_Enduser.full_name if user and user.user_Enduser else None,
         })
 
-    return render(request, "laptop/laptop_list.html", {"laptops": laptops})
+    if wants_json(request):
+        def serialize(item):
+            details = item["details"]
+            return {
+                'package_id': item["package"].id,
+                'computer_name': details.computer_name if details else None,
+                'serial_no': details.laptop_sn_db if details else None,
+                'brand': details.brand_name.name if details and details.brand_name else None,
+                'model': details.model if details else None,
+                'end_user': item["end_user"],
+                'is_disposed': item["package"].is_disposed,
+            }
+        items = {item["package"].pk: item for item in laptops}
+        return page.json_response(lambda pkg: serialize(items[pkg.pk]))
+
+    return render(request, "laptop/laptop_list.html", {"laptops": laptops, "page": page})
 
 
 @login_required
@@ -5325,17 +4754,8 @@ def laptop_details_view(request, package_id):
     enduser_history = get_end_user_history(laptop_package)
     assetowner_history = get_asset_owner_history(laptop_package)
 
-    # Auto-create missing PMScheduleAssignment records for the laptop's section
-    # (covers cases where new year schedules were added after the laptop was registered)
-    if user_details and user_details.user_Enduser and user_details.user_Enduser.employee_office_section:
-        laptop_section = user_details.user_Enduser.employee_office_section
-        for section_schedule in PMSectionSchedule.objects.filter(section=laptop_section):
-            PMScheduleAssignment.objects.get_or_create(
-                laptop_package=laptop_package,
-                pm_section_schedule=section_schedule,
-            )
-
     # PM assignments for this laptop
+    # (kept in step with the end user's section by inventory/pm_assignments.py)
     pm_assignments = PMScheduleAssignment.objects.filter(laptop_package=laptop_package).select_related(
         'pm_section_schedule__quarter_schedule',
         'pm_section_schedule__section'
@@ -5518,69 +4938,9 @@ def dispose_laptop(request, package_id):
         }, status=500)
 
 
-
-def generate_laptop_pdf(request, package_id):
-    from django.templatetags.static import static
-    from django.template.loader import render_to_string
-    from weasyprint import HTML
-
-    laptop_package = get_object_or_404(LaptopPackage, id=package_id)
-    laptop_details = laptop_package.laptop_details.first()
-
-    if not laptop_details:
-        raise Http404("No LaptopDetails found for this package.")
-
-    # ✅ Documents
-    documents_details = DocumentsDetails.objects.filter(laptop_package=laptop_package).first()
-
-    # ✅ Current user
-    user_details = UserDetails.objects.filter(laptop_package=laptop_package).first()
-
-    # ✅ Disposed history
-    disposed_laptops = DisposedLaptop.objects.filter(laptop__laptop_package=laptop_package).order_by("-date_disposed")
-
-    # ✅ Maintenance history
-    maintenance_records = PreventiveMaintenance.objects.filter(laptop_package=laptop_package).order_by("date_accomplished")
-
-    # ✅ Current PM Schedule
-    current_pm_schedule = PMScheduleAssignment.objects.filter(laptop_package=laptop_package).select_related(
-        "pm_section_schedule__quarter_schedule", "pm_section_schedule__section"
-    ).order_by(
-        "pm_section_schedule__quarter_schedule__year",
-        "pm_section_schedule__quarter_schedule__quarter"
-    )
-
-    # ✅ QR and logo
-    qr_code_url = None
-    if laptop_package.qr_code:
-        qr_code_url = request.build_absolute_uri(laptop_package.qr_code.url)
-
-    logo_url = request.build_absolute_uri(static('img/logo.png'))
-
-    # ✅ Filename
-    filename = f"laptop_{laptop_details.computer_name or laptop_package.id}_details.pdf"
-
-    # ✅ Render HTML template
-    html_string = render_to_string('laptop/pdf_template_laptop.html', {
-        "laptop_package": laptop_package,
-        "laptop_details": laptop_details,
-        "user_details": user_details,
-        "documents_details": documents_details,
-        "disposed_laptops": disposed_laptops,
-        "maintenance_records": maintenance_records,
-        "current_pm_schedule": current_pm_schedule,
-        "qr_code_url": qr_code_url,
-        "logo_url": logo_url,
-    })
-
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = f'inline; filename="{filename}"'
-    HTML(string=html_string).write_pdf(response)
-    return response
-
-
 def generate_qr_for_laptop(instance):
     """Generate a QR code for LaptopPackage and attach it to the model."""
+    import qrcode
     qr = qrcode.make(f"{settings.SITE_URL}{reverse('laptop_details_view', args=[instance.id])}")
     qr_io = BytesIO()
     qr.save(qr_io, format='PNG')
@@ -5853,10 +5213,40 @@ def printer_list(request):
         'printer_package__user_details',  # Prefetch UserDetails
         'printer_package__user_details__user_Enduser',  # Prefetch End User Employee
         'printer_package__user_details__user_Assetowner'  # Prefetch Asset Owner Employee
+    ).annotate(sort_model=Coalesce('printer_model_db', Value('')))
+
+    page = paginate(
+        request, printers,
+        sorts={
+            'model': ('sort_model',),
+            'serial': ('printer_sn_db',),
+            'newest': ('-created_at',),
+        },
+        filters={
+            'status': ACTIVE_DISPOSED_FILTER,
+            'type': 'printer_type__icontains',
+        },
+        search=_index_search('printer', 'printer_package_id'),
     )
-    
-    print("🖨️ VIEW CALLED — TOTAL PRINTER COUNT:", printers.count())
-    return render(request, 'printer/printer_list.html', {'printers': printers})
+    stats = PrinterDetails.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_disposed=False)),
+        disposed=Count('id', filter=Q(is_disposed=True)),
+    )
+
+    if wants_json(request):
+        return page.json_response(lambda p: {
+            'id': p.id,
+            'package_id': p.printer_package_id,
+            'brand': p.printer_brand_db.name if p.printer_brand_db else None,
+            'model': p.printer_model_db,
+            'serial_no': p.printer_sn_db,
+            'type': p.printer_type,
+            'end_user': p.end_user.full_name if p.end_user else None,
+            'is_disposed': p.is_disposed,
+        })
+
+    return render(request, 'printer/printer_list.html', {'printers': page.object_list, 'page': page, 'stats': stats})
 
 
 
@@ -5943,65 +5333,53 @@ def notifications_center(request):
     search_query = request.GET.get('q', '')
     
     # Base queryset
-    notifications = Notification.objects.filter(user=request.user, is_archived=False)
-    
-    # Apply type filter
-    if filter_type != 'all':
-        notifications = notifications.filter(notification_type=filter_type)
-    
-    # Apply status filter
-    if filter_status == 'unread':
-        notifications = notifications.filter(is_read=False)
-    elif filter_status == 'read':
-        notifications = notifications.filter(is_read=True)
-    
-    # Apply search
-    if search_query:
-        notifications = notifications.filter(
-            Q(title__icontains=search_query) | 
-            Q(message__icontains=search_query)
-        )
+    base = Notification.objects.filter(user=request.user, is_archived=False)
     
-    # Get statistics
-    unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
-    total_count = Notification.objects.filter(user=request.user, is_archived=False).count()
-    
-    # Get counts by type
-    type_counts = Notification.objects.filter(
-        user=request.user, 
-        is_archived=False
-    ).values('notification_type').annotate(count=Count('id'))
+    # Type/status filters, search and keyset pagination
+    page = paginate(
+        request, base.select_related('content_type'),
+        sorts={'newest': ('-created_at',), 'oldest': ('created_at',)},
+        filters={
+            'type': lambda qs, value: qs if value == 'all' else qs.filter(notification_type=value),
+            'status': {'unread': Q(is_read=False), 'read': Q(is_read=True)},
+        },
+        search=('title', 'message'),
+    )
+
+    if wants_json(request):
+        return page.json_response(lambda n: {
+            'id': n.id,
+            'type': n.notification_type,
+            'priority': n.priority,
+            'title': n.title,
+            'message': n.message,
+            'is_read': n.is_read,
+            'created_at': n.created_at.isoformat(),
+        })
     
-    # Today's notifications
+    # Statistics in one pass over the user's notifications
     today = timezone.now().date()
-    today_notifications = Notification.objects.filter(
-        user=request.user,
-        created_at__date=today
-    ).count()
-    
-    # This week's notifications
     week_ago = timezone.now() - timedelta(days=7)
-    week_notifications = Notification.objects.filter(
-        user=request.user,
-        created_at__gte=week_ago
-    ).count()
+    stats = Notification.objects.filter(user=request.user).aggregate(
+        unread_count=Count('id', filter=Q(is_read=False)),
+        total_count=Count('id', filter=Q(is_archived=False)),
+        today_count=Count('id', filter=Q(created_at__date=today)),
+        week_count=Count('id', filter=Q(created_at__gte=week_ago)),
+        urgent_count=Count('id', filter=Q(is_archived=False, priority='urgent', is_read=False)),
+        high_count=Count('id', filter=Q(is_archived=False, priority='high', is_read=False)),
+    )
     
-    # Priority counts
-    urgent_count = notifications.filter(priority='urgent', is_read=False).count()
-    high_count = notifications.filter(priority='high', is_read=False).count()
+    # Get counts by type
+    type_counts = base.values('notification_type').annotate(count=Count('id'))
     
     context = {
-        'notifications': notifications,
-        'unread_count': unread_count,
-        'total_count': total_count,
-        'today_count': today_notifications,
-        'week_count': week_notifications,
-        'urgent_count': urgent_count,
-        'high_count': high_count,
+        'notifications': page.object_list,
+        'page': page,
         'type_counts': type_counts,
         'current_filter': filter_type,
         'current_status': filter_status,
         'search_query': search_query,
+        **stats,
     }
     
     return render(request, 'notifications/notifications_center.html', context)
@@ -6084,6 +5462,41 @@ def get_notification_count(request):
     return JsonResponse({'unread_count': unread_count})
 
 
+@login_required
+def asset_search_api(request):
+    """
+    Cross-type asset search (desktops, laptops, printers, office supplies)
+    served from the AssetIndex table.
+    ?q=term&type=desktop&disposed=1&limit=50
+    """
+    from .asset_index import search_assets
+
+    try:
+        limit = min(max(int(request.GET.get('limit', 50)), 1), 200)
+    except ValueError:
+        limit = 50
+
+    rows = search_assets(
+        request.GET.get('q', ''),
+        asset_type=request.GET.get('type') or None,
+        include_disposed=request.GET.get('disposed') == '1',
+    )[:limit]
+
+    return JsonResponse({'results': [{
+        'type': row.asset_type,
+        'package_id': row.package_id,
+        'computer_name': row.computer_name,
+        'serial_no': row.serial_no,
+        'brand': row.brand,
+        'model': row.model,
+        'end_user': row.end_user_name,
+        'asset_owner': row.asset_owner_name,
+        'section': row.section_name,
+        'is_disposed': row.is_disposed,
+        'url': row.get_absolute_url(),
+    } for row in rows]})
+
+
 # ==================== OFFICE SUPPLIES VIEWS ====================
 
 @login_required
@@ -6091,9 +5504,30 @@ def office_supplies_list(request):
     """List all office supplies"""
     supplies = OfficeSuppliesDetails.objects.select_related(
         'supplies_package', 'brand_name'
-    ).filter(is_disposed=False).order_by('-created_at')
+    ).prefetch_related(
+        'supplies_package__user_details__user_Enduser'
+    ).filter(is_disposed=False)
+
+    page = paginate(
+        request, supplies,
+        sorts={'newest': ('-created_at',), 'type': ('item_type',)},
+        filters={'type': 'item_type__icontains'},
+        search=_index_search('office_supplies', 'supplies_package_id'),
+    )
+
+    if wants_json(request):
+        return page.json_response(lambda d: {
+            'id': d.id,
+            'package_id': d.supplies_package_id,
+            'item_type': d.item_type,
+            'brand': d.brand_name.name if d.brand_name else None,
+            'quantity': d.quantity,
+            'unit': d.unit,
+            'serial_no': d.supplies_sn_db,
+            'end_user': d.end_user.full_name if d.end_user else None,
+        })
 
-    return render(request, 'office_supplies/supplies_list.html', {'supplies': supplies})
+    return render(request, 'office_supplies/supplies_list.html', {'supplies': page.object_list, 'page': page})
 
 
 @login_required
@@ -6368,39 +5802,30 @@ def pm_dashboard(request):
 def pm_checklist_list(request):
     """List all scheduled checklists with filters"""
     
-    # Get filter parameters
-    status_filter = request.GET.get('status', '')
-    annex_filter = request.GET.get('annex', '')
-    date_from = request.GET.get('date_from', '')
-    date_to = request.GET.get('date_to', '')
-    
     checklists = PMChecklistSchedule.objects.all().select_related('template', 'assigned_to')
     
-    # Apply filters
-    if status_filter:
-        checklists = checklists.filter(status=status_filter)
-    
-    if annex_filter:
-        checklists = checklists.filter(template__annex_code=annex_filter)
-    
-    if date_from:
-        checklists = checklists.filter(scheduled_date__gte=date_from)
-    
-    if date_to:
-        checklists = checklists.filter(scheduled_date__lte=date_to)
-    
-    checklists = checklists.order_by('-scheduled_date')
+    page = paginate(
+        request, checklists,
+        sorts={'newest': ('-scheduled_date',), 'oldest': ('scheduled_date',)},
+        filters={
+            'status': 'status',
+            'annex': 'template__annex_code',
+            'date_from': 'scheduled_date__gte',
+            'date_to': 'scheduled_date__lte',
+        },
+    )
     
     # Get all templates for filter dropdown
     templates = PMChecklistTemplate.objects.filter(is_active=True)
     
     context = {
-        'checklists': checklists,
+        'checklists': page,
+        'page': page,
         'templates': templates,
-        'status_filter': status_filter,
-        'annex_filter': annex_filter,
-        'date_from': date_from,
-        'date_to': date_to,
+        'status_filter': page.params['status'],
+        'annex_filter': page.params['annex'],
+        'date_from': page.params['date_from'],
+        'date_to': page.params['date_to'],
     }
     
     return render(request, 'pm/pm_checklist_list.html', context)
@@ -6664,27 +6089,24 @@ def pm_generate_report(request):
 def pm_issues(request):
     """List all PM issues"""
     
-    status_filter = request.GET.get('status', '')
-    priority_filter = request.GET.get('priority', '')
-    
     issues = PMIssueLog.objects.all().select_related(
         'item_completion__completion__schedule__template',
         'reported_by',
         'assigned_to'
     )
     
-    if status_filter:
-        issues = issues.filter(status=status_filter)
-    
-    if priority_filter:
-        issues = issues.filter(priority=priority_filter)
-    
-    issues = issues.order_by('-priority', '-reported_at')
+    page = paginate(
+        request, issues,
+        sorts={'priority': ('-priority', '-reported_at'), 'newest': ('-reported_at',)},
+        filters={'status': 'status', 'priority': 'priority'},
+        search=('issue_title', 'issue_description'),
+    )
     
     context = {
-        'issues': issues,
-        'status_filter': status_filter,
-        'priority_filter': priority_filter,
+        'issues': page,
+        'page': page,
+        'status_filter': page.params['status'],
+        'priority_filter': page.params['priority'],
     }
     
     return render(request, 'pm/issues.html', context)
@@ -7170,79 +6592,6 @@ def snmr_delete(request, report_id):
     return redirect('snmr_list')
 
 
-@login_required
-def snmr_export_excel(request, report_id):
-    """Export SNMR report to Excel using template - fills data into pre-formatted cells"""
-    from openpyxl import load_workbook
-    from openpyxl.styles import Alignment
-    from django.http import HttpResponse
-    import io
-    from copy import copy
-
-    report = get_object_or_404(SNMRReport, id=report_id)
-    entries = report.entries.select_related('area_category').order_by('item_number')
-
-    # Load template
-    template_path = 'static/excel_template/snmr_template.xlsx'
-    wb = load_workbook(template_path)
-    ws = wb.active
-
-    # Fill in header information
-    ws['A2'] = f'For the Month of {report.period_display}'
-    ws['B4'] = report.region
-    ws['B5'] = report.office
-    ws['B6'] = report.address
-    ws['F4'] = report.network_admin_name
-    ws['F5'] = report.network_admin_contact
-    ws['F6'] = report.network_admin_email
-
-    # Data starts at row 10 (template already has headers and formatting)
-    data_start_row = 10
-
-    # Fill in data entries - just add data and enable wrapping, preserve all template formatting
-    for idx, entry in enumerate(entries):
-        row_num = data_start_row + idx
-
-        # Fill in the data for this entry
-        ws[f'A{row_num}'] = entry.item_number
-        ws[f'B{row_num}'] = entry.area_category.name
-        ws[f'C{row_num}'] = entry.status
-        ws[f'D{row_num}'] = entry.reason
-        ws[f'E{row_num}'] = entry.initial_isolation
-        ws[f'F{row_num}'] = entry.date
-        ws[f'G{row_num}'] = entry.resolution
-
-        # Enable text wrapping for all data cells to handle long content
-        # Preserve existing alignment from template
-        for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G']:
-            cell = ws[f'{col}{row_num}']
-            if cell.alignment:
-                # Preserve existing alignment but enable wrapping
-                cell.alignment = Alignment(
-                    horizontal=cell.alignment.horizontal,
-                    vertical=cell.alignment.vertical,
-                    wrap_text=True
-                )
-            else:
-                # Default alignment with wrapping if no existing alignment
-                cell.alignment = Alignment(wrap_text=True)
-
-    # Save to BytesIO
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-
-    # Create response
-    response = HttpResponse(
-        output,
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="SNMR_{report.month_name}_{report.year}.xlsx"'
-
-    return response
-
-
-
 @login_required
 def snmr_finalize(request, report_id):
     """Finalize SNMR report (lock it from editing)"""
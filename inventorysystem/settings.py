@@ -50,6 +50,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'inventory.middleware.QueryInstrumentationMiddleware',  # Opt-in, see QUERY_INSTRUMENTATION below
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -95,6 +96,18 @@ DATABASES = {
 }
 
 
+# Cache
+# Shared between worker processes (used for the pending PM summary, etc.)
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('CACHE_LOCATION', default=os.path.join(BASE_DIR, 'cache')),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -186,4 +199,80 @@ if not DEBUG:
     # HSTS (HTTP Strict Transport Security)
     SECURE_HSTS_SECONDS = config('SECURE_HSTS_SECONDS', default=31536000, cast=int)
     SECURE_HSTS_INCLUDE_SUBDOMAINS = config('SECURE_HSTS_INCLUDE_SUBDOMAINS', default=True, cast=bool)
-    SECURE_HSTS_PRELOAD = config('SECURE_HSTS_PRELOAD', default=True, cast=bool)
\ No newline at end of file
+    SECURE_HSTS_PRELOAD = config('SECURE_HSTS_PRELOAD', default=True, cast=bool)
+
+# ============================================================================
+# DASHBOARD SNAPSHOT
+# ============================================================================
+# Maximum age (seconds) of the materialized dashboard numbers before the next
+# dashboard hit rebuilds them. 0 = only rebuild when flagged stale by signals.
+DASHBOARD_SNAPSHOT_MAX_AGE = config('DASHBOARD_SNAPSHOT_MAX_AGE', default=900, cast=int)
+
+
+# ============================================================================
+# NOTIFICATION OUTBOX (inventory/notification_outbox.py)
+# ============================================================================
+# Signals queue notification events; `python manage.py process_notification_outbox`
+# (cron/systemd) or the in-process APScheduler job below writes the notifications.
+# Enable the scheduler in one web process only.
+NOTIFICATION_OUTBOX_SCHEDULER = config('NOTIFICATION_OUTBOX_SCHEDULER', default=False, cast=bool)
+NOTIFICATION_OUTBOX_INTERVAL = config('NOTIFICATION_OUTBOX_INTERVAL', default=30, cast=int)
+NOTIFICATION_OUTBOX_BATCH_SIZE = config('NOTIFICATION_OUTBOX_BATCH_SIZE', default=200, cast=int)
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = 5
+# A claimed batch not finished within this many seconds is picked up again
+NOTIFICATION_OUTBOX_LEASE_SECONDS = 300
+# Seconds between PM due/overdue scans in the scheduler (0 = off; then run
+# `python manage.py check_pm_schedules` from cron instead)
+PM_ALERT_SCAN_INTERVAL = config('PM_ALERT_SCAN_INTERVAL', default=3600, cast=int)
+
+
+# ============================================================================
+# EXPORT JOBS (inventory/export_jobs.py)
+# ============================================================================
+# Exports submitted with ?background=1 are rendered by
+# `python manage.py run_export_jobs --loop 5` and downloaded when ready.
+# Finished files live under MEDIA_ROOT/exports/ for EXPORT_JOB_TTL_HOURS.
+EXPORT_JOB_TTL_HOURS = config('EXPORT_JOB_TTL_HOURS', default=24, cast=int)
+EXPORT_JOB_MAX_ATTEMPTS = 2
+# A running job without a progress report for this many seconds is picked up again
+EXPORT_JOB_LEASE_SECONDS = 600
+
+# Worker processes for the month-wide HDR job sheet export (inventory/job_sheets.py);
+# 0 = one per CPU (up to 4), 1 = render in the calling process
+HDR_JOB_SHEET_WORKERS = config('HDR_JOB_SHEET_WORKERS', default=0, cast=int)
+
+# ============================================================================
+# ASSET SHEET PDF CACHE (inventory/asset_pdf_cache.py)
+# ============================================================================
+# Rendered desktop/laptop asset sheets, keyed by a hash of their content.
+# `run_export_jobs --purge` deletes files first rendered ASSET_PDF_CACHE_DAYS ago.
+ASSET_PDF_CACHE_DIR = config('ASSET_PDF_CACHE_DIR', default=os.path.join(BASE_DIR, 'cache', 'asset_pdfs'))
+ASSET_PDF_CACHE_DAYS = config('ASSET_PDF_CACHE_DAYS', default=30, cast=int)
+
+# Worker processes rendering batch asset sheet PDFs (inventory/asset_sheets.py);
+# 0 = one per CPU (up to 4), 1 = render in the calling process
+ASSET_SHEET_BATCH_WORKERS = config('ASSET_SHEET_BATCH_WORKERS', default=0, cast=int)
+
+
+# ============================================================================
+# QUERY BUDGET / TIMING INSTRUMENTATION (inventory/middleware.py)
+# ============================================================================
+# Opt-in: records SQL count/time, duplicate queries and response time per URL
+# name into response headers and a rolling JSON-lines log.
+QUERY_INSTRUMENTATION = config('QUERY_INSTRUMENTATION', default=False, cast=bool)
+QUERY_INSTRUMENTATION_LOG = config('QUERY_INSTRUMENTATION_LOG', default=os.path.join(BASE_DIR, 'logs', 'query_budget.log'))
+QUERY_INSTRUMENTATION_LOG_MAX_BYTES = 5 * 1024 * 1024
+QUERY_INSTRUMENTATION_LOG_BACKUPS = 5
+
+# 'warn' logs a warning when a budget is exceeded, 'raise' fails the request (tests)
+QUERY_BUDGET_MODE = config('QUERY_BUDGET_MODE', default='warn')
+
+# Per URL name budgets; '*' is the fallback for views without their own entry.
+# Keys: queries, sql_ms, total_ms, duplicates
+QUERY_BUDGETS = {
+    '*': {'queries': 50, 'duplicates': 10},
+    'dashboard': {'queries': 10},
+    'pm_overview': {'queries': 30},
+    'salvage_overview': {'queries': 30},
+    'laptop_list': {'queries': 20},
+}